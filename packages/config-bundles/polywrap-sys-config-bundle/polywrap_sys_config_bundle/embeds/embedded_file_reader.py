@@ -1,20 +1,19 @@
 """This module contains the embedded file reader."""
 from pathlib import Path
 
-from polywrap_core import FileReader
+from polywrap_wasm import MappedFileReader
 
 
-class EmbeddedFileReader(FileReader):
-    """A file reader that reads from the embedded files."""
+class EmbeddedFileReader(MappedFileReader):
+    """A file reader that reads from the embedded files.
+
+    The Wasm modules of the embedded wraps are mapped in memory,\
+        so embedded wraps that are never invoked aren't read.
+    """
 
     def __init__(self, embedded_wrap_path: Path):
         """Initialize the embedded file reader."""
-        self._embedded_wrap_path = embedded_wrap_path
-
-    def read_file(self, file_path: str) -> bytes:
-        """Read the file from the embedded files."""
-        with open(self._embedded_wrap_path / file_path, "rb") as f:
-            return f.read()
+        super().__init__(embedded_wrap_path)
 
 
 __all__ = ["EmbeddedFileReader"]
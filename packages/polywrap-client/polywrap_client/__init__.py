@@ -38,4 +38,6 @@ Invoke a wrapper.
 >>> result = client.invoke(uri=uri, method="cat", args=args, encode_result=False)
 >>> assert result.startswith(b"<svg")
 """
+from .async_client import *
 from .client import *
+from .invocation import *
@@ -0,0 +1,325 @@
+"""This module contains the asyncio Polywrap client implementation."""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+from polywrap_core import (
+    AsyncInvocable,
+    ClientConfig,
+    InvocableResult,
+    Uri,
+    UriPackageOrWrapper,
+    UriResolutionContext,
+    UriResolver,
+    Wrapper,
+    get_env_from_resolution_path,
+)
+from polywrap_manifest import AnyWrapManifest
+
+from .client import PolywrapClient
+from .invocation import (
+    format_invoke_result,
+    get_wrap_method_codec,
+    load_invocation_wrapper,
+    track_wrapper_invocation,
+)
+
+_T = TypeVar("_T")
+
+
+class AsyncPolywrapClient:
+    """Defines the asyncio Polywrap client.
+
+    Wrappers, resolvers and plugin methods are blocking, so they run\
+        in a bounded thread pool while the event loop stays free to run\
+        other invocations. Plugin methods defined with `async def` are\
+        awaited on the event loop instead. Subinvocations made by a wrapper\
+        are handled synchronously, in the thread running the wrapper,\
+        by the PolywrapClient returned by `get_sync_client`.
+
+    `async def` plugin methods receive that synchronous client too, so\
+        a subinvocation made with it blocks the event loop until it\
+        returns. Such methods must hand their subinvocations to a thread,\
+        e.g. with `await asyncio.to_thread(client.invoke, ...)`, or be\
+        defined as blocking methods, which run in the executor.
+
+    Args:
+        config (ClientConfig): The polywrap client config.
+        executor (Optional[Executor]): The executor running the blocking\
+            calls. A thread pool of max_workers threads, shut down\
+            by `shutdown`, is created when it isn't given.
+        max_workers (Optional[int]): The maximum number of threads\
+            of the created thread pool. Defaults to the default\
+            of ThreadPoolExecutor.
+
+    Examples:
+        >>> import asyncio
+        >>> from polywrap_client_config_builder import PolywrapClientConfigBuilder
+        >>> from polywrap_core import Uri
+        >>> async def main():
+        ...     async with AsyncPolywrapClient(
+        ...         PolywrapClientConfigBuilder().build(), max_workers=4
+        ...     ) as client:
+        ...         return await client.try_resolve_uri(Uri.from_str("ens/foo.eth"))
+        >>> asyncio.run(main())
+        Uri("ens", "foo.eth")
+    """
+
+    _client: PolywrapClient
+    _executor: Executor
+    _owns_executor: bool
+
+    def __init__(
+        self,
+        config: ClientConfig,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize a new AsyncPolywrapClient instance."""
+        self._client = PolywrapClient(config)
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="polywrap-client"
+        )
+
+    def get_sync_client(self) -> PolywrapClient:
+        """Get the synchronous client sharing the configuration of this client.
+
+        Returns:
+            PolywrapClient: The client handling the subinvocations.
+        """
+        return self._client
+
+    def get_config(self) -> ClientConfig:
+        """Get the client configuration.
+
+        Returns:
+            ClientConfig: The polywrap client configuration.
+        """
+        return self._client.get_config()
+
+    def get_uri_resolver(self) -> UriResolver:
+        """Get the URI resolver.
+
+        Returns:
+            UriResolver: The URI resolver.
+        """
+        return self._client.get_uri_resolver()
+
+    def get_envs(self) -> Dict[Uri, Any]:
+        """Get the dictionary of environment variables.
+
+        Returns:
+            Dict[Uri, Any]: The dictionary of environment variables.
+        """
+        return self._client.get_envs()
+
+    def get_interfaces(self) -> Dict[Uri, List[Uri]]:
+        """Get the interfaces.
+
+        Returns:
+            Dict[Uri, List[Uri]]: The dictionary of interface-implementations.
+        """
+        return self._client.get_interfaces()
+
+    def get_env_by_uri(self, uri: Uri) -> Union[Any, None]:
+        """Get the environment variables for the given URI.
+
+        Args:
+            uri (Uri): The URI of the wrapper.
+
+        Returns:
+            Union[Any, None]: The environment variables.
+        """
+        return self._client.get_env_by_uri(uri)
+
+    async def get_implementations(
+        self,
+        uri: Uri,
+        apply_resolution: bool = True,
+        resolution_context: Optional[UriResolutionContext] = None,
+    ) -> Optional[List[Uri]]:
+        """Get implementations of an interface with its URI.
+
+        Args:
+            uri (Uri): URI of the interface.
+            apply_resolution (bool): If True, apply resolution to the URI and interfaces.
+            resolution_context (Optional[UriResolutionContext]): A URI resolution context
+
+        Returns:
+            Optional[List[Uri]]: List of implementations or None if not found.
+
+        Raises:
+            WrapGetImplementationsError: If the URI cannot be resolved.
+        """
+        return await self._run(
+            self._client.get_implementations, uri, apply_resolution, resolution_context
+        )
+
+    async def get_file(
+        self, uri: Uri, path: str, encoding: Optional[str] = "utf-8"
+    ) -> Union[bytes, str]:
+        """Get the file from the given wrapper URI.
+
+        Args:
+            uri (Uri): The wrapper URI.
+            path (str): The path to the file.
+            encoding (Optional[str]): The encoding of the file.
+
+        Returns:
+            Union[bytes, str]: The file contents.
+        """
+        loaded_wrapper = await self.load_wrapper(uri)
+        return await self._run(loaded_wrapper.get_file, path, encoding)
+
+    async def get_manifest(self, uri: Uri) -> AnyWrapManifest:
+        """Get the manifest from the given wrapper URI.
+
+        Args:
+            uri (Uri): The wrapper URI.
+
+        Returns:
+            AnyWrapManifest: The manifest.
+        """
+        loaded_wrapper = await self.load_wrapper(uri)
+        return loaded_wrapper.get_manifest()
+
+    async def try_resolve_uri(
+        self, uri: Uri, resolution_context: Optional[UriResolutionContext] = None
+    ) -> UriPackageOrWrapper:
+        """Try to resolve the given URI.
+
+        Args:
+            uri (Uri): The URI to resolve.
+            resolution_context (Optional[UriResolutionContext]):\
+                The resolution context.
+
+        Returns:
+            UriPackageOrWrapper: The resolved URI, package or wrapper.
+
+        Raises:
+            UriResolutionError: If the URI cannot be resolved.
+        """
+        return await self._run(self._client.try_resolve_uri, uri, resolution_context)
+
+    async def load_wrapper(
+        self,
+        uri: Uri,
+        resolution_context: Optional[UriResolutionContext] = None,
+    ) -> Wrapper:
+        """Load the wrapper for the given URI.
+
+        Args:
+            uri (Uri): The wrapper URI.
+            resolution_context (Optional[UriResolutionContext]):\
+                The resolution context.
+
+        Returns:
+            Wrapper: initialized wrapper instance.
+
+        Raises:
+            UriResolutionError: If the URI cannot be resolved.
+            WrapNotFoundError: If the wrap is not found.
+        """
+        return await self._run(self._client.load_wrapper, uri, resolution_context)
+
+    async def invoke(
+        self,
+        uri: Uri,
+        method: str,
+        args: Optional[Any] = None,
+        env: Optional[Any] = None,
+        resolution_context: Optional[UriResolutionContext] = None,
+        encode_result: Optional[bool] = False,
+        lazy_decode: Optional[bool] = False,
+    ) -> Any:
+        """Invoke the given wrapper URI.
+
+        Wrappers implementing the AsyncInvocable protocol, such as plugin\
+            wrappers, are awaited so that `async def` plugin methods run\
+            on the event loop. Other wrappers are invoked in the executor.
+
+        Args:
+            uri (Uri): The wrapper URI.
+            method (str): The method to invoke.
+            args (Optional[Any]): The arguments to pass to the method.
+            env (Optional[Any]): The environment variables to pass.
+            resolution_context (Optional[UriResolutionContext]):\
+                The resolution context.
+            encode_result (Optional[bool]): If True, encode the result.
+            lazy_decode (Optional[bool]): If True, decode maps and arrays\
+                of the result into LazyMsgpackMap and LazyMsgpackArray views\
+                which decode their fields on access.
+
+        Returns:
+            Any: The result of the invocation.
+
+        Raises:
+            MsgpackError: If the data cannot be encoded/decoded.
+            ManifestError: If the manifest is invalid.
+            WrapError: If something went wrong during the invocation.
+            WrapNotFoundError: If the wrap is not found.
+            UriResolutionError: If the URI cannot be resolved.
+        """
+        resolution_context = resolution_context or UriResolutionContext()
+        wrapper, wrapper_resolution_path = await self._run(
+            load_invocation_wrapper, self._client, uri, resolution_context
+        )
+        wrapper_resolved_uri = wrapper_resolution_path[-1]
+
+        env = env or get_env_from_resolution_path(wrapper_resolution_path, self._client)
+
+        with track_wrapper_invocation(
+            resolution_context, wrapper_resolved_uri
+        ) as wrapper_invoke_context:
+            invocable_result = await self._invoke_wrapper(
+                wrapper,
+                {
+                    "uri": wrapper_resolved_uri,
+                    "method": method,
+                    "args": args,
+                    "env": env,
+                    "resolution_context": wrapper_invoke_context,
+                    "client": self._client,
+                },
+            )
+
+        codec = None if encode_result else get_wrap_method_codec(wrapper, method)
+        return format_invoke_result(invocable_result, encode_result, lazy_decode, codec)
+
+    async def _invoke_wrapper(
+        self, wrapper: Wrapper, options: Dict[str, Any]
+    ) -> InvocableResult:
+        """Await the wrapper if it supports it, or else invoke it\
+            in the executor."""
+        if isinstance(wrapper, AsyncInvocable):
+            return await wrapper.invoke_async(executor=self._executor, **options)
+        return await self._run(partial(wrapper.invoke, **options))
+
+    async def _run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run a blocking call in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the thread pool created by the client, if any.
+
+        Args:
+            wait (bool): If True, wait for the running calls to finish.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+
+    async def __aenter__(self) -> AsyncPolywrapClient:
+        """Enter the client context."""
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Shut the client down when leaving its context."""
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+
+
+__all__ = ["AsyncPolywrapClient"]
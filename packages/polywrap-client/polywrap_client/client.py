@@ -1,26 +1,37 @@
 """This module contains the Polywrap client implementation."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 from polywrap_core import (
+    BatchInvocable,
     Client,
     ClientConfig,
+    InvocableBatchResult,
     Uri,
     UriPackage,
     UriPackageOrWrapper,
     UriResolutionContext,
-    UriResolutionStep,
     UriResolver,
     UriWrapper,
     Wrapper,
     get_env_from_resolution_path,
 )
 from polywrap_core import get_implementations as core_get_implementations
-from polywrap_manifest import AnyWrapManifest, DeserializeManifestOptions
-from polywrap_msgpack import msgpack_decode, msgpack_encode
+from polywrap_manifest import (
+    AnyWrapManifest,
+    DeserializeManifestOptions,
+    WrapMethodCodec,
+)
+from polywrap_msgpack import DEFAULT_CHUNK_SIZE, msgpack_decode_stream
 
 from .errors import WrapNotFoundError
+from .invocation import (
+    format_invoke_result,
+    get_wrap_method_codec,
+    load_invocation_wrapper,
+    track_wrapper_invocation,
+)
 
 
 class PolywrapClient(Client):
@@ -198,6 +209,7 @@ class PolywrapClient(Client):
         env: Optional[Any] = None,
         resolution_context: Optional[UriResolutionContext] = None,
         encode_result: Optional[bool] = False,
+        lazy_decode: Optional[bool] = False,
     ) -> Any:
         """Invoke the given wrapper URI.
 
@@ -209,6 +221,9 @@ class PolywrapClient(Client):
             resolution_context (Optional[UriResolutionContext]):\
                 The resolution context.
             encode_result (Optional[bool]): If True, encode the result.
+            lazy_decode (Optional[bool]): If True, decode maps and arrays\
+                of the result into LazyMsgpackMap and LazyMsgpackArray views\
+                which decode their fields on access.
 
         Returns:
             Any: The result of the invocation.
@@ -221,40 +236,16 @@ class PolywrapClient(Client):
             UriResolutionError: If the URI cannot be resolved.
         """
         resolution_context = resolution_context or UriResolutionContext()
-        load_wrapper_context = resolution_context.create_sub_history_context()
-
-        try:
-            wrapper = self.load_wrapper(uri, resolution_context=load_wrapper_context)
-        except Exception as err:
-            resolution_context.track_step(
-                UriResolutionStep(
-                    source_uri=uri,
-                    result=uri,
-                    description=f"Client.load_wrapper - Error: {err.__class__.__name__}",
-                    sub_history=load_wrapper_context.get_history(),
-                )
-            )
-            raise err
-
-        wrapper_resolution_path = load_wrapper_context.get_resolution_path()
-        wrapper_resolved_uri = wrapper_resolution_path[-1]
-
-        resolution_context.track_step(
-            UriResolutionStep(
-                source_uri=uri,
-                result=UriWrapper(uri=uri, wrapper=wrapper),
-                description="Client.load_wrapper",
-                sub_history=load_wrapper_context.get_history(),
-            )
-        )
-
-        env = env or get_env_from_resolution_path(
-            load_wrapper_context.get_resolution_path(), self
+        wrapper, wrapper_resolution_path = load_invocation_wrapper(
+            self, uri, resolution_context
         )
+        wrapper_resolved_uri = wrapper_resolution_path[-1]
 
-        wrapper_invoke_context = resolution_context.create_sub_history_context()
+        env = env or get_env_from_resolution_path(wrapper_resolution_path, self)
 
-        try:
+        with track_wrapper_invocation(
+            resolution_context, wrapper_resolved_uri
+        ) as wrapper_invoke_context:
             invocable_result = wrapper.invoke(
                 uri=wrapper_resolved_uri,
                 method=method,
@@ -263,39 +254,186 @@ class PolywrapClient(Client):
                 resolution_context=wrapper_invoke_context,
                 client=self,
             )
-        except Exception as err:
-            resolution_context.track_step(
-                UriResolutionStep(
-                    source_uri=wrapper_resolved_uri,
-                    result=wrapper_resolved_uri,
-                    description=f"Wrapper.invoke - Error: {err.__class__.__name__}",
-                    sub_history=wrapper_invoke_context.get_history(),
-                )
-            )
-            raise err
-
-        resolution_context.track_step(
-            UriResolutionStep(
-                source_uri=wrapper_resolved_uri,
-                result=wrapper_resolved_uri,
-                description="Wrapper.invoke",
-                sub_history=wrapper_invoke_context.get_history(),
-            )
+
+        codec = None if encode_result else get_wrap_method_codec(wrapper, method)
+        return format_invoke_result(invocable_result, encode_result, lazy_decode, codec)
+
+    def invoke_stream(
+        self,
+        uri: Uri,
+        method: str,
+        args: Optional[Any] = None,
+        env: Optional[Any] = None,
+        resolution_context: Optional[UriResolutionContext] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Any]:
+        """Invoke the given wrapper URI and decode the result incrementally.
+
+        The msgpack encoded result is decoded one top-level element\
+            at a time instead of all at once, so that large results can be\
+            consumed without materializing the whole decoded value.\
+            Results of wrappers which don't encode them, such as plugins,\
+            are encoded first so that they are iterated the same way.
+
+        Args:
+            uri (Uri): The wrapper URI.
+            method (str): The method to invoke.
+            args (Optional[Any]): The arguments to pass to the method.
+            env (Optional[Any]): The environment variables to pass.
+            resolution_context (Optional[UriResolutionContext]):\
+                The resolution context.
+            chunk_size (int): The number of bytes decoded at once.
+
+        Returns:
+            Iterator[Any]: The elements of an array result, the key and value\
+                tuples of a map result, or else the result alone.
+
+        Raises:
+            MsgpackError: If the data cannot be encoded/decoded.
+            ManifestError: If the manifest is invalid.
+            WrapError: If something went wrong during the invocation.
+            WrapNotFoundError: If the wrap is not found.
+            UriResolutionError: If the URI cannot be resolved.
+        """
+        encoded_result = self.invoke(
+            uri=uri,
+            method=method,
+            args=args,
+            env=env,
+            resolution_context=resolution_context,
+            encode_result=True,
         )
+        return msgpack_decode_stream(encoded_result, chunk_size)
 
-        if encode_result and not invocable_result.encoded:
-            encoded = msgpack_encode(invocable_result.result)
-            return encoded
+    def invoke_batch(
+        self,
+        uri: Uri,
+        method: str,
+        args_iterable: Iterable[Optional[Any]],
+        env: Optional[Any] = None,
+        resolution_context: Optional[UriResolutionContext] = None,
+        encode_result: Optional[bool] = False,
+    ) -> Iterator[InvocableBatchResult]:
+        """Invoke a method of the given wrapper URI once for every args.
+
+        The wrapper is resolved once for the whole batch. Wrappers\
+            implementing the BatchInvocable protocol, such as Wasm wrappers,\
+            run the batch themselves, such as in the pooled instances\
+            of the wrapper. The invocation of the wrapper is tracked\
+            in the resolution context once the results are consumed.
+
+        Args:
+            uri (Uri): The wrapper URI.
+            method (str): The method to invoke.
+            args_iterable (Iterable[Optional[Any]]): The arguments\
+                of the invocations. It is consumed lazily.
+            env (Optional[Any]): The environment variables to pass.
+            resolution_context (Optional[UriResolutionContext]):\
+                The resolution context.
+            encode_result (Optional[bool]): If True, encode the results.
+
+        Returns:
+            Iterator[InvocableBatchResult]: The results of the invocations,\
+                in the order of their args. A failed invocation yields\
+                its error and doesn't stop the batch.
+
+        Raises:
+            WrapNotFoundError: If the wrap is not found.
+            UriResolutionError: If the URI cannot be resolved.
+        """
+        resolution_context = resolution_context or UriResolutionContext()
+        wrapper, wrapper_resolution_path = load_invocation_wrapper(
+            self, uri, resolution_context
+        )
+        wrapper_resolved_uri = wrapper_resolution_path[-1]
+
+        env = env or get_env_from_resolution_path(wrapper_resolution_path, self)
+
+        results = self._invoke_batch_wrapper(
+            wrapper,
+            wrapper_resolved_uri,
+            method,
+            args_iterable,
+            env,
+            resolution_context,
+        )
+        return self._format_batch_results(
+            results,
+            encode_result,
+            None if encode_result else get_wrap_method_codec(wrapper, method),
+        )
+
+    def _invoke_batch_wrapper(
+        self,
+        wrapper: Wrapper,
+        uri: Uri,
+        method: str,
+        args_iterable: Iterable[Optional[Any]],
+        env: Optional[Any],
+        resolution_context: UriResolutionContext,
+    ) -> Iterator[InvocableBatchResult]:
+        """Run the invocations of a batch and track them once it's consumed."""
+        with track_wrapper_invocation(
+            resolution_context, uri
+        ) as wrapper_invoke_context:
+            if isinstance(wrapper, BatchInvocable):
+                yield from wrapper.invoke_batch(
+                    uri=uri,
+                    method=method,
+                    args_iterable=args_iterable,
+                    env=env,
+                    resolution_context=wrapper_invoke_context,
+                    client=self,
+                )
+            else:
+                yield from self._invoke_each(
+                    wrapper, uri, method, args_iterable, env, wrapper_invoke_context
+                )
 
-        if (
-            not encode_result
-            and invocable_result.encoded
-            and isinstance(invocable_result.result, (bytes, bytearray))
-        ):
-            decoded: Any = msgpack_decode(invocable_result.result)
-            return decoded
+    def _invoke_each(
+        self,
+        wrapper: Wrapper,
+        uri: Uri,
+        method: str,
+        args_iterable: Iterable[Optional[Any]],
+        env: Optional[Any],
+        resolution_context: UriResolutionContext,
+    ) -> Iterator[InvocableBatchResult]:
+        """Invoke a wrapper without batch support once for every args."""
+        for args in args_iterable:
+            try:
+                invocable_result = wrapper.invoke(
+                    uri=uri,
+                    method=method,
+                    args=args,
+                    env=env,
+                    resolution_context=resolution_context,
+                    client=self,
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                yield InvocableBatchResult(error=err)
+                continue
+            yield InvocableBatchResult(
+                result=invocable_result.result, encoded=invocable_result.encoded
+            )
 
-        return invocable_result.result
+    def _format_batch_results(
+        self,
+        results: Iterable[InvocableBatchResult],
+        encode_result: Optional[bool],
+        codec: Optional[WrapMethodCodec],
+    ) -> Iterator[InvocableBatchResult]:
+        """Encode or decode the results of a batch like `invoke` does."""
+        for result in results:
+            if result.error is not None:
+                yield result
+                continue
+            try:
+                value = format_invoke_result(result, encode_result, codec=codec)
+            except Exception as err:  # pylint: disable=broad-except
+                yield InvocableBatchResult(error=err)
+                continue
+            yield InvocableBatchResult(result=value, encoded=bool(encode_result))
 
 
 __all__ = ["PolywrapClient"]
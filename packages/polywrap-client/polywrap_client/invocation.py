@@ -0,0 +1,210 @@
+"""This module contains the helpers shared by the clients to run an invocation."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Generator, List, Optional, Tuple, Union, cast
+
+from polywrap_core import (
+    InvocableBatchResult,
+    InvocableResult,
+    Uri,
+    UriResolutionContext,
+    UriResolutionStep,
+    UriWrapper,
+    Wrapper,
+)
+from polywrap_manifest import WrapCodecsProvider, WrapMethodCodec
+from polywrap_msgpack import (
+    MsgpackBuffer,
+    msgpack_decode,
+    msgpack_decode_lazy,
+    msgpack_encode,
+)
+
+if TYPE_CHECKING:
+    from .client import PolywrapClient
+
+
+def load_invocation_wrapper(
+    client: PolywrapClient, uri: Uri, resolution_context: UriResolutionContext
+) -> Tuple[Wrapper, List[Uri]]:
+    """Load the wrapper of an invocation and track it in the resolution context.
+
+    Args:
+        client (PolywrapClient): The client loading the wrapper.
+        uri (Uri): The wrapper URI.
+        resolution_context (UriResolutionContext): The resolution context\
+            of the invocation.
+
+    Returns:
+        Tuple[Wrapper, List[Uri]]: The wrapper and the URIs\
+            of its resolution path.
+
+    Raises:
+        UriResolutionError: If the URI cannot be resolved.
+        WrapNotFoundError: If the wrap is not found.
+    """
+    load_wrapper_context = resolution_context.create_sub_history_context()
+
+    try:
+        wrapper = client.load_wrapper(uri, resolution_context=load_wrapper_context)
+    except Exception as err:
+        track_load_wrapper(resolution_context, load_wrapper_context, uri, err)
+        raise err
+
+    track_load_wrapper(resolution_context, load_wrapper_context, uri, wrapper)
+    return wrapper, load_wrapper_context.get_resolution_path()
+
+
+def track_load_wrapper(
+    resolution_context: UriResolutionContext,
+    load_wrapper_context: UriResolutionContext,
+    uri: Uri,
+    wrapper_or_error: Union[Wrapper, Exception],
+) -> None:
+    """Track the loading of the wrapper of an invocation.
+
+    Args:
+        resolution_context (UriResolutionContext): The resolution context\
+            of the invocation.
+        load_wrapper_context (UriResolutionContext): The sub context\
+            the wrapper was loaded in.
+        uri (Uri): The wrapper URI.
+        wrapper_or_error (Union[Wrapper, Exception]): The loaded wrapper\
+            or the error raised while loading it.
+    """
+    if isinstance(wrapper_or_error, Exception):
+        result: Any = uri
+        description = (
+            f"Client.load_wrapper - Error: {wrapper_or_error.__class__.__name__}"
+        )
+    else:
+        result = UriWrapper(uri=uri, wrapper=wrapper_or_error)
+        description = "Client.load_wrapper"
+    resolution_context.track_step(
+        UriResolutionStep(
+            source_uri=uri,
+            result=result,
+            description=description,
+            sub_history=load_wrapper_context.get_history(),
+        )
+    )
+
+
+def track_wrapper_invoke(
+    resolution_context: UriResolutionContext,
+    wrapper_invoke_context: UriResolutionContext,
+    uri: Uri,
+    error: Optional[Exception] = None,
+) -> None:
+    """Track the invocation of a wrapper.
+
+    Args:
+        resolution_context (UriResolutionContext): The resolution context\
+            of the invocation.
+        wrapper_invoke_context (UriResolutionContext): The sub context\
+            the wrapper was invoked in.
+        uri (Uri): The resolved wrapper URI.
+        error (Optional[Exception]): The error raised by the wrapper, if any.
+    """
+    resolution_context.track_step(
+        UriResolutionStep(
+            source_uri=uri,
+            result=uri,
+            description=f"Wrapper.invoke - Error: {error.__class__.__name__}"
+            if error
+            else "Wrapper.invoke",
+            sub_history=wrapper_invoke_context.get_history(),
+        )
+    )
+
+
+@contextmanager
+def track_wrapper_invocation(
+    resolution_context: UriResolutionContext, uri: Uri
+) -> Generator[UriResolutionContext, None, None]:
+    """Track the invocation of a wrapper run in the context.
+
+    Args:
+        resolution_context (UriResolutionContext): The resolution context\
+            of the invocation.
+        uri (Uri): The resolved wrapper URI.
+
+    Returns:
+        Generator[UriResolutionContext, None, None]: The sub context to invoke\
+            the wrapper in.
+    """
+    wrapper_invoke_context = resolution_context.create_sub_history_context()
+    try:
+        yield wrapper_invoke_context
+    except Exception as err:
+        track_wrapper_invoke(resolution_context, wrapper_invoke_context, uri, err)
+        raise err
+    track_wrapper_invoke(resolution_context, wrapper_invoke_context, uri)
+
+
+def get_wrap_method_codec(wrapper: Wrapper, method: str) -> Optional[WrapMethodCodec]:
+    """Get the codec compiled from the abi of a wrapper method, if any.
+
+    Args:
+        wrapper (Wrapper): The invoked wrapper.
+        method (str): The invoked method.
+
+    Returns:
+        Optional[WrapMethodCodec]: The codec of the method, or None\
+            if the wrapper doesn't provide codecs or has none for the method.
+    """
+    if not isinstance(wrapper, WrapCodecsProvider):
+        return None
+    codecs = wrapper.get_wrap_codecs()
+    return codecs.get(method) if codecs else None
+
+
+def format_invoke_result(
+    invocable_result: Union[InvocableResult, InvocableBatchResult],
+    encode_result: Optional[bool],
+    lazy_decode: Optional[bool] = False,
+    codec: Optional[WrapMethodCodec] = None,
+) -> Any:
+    """Encode or decode an invocation result as requested.
+
+    Args:
+        invocable_result (Union[InvocableResult, InvocableBatchResult]):\
+            The result returned by the wrapper.
+        encode_result (Optional[bool]): If True, encode the result.
+        lazy_decode (Optional[bool]): If True, decode maps and arrays\
+            of the result into lazy views.
+        codec (Optional[WrapMethodCodec]): The codec decoding the result.
+
+    Returns:
+        Any: The encoded or decoded result.
+    """
+    result = invocable_result.result
+    encoded = invocable_result.encoded
+    if encode_result and not encoded:
+        return msgpack_encode(result)
+
+    if (
+        not encode_result
+        and encoded
+        and isinstance(result, (bytes, bytearray, memoryview))
+    ):
+        buffer = cast(MsgpackBuffer, result)
+        if lazy_decode:
+            return msgpack_decode_lazy(buffer)
+        if codec is not None and codec.decode_result is not None:
+            return codec.decode_result(buffer)
+        decoded: Any = msgpack_decode(buffer)
+        return decoded
+
+    return result
+
+
+__all__ = [
+    "load_invocation_wrapper",
+    "track_load_wrapper",
+    "track_wrapper_invoke",
+    "track_wrapper_invocation",
+    "get_wrap_method_codec",
+    "format_invoke_result",
+]
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from polywrap_client import AsyncPolywrapClient, PolywrapClient
+from polywrap_core import AsyncInvocable, InvokerClient, Uri, UriPackage, WrapAbortError
+from polywrap_client_config_builder import PolywrapClientConfigBuilder
+from polywrap_client_config_builder.types import ClientConfigBuilder
+from polywrap_plugin import PluginModule, PluginPackage
+import pytest
+
+from ..consts import SUPPORTED_IMPLEMENTATIONS
+
+
+PLUGIN_URI = Uri.from_str("plugin/async-test")
+
+
+class AsyncTestPlugin(PluginModule[None]):
+    def __init__(self):
+        super().__init__(None)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    async def sleep(
+        self, args: Dict[str, Any], client: InvokerClient, env: Optional[Any] = None
+    ):
+        await asyncio.sleep(args["seconds"])
+        return threading.current_thread().name
+
+    def block(
+        self, args: Dict[str, Any], client: InvokerClient, env: Optional[Any] = None
+    ):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(args["seconds"])
+        with self.lock:
+            self.running -= 1
+        return threading.current_thread().name
+
+    async def subinvoke(
+        self, args: Dict[str, Any], client: InvokerClient, env: Optional[Any] = None
+    ):
+        return await asyncio.to_thread(
+            client.invoke, uri=PLUGIN_URI, method="sleep", args={"seconds": 0}
+        )
+
+    async def fail(
+        self, args: Dict[str, Any], client: InvokerClient, env: Optional[Any] = None
+    ):
+        raise ValueError("async failure")
+
+
+def create_client(plugin: AsyncTestPlugin, max_workers: int = 2) -> AsyncPolywrapClient:
+    config = (
+        PolywrapClientConfigBuilder()
+        .set_package(PLUGIN_URI, PluginPackage(module=plugin, manifest=NotImplemented))
+        .build()
+    )
+    return AsyncPolywrapClient(config, max_workers=max_workers)
+
+
+def test_async_plugin_methods_share_the_event_loop():
+    plugin = AsyncTestPlugin()
+
+    async def main() -> List[Any]:
+        async with create_client(plugin) as client:
+            return await asyncio.gather(
+                *(
+                    client.invoke(uri=PLUGIN_URI, method="sleep", args={"seconds": 0.2})
+                    for _ in range(20)
+                )
+            )
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+
+    assert time.perf_counter() - start < 2
+    assert results == [threading.current_thread().name] * 20
+
+
+def test_blocking_plugin_methods_run_in_bounded_executor():
+    plugin = AsyncTestPlugin()
+
+    async def main() -> List[Any]:
+        async with create_client(plugin, max_workers=2) as client:
+            return await asyncio.gather(
+                *(
+                    client.invoke(
+                        uri=PLUGIN_URI, method="block", args={"seconds": 0.05}
+                    )
+                    for _ in range(6)
+                )
+            )
+
+    results = asyncio.run(main())
+
+    assert all(name.startswith("polywrap-client") for name in results)
+    assert plugin.max_running == 2
+
+
+def test_async_plugin_error():
+    async def main() -> None:
+        async with create_client(AsyncTestPlugin()) as client:
+            await client.invoke(uri=PLUGIN_URI, method="fail")
+
+    with pytest.raises(WrapAbortError) as err:
+        asyncio.run(main())
+
+    assert "async failure" in err.value.args[0]
+
+
+def test_async_plugin_method_subinvokes_in_thread():
+    async def main() -> Any:
+        async with create_client(AsyncTestPlugin()) as client:
+            return await client.invoke(uri=PLUGIN_URI, method="subinvoke")
+
+    assert asyncio.run(main()) != threading.current_thread().name
+
+
+def test_async_resolve_and_load_wrapper():
+    async def main() -> Any:
+        async with create_client(AsyncTestPlugin()) as client:
+            resolved = await client.try_resolve_uri(PLUGIN_URI)
+            wrapper = await client.load_wrapper(PLUGIN_URI)
+            return resolved, wrapper
+
+    resolved, wrapper = asyncio.run(main())
+
+    assert isinstance(resolved, UriPackage)
+    assert resolved.uri == PLUGIN_URI
+    assert isinstance(wrapper, AsyncInvocable)
+
+
+def test_sync_client_runs_async_plugin_methods():
+    client = create_client(AsyncTestPlugin()).get_sync_client()
+
+    result = client.invoke(uri=PLUGIN_URI, method="sleep", args={"seconds": 0})
+
+    assert result == threading.current_thread().name
+
+
+@pytest.mark.parametrize("implementation", SUPPORTED_IMPLEMENTATIONS)
+def test_async_invoke_wasm(
+    implementation: str,
+    builder: ClientConfigBuilder,
+    wrapper_uri: Callable[[str, str], Uri],
+):
+    uri = wrapper_uri("bytes-type", implementation)
+
+    async def main() -> List[Any]:
+        async with AsyncPolywrapClient(builder.build()) as client:
+            return await asyncio.gather(
+                *(
+                    client.invoke(
+                        uri=uri,
+                        method="bytesMethod",
+                        args={"arg": {"prop": f"hello {i}".encode()}},
+                    )
+                    for i in range(4)
+                )
+            )
+
+    assert asyncio.run(main()) == [f"hello {i} Sanity!".encode() for i in range(4)]
+
+    sync_client = PolywrapClient(builder.build())
+    assert (
+        sync_client.invoke(
+            uri=uri, method="bytesMethod", args={"arg": {"prop": b"hello 0"}}
+        )
+        == b"hello 0 Sanity!"
+    )
@@ -0,0 +1,101 @@
+from typing import Any, Callable, Iterator, cast
+from polywrap_client import PolywrapClient
+from polywrap_core import (
+    BatchInvocable,
+    InvocableBatchResult,
+    InvocableResult,
+    Uri,
+    UriResolutionContext,
+)
+from polywrap_client_config_builder import PolywrapClientConfigBuilder
+from polywrap_client_config_builder.types import ClientConfigBuilder
+import pytest
+
+from ..consts import SUPPORTED_IMPLEMENTATIONS
+
+
+@pytest.mark.parametrize("implementation", SUPPORTED_IMPLEMENTATIONS)
+def test_invoke_batch(
+    implementation: str,
+    builder: ClientConfigBuilder,
+    wrapper_uri: Callable[[str, str], Uri],
+):
+    client = PolywrapClient(builder.build())
+    uri = wrapper_uri("bytes-type", implementation)
+
+    props = [b"hello", b"world", b"batch"]
+    args_iterable = [{"arg": {"prop": prop}} for prop in props]
+    args_iterable.insert(1, {"arg": {}})
+
+    results = list(
+        client.invoke_batch(uri=uri, method="bytesMethod", args_iterable=args_iterable)
+    )
+
+    assert len(results) == 4
+    assert results[1].error is not None
+    assert [result.result for result in results if result.error is None] == [
+        prop + b" Sanity!" for prop in props
+    ]
+
+
+class MockWrapper:
+    def invoke(self, **kwargs: Any) -> InvocableResult:
+        return InvocableResult(result=kwargs["args"], encoded=False)
+
+    def get_file(self, *args: Any, **kwargs: Any) -> Any:
+        raise NotImplementedError()
+
+    def get_manifest(self) -> Any:
+        return None
+
+
+class MockBatchWrapper(MockWrapper):
+    def __init__(self):
+        self.batches = 0
+
+    def invoke_batch(self, **kwargs: Any) -> Iterator[InvocableBatchResult]:
+        self.batches += 1
+        for args in kwargs["args_iterable"]:
+            yield InvocableBatchResult(result=args, encoded=False)
+
+
+@pytest.mark.parametrize("wrapper", [MockWrapper(), MockBatchWrapper()])
+def test_invoke_batch_tracks_resolution(wrapper: MockWrapper):
+    uri = Uri.from_str("wrap://mock/wrapper")
+    client = PolywrapClient(
+        PolywrapClientConfigBuilder().set_wrapper(uri, cast(Any, wrapper)).build()
+    )
+    resolution_context = UriResolutionContext()
+
+    results = client.invoke_batch(
+        uri=uri,
+        method="method",
+        args_iterable=[{"a": 1}, {"a": 2}],
+        resolution_context=resolution_context,
+    )
+
+    assert [result.result for result in results] == [{"a": 1}, {"a": 2}]
+    assert [step.description for step in resolution_context.get_history()] == [
+        "Client.load_wrapper",
+        "Wrapper.invoke",
+    ]
+    assert isinstance(wrapper, BatchInvocable) == hasattr(wrapper, "batches")
+    assert getattr(wrapper, "batches", 1) == 1
+
+
+def test_invoke_batch_tracks_load_wrapper_error():
+    client = PolywrapClient(PolywrapClientConfigBuilder().build())
+    resolution_context = UriResolutionContext()
+
+    with pytest.raises(Exception):
+        client.invoke_batch(
+            uri=Uri.from_str("wrap://mock/missing"),
+            method="method",
+            args_iterable=[{"a": 1}],
+            resolution_context=resolution_context,
+        )
+
+    [step] = resolution_context.get_history()
+    assert step.description and step.description.startswith(
+        "Client.load_wrapper - Error"
+    )
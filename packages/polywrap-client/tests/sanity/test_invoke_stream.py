@@ -0,0 +1,33 @@
+from typing import Callable
+from polywrap_client import PolywrapClient
+from polywrap_core import Uri
+from polywrap_msgpack import GenericMap
+from polywrap_client_config_builder.types import ClientConfigBuilder
+import pytest
+
+from ..consts import SUPPORTED_IMPLEMENTATIONS
+
+
+@pytest.mark.parametrize("implementation", SUPPORTED_IMPLEMENTATIONS)
+def test_invoke_stream(
+    implementation: str,
+    builder: ClientConfigBuilder,
+    wrapper_uri: Callable[[str, str], Uri],
+):
+    client = PolywrapClient(builder.build())
+    uri = wrapper_uri("map-type", implementation)
+    map_value = GenericMap({f"key {i}": i for i in range(1000)})
+
+    items = client.invoke_stream(
+        uri=uri,
+        method="returnMap",
+        args={
+            "map": map_value,
+        },
+        chunk_size=64,
+    )
+
+    assert next(items) == ("key 0", 0)
+    assert GenericMap(dict(items)) == GenericMap(
+        {f"key {i}": i for i in range(1, 1000)}
+    )
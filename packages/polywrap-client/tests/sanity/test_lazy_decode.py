@@ -0,0 +1,33 @@
+from typing import Callable
+from polywrap_client import PolywrapClient
+from polywrap_core import Uri
+from polywrap_msgpack import GenericMap, LazyMsgpackMap
+from polywrap_client_config_builder.types import ClientConfigBuilder
+import pytest
+
+from ..consts import SUPPORTED_IMPLEMENTATIONS
+
+
+@pytest.mark.parametrize("implementation", SUPPORTED_IMPLEMENTATIONS)
+def test_lazy_decode(
+    implementation: str,
+    builder: ClientConfigBuilder,
+    wrapper_uri: Callable[[str, str], Uri],
+):
+    client = PolywrapClient(builder.build())
+    uri = wrapper_uri("map-type", implementation)
+    map_value = GenericMap({"Hello": 1, "World": 2})
+
+    response = client.invoke(
+        uri=uri,
+        method="returnMap",
+        args={
+            "map": map_value,
+        },
+        lazy_decode=True,
+    )
+
+    assert isinstance(response, LazyMsgpackMap)
+    assert response.generic_map
+    assert response["World"] == 2
+    assert response.decode() == map_value
@@ -0,0 +1,126 @@
+from pathlib import Path
+from typing import Any, List, cast
+
+from polywrap_client import PolywrapClient
+from polywrap_client_config_builder import PolywrapClientConfigBuilder
+from polywrap_core import Uri
+from polywrap_test_cases import get_path_to_test_wrappers
+from polywrap_uri_resolvers import SimpleFileReader
+from polywrap_wasm import (
+    InstancePoolConfig,
+    ModuleCache,
+    SnapshotConfig,
+    WasmPackage,
+    WasmSnapshotTemplate,
+    WasmWrapper,
+    wasm_wrapper,
+)
+from polywrap_wasm.instance import WasmInstanceTemplate
+import pytest
+
+from ..consts import SUPPORTED_IMPLEMENTATIONS
+
+
+def create_package(implementation: str, **kwargs: Any) -> WasmPackage:
+    wrapper_path = (
+        Path(get_path_to_test_wrappers())
+        / "bytes-type"
+        / "implementations"
+        / implementation
+    )
+    return WasmPackage(
+        SimpleFileReader(),
+        manifest=(wrapper_path / "wrap.info").read_bytes(),
+        wasm_module=(wrapper_path / "wrap.wasm").read_bytes(),
+        module_cache=ModuleCache(),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("implementation", SUPPORTED_IMPLEMENTATIONS)
+def test_invokes_share_instance_template(
+    implementation: str, monkeypatch: pytest.MonkeyPatch
+):
+    templates: List[WasmInstanceTemplate] = []
+
+    class CountingTemplate(WasmInstanceTemplate):
+        def __init__(self, *args: Any, **kwargs: Any):
+            super().__init__(*args, **kwargs)
+            templates.append(self)
+
+    monkeypatch.setattr(wasm_wrapper, "WasmInstanceTemplate", CountingTemplate)
+    uri = Uri.from_str("wrap://package/bytes-type")
+    config = (
+        PolywrapClientConfigBuilder()
+        .set_package(uri, create_package(implementation))
+        .build()
+    )
+    client = PolywrapClient(config)
+
+    for prop in [b"hello", b"world", b"again"]:
+        result = client.invoke(
+            uri=uri, method="bytesMethod", args={"arg": {"prop": prop}}
+        )
+        assert result == prop + b" Sanity!"
+
+    assert len(templates) == 1
+
+
+@pytest.mark.parametrize("implementation", SUPPORTED_IMPLEMENTATIONS)
+def test_invokes_share_instance_pool(implementation: str):
+    uri = Uri.from_str("wrap://package/bytes-type")
+    config = (
+        PolywrapClientConfigBuilder()
+        .set_package(
+            uri,
+            create_package(implementation, instance_pool_config=InstancePoolConfig()),
+        )
+        .build()
+    )
+    client = PolywrapClient(config)
+
+    for prop in [b"hello", b"world", b"again"]:
+        result = client.invoke(
+            uri=uri, method="bytesMethod", args={"arg": {"prop": prop}}
+        )
+        assert result == prop + b" Sanity!"
+
+    wrapper = cast(WasmWrapper, client.load_wrapper(uri))
+    pool = wrapper.get_instance_pool()
+    assert pool is not None
+    stats = pool.get_stats()
+    assert (stats.created, stats.reused) == (1, 2)
+
+
+@pytest.mark.parametrize("implementation", SUPPORTED_IMPLEMENTATIONS)
+def test_invokes_capture_snapshot_once(
+    implementation: str, monkeypatch: pytest.MonkeyPatch
+):
+    captures: List[WasmSnapshotTemplate] = []
+    capture = WasmSnapshotTemplate._capture  # pyright: ignore[reportPrivateUsage]
+
+    def counting_capture(self: WasmSnapshotTemplate, *args: Any) -> None:
+        captures.append(self)
+        capture(self, *args)
+
+    monkeypatch.setattr(WasmSnapshotTemplate, "_capture", counting_capture)
+    uri = Uri.from_str("wrap://package/bytes-type")
+    config = (
+        PolywrapClientConfigBuilder()
+        .set_package(
+            uri,
+            create_package(
+                implementation, snapshot_config=SnapshotConfig(after_first_invoke=True)
+            ),
+        )
+        .build()
+    )
+    client = PolywrapClient(config)
+
+    for prop in [b"hello", b"world", b"again"]:
+        result = client.invoke(
+            uri=uri, method="bytesMethod", args={"arg": {"prop": prop}}
+        )
+        assert result == prop + b" Sanity!"
+
+    assert len(captures) == 1
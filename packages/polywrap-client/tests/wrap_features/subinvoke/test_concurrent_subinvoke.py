@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from polywrap_client import PolywrapClient
+from polywrap_client_config_builder.types import ClientConfigBuilder
+from polywrap_core import Uri
+import pytest
+
+from ...consts import SUPPORTED_IMPLEMENTATIONS
+
+INVOCATIONS = 300
+THREADS = 16
+
+
+@pytest.mark.parametrize("implementation", SUPPORTED_IMPLEMENTATIONS)
+def test_concurrent_subinvoke(
+    implementation: str,
+    builder: Callable[[str], ClientConfigBuilder],
+    wrapper_uri: Callable[[str], Uri],
+):
+    client = PolywrapClient(builder(implementation).build())
+    uri = wrapper_uri(implementation)
+
+    def add_and_increment(i: int) -> int:
+        return client.invoke(
+            uri=uri,
+            method="addAndIncrement",
+            args={"a": i, "b": i * 2},
+        )
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(add_and_increment, range(INVOCATIONS)))
+
+    assert results == [i + i * 2 + 1 for i in range(INVOCATIONS)]
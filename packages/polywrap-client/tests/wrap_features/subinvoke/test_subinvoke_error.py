@@ -0,0 +1,74 @@
+from typing import Any, Dict, Optional
+
+from polywrap_client import PolywrapClient
+from polywrap_client_config_builder import PolywrapClientConfigBuilder
+from polywrap_core import InvokerClient, Uri
+from polywrap_msgpack import msgpack_encode
+from polywrap_plugin import PluginModule, PluginPackage
+from polywrap_wasm.imports import WrapImports
+from polywrap_wasm.types.state import State, WasmInvokeOptions
+from wasmtime import Engine, Limits, Memory, MemoryType, Store
+
+PLUGIN_URI = "plugin/failing"
+METHOD = "fail"
+ARGS = msgpack_encode({"arg": 1})
+
+
+class FailingPlugin(PluginModule[None]):
+    def __init__(self):
+        super().__init__(None)
+
+    def fail(
+        self, args: Dict[str, Any], client: InvokerClient, env: Optional[Any] = None
+    ):
+        raise ValueError("subinvoke failure")
+
+
+class ClientInvoker:
+    """Only invokes through the client, so subinvocations don't resolve\
+        the wrapper themselves."""
+
+    def __init__(self, client: PolywrapClient):
+        self.client = client
+
+    def invoke(self, **kwargs: Any) -> Any:
+        return self.client.invoke(**kwargs)
+
+
+def subinvoke_error(invoker: Any) -> Exception:
+    state = State(
+        invoke_options=WasmInvokeOptions(
+            uri=Uri.from_str("wrap://mock/parent"), method="m"
+        )
+    )
+    wrap_imports = WrapImports(state, invoker)
+    store = wrap_imports.store = Store(Engine(), wrap_imports)
+    wrap_imports.memory = Memory(store, MemoryType(Limits(1, None)))
+    wrap_imports.write_string(0, PLUGIN_URI)
+    wrap_imports.write_string(100, METHOD)
+    wrap_imports.write_bytes(200, ARGS)
+
+    assert not wrap_imports.wrap_subinvoke(
+        0, len(PLUGIN_URI), 100, len(METHOD), 200, len(ARGS)
+    )
+    assert state.subinvoke_result is not None
+    assert state.subinvoke_result.error is not None
+    return state.subinvoke_result.error
+
+
+def test_subinvoke_error_matches_client_invoke():
+    config = (
+        PolywrapClientConfigBuilder()
+        .set_package(
+            Uri.from_str(PLUGIN_URI),
+            PluginPackage(module=FailingPlugin(), manifest=NotImplemented),
+        )
+        .build()
+    )
+    client = PolywrapClient(config)
+
+    direct_error = subinvoke_error(client)
+    client_error = subinvoke_error(ClientInvoker(client))
+
+    assert type(direct_error) is type(client_error)
+    assert repr(direct_error) == repr(client_error)
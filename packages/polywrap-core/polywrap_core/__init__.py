@@ -10,6 +10,8 @@ Core types
     "Uri", "Defines a wrapper URI and provides utilities for parsing and validating them."
     "Invoker", "Invoker protocol defines the methods for invoking an invocable."
     "Invocable", "Defines Protocol for an Invocable that can be invoked by an invoker."
+    "BatchInvocable", "Defines Protocol for an Invocable that runs a batch of invocations itself."
+    "AsyncInvocable", "Defines Protocol for an Invocable that can be awaited from an event loop."
     "InvokerClient", "InvokerClient protocol defines core set of functionalities for resolving and invoking an Invocable."
     "Wrapper", "Defines the Wrapper protocol that extends the Invocable."
     "WrapPackage", "Defines protocol for representing the package of a wrapper"
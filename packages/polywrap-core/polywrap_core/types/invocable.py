@@ -3,8 +3,9 @@
 
 from __future__ import annotations
 
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Any, Optional, Protocol
+from typing import Any, Iterable, Iterator, Optional, Protocol, runtime_checkable
 
 from .invoker_client import InvokerClient
 from .uri import Uri
@@ -25,6 +26,21 @@ class InvocableResult:
     encoded: Optional[bool] = None
 
 
+@dataclass(slots=True, kw_only=True)
+class InvocableBatchResult:
+    """Result of one invocation of a batch.
+
+    Args:
+        result (Any): Invocation result, None if the invocation failed.
+        encoded (Optional[bool]): It will be set true if result is encoded
+        error (Optional[Exception]): The error of the invocation, if it failed.
+    """
+
+    result: Any = None
+    encoded: Optional[bool] = None
+    error: Optional[Exception] = None
+
+
 class Invocable(Protocol):
     """Defines Protocol for an Invocable that can be invoked by an invoker."""
 
@@ -55,4 +71,75 @@ class Invocable(Protocol):
         ...
 
 
-__all__ = ["Invocable", "InvocableResult"]
+@runtime_checkable
+class BatchInvocable(Protocol):
+    """Defines Protocol for an Invocable that runs a batch of invocations itself."""
+
+    def invoke_batch(
+        self,
+        uri: Uri,
+        method: str,
+        args_iterable: Iterable[Optional[Any]],
+        env: Optional[Any] = None,
+        resolution_context: Optional[UriResolutionContext] = None,
+        client: Optional[InvokerClient] = None,
+    ) -> Iterator[InvocableBatchResult]:
+        """Invoke a method once for every args of an iterable.
+
+        Args:
+            uri (Uri): Uri of the Invocable
+            method (str): Method to be executed
+            args_iterable (Iterable[Optional[Any]]): Arguments of the invocations.\
+                It is consumed lazily.
+            env (Optional[Any]): Override the client's config for all the invocations.
+            resolution_context (Optional[UriResolutionContext]): A URI resolution context
+            client (Optional[InvokerClient]): The invoker client instance requesting\
+                the invocations, used for any subinvocation that may occur.
+
+        Returns:
+            Iterator[InvocableBatchResult]: The results of the invocations,\
+                in the order of their args.
+        """
+        ...
+
+
+@runtime_checkable
+class AsyncInvocable(Protocol):
+    """Defines Protocol for an Invocable that can be awaited from an event loop."""
+
+    async def invoke_async(
+        self,
+        uri: Uri,
+        method: str,
+        args: Optional[Any] = None,
+        env: Optional[Any] = None,
+        resolution_context: Optional[UriResolutionContext] = None,
+        client: Optional[InvokerClient] = None,
+        executor: Optional[Executor] = None,
+    ) -> InvocableResult:
+        """Invoke the Invocable without blocking the running event loop.
+
+        Args:
+            uri (Uri): Uri of the Invocable
+            method (str): Method to be executed
+            args (Optional[Any]) : Arguments for the method, structured as a dictionary
+            env (Optional[Any]): Override the client's config for all invokes within this invoke.
+            resolution_context (Optional[UriResolutionContext]): A URI resolution context
+            client (Optional[InvokerClient]): The invoker client instance requesting\
+                this invocation, used for any subinvocation that may occur.
+            executor (Optional[Executor]): The executor running the blocking\
+                work of the invocation.
+
+        Returns:
+            InvocableResult: Result of the invocation.
+        """
+        ...
+
+
+__all__ = [
+    "AsyncInvocable",
+    "BatchInvocable",
+    "Invocable",
+    "InvocableBatchResult",
+    "InvocableResult",
+]
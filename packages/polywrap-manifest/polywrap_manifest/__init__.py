@@ -18,6 +18,7 @@ Deserialize WRAP manifest
 >>> manifest = deserialize_wrap_manifest(raw_manifest)
 >>> assert isinstance(manifest, WrapManifest_0_1)
 """
+from .codec import *
 from .deserialize import *
 from .errors import *
 from .manifest import *
@@ -0,0 +1,592 @@
+"""This module contains the codec compiler which creates specialized\
+    msgpack encoders and decoders for the methods of a wrapper from its abi."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    cast,
+    runtime_checkable,
+)
+
+from msgpack.ext import ExtType  # pyright: ignore[reportMissingTypeStubs]
+from polywrap_msgpack import (
+    ExtensionTypes,
+    GenericMap,
+    MsgpackBuffer,
+    msgpack_decode,
+    msgpack_pack,
+    sanitize,
+)
+
+from .errors import WrapCodecError
+from .manifest import AnyWrapAbi
+from .wrap_0_1 import (
+    AnyDefinition,
+    EnumDefinition,
+    MapKeyType,
+    MethodDefinition,
+    ObjectDefinition,
+    PropertyDefinition,
+    ScalarType,
+)
+
+Converter = Callable[[Any], Any]
+"""Validates a value against an abi type and converts it into its msgpack\
+    serializable form, raising WrapCodecError if it doesn't match."""
+
+ScalarsCheck = Callable[[Collection[Any]], bool]
+"""Tells whether scalar values can all be encoded as they are."""
+
+_INT_RANGES: Dict[str, Tuple[int, int]] = {
+    "UInt": (0, 2**32 - 1),
+    "UInt8": (0, 2**8 - 1),
+    "UInt16": (0, 2**16 - 1),
+    "UInt32": (0, 2**32 - 1),
+    "Int": (-(2**31), 2**31 - 1),
+    "Int8": (-(2**7), 2**7 - 1),
+    "Int16": (-(2**15), 2**15 - 1),
+    "Int32": (-(2**31), 2**31 - 1),
+}
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class WrapMethodCodec:
+    """Defines the specialized codec of a method of a wrapper.
+
+    Args:
+        method (str): The name of the method.
+        encode_args (Callable[[Any], bytes]): Validates the args\
+            of the method against its abi and encodes them into msgpack\
+            in a single pass. Raises WrapCodecError if they don't match.
+        decode_result (Optional[Callable[[MsgpackBuffer], Any]]): Decodes\
+            the msgpack encoded result of the method, or None if the result\
+            decodes as is with `msgpack_decode`.
+    """
+
+    method: str
+    encode_args: Callable[[Any], bytes]
+    decode_result: Optional[Callable[[MsgpackBuffer], Any]] = None
+
+
+def _type_error(type_name: Optional[str], value: Any) -> WrapCodecError:
+    return WrapCodecError(
+        f"Property must be of type '{type_name}'. Found '{type(value).__name__}'."
+    )
+
+
+def _convert_bool(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    raise _type_error("Boolean", value)
+
+
+def _convert_bytes(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(cast(bytearray, value))
+    raise _type_error("Bytes", value)
+
+
+def _create_str_converter(type_name: str) -> Converter:
+    """Create the converter of a scalar type sent as a string."""
+
+    def convert_str(value: Any) -> Any:
+        if isinstance(value, str):
+            return value
+        raise _type_error(type_name, value)
+
+    return convert_str
+
+
+def _create_int_converter(type_name: str) -> Converter:
+    low, high = _INT_RANGES[type_name]
+
+    def convert_int(value: Any) -> Any:
+        if type(value) is int and low <= value <= high:  # pylint: disable=C0123
+            return value
+        if isinstance(value, int) and not isinstance(value, bool):
+            if low <= value <= high:
+                return int(value)
+            raise WrapCodecError(f"Property of type '{type_name}' out of range")
+        raise _type_error(type_name, value)
+
+    return convert_int
+
+
+_SCALAR_CONVERTERS: Dict[str, Converter] = {
+    ScalarType.STRING.value: _create_str_converter("String"),
+    ScalarType.BOOLEAN.value: _convert_bool,
+    ScalarType.BYTES.value: _convert_bytes,
+    ScalarType.BIG_INT.value: _create_str_converter("BigInt"),
+    ScalarType.BIG_NUMBER.value: _create_str_converter("BigNumber"),
+    ScalarType.JSON.value: _create_str_converter("JSON"),
+    **{name: _create_int_converter(name) for name in _INT_RANGES},
+}
+
+_SCALAR_TYPES: Dict[str, FrozenSet[type]] = {
+    ScalarType.STRING.value: frozenset({str}),
+    ScalarType.BOOLEAN.value: frozenset({bool}),
+    ScalarType.BYTES.value: frozenset({bytes}),
+    ScalarType.BIG_INT.value: frozenset({str}),
+    ScalarType.BIG_NUMBER.value: frozenset({str}),
+    ScalarType.JSON.value: frozenset({str}),
+    **{name: frozenset({int}) for name in _INT_RANGES},
+}
+"""The classes of the scalar values which are encoded as they are."""
+
+
+def _create_scalars_check(type_name: str) -> ScalarsCheck:
+    """Create the check telling whether scalars can all be encoded as they are.
+
+    The check looks at the classes and the bounds of all the scalars at once\
+        instead of converting them one by one.
+    """
+    types = _SCALAR_TYPES[type_name]
+    low, high = _INT_RANGES.get(type_name, (None, None))
+
+    def check_scalars(values: Collection[Any]) -> bool:
+        if not set(map(type, values)) <= types:
+            return False
+        if low is None or high is None or not values:
+            return True
+        return low <= min(values) and max(values) <= high
+
+    return check_scalars
+
+
+def _create_optional_converter(convert: Converter) -> Converter:
+    def convert_optional(value: Any) -> Any:
+        return None if value is None else convert(value)
+
+    return convert_optional
+
+
+def _create_array_converter(
+    type_name: str, convert_item: Converter, check_items: Optional[ScalarsCheck]
+) -> Converter:
+    def convert_array(value: Any) -> Any:
+        if isinstance(value, (list, tuple, set)):
+            items = cast(Collection[Any], value)
+            if isinstance(items, list) and check_items and check_items(items):
+                return items
+            return [convert_item(item) for item in items]
+        raise _type_error(type_name, value)
+
+    return convert_array
+
+
+def _create_map_converter(
+    type_name: str,
+    key_type: Optional[MapKeyType],
+    convert_value: Converter,
+    check_values: Optional[ScalarsCheck],
+) -> Converter:
+    key_type_name = (key_type or MapKeyType.STRING).value
+    convert_key = _SCALAR_CONVERTERS[key_type_name]
+    check_keys = _create_scalars_check(key_type_name)
+
+    def convert_map(value: Any) -> Any:
+        if not isinstance(value, (dict, GenericMap)):
+            raise _type_error(type_name, value)
+        mapping = cast(Mapping[Any, Any], value)
+        if (
+            check_values
+            and check_keys(mapping.keys())
+            and check_values(mapping.values())
+        ):
+            converted = mapping if isinstance(mapping, dict) else dict(mapping.items())
+        else:
+            converted = {
+                convert_key(key): convert_value(val) for key, val in mapping.items()
+            }
+        return ExtType(ExtensionTypes.GENERIC_MAP.value, msgpack_pack(converted))
+
+    return convert_map
+
+
+def _create_enum_converter(definition: EnumDefinition) -> Converter:
+    constants = definition.constants or []
+    names = frozenset(constants)
+
+    def convert_enum(value: Any) -> Any:
+        if isinstance(value, IntEnum):
+            value = value.value
+        if isinstance(value, str) and value in names:
+            return value
+        if isinstance(value, int) and not isinstance(value, bool):
+            if 0 <= value < len(constants):
+                return value
+            raise WrapCodecError(f"Invalid value for enum '{definition.type}'")
+        raise _type_error(str(definition.type), value)
+
+    return convert_enum
+
+
+def _create_object_converter(
+    type_name: Optional[str], properties: List[Tuple[str, bool, Converter]]
+) -> Converter:
+    names = frozenset(name for name, _, _ in properties)
+    required_names = frozenset(name for name, required, _ in properties if required)
+    converters = [(name, convert) for name, _, convert in properties]
+
+    def convert_object(value: Any) -> Any:
+        if not isinstance(value, dict) and (
+            hasattr(value, "__slots__") or hasattr(value, "__dict__")
+        ):
+            # Objects are sent with all their attributes, like sanitize does
+            value = sanitize(value)
+        if not isinstance(value, dict):
+            raise _type_error(type_name, value)
+        fields = cast(Dict[Any, Any], value)
+        if not names.issuperset(fields):
+            raise WrapCodecError(f"Unknown property of type '{type_name}'")
+        if not required_names.issubset(fields):
+            raise WrapCodecError(f"Missing required property of type '{type_name}'")
+        # Write the properties in the order of the abi
+        return {
+            name: convert(fields[name])
+            for name, convert in converters
+            if name in fields
+        }
+
+    return convert_object
+
+
+def _create_map_normalizer(normalize_value: Optional[Converter]) -> Converter:
+    def normalize_map(value: Any) -> Any:
+        if not isinstance(value, (dict, GenericMap)):
+            return value
+        if normalize_value is None:
+            if isinstance(value, GenericMap):
+                return cast(GenericMap[Any, Any], value)
+            return GenericMap(cast(Dict[Any, Any], value))
+        items = cast(Mapping[Any, Any], value).items()
+        entries = {key: normalize_value(val) for key, val in items}
+        if isinstance(value, GenericMap) and all(
+            entries[key] is val for key, val in items
+        ):
+            return cast(GenericMap[Any, Any], value)
+        return GenericMap(entries)
+
+    return normalize_map
+
+
+def _create_array_normalizer(normalize_item: Converter) -> Converter:
+    def normalize_array(value: Any) -> Any:
+        if not isinstance(value, list):
+            return value
+        items = cast(List[Any], value)
+        normalized = [normalize_item(item) for item in items]
+        if all(a is b for a, b in zip(normalized, items)):
+            return items
+        return normalized
+
+    return normalize_array
+
+
+def _create_object_normalizer(properties: List[Tuple[str, Converter]]) -> Converter:
+    def normalize_object(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        fields = cast(Dict[Any, Any], value)
+        changed: Dict[Any, Any] = {}
+        for name, normalize in properties:
+            field = fields.get(name)
+            if field is not None and (normalized := normalize(field)) is not field:
+                changed[name] = normalized
+        return {**fields, **changed} if changed else fields
+
+    return normalize_object
+
+
+class WrapCodecs:
+    """Compiles and holds the specialized codecs of the methods of a wrapper.
+
+    The encoders validate the args against the abi and convert them into\
+        msgpack serializable values in a single pass, writing the properties\
+        of objects in the order of the abi. They send the same values as\
+        `msgpack_encode`, except that dicts given for Map types are sent\
+        as GenericMap extensions, which is how wrappers expect Map types.\
+        BigInt, BigNumber and JSON types must be given as strings, and\
+        objects must not have attributes missing from the abi. Args which\
+        don't match the abi raise WrapCodecError, so that they can be sent\
+        by `msgpack_encode` instead. Only the methods whose result may\
+        contain Map types get a decoder, which turns the maps decoded\
+        as dicts into GenericMaps and leaves the rest of the result as is.\
+        Object and enum types are compiled once and shared by all the methods.
+
+    Args:
+        abi (AnyWrapAbi): The abi of the wrapper.
+
+    Examples:
+        >>> from polywrap_manifest import WrapManifest_0_1
+        >>> from polywrap_msgpack import msgpack_decode
+        >>> manifest = WrapManifest_0_1.validate({
+        ...     "version": "0.1",
+        ...     "type": "wasm",
+        ...     "name": "test",
+        ...     "abi": {
+        ...         "moduleType": {
+        ...             "kind": 128,
+        ...             "type": "Module",
+        ...             "methods": [{
+        ...                 "kind": 64,
+        ...                 "type": "Method",
+        ...                 "name": "method",
+        ...                 "arguments": [{
+        ...                     "kind": 34,
+        ...                     "type": "BigInt",
+        ...                     "name": "arg",
+        ...                     "required": True,
+        ...                     "scalar": {"kind": 4, "type": "BigInt"},
+        ...                 }],
+        ...             }],
+        ...         },
+        ...     },
+        ... })
+        >>> codec = WrapCodecs(manifest.abi).get("method")
+        >>> msgpack_decode(codec.encode_args({"arg": "100000000000000000000"}))
+        {'arg': '100000000000000000000'}
+        >>> codec.encode_args({"arg": 10**20})
+        Traceback (most recent call last):
+        ...
+        polywrap_manifest.errors.WrapCodecError: Property must be of type 'BigInt'. Found 'int'.
+    """
+
+    __slots__ = (
+        "_objects",
+        "_enums",
+        "_object_converters",
+        "_object_normalizers",
+        "_methods",
+        "_codecs",
+    )
+
+    _objects: Dict[str, ObjectDefinition]
+    _enums: Dict[str, EnumDefinition]
+    _object_converters: Dict[str, Converter]
+    _object_normalizers: Dict[str, Optional[Converter]]
+    _methods: Dict[str, MethodDefinition]
+    _codecs: Dict[str, WrapMethodCodec]
+
+    def __init__(self, abi: AnyWrapAbi):
+        """Initialize a new WrapCodecs instance."""
+        object_types: List[ObjectDefinition] = [
+            *(abi.object_types or []),
+            *(abi.imported_object_types or []),
+        ]
+        if abi.env_type:
+            object_types.append(abi.env_type)
+        enum_types = [*(abi.enum_types or []), *(abi.imported_enum_types or [])]
+        self._objects = {str(o.type): o for o in object_types}
+        self._enums = {str(e.type): e for e in enum_types}
+        self._object_converters = {}
+        self._object_normalizers = {}
+        methods = (abi.module_type and abi.module_type.methods) or []
+        self._methods = {str(m.name): m for m in methods}
+        self._codecs = {}
+
+    def get(self, method: str) -> Optional[WrapMethodCodec]:
+        """Get the codec of a method, compiling it on first use.
+
+        Args:
+            method (str): The name of the method.
+
+        Returns:
+            Optional[WrapMethodCodec]: The codec of the method, or None\
+                if the abi doesn't define the method.
+        """
+        codec = self._codecs.get(method)
+        if codec is None and method in self._methods:
+            codec = self._codecs[method] = self._compile_method(self._methods[method])
+        return codec
+
+    def _compile_method(self, definition: MethodDefinition) -> WrapMethodCodec:
+        convert_args = _create_object_converter(
+            definition.name, self._compile_properties(definition.arguments or [])
+        )
+
+        def encode_args(args: Any) -> bytes:
+            try:
+                return msgpack_pack(convert_args(args))
+            except WrapCodecError:
+                raise
+            except Exception as err:
+                raise WrapCodecError("Failed to encode the args") from err
+
+        normalize = (
+            self._compile_normalizer(definition.return_, set())
+            if definition.return_ and self._has_maps(definition.return_, set())
+            else None
+        )
+        if normalize is None:
+            # The result decodes as is, so it doesn't need a decoder
+            return WrapMethodCodec(method=str(definition.name), encode_args=encode_args)
+
+        def decode_result(result: MsgpackBuffer) -> Any:
+            return normalize(msgpack_decode(result))
+
+        return WrapMethodCodec(
+            method=str(definition.name),
+            encode_args=encode_args,
+            decode_result=decode_result,
+        )
+
+    def _compile_properties(
+        self, properties: List[PropertyDefinition]
+    ) -> List[Tuple[str, bool, Converter]]:
+        return [
+            (
+                str(prop.name),
+                bool(prop.required),
+                self._compile_converter(prop, prop.required),
+            )
+            for prop in properties
+        ]
+
+    def _compile_converter(
+        self, definition: AnyDefinition, required: Optional[bool]
+    ) -> Converter:
+        convert = self._compile_required_converter(definition)
+        return convert if required else _create_optional_converter(convert)
+
+    def _compile_required_converter(self, definition: AnyDefinition) -> Converter:
+        if definition.scalar:
+            return _SCALAR_CONVERTERS[definition.scalar.type.value]
+        if definition.array:
+            item = definition.array.item
+            return _create_array_converter(
+                str(definition.array.type),
+                self._compile_converter(definition.array, item and item.required),
+                self._compile_scalars_check(definition.array, item and item.required),
+            )
+        if definition.map:
+            value = definition.map.value
+            return _create_map_converter(
+                str(definition.map.type),
+                definition.map.key and definition.map.key.type,
+                self._compile_converter(definition.map, value and value.required),
+                self._compile_scalars_check(definition.map, value and value.required),
+            )
+        if definition.enum and str(definition.enum.type) in self._enums:
+            return _create_enum_converter(self._enums[str(definition.enum.type)])
+        if definition.object and str(definition.object.type) in self._objects:
+            return self._get_object_converter(str(definition.object.type))
+        # Types missing from the abi are sanitized like any other value
+        return sanitize
+
+    @staticmethod
+    def _compile_scalars_check(
+        definition: AnyDefinition, required: Optional[bool]
+    ) -> Optional[ScalarsCheck]:
+        """Compile the check of the items of an array or the values of a map\
+            of required scalars, or None if they aren't."""
+        if required and definition.scalar:
+            return _create_scalars_check(definition.scalar.type.value)
+        return None
+
+    def _get_object_converter(self, type_name: str) -> Converter:
+        if type_name in self._object_converters:
+            return self._object_converters[type_name]
+
+        def convert_recursive(value: Any) -> Any:
+            return self._object_converters[type_name](value)
+
+        # Properties of a recursive type look the converter up on call
+        self._object_converters[type_name] = convert_recursive
+        converter = _create_object_converter(
+            type_name,
+            self._compile_properties(self._objects[type_name].properties or []),
+        )
+        self._object_converters[type_name] = converter
+        return converter
+
+    def _has_maps(self, definition: AnyDefinition, visited: Set[str]) -> bool:
+        """Tell whether the values of a type may contain Map types."""
+        if definition.array:
+            return self._has_maps(definition.array, visited)
+        if definition.map:
+            return True
+        if definition.object:
+            type_name = str(definition.object.type)
+            if type_name not in self._objects or type_name in visited:
+                return False
+            visited.add(type_name)
+            return any(
+                self._has_maps(prop, visited)
+                for prop in self._objects[type_name].properties or []
+            )
+        return False
+
+    def _compile_normalizer(
+        self, definition: AnyDefinition, visiting: Set[str]
+    ) -> Optional[Converter]:
+        """Compile the normalizer of the decoded values of a type,\
+            or None if they don't need one."""
+        if definition.array:
+            normalize_item = self._compile_normalizer(definition.array, visiting)
+            return normalize_item and _create_array_normalizer(normalize_item)
+        if definition.map:
+            return _create_map_normalizer(
+                self._compile_normalizer(definition.map, visiting)
+            )
+        if definition.object and str(definition.object.type) in self._objects:
+            return self._get_object_normalizer(str(definition.object.type), visiting)
+        return None
+
+    def _get_object_normalizer(
+        self, type_name: str, visiting: Set[str]
+    ) -> Optional[Converter]:
+        if type_name in self._object_normalizers:
+            return self._object_normalizers[type_name]
+        if type_name in visiting:
+
+            def normalize_recursive(value: Any) -> Any:
+                normalize = self._object_normalizers[type_name]
+                return value if normalize is None else normalize(value)
+
+            # Properties of a recursive type look the normalizer up on call
+            return normalize_recursive
+        visiting.add(type_name)
+        properties = [
+            (str(prop.name), normalize)
+            for prop in self._objects[type_name].properties or []
+            if (normalize := self._compile_normalizer(prop, visiting)) is not None
+        ]
+        visiting.discard(type_name)
+        normalizer = _create_object_normalizer(properties) if properties else None
+        self._object_normalizers[type_name] = normalizer
+        return normalizer
+
+
+@runtime_checkable
+class WrapCodecsProvider(Protocol):
+    """Defines the protocol of the wrappers holding the codecs of their methods."""
+
+    def get_wrap_codecs(self) -> Optional[WrapCodecs]:
+        """Get the codecs compiled from the abi of the wrapper.
+
+        Returns:
+            Optional[WrapCodecs]: The codecs of the methods of the wrapper,\
+                or None if it has no abi.
+        """
+
+
+__all__ = [
+    "WrapCodecs",
+    "WrapCodecsProvider",
+    "WrapMethodCodec",
+]
@@ -9,4 +9,8 @@ class DeserializeManifestError(ManifestError):
     """Raised when a manifest cannot be deserialized."""
 
 
-__all__ = ["ManifestError", "DeserializeManifestError"]
+class WrapCodecError(ManifestError):
+    """Raised when a value doesn't match its type in the abi of a wrapper."""
+
+
+__all__ = ["ManifestError", "DeserializeManifestError", "WrapCodecError"]
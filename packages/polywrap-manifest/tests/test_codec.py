@@ -0,0 +1,367 @@
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, Optional
+
+import pytest
+from polywrap_msgpack import GenericMap, msgpack_decode, msgpack_encode
+
+from polywrap_manifest import (
+    WrapCodecError,
+    WrapCodecs,
+    WrapCodecsProvider,
+    WrapManifest_0_1,
+)
+
+
+def scalar(name: str, type: str, required: bool = True) -> Dict[str, Any]:
+    return {
+        "kind": 34,
+        "type": type,
+        "name": name,
+        "required": required,
+        "scalar": {"kind": 4, "type": type, "name": name, "required": required},
+    }
+
+
+def map_ref(name: str) -> Dict[str, Any]:
+    return {
+        "kind": 34,
+        "type": "Map<String, Int>",
+        "name": name,
+        "required": True,
+        "map": {
+            "kind": 262146,
+            "type": "Map<String, Int>",
+            "name": name,
+            "scalar": {"kind": 4, "type": "Int", "name": name, "required": True},
+            "key": {"kind": 4, "type": "String", "name": name, "required": True},
+            "value": {"kind": 4, "type": "Int", "name": name, "required": True},
+        },
+    }
+
+
+def object_ref(name: str, type: str, required: bool = True) -> Dict[str, Any]:
+    return {
+        "kind": 34,
+        "type": type,
+        "name": name,
+        "required": required,
+        "object": {"kind": 8192, "type": type, "name": name, "required": required},
+    }
+
+
+ABI: Dict[str, Any] = {
+    "version": "0.1",
+    "objectTypes": [
+        {
+            "kind": 1,
+            "type": "Arg",
+            "properties": [
+                scalar("prop", "String"),
+                object_ref("nested", "Arg", required=False),
+            ],
+        },
+        {
+            "kind": 1,
+            "type": "Box",
+            "properties": [scalar("name", "String"), map_ref("counts")],
+        },
+    ],
+    "enumTypes": [
+        {"kind": 8, "type": "Color", "constants": ["RED", "GREEN"]},
+    ],
+    "moduleType": {
+        "kind": 128,
+        "type": "Module",
+        "methods": [
+            {
+                "kind": 64,
+                "type": "Method",
+                "name": "method",
+                "required": True,
+                "arguments": [
+                    scalar("str", "String"),
+                    scalar("num", "UInt8"),
+                    scalar("big", "BigInt", required=False),
+                    scalar("json", "JSON", required=False),
+                    object_ref("obj", "Arg", required=False),
+                    {
+                        "kind": 34,
+                        "type": "Color",
+                        "name": "color",
+                        "enum": {"kind": 16384, "type": "Color", "name": "color"},
+                    },
+                    {
+                        "kind": 34,
+                        "type": "[Int]",
+                        "name": "list",
+                        "array": {
+                            "kind": 18,
+                            "type": "[Int]",
+                            "name": "list",
+                            "scalar": {
+                                "kind": 4,
+                                "type": "Int",
+                                "name": "list",
+                                "required": True,
+                            },
+                            "item": {
+                                "kind": 4,
+                                "type": "Int",
+                                "name": "list",
+                                "required": True,
+                            },
+                        },
+                    },
+                    {
+                        "kind": 34,
+                        "type": "Map<String, Int>",
+                        "name": "map",
+                        "map": {
+                            "kind": 262146,
+                            "type": "Map<String, Int>",
+                            "name": "map",
+                            "scalar": {
+                                "kind": 4,
+                                "type": "Int",
+                                "name": "map",
+                                "required": True,
+                            },
+                            "key": {
+                                "kind": 4,
+                                "type": "String",
+                                "name": "map",
+                                "required": True,
+                            },
+                            "value": {
+                                "kind": 4,
+                                "type": "Int",
+                                "name": "map",
+                                "required": True,
+                            },
+                        },
+                    },
+                ],
+                "return": {
+                    "kind": 34,
+                    "type": "Map<String, Int>",
+                    "name": "method",
+                    "required": True,
+                    "map": {
+                        "kind": 262146,
+                        "type": "Map<String, Int>",
+                        "name": "method",
+                        "scalar": {
+                            "kind": 4,
+                            "type": "Int",
+                            "name": "method",
+                            "required": True,
+                        },
+                        "key": {
+                            "kind": 4,
+                            "type": "String",
+                            "name": "method",
+                            "required": True,
+                        },
+                        "value": {
+                            "kind": 4,
+                            "type": "Int",
+                            "name": "method",
+                            "required": True,
+                        },
+                    },
+                },
+            },
+            {
+                "kind": 64,
+                "type": "Method",
+                "name": "getArg",
+                "required": True,
+                "return": object_ref("getArg", "Arg"),
+            },
+            {
+                "kind": 64,
+                "type": "Method",
+                "name": "getBoxes",
+                "required": True,
+                "return": {
+                    "kind": 34,
+                    "type": "[Box]",
+                    "name": "getBoxes",
+                    "required": True,
+                    "array": {
+                        **object_ref("getBoxes", "Box"),
+                        "kind": 18,
+                        "item": object_ref("getBoxes", "Box"),
+                    },
+                },
+            },
+        ],
+    },
+}
+
+
+class Color(IntEnum):
+    RED = 0
+    GREEN = 1
+
+
+@dataclass(slots=True)
+class Arg:
+    prop: str
+    nested: Optional["Arg"] = None
+
+
+@dataclass(slots=True)
+class ExtendedArg:
+    prop: str
+    extra: int
+
+
+@pytest.fixture
+def manifest() -> WrapManifest_0_1:
+    return WrapManifest_0_1.validate(
+        {"version": "0.1", "type": "wasm", "name": "test", "abi": ABI}
+    )
+
+
+@pytest.fixture
+def codecs(manifest: WrapManifest_0_1) -> WrapCodecs:
+    return WrapCodecs(manifest.abi)
+
+
+def test_method_compiled_once(codecs: WrapCodecs):
+    assert codecs.get("method") is codecs.get("method")
+
+
+def test_codecs_provider(codecs: WrapCodecs):
+    class Provider:
+        def get_wrap_codecs(self) -> Optional[WrapCodecs]:
+            return codecs
+
+    assert isinstance(Provider(), WrapCodecsProvider)
+    assert not isinstance(object(), WrapCodecsProvider)
+
+
+def test_unknown_method(codecs: WrapCodecs):
+    assert codecs.get("unknown") is None
+
+
+def test_encode_args_like_msgpack_encode(codecs: WrapCodecs):
+    codec = codecs.get("method")
+    assert codec
+    args = {
+        "str": "hello",
+        "num": 255,
+        "obj": {"prop": "a", "nested": {"prop": "b"}},
+        "color": 1,
+        "list": [1, -2, 3],
+        "map": GenericMap({"a": 1}),
+    }
+
+    assert codec.encode_args(args) == msgpack_encode(args)
+
+
+def test_encode_args_sanitized_like_msgpack_encode(codecs: WrapCodecs):
+    codec = codecs.get("method")
+    assert codec
+    args = {
+        "str": "hello",
+        "num": 1,
+        "big": str(10**30),
+        "json": '{"foo": [1, 2]}',
+        "obj": Arg(prop="a", nested=Arg(prop="b")),
+        "color": Color.GREEN,
+        "list": (1, 2),
+        "map": GenericMap({"a": 1}),
+    }
+
+    assert codec.encode_args(args) == msgpack_encode(args)
+
+
+def test_encode_args_map_as_generic_map(codecs: WrapCodecs):
+    codec = codecs.get("method")
+    assert codec
+
+    # Unlike msgpack_encode, dicts given for Map types are sent as GenericMaps
+    encoded = codec.encode_args({"str": "a", "num": 1, "map": {"a": 1}})
+
+    assert encoded == msgpack_encode(
+        {"str": "a", "num": 1, "map": GenericMap({"a": 1})}
+    )
+    assert isinstance(msgpack_decode(encoded)["map"], GenericMap)
+
+
+def test_encode_args_field_order(codecs: WrapCodecs):
+    codec = codecs.get("method")
+    assert codec
+
+    encoded = codec.encode_args(
+        {"num": 1, "str": "a", "obj": {"nested": None, "prop": "b"}}
+    )
+
+    decoded = msgpack_decode(encoded)
+    assert list(decoded) == ["str", "num", "obj"]
+    assert list(decoded["obj"]) == ["prop", "nested"]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        {"str": 1, "num": 1},
+        {"str": "a", "num": 256},
+        {"str": "a", "num": True},
+        {"str": "a"},
+        {"str": "a", "num": 1, "unknown": 1},
+        {"str": "a", "num": 1, "color": 2},
+        {"str": "a", "num": 1, "color": "BLUE"},
+        {"str": "a", "num": 1, "list": [1, None]},
+        {"str": "a", "num": 1, "map": {1: 1}},
+        {"str": "a", "num": 1, "obj": {"nested": {}}},
+        {"str": "a", "num": 1, "big": 0.5},
+        # Values that msgpack_encode sends as they are, unlike the abi types
+        {"str": "a", "num": 1, "big": 10**30},
+        {"str": "a", "num": 1, "json": {"foo": [1, 2]}},
+        {"str": "a", "num": 1, "obj": ExtendedArg(prop="a", extra=1)},
+        ["a", 1],
+    ],
+)
+def test_encode_args_invalid(codecs: WrapCodecs, args: Any):
+    codec = codecs.get("method")
+    assert codec
+
+    with pytest.raises(WrapCodecError):
+        codec.encode_args(args)
+
+
+def test_decode_result_map(codecs: WrapCodecs):
+    codec = codecs.get("method")
+    assert codec and codec.decode_result
+
+    assert codec.decode_result(msgpack_encode(GenericMap({"a": 1}))) == GenericMap(
+        {"a": 1}
+    )
+    result = codec.decode_result(msgpack_encode({"a": 1}))
+    assert isinstance(result, GenericMap)
+    assert result == GenericMap({"a": 1})
+
+
+def test_decode_result_keeps_generic_maps(codecs: WrapCodecs):
+    codec = codecs.get("getBoxes")
+    assert codec and codec.decode_result
+
+    decoded = codec.decode_result(
+        msgpack_encode([{"name": "a", "counts": GenericMap({"x": 1})}])
+    )
+    assert decoded == [{"name": "a", "counts": GenericMap({"x": 1})}]
+    assert isinstance(decoded[0]["counts"], GenericMap)
+
+    decoded = codec.decode_result(msgpack_encode([{"name": "a", "counts": {"x": 1}}]))
+    assert isinstance(decoded[0]["counts"], GenericMap)
+
+
+def test_decode_result_object_without_maps(codecs: WrapCodecs):
+    codec = codecs.get("getArg")
+    assert codec
+    # The result decodes as is, so the codec doesn't decode it
+    assert codec.decode_result is None
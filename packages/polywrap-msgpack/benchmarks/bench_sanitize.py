@@ -0,0 +1,155 @@
+"""Benchmark sanitizing and encoding payloads shaped like the wrap_types args.
+
+Compares the sanitize function against the previous implementation, which
+ran a chain of isinstance/hasattr checks on every node and copied every dict
+and list, and shows the share of sanitize in msgpack_encode. The payloads
+repeat the args of the polywrap-client wrap_types tests the given number of
+times, plus the same objects as dataclasses and generic maps, which can't take
+the check-only fast path.
+
+Usage:
+    python benchmarks/bench_sanitize.py [--iterations N] [--size N]
+"""
+import argparse
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Set, Tuple, cast
+
+import msgpack
+
+from polywrap_msgpack import GenericMap, msgpack_encode, sanitize
+from polywrap_msgpack.encoder import _encode_ext_hook
+
+
+@dataclass(slots=True)
+class Nested:
+    """Nested object of the object-type wrapper."""
+
+    prop: str
+
+
+@dataclass(slots=True)
+class Arg:
+    """Object arg of the object-type wrapper."""
+
+    prop: str
+    nested: Nested
+
+
+def legacy_sanitize(value: Any) -> Any:
+    """Sanitize a value like sanitize did before the dispatch table."""
+    if isinstance(value, IntEnum):
+        return value.value
+    if isinstance(value, GenericMap):
+        new_map: GenericMap[str, Any] = GenericMap({})
+        for key, val in cast(GenericMap[Any, Any], value).items():
+            if not isinstance(key, str):
+                raise ValueError(f"GenericMap key must be string, got {key}")
+            new_map[key] = legacy_sanitize(val)
+        return new_map
+    if isinstance(value, dict):
+        new_dict: Dict[str, Any] = {}
+        for key, val in cast(Dict[Any, Any], value).items():
+            if not isinstance(key, str):
+                raise ValueError(f"Dict key must be string, got {key}")
+            new_dict[key] = legacy_sanitize(val)
+        return new_dict
+    if isinstance(value, list):
+        return [legacy_sanitize(a) for a in cast(List[Any], value)]
+    if isinstance(value, tuple):
+        return legacy_sanitize(list(cast(Tuple[Any], value)))
+    if isinstance(value, set):
+        return legacy_sanitize(list(cast(Set[Any], value)))
+    if isinstance(value, complex):
+        return str(value)
+    if hasattr(value, "__slots__"):
+        return {
+            s: legacy_sanitize(getattr(value, s))
+            for s in getattr(value, "__slots__")
+            if hasattr(value, s)
+        }
+    if hasattr(value, "__dict__"):
+        return {
+            k: legacy_sanitize(v) for k, v in cast(Dict[Any, Any], vars(value)).items()
+        }
+    return value
+
+
+def legacy_encode(value: Any) -> bytes:
+    """Encode a value like msgpack_encode did before the dispatch table."""
+    return msgpack.packb(
+        legacy_sanitize(value), default=_encode_ext_hook, use_bin_type=True
+    )
+
+
+def create_payloads(size: int) -> Dict[str, Any]:
+    """Create the payloads, each repeating a wrap_types args size times."""
+    return {
+        "object-type": [
+            {
+                "arg1": {
+                    "prop": f"arg1 prop {i}",
+                    "nested": {"prop": "arg1 nested prop"},
+                }
+            }
+            for i in range(size)
+        ],
+        "numbers-type": [
+            {"first": -128, "second": 65535, "third": 2**31 - 1, "fourth": 0.5}
+            for _ in range(size)
+        ],
+        "bigint-type": [
+            {
+                "arg1": "123456789123456789",
+                "obj": {"prop1": "987654321987654321", "prop2": None},
+            }
+            for _ in range(size)
+        ],
+        "json-type": [
+            {"json": '{"foo": "bar", "bar": [1, 2, 3]}', "keys": ["foo", "bar"]}
+            for _ in range(size)
+        ],
+        "bytes-type": [{"arg": {"prop": bytes(256)}} for _ in range(size)],
+        "object-type (dataclasses)": [
+            {"arg1": Arg(prop=f"arg1 prop {i}", nested=Nested(prop="nested"))}
+            for i in range(size)
+        ],
+        "map-type (GenericMap)": [
+            {"map": GenericMap({"Hello": i, "World": i + 1})} for i in range(size)
+        ],
+    }
+
+
+def measure(func: Callable[[], object], iterations: int) -> float:
+    """Run func the given number of times and return the mean time per call."""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--size", type=int, default=1000)
+    options = parser.parse_args()
+
+    header = ["payload", "legacy", "sanitize", "speedup", "legacy enc", "encode"]
+    print(f"{header[0]:<28}" + "".join(f"{name:>12}" for name in header[1:]))
+    for name, payload in create_payloads(options.size).items():
+        before = measure(lambda: legacy_sanitize(payload), options.iterations)
+        after = measure(lambda: sanitize(payload), options.iterations)
+        before_encode = measure(lambda: legacy_encode(payload), options.iterations)
+        after_encode = measure(lambda: msgpack_encode(payload), options.iterations)
+        print(
+            f"{name:<28}{before * 1e6:>10.0f}us{after * 1e6:>10.0f}us"
+            f"{before / after:>11.2f}x"
+            f"{before_encode * 1e6:>10.0f}us{after_encode * 1e6:>10.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Benchmark msgpack_encode, msgpack_decode and sanitize on the wrap types.
+
+Measures the throughput and the memory allocated by every operation on the
+args of the polywrap-client wrap_types tests: BigInt and BigNumber strings,
+JSON, maps, generic maps, nested objects, bytes, enums and numbers. Every
+payload holds the args of one invocation, repeated --size times in a list.
+
+The results can be saved as a baseline and compared against it later, in
+which case the script exits with status 1 if any operation is slower, or
+allocates more, than the baseline by more than the threshold. Baselines
+depend on the machine and the python version, so save one on the machine
+that runs the comparison, before the change under test.
+
+Usage:
+    python benchmarks/bench_wrap_types.py [--size N] [--repeat N] \
+        [--save-baseline PATH] [--baseline PATH] [--threshold RATIO]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import msgpack
+
+from polywrap_msgpack import GenericMap, msgpack_decode, msgpack_encode, sanitize
+
+
+class SanityEnum(IntEnum):
+    """Enum of the enum-type wrapper."""
+
+    OPTION1 = 0
+    OPTION2 = 1
+    OPTION3 = 2
+
+
+@dataclass(slots=True)
+class Nested:
+    """Nested object of the object-type wrapper."""
+
+    prop: str
+
+
+@dataclass(slots=True)
+class Arg:
+    """Object arg of the object-type wrapper."""
+
+    prop: str
+    nested: Nested
+
+
+SHAPES: Dict[str, Dict[str, Any]] = {
+    "bigint": {
+        "arg1": "123456789123456789",
+        "arg2": "123456789123456789123456789123456789",
+        "obj": {"prop1": "987654321987654321", "prop2": "987654321987654321"},
+    },
+    "bignumber": {
+        "arg1": "1234567.89123456789",
+        "arg2": "123456789123.456789123456789123456789",
+        "obj": {
+            "prop1": "987654.321987654321",
+            "prop2": "987.654321987654321987654321987654321",
+        },
+    },
+    "json": {
+        "json": json.dumps({"foo": "bar", "bar": "baz"}),
+        "prop": "foo",
+    },
+    "map": {
+        "map": {"Hello": 1, "Heyo": 50},
+        "nestedMap": {"Nested": {"Hello": 1, "Heyo": 50}},
+    },
+    "generic-map": {
+        "map": GenericMap({"Hello": 1, "Heyo": 50}),
+        "nestedMap": GenericMap({"Nested": GenericMap({"Hello": 1, "Heyo": 50})}),
+    },
+    "object": {
+        "arg1": {"prop": "arg1 prop", "nested": {"prop": "arg1 nested prop"}},
+        "arg2": {"prop": "arg2 prop", "circular": {"prop": "arg2 circular prop"}},
+    },
+    "object (dataclass)": {
+        "arg1": Arg(prop="arg1 prop", nested=Nested(prop="arg1 nested prop")),
+    },
+    "bytes": {"arg": {"prop": bytes(range(256)) * 4}},
+    "enum": {
+        "en": SanityEnum.OPTION2,
+        "optEnum": SanityEnum.OPTION1,
+        "enumArray": [SanityEnum.OPTION1, SanityEnum.OPTION3],
+    },
+    "numbers": {"first": -128, "second": 65535, "third": 2**31 - 1, "fourth": 0.5},
+}
+"""Args of the wrap_types tests by shape."""
+
+BenchmarkResults = Dict[str, Dict[str, float]]
+
+
+def create_operations(size: int) -> Dict[str, Callable[[], object]]:
+    """Create the benchmarked operations by name."""
+    operations: Dict[str, Callable[[], object]] = {}
+    for shape, args in SHAPES.items():
+        payload: Any = args if size == 1 else [args] * size
+        encoded = msgpack_encode(payload)
+        operations[f"{shape}/sanitize"] = lambda p=payload: sanitize(p)
+        operations[f"{shape}/encode"] = lambda p=payload: msgpack_encode(p)
+        operations[f"{shape}/decode"] = lambda e=encoded: msgpack_decode(e)
+    return operations
+
+
+def measure_ops_per_sec(func: Callable[[], object], repeat: int) -> float:
+    """Get the best throughput of func over the given number of runs."""
+    timer = timeit.Timer(func, timer=time.perf_counter)
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat=repeat, number=number))
+
+
+def measure_allocated_bytes(func: Callable[[], object]) -> float:
+    """Get the peak memory allocated by a single call of func."""
+    func()  # warm up the caches
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return float(peak)
+
+
+def run(size: int, repeat: int) -> BenchmarkResults:
+    """Run every operation and return its throughput and allocations."""
+    results: BenchmarkResults = {}
+    for name, func in create_operations(size).items():
+        results[name] = {
+            "ops_per_sec": measure_ops_per_sec(func, repeat),
+            "allocated_bytes": measure_allocated_bytes(func),
+        }
+    return results
+
+
+def find_regressions(
+    results: BenchmarkResults, baseline: BenchmarkResults, threshold: float
+) -> List[str]:
+    """Get the operations slower or allocating more than the baseline."""
+    regressions: List[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if result["ops_per_sec"] < expected["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:.0f} ops/s, "
+                f"baseline {expected['ops_per_sec']:.0f} ops/s"
+            )
+        if result["allocated_bytes"] > expected["allocated_bytes"] * (1 + threshold):
+            regressions.append(
+                f"{name}: {result['allocated_bytes']:.0f} B allocated, "
+                f"baseline {expected['allocated_bytes']:.0f} B"
+            )
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--size", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    options = parser.parse_args()
+
+    baseline: BenchmarkResults = {}
+    if options.baseline:
+        saved = json.loads(options.baseline.read_text())
+        if saved["size"] != options.size:
+            parser.error(f"the baseline was saved with --size {saved['size']}")
+        baseline = saved["results"]
+
+    results = run(options.size, options.repeat)
+
+    header = ["operation", "ops/s", "baseline", "change", "allocated"]
+    print(f"{header[0]:<28}" + "".join(f"{name:>12}" for name in header[1:]))
+    for name, result in results.items():
+        ops_per_sec = result["ops_per_sec"]
+        expected = baseline.get(name, {}).get("ops_per_sec")
+        comparison = (
+            f"{expected:>12.0f}{(ops_per_sec / expected - 1) * 100:>+11.1f}%"
+            if expected
+            else f"{'-':>12}{'-':>12}"
+        )
+        print(
+            f"{name:<28}{ops_per_sec:>12.0f}{comparison}"
+            f"{result['allocated_bytes']:>11.0f}B"
+        )
+
+    if options.save_baseline:
+        options.save_baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "msgpack": ".".join(map(str, msgpack.version)),
+                    "size": options.size,
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+
+    regressions = find_regressions(results, baseline, options.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {options.threshold:.0%}:")
+        print("\n".join(f"  {regression}" for regression in regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
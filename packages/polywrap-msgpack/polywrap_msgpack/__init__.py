@@ -46,4 +46,6 @@ from .decoder import *
 from .encoder import *
 from .errors import *
 from .extensions import *
+from .lazy import *
 from .sanitize import *
+from .stream import *
@@ -2,12 +2,34 @@
     recieved from a wrapper."""
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Dict, List, Tuple, Union
 
 import msgpack
 
 from .errors import MsgpackDecodeError, MsgpackExtError
-from .extensions import ExtensionTypes, GenericMap
+from .extensions import ExtensionTypes, GenericMap, get_ext_codec
+from .headers import is_array_header, is_map_header
+
+MsgpackBuffer = Union[bytes, bytearray, memoryview]
+
+_GENERIC_MAP_CODE = ExtensionTypes.GENERIC_MAP.value
+
+# Size of the values with a fixed size, by their first byte
+_FIXED_SIZES = {
+    **dict.fromkeys((0xC0, 0xC2, 0xC3), 1),  # nil, false, true
+    **{0xCA: 5, 0xCB: 9},  # float 32, float 64
+    **{0xCC: 2, 0xCD: 3, 0xCE: 5, 0xCF: 9},  # uint 8 to 64
+    **{0xD0: 2, 0xD1: 3, 0xD2: 5, 0xD3: 9},  # int 8 to 64
+    **{0xD4: 3, 0xD5: 4, 0xD6: 6, 0xD7: 10, 0xD8: 18},  # fixext 1 to 16
+}
+# Size of the length and of the whole header of the values with a length
+_LENGTH_SIZES = {
+    **{0xC4: (1, 2), 0xC5: (2, 3), 0xC6: (4, 5)},  # bin 8 to 32
+    **{0xC7: (1, 3), 0xC8: (2, 4), 0xC9: (4, 6)},  # ext 8 to 32
+    **{0xD9: (1, 2), 0xDA: (2, 3), 0xDB: (4, 5)},  # str 8 to 32
+}
+_BIN_HEADERS = (0xC4, 0xC5, 0xC6)
+_EXT_HEADERS = (0xC7, 0xC8, 0xC9)
 
 
 def _decode_ext_hook(code: int, data: bytes) -> Any:
@@ -24,16 +46,20 @@ def _decode_ext_hook(code: int, data: bytes) -> Any:
     Returns:
         Any: decoded object
     """
-    if code == ExtensionTypes.GENERIC_MAP.value:
-        return GenericMap(msgpack_decode(data))
-    raise MsgpackExtError("Invalid extention type")
+    codec = get_ext_codec(code)
+    if codec is None:
+        raise MsgpackExtError("Invalid extention type")
+    return codec.decode(data)
 
 
-def msgpack_decode(val: bytes) -> Any:
+def msgpack_decode(val: MsgpackBuffer, zero_copy: bool = False) -> Any:
     r"""Decode msgpack bytes into a valid python object.
 
     Args:
-        val (bytes): msgpack encoded bytes
+        val (MsgpackBuffer): msgpack encoded bytes, or any contiguous buffer
+        zero_copy (bool): If True, decode bin values into memoryview slices\
+            of val instead of bytes copies. The slices keep val alive\
+            and see any later change to it.
 
     Raises:
         MsgpackExtError: when given invalid extension type code
@@ -52,19 +78,106 @@ def msgpack_decode(val: bytes) -> Any:
         GenericMap({'a': 1})
         >>> msgpack_decode(msgpack_encode([{"a": 2}, {"b": 4}]))
         [{'a': 2}, {'b': 4}]
+        >>> value = msgpack_decode(bytearray(msgpack_encode(b"bin")), zero_copy=True)
+        >>> type(value), bytes(value)
+        (<class 'memoryview'>, b'bin')
         >>> msgpack_decode(b"\xc1")
         Traceback (most recent call last):
         ...
         polywrap_msgpack.errors.MsgpackDecodeError: Failed to decode msgpack data
     """
     try:
+        if zero_copy:
+            return _decode_zero_copy(val)
         return msgpack.unpackb(  # pyright: ignore[reportUnknownMemberType]
-            val, ext_hook=_decode_ext_hook
+            val, ext_hook=_decode_ext_hook  # pyright: ignore[reportArgumentType]
         )
     except Exception as e:
         raise MsgpackDecodeError("Failed to decode msgpack data") from e
 
 
+def _decode_zero_copy(val: MsgpackBuffer) -> Any:
+    """Decode msgpack data with its bin values as slices of the data.
+
+    The headers of containers, bins and GenericMaps are read in place, so\
+        the data is never copied as a whole. Other values are decoded from\
+        their own slice of the data.
+    """
+    data = memoryview(val).cast("B")
+    value, end = _decode_zero_copy_at(data, 0)
+    if end != data.nbytes:
+        raise ValueError("Extra data after the msgpack value")
+    return value
+
+
+def _read_length(data: memoryview, start: int, size: int) -> int:
+    if start + size > data.nbytes:
+        raise ValueError("Unexpected end of msgpack data")
+    return int.from_bytes(data[start : start + size], "big")
+
+
+def _decode_zero_copy_at(data: memoryview, start: int) -> Tuple[Any, int]:
+    """Decode the value starting at the given position of the data,\
+        returning it with the position right after it."""
+    if start >= data.nbytes:
+        raise ValueError("Unexpected end of msgpack data")
+    first_byte = data[start]
+    if is_array_header(first_byte) or is_map_header(first_byte):
+        return _decode_zero_copy_container(data, start, first_byte)
+
+    if first_byte in _FIXED_SIZES:
+        end = start + _FIXED_SIZES[first_byte]
+    elif first_byte in _LENGTH_SIZES:
+        length_size, header_size = _LENGTH_SIZES[first_byte]
+        payload_start = start + header_size
+        end = payload_start + _read_length(data, start + 1, length_size)
+        if end > data.nbytes:
+            raise ValueError("Unexpected end of msgpack data")
+        if first_byte in _BIN_HEADERS:
+            return data[payload_start:end], end
+        if first_byte in _EXT_HEADERS and data[payload_start - 1] == _GENERIC_MAP_CODE:
+            payload, payload_end = _decode_zero_copy_at(data, payload_start)
+            if payload_end != end:
+                raise ValueError("Invalid GenericMap payload")
+            return GenericMap(payload), end
+    elif first_byte <= 0x7F or first_byte >= 0xE0:
+        end = start + 1  # fixint
+    elif 0xA0 <= first_byte <= 0xBF:
+        end = start + 1 + (first_byte & 0x1F)  # fixstr
+    else:
+        raise ValueError(f"Invalid msgpack header: {first_byte:#x}")
+    return (
+        msgpack.unpackb(  # pyright: ignore[reportUnknownMemberType]
+            data[start:end],  # pyright: ignore[reportArgumentType]
+            ext_hook=_decode_ext_hook,
+        ),
+        end,
+    )
+
+
+def _decode_zero_copy_container(
+    data: memoryview, start: int, first_byte: int
+) -> Tuple[Any, int]:
+    if first_byte <= 0x9F:
+        count, position = first_byte & 0x0F, start + 1  # fixmap or fixarray
+    else:
+        length_size = 2 if first_byte in (0xDC, 0xDE) else 4
+        count = _read_length(data, start + 1, length_size)
+        position = start + 1 + length_size
+    if is_array_header(first_byte):
+        items: List[Any] = []
+        for _ in range(count):
+            item, position = _decode_zero_copy_at(data, position)
+            items.append(item)
+        return items, position
+    entries: Dict[Any, Any] = {}
+    for _ in range(count):
+        key, position = _decode_zero_copy_at(data, position)
+        entries[key], position = _decode_zero_copy_at(data, position)
+    return entries, position
+
+
 __all__ = [
+    "MsgpackBuffer",
     "msgpack_decode",
 ]
@@ -2,15 +2,90 @@
     before sending it to a wrapper."""
 from __future__ import annotations
 
-from typing import Any, cast
+import threading
+from typing import Any, List, Optional, Protocol, Union, cast
 
 import msgpack
 from msgpack.ext import ExtType
 
+from .decoder import msgpack_decode
 from .errors import MsgpackEncodeError, MsgpackExtError, MsgpackSanitizeError
-from .extensions import ExtensionTypes, GenericMap
+from .extensions import (
+    ExtCodec,
+    ExtensionTypes,
+    GenericMap,
+    find_ext_codec,
+    register_ext_codec,
+)
+from .sanitize import _sanitize_generic_map  # pyright: ignore[reportPrivateUsage]
 from .sanitize import sanitize
 
+WritableBuffer = Union[bytearray, memoryview]
+
+
+MAX_POOLED_BUFFER_SIZE = 1024 * 1024
+"""Packers whose buffer grew past this size aren't kept in the pool."""
+
+
+class _Packer(Protocol):
+    """The members of msgpack.Packer used by the encoder."""
+
+    def pack(self, obj: Any) -> bytes:
+        """Pack an object, or append it to the buffer if not autoreset."""
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def getbuffer(self) -> memoryview:
+        """Get a view over the internal buffer."""
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def reset(self) -> None:
+        """Clear the internal buffer."""
+
+
+class _PackerPool(threading.local):  # pylint: disable=too-few-public-methods
+    """Packers of the current thread, one per depth of nested packing."""
+
+    packers: List[_Packer]
+    depth: int
+    into_packer: Optional[_Packer]
+
+    def __init__(self):
+        self.packers = []
+        self.depth = 0
+        self.into_packer = None
+
+
+_pool = _PackerPool()
+
+
+def _create_packer(autoreset: bool = True) -> _Packer:
+    return cast(
+        _Packer,
+        msgpack.Packer(  # pyright: ignore[reportUnknownMemberType]
+            default=_encode_ext_hook, use_bin_type=True, autoreset=autoreset
+        ),
+    )
+
+
+def _pack(value: Any) -> bytes:
+    """Pack a sanitized value with the pooled packer of the current depth.
+
+    A packer is busy until its value is packed, so the payloads of nested\
+        extensions are packed by the packer of the next depth.
+    """
+    depth = _pool.depth
+    if depth == len(_pool.packers):
+        _pool.packers.append(_create_packer())
+    _pool.depth = depth + 1
+    try:
+        packed = _pool.packers[depth].pack(value)
+    finally:
+        _pool.depth = depth
+    if len(packed) > MAX_POOLED_BUFFER_SIZE:
+        # Release the grown buffer instead of keeping it for the thread
+        _pool.packers[depth] = _create_packer()
+    return packed
+
 
 def _encode_ext_hook(obj: Any) -> ExtType:
     """Extension hook for extending the msgpack supported types.
@@ -24,17 +99,30 @@ def _encode_ext_hook(obj: Any) -> ExtType:
     Returns:
         Tuple[int, bytes]: extension type code and payload
     """
-    if isinstance(obj, GenericMap):
-        return ExtType(
-            ExtensionTypes.GENERIC_MAP.value,
-            # pylint: disable=protected-access
-            msgpack_encode(
-                cast(
-                    GenericMap[Any, Any], obj
-                )._map  # pyright: ignore[reportPrivateUsage]
-            ),
-        )
-    raise MsgpackExtError(f"Object of type {type(obj)} is not supported")
+    codec = find_ext_codec(type(obj))  # pyright: ignore[reportUnknownArgumentType]
+    if codec is None:
+        raise MsgpackExtError(f"Object of type {type(obj)} is not supported")
+    return ExtType(codec.code, codec.encode(obj))
+
+
+def _encode_generic_map(value: GenericMap[Any, Any]) -> bytes:
+    # The map is already sanitized, so its payload is packed as it is
+    return _pack(value._map)  # pyright: ignore[reportPrivateUsage]
+
+
+def _decode_generic_map(data: bytes) -> GenericMap[Any, Any]:
+    return GenericMap(msgpack_decode(data))
+
+
+register_ext_codec(
+    ExtCodec(
+        code=ExtensionTypes.GENERIC_MAP.value,
+        type=GenericMap,
+        encode=_encode_generic_map,
+        decode=_decode_generic_map,
+        sanitize=_sanitize_generic_map,
+    )
+)
 
 
 def msgpack_encode(value: Any) -> bytes:
@@ -70,11 +158,108 @@ def msgpack_encode(value: Any) -> bytes:
         raise MsgpackSanitizeError("Failed to sanitize object") from e
 
     try:
-        return msgpack.packb(sanitized, default=_encode_ext_hook, use_bin_type=True)
+        return _pack(sanitized)
+    except Exception as e:
+        raise MsgpackEncodeError("Failed to encode object") from e
+
+
+def msgpack_pack(value: Any) -> bytes:
+    r"""Encode a msgpack compatible value into msgpack bytes without sanitizing it.
+
+    The value must already be made of msgpack serializable values\
+        and GenericMaps with sanitized maps, such as the values returned\
+        by sanitize.
+
+    Args:
+        value (Any): msgpack compatible value
+
+    Raises:
+        MsgpackExtError: when given object is not a supported extension type
+        MsgpackEncodeError: when the value is not msgpack serializable
+
+    Returns:
+        bytes: encoded msgpack value
+
+    Examples:
+        >>> from polywrap_msgpack import GenericMap
+        >>> msgpack_pack({"a": GenericMap({"b": 1})})
+        b'\x81\xa1a\xd6\x01\x81\xa1b\x01'
+        >>> msgpack_pack({"a": {1}})
+        Traceback (most recent call last):
+        ...
+        polywrap_msgpack.errors.MsgpackEncodeError: Failed to encode object
+    """
+    try:
+        return _pack(value)
+    except Exception as e:
+        raise MsgpackEncodeError("Failed to encode object") from e
+
+
+def msgpack_encode_into(value: Any, buffer: WritableBuffer, offset: int = 0) -> int:
+    r"""Encode any python object into msgpack bytes written into a buffer.
+
+    The value is packed into the buffer of a pooled packer and copied\
+        into the given buffer, such as preallocated or guest memory,\
+        without creating an intermediate bytes object.
+
+    Args:
+        value (Any): any valid python object
+        buffer (WritableBuffer): writable buffer receiving the encoded value
+        offset (int): position in the buffer where the encoded value starts
+
+    Raises:
+        MsgpackExtError: when given object is not a supported extension type
+        MsgpackEncodeError: when sanitized object is not msgpack serializable\
+            or doesn't fit in the buffer
+        MsgpackSanitizeError: when given object is not sanitizable
+
+    Returns:
+        int: number of bytes written into the buffer
+
+    Examples:
+        >>> buffer = bytearray(8)
+        >>> msgpack_encode_into({"a": 1}, buffer, 2)
+        4
+        >>> buffer
+        bytearray(b'\x00\x00\x81\xa1a\x01\x00\x00')
+        >>> msgpack_encode_into("too long", buffer)
+        Traceback (most recent call last):
+        ...
+        polywrap_msgpack.errors.MsgpackEncodeError: Buffer too small for 9 bytes
+    """
+    try:
+        sanitized = sanitize(value)
+    except Exception as e:
+        raise MsgpackSanitizeError("Failed to sanitize object") from e
+
+    target = memoryview(buffer).cast("B")
+    if target.readonly:
+        raise MsgpackEncodeError("Buffer is read-only")
+    packer = _pool.into_packer
+    if packer is None:
+        packer = _pool.into_packer = _create_packer(autoreset=False)
+    try:
+        packer.pack(sanitized)
+        with packer.getbuffer() as packed:
+            size = packed.nbytes
+            if 0 <= offset and offset + size <= target.nbytes:
+                target[offset : offset + size] = packed
     except Exception as e:
         raise MsgpackEncodeError("Failed to encode object") from e
+    finally:
+        packer.reset()
+    if size > MAX_POOLED_BUFFER_SIZE:
+        # Release the grown buffer instead of keeping it for the thread
+        _pool.into_packer = None
+    if offset < 0 or offset + size > target.nbytes:
+        raise MsgpackEncodeError(f"Buffer too small for {size} bytes")
+    return size
 
 
 __all__ = [
+    "MAX_POOLED_BUFFER_SIZE",
+    "WritableBuffer",
     "msgpack_encode",
+    "msgpack_encode_into",
+    "msgpack_pack",
 ]
@@ -5,6 +5,7 @@ from __future__ import annotations
 from enum import Enum
 
 from .generic_map import *
+from .registry import *
 
 
 class ExtensionTypes(Enum):
@@ -13,4 +14,12 @@ class ExtensionTypes(Enum):
     GENERIC_MAP = 1
 
 
-__all__ = ["ExtensionTypes", "GenericMap"]
+__all__ = [
+    "ExtCodec",
+    "ExtensionTypes",
+    "GenericMap",
+    "find_ext_codec",
+    "get_ext_codec",
+    "register_ext_codec",
+    "unregister_ext_codec",
+]
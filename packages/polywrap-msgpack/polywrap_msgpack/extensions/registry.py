@@ -0,0 +1,168 @@
+"""This module contains the registry of the msgpack extension codecs\
+    used by the encoder and the decoder."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar
+
+from ..errors import MsgpackExtError
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class ExtCodec(Generic[T]):
+    """Defines how the objects of a python type are encoded into\
+        a msgpack extension type and decoded back.
+
+    Args:
+        code (int): The extension type code, from 0 to 127.
+        type (Type[T]): The python type encoded into the extension type.\
+            Its subclasses are encoded too, unless they have their own codec.
+        encode (Callable[[T], bytes]): Encodes an object into the payload\
+            of the extension type.
+        decode (Callable[[bytes], T]): Decodes the payload of the extension\
+            type into an object.
+        sanitize (Optional[Callable[[T], T]]): Sanitizes the content\
+            of an object before it's encoded. Objects are encoded as they\
+            are when it's None.
+    """
+
+    code: int
+    type: Type[T]
+    encode: Callable[[T], bytes]
+    decode: Callable[[bytes], T]
+    sanitize: Optional[Callable[[T], T]] = None
+
+
+_CODECS_BY_CODE: Dict[int, ExtCodec[Any]] = {}
+_CODECS_BY_TYPE: Dict[type, ExtCodec[Any]] = {}
+_RESOLVED_CODECS: Dict[type, Optional[ExtCodec[Any]]] = {}
+"""Codecs by the types met while encoding, including subclasses."""
+_CHANGE_LISTENERS: List[Callable[[], None]] = []
+_REGISTRY_LOCK = Lock()
+
+
+def register_ext_codec(codec: ExtCodec[Any]) -> None:
+    r"""Register the codec of a msgpack extension type.
+
+    Args:
+        codec (ExtCodec[Any]): The codec of the extension type.
+
+    Raises:
+        MsgpackExtError: when the code is out of range, or the code\
+            or the type already has a codec
+
+    Examples:
+        >>> from polywrap_msgpack import msgpack_decode, msgpack_encode
+        >>> from fractions import Fraction
+        >>> codec = ExtCodec(
+        ...     code=42,
+        ...     type=Fraction,
+        ...     encode=lambda f: f"{f.numerator}/{f.denominator}".encode(),
+        ...     decode=lambda payload: Fraction(payload.decode()),
+        ... )
+        >>> register_ext_codec(codec)
+        >>> msgpack_encode(Fraction(1, 3))
+        b'\xc7\x03*1/3'
+        >>> msgpack_decode(msgpack_encode({"ratio": Fraction(1, 3)}))
+        {'ratio': Fraction(1, 3)}
+        >>> register_ext_codec(codec)
+        Traceback (most recent call last):
+        ...
+        polywrap_msgpack.errors.MsgpackExtError: Extension type code 42 is already registered
+        >>> unregister_ext_codec(42)
+    """
+    if not 0 <= codec.code <= 127:
+        raise MsgpackExtError(
+            f"Extension type code must be between 0 and 127, got {codec.code}"
+        )
+    with _REGISTRY_LOCK:
+        if codec.code in _CODECS_BY_CODE:
+            raise MsgpackExtError(
+                f"Extension type code {codec.code} is already registered"
+            )
+        if codec.type in _CODECS_BY_TYPE:
+            raise MsgpackExtError(
+                f"Extension type of {codec.type} is already registered"
+            )
+        _CODECS_BY_CODE[codec.code] = codec
+        _CODECS_BY_TYPE[codec.type] = codec
+        _notify_change()
+
+
+def unregister_ext_codec(code: int) -> None:
+    """Unregister the codec of a msgpack extension type.
+
+    Args:
+        code (int): The extension type code.
+
+    Raises:
+        MsgpackExtError: when the code has no codec
+    """
+    with _REGISTRY_LOCK:
+        codec = _CODECS_BY_CODE.pop(code, None)
+        if codec is None:
+            raise MsgpackExtError(f"Extension type code {code} is not registered")
+        del _CODECS_BY_TYPE[codec.type]
+        _notify_change()
+
+
+def get_ext_codec(code: int) -> Optional[ExtCodec[Any]]:
+    """Get the codec of an extension type code.
+
+    Args:
+        code (int): The extension type code.
+
+    Returns:
+        Optional[ExtCodec[Any]]: The codec, or None if the code has none.
+    """
+    return _CODECS_BY_CODE.get(code)
+
+
+def find_ext_codec(cls: type) -> Optional[ExtCodec[Any]]:
+    """Find the codec encoding the objects of a class.
+
+    The codec of the closest base class is used when the class\
+        has no codec of its own. The result is cached per class.
+
+    Args:
+        cls (type): The class of the objects.
+
+    Returns:
+        Optional[ExtCodec[Any]]: The codec, or None if the class has none.
+    """
+    try:
+        return _RESOLVED_CODECS[cls]
+    except KeyError:
+        pass
+    codec = next(
+        (_CODECS_BY_TYPE[base] for base in cls.__mro__ if base in _CODECS_BY_TYPE),
+        None,
+    )
+    _RESOLVED_CODECS[cls] = codec
+    return codec
+
+
+def _add_change_listener(  # pyright: ignore[reportUnusedFunction]
+    listener: Callable[[], None],
+) -> None:
+    """Call the listener whenever a codec is registered or unregistered,\
+        so that caches depending on the codecs can be cleared."""
+    _CHANGE_LISTENERS.append(listener)
+
+
+def _notify_change() -> None:
+    _RESOLVED_CODECS.clear()
+    for listener in _CHANGE_LISTENERS:
+        listener()
+
+
+__all__ = [
+    "ExtCodec",
+    "find_ext_codec",
+    "get_ext_codec",
+    "register_ext_codec",
+    "unregister_ext_codec",
+]
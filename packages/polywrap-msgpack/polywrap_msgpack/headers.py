@@ -0,0 +1,38 @@
+"""This module contains helpers to tell the type of a msgpack value\
+    from its first byte without decoding it."""
+from typing import Optional
+
+# Size of an ext header, from its first byte up to and including its type code
+_EXT_HEADER_SIZES = {
+    0xD4: 2,  # fixext 1
+    0xD5: 2,  # fixext 2
+    0xD6: 2,  # fixext 4
+    0xD7: 2,  # fixext 8
+    0xD8: 2,  # fixext 16
+    0xC7: 3,  # ext 8
+    0xC8: 4,  # ext 16
+    0xC9: 6,  # ext 32
+}
+
+
+def is_array_header(first_byte: int) -> bool:
+    """Check whether a msgpack value starting with the given byte is an array."""
+    return 0x90 <= first_byte <= 0x9F or first_byte in (0xDC, 0xDD)
+
+
+def is_map_header(first_byte: int) -> bool:
+    """Check whether a msgpack value starting with the given byte is a map."""
+    return 0x80 <= first_byte <= 0x8F or first_byte in (0xDE, 0xDF)
+
+
+def ext_header_size(first_byte: int) -> Optional[int]:
+    """Get the size of the ext header starting with the given byte.
+
+    The ext type code is the last byte of the header and the payload\
+        follows it.
+
+    Returns:
+        Optional[int]: The size of the header, or None if the byte\
+            doesn't start an ext.
+    """
+    return _EXT_HEADER_SIZES.get(first_byte)
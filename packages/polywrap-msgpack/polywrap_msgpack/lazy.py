@@ -0,0 +1,296 @@
+"""This module implements lazy views over msgpack data which decode\
+    the fields of a value only when they are accessed."""
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+import msgpack
+
+from .decoder import _decode_ext_hook  # pyright: ignore[reportPrivateUsage]
+from .decoder import MsgpackBuffer, msgpack_decode
+from .errors import MsgpackDecodeError
+from .extensions import ExtensionTypes, GenericMap
+from .headers import ext_header_size, is_array_header, is_map_header
+from .stream import _Unpacker  # pyright: ignore[reportPrivateUsage]
+
+
+def _create_unpacker(data: memoryview) -> _Unpacker:
+    # The unpacker copies the data into its own buffer when it is fed
+    unpacker = cast(
+        _Unpacker,
+        msgpack.Unpacker(  # pyright: ignore[reportUnknownMemberType]
+            max_buffer_size=0, ext_hook=_decode_ext_hook
+        ),
+    )
+    unpacker.feed(data)
+    return unpacker
+
+
+def _decode_lazy(data: memoryview) -> Any:
+    """Decode the msgpack value filling the data into a lazy view\
+        if it is a container, or else into a python object."""
+    first_byte = data[0]
+    if is_map_header(first_byte):
+        return LazyMsgpackMap(data)
+    if is_array_header(first_byte):
+        return LazyMsgpackArray(data)
+    header_size = ext_header_size(first_byte)
+    if (
+        header_size is not None
+        and data[header_size - 1] == ExtensionTypes.GENERIC_MAP.value
+        and len(data) > header_size
+        and is_map_header(data[header_size])
+    ):
+        return LazyMsgpackMap(data[header_size:], generic_map=True)
+    return msgpack_decode(data)
+
+
+class LazyMsgpackMap(Mapping[Any, Any]):
+    """Read-only mapping over a msgpack encoded map decoding its values\
+        on access.
+
+    The keys and the offsets of the values are indexed on first access,\
+        which copies the map into a msgpack unpacker once. The values\
+        are decoded from slices of the data, which aren't copied. Maps\
+        and arrays nested in the values are returned as lazy views\
+        too, so that only the accessed path of a large value is decoded.
+
+    Args:
+        data (MsgpackBuffer): The msgpack encoded map.
+        generic_map (bool): Whether the map is the payload\
+            of a GenericMap extension.
+
+    Examples:
+        >>> from polywrap_msgpack import msgpack_encode
+        >>> response = LazyMsgpackMap(msgpack_encode({"status": 200, "body": "..."}))
+        >>> response["status"]
+        200
+        >>> response == {"status": 200, "body": "..."}
+        True
+        >>> response.decode()
+        {'status': 200, 'body': '...'}
+    """
+
+    __slots__ = ("_data", "_generic_map", "_offsets", "_values")
+
+    _data: memoryview
+    _generic_map: bool
+    _offsets: Optional[Dict[Any, Tuple[int, int]]]
+    _values: Dict[Any, Any]
+
+    def __init__(self, data: MsgpackBuffer, generic_map: bool = False):
+        """Initialize a new LazyMsgpackMap instance."""
+        self._data = memoryview(data).cast("B")
+        self._generic_map = generic_map
+        self._offsets = None
+        self._values = {}
+
+    @property
+    def generic_map(self) -> bool:
+        """Whether the map is the payload of a GenericMap extension."""
+        return self._generic_map
+
+    def _index(self) -> Dict[Any, Tuple[int, int]]:
+        if self._offsets is not None:
+            return self._offsets
+        offsets: Dict[Any, Tuple[int, int]] = {}
+        try:
+            if not self._data or not is_map_header(self._data[0]):
+                raise ValueError("Msgpack value is not a map")
+            unpacker = _create_unpacker(self._data)
+            for _ in range(unpacker.read_map_header()):
+                key = unpacker.unpack()
+                start = unpacker.tell()
+                unpacker.skip()
+                offsets[key] = (start, unpacker.tell())
+            if unpacker.tell() != len(self._data):
+                raise ValueError("Extra data after the msgpack value")
+        except Exception as e:
+            raise MsgpackDecodeError("Failed to decode msgpack data") from e
+        self._offsets = offsets
+        return offsets
+
+    def __getitem__(self, key: Any) -> Any:
+        """Get the value of the key, decoding it on first access."""
+        if key in self._values:
+            return self._values[key]
+        start, end = self._index()[key]
+        value = self._values[key] = _decode_lazy(self._data[start:end])
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the keys of the map."""
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        """Get the number of items in the map."""
+        return len(self._index())
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether the key is in the map without decoding its value."""
+        return key in self._index()
+
+    def decode(self) -> Union[Dict[Any, Any], GenericMap[Any, Any]]:
+        """Decode the whole map into a dict, or a GenericMap for the payload\
+            of a GenericMap extension."""
+        decoded = msgpack_decode(self._data)
+        return GenericMap(decoded) if self._generic_map else decoded
+
+    def __repr__(self) -> str:
+        """Return the string representation of the decoded map."""
+        return f"LazyMsgpackMap({self.decode()!r})"
+
+
+class LazyMsgpackArray(Sequence[Any]):
+    """Read-only sequence over a msgpack encoded array decoding its items\
+        on access.
+
+    The offsets of the items are indexed on first access, which copies\
+        the array into a msgpack unpacker once. The items are decoded from\
+        slices of the data, which aren't copied. Maps and arrays nested\
+        in the items are returned as lazy views too.
+
+    Args:
+        data (MsgpackBuffer): The msgpack encoded array.
+
+    Examples:
+        >>> from polywrap_msgpack import msgpack_encode
+        >>> items = LazyMsgpackArray(msgpack_encode([{"id": 1}, {"id": 2}]))
+        >>> items[-1]["id"]
+        2
+        >>> items == [{"id": 1}, {"id": 2}]
+        True
+    """
+
+    __slots__ = ("_data", "_offsets", "_items")
+
+    _data: memoryview
+    _offsets: Optional[List[Tuple[int, int]]]
+    _items: Dict[int, Any]
+
+    def __init__(self, data: MsgpackBuffer):
+        """Initialize a new LazyMsgpackArray instance."""
+        self._data = memoryview(data).cast("B")
+        self._offsets = None
+        self._items = {}
+
+    def _index(self) -> List[Tuple[int, int]]:
+        if self._offsets is not None:
+            return self._offsets
+        offsets: List[Tuple[int, int]] = []
+        try:
+            if not self._data or not is_array_header(self._data[0]):
+                raise ValueError("Msgpack value is not an array")
+            unpacker = _create_unpacker(self._data)
+            for _ in range(unpacker.read_array_header()):
+                start = unpacker.tell()
+                unpacker.skip()
+                offsets.append((start, unpacker.tell()))
+            if unpacker.tell() != len(self._data):
+                raise ValueError("Extra data after the msgpack value")
+        except Exception as e:
+            raise MsgpackDecodeError("Failed to decode msgpack data") from e
+        self._offsets = offsets
+        return offsets
+
+    def _get_item(self, index: int) -> Any:
+        offsets = self._index()
+        if index < 0:
+            index += len(offsets)
+        if index in self._items:
+            return self._items[index]
+        start, end = offsets[index]
+        item = self._items[index] = _decode_lazy(self._data[start:end])
+        return item
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        """Get the item at the index, decoding it on first access."""
+        if isinstance(index, slice):
+            return [
+                self._get_item(i) for i in range(*index.indices(len(self._index())))
+            ]
+        return self._get_item(index)
+
+    def __len__(self) -> int:
+        """Get the number of items in the array."""
+        return len(self._index())
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the items with the items of another sequence."""
+        if isinstance(other, (str, bytes, bytearray)) or not isinstance(
+            other, Sequence
+        ):
+            return NotImplemented
+        other_items = cast(Sequence[Any], other)
+        return len(self) == len(other_items) and all(
+            a == b for a, b in zip(self, other_items)
+        )
+
+    def decode(self) -> List[Any]:
+        """Decode the whole array into a list."""
+        return msgpack_decode(self._data)
+
+    def __repr__(self) -> str:
+        """Return the string representation of the decoded array."""
+        return f"LazyMsgpackArray({self.decode()!r})"
+
+
+def msgpack_decode_lazy(val: MsgpackBuffer) -> Any:
+    r"""Decode msgpack bytes into lazy views decoding the fields on access.
+
+    Maps, GenericMaps and arrays are returned as LazyMsgpackMap and\
+        LazyMsgpackArray views over slices of the bytes. A view copies\
+        the bytes of its own container into a msgpack unpacker once, when\
+        it is indexed, and the returned view is indexed right away to\
+        validate the bytes. Any other value is decoded like msgpack_decode does.
+
+    Args:
+        val (MsgpackBuffer): msgpack encoded bytes
+
+    Raises:
+        MsgpackExtError: when given invalid extension type code
+        MsgpackDecodeError: when given invalid msgpack data
+
+    Returns:
+        Any: a lazy view, or any python object
+
+    Examples:
+        >>> from polywrap_msgpack import msgpack_encode
+        >>> from polywrap_msgpack import GenericMap
+        >>> msgpack_decode_lazy(msgpack_encode({"a": [1, 2]}))["a"]
+        LazyMsgpackArray([1, 2])
+        >>> msgpack_decode_lazy(msgpack_encode(GenericMap({"a": 1}))).generic_map
+        True
+        >>> msgpack_decode_lazy(msgpack_encode("value"))
+        'value'
+        >>> msgpack_decode_lazy(b"\x91\x01\x01")
+        Traceback (most recent call last):
+        ...
+        polywrap_msgpack.errors.MsgpackDecodeError: Failed to decode msgpack data
+    """
+    data = memoryview(val).cast("B")
+    if not data:
+        raise MsgpackDecodeError("Failed to decode msgpack data")
+    value = _decode_lazy(data)
+    if isinstance(value, (LazyMsgpackMap, LazyMsgpackArray)):
+        # Indexing the view, e.g. to get its length, validates the whole value
+        len(value)
+    return value
+
+
+__all__ = [
+    "LazyMsgpackArray",
+    "LazyMsgpackMap",
+    "msgpack_decode_lazy",
+]
@@ -3,14 +3,39 @@
 from __future__ import annotations
 
 from enum import IntEnum
-from typing import Any, Dict, List, Set, Tuple, cast
+from typing import Any, Callable, Dict, List, Set, Tuple, Type, Union, cast
 
 from .extensions.generic_map import GenericMap
+from .extensions.registry import (
+    _add_change_listener,  # pyright: ignore[reportPrivateUsage]
+)
+from .extensions.registry import find_ext_codec
+from .lazy import LazyMsgpackArray, LazyMsgpackMap
+
+Sanitizer = Callable[[Any], Any]
+
+_SCALAR_TYPES: Tuple[type, ...] = (
+    str,
+    int,
+    float,
+    bool,
+    bytes,
+    bytearray,
+    memoryview,
+    type(None),
+)
+_SCALAR_TYPE_SET = frozenset(_SCALAR_TYPES)
 
 
 def sanitize(value: Any) -> Any:
     """Sanitize the value into msgpack encoder compatible format.
 
+    Values made only of str, int, float, bool, bytes, bytearray, memoryview,\
+        None, lists and dicts with str keys are already msgpack compatible. They are returned\
+        as is after a check-only pass, without being copied. Other values\
+        are converted into new values by a sanitizer chosen from the class\
+        of every node, and cached per class.
+
     Args:
         value (Any): any valid python value
 
@@ -43,50 +68,167 @@ def sanitize(value: Any) -> Any:
         ...
         ValueError: GenericMap key must be string, got 1 of type <class 'int'>
     """
-    if isinstance(value, IntEnum):
-        return value.value
-    if isinstance(value, GenericMap):
-        dictionary: Dict[Any, Any] = cast(
-            GenericMap[Any, Any], value
-        )._map  # pyright: ignore[reportPrivateUsage]
-        new_map: GenericMap[str, Any] = GenericMap({})
-        for key, val in dictionary.items():
-            if not isinstance(key, str):
-                raise ValueError(
-                    f"GenericMap key must be string, got {key} of type {type(key)}"
-                )
-            new_map[key] = sanitize(val)
-        return new_map
-    if isinstance(value, dict):
-        dictionary: Dict[Any, Any] = value
-        new_dict: Dict[str, Any] = {}
-        for key, val in dictionary.items():
-            if not isinstance(key, str):
-                raise ValueError(
-                    f"Dict key must be string, got {key} of type {type(key)}"
-                )
-            new_dict[key] = sanitize(val)
-        return new_dict
-    if isinstance(value, list):
-        array: List[Any] = value
-        return [sanitize(a) for a in array]
-    if isinstance(value, tuple):
-        array: List[Any] = list(cast(Tuple[Any], value))
-        return sanitize(array)
-    if isinstance(value, set):
-        set_val: List[Any] = list(cast(Set[Any], value))
-        return sanitize(set_val)
-    if isinstance(value, complex):
-        return str(value)
+    if _is_sanitized(value):
+        return value
+    return _sanitize(value)
+
+
+def _is_sanitized(value: Any) -> bool:
+    """Check whether a value is already msgpack compatible.
+
+    Only the exact builtin types are accepted, so that subclasses\
+        and extension types still go through their sanitizer. A container\
+        met twice, such as a cyclic one, is left to the sanitizer too,\
+        which fails on cycles.
+    """
+    pending: List[Any] = [value]
+    seen: Set[int] = set()
+    while pending:
+        item = pending.pop()
+        item_type = type(item)  # pyright: ignore[reportUnknownVariableType]
+        if item_type in _SCALAR_TYPE_SET:
+            continue
+        if item_type is list or item_type is dict:
+            if id(item) in seen:
+                return False
+            seen.add(id(item))
+        if item_type is list:
+            pending.extend(cast(List[Any], item))
+        elif item_type is dict:
+            dictionary = cast(Dict[Any, Any], item)
+            for key in dictionary:
+                if type(key) is not str:  # pylint: disable=unidiomatic-typecheck
+                    return False
+            pending.extend(dictionary.values())
+        else:
+            return False
+    return True
+
+
+def _sanitize(value: Any) -> Any:
+    value_type: Type[Any] = type(value)  # pyright: ignore[reportUnknownVariableType]
+    sanitizer = _SANITIZERS.get(value_type)
+    if sanitizer is None:
+        sanitizer = _SANITIZERS[value_type] = _resolve_sanitizer(value)
+    return sanitizer(value)
+
+
+def _sanitize_scalar(value: Any) -> Any:
+    return value
+
+
+def _sanitize_int_enum(value: Any) -> Any:
+    return cast(IntEnum, value).value
+
+
+def _sanitize_generic_map(value: Any) -> Any:  # pyright: ignore[reportUnusedFunction]
+    dictionary: Dict[Any, Any] = cast(
+        GenericMap[Any, Any], value
+    )._map  # pyright: ignore[reportPrivateUsage]
+    new_map: GenericMap[str, Any] = GenericMap({})
+    for key, val in dictionary.items():
+        if not isinstance(key, str):
+            raise ValueError(
+                f"GenericMap key must be string, got {key} of type {type(key)}"
+            )
+        new_map[key] = _sanitize(val)
+    return new_map
+
+
+def _sanitize_dict(value: Any) -> Any:
+    dictionary: Dict[Any, Any] = value
+    new_dict: Dict[str, Any] = {}
+    for key, val in dictionary.items():
+        if not isinstance(key, str):
+            raise ValueError(f"Dict key must be string, got {key} of type {type(key)}")
+        new_dict[key] = _sanitize(val)
+    return new_dict
+
+
+def _sanitize_list(value: Any) -> Any:
+    return [_sanitize(item) for item in cast(List[Any], value)]
+
+
+def _sanitize_tuple(value: Any) -> Any:
+    return [_sanitize(item) for item in cast(Tuple[Any, ...], value)]
+
+
+def _sanitize_set(value: Any) -> Any:
+    return [_sanitize(item) for item in cast(Set[Any], value)]
+
+
+def _sanitize_complex(value: Any) -> Any:
+    return str(value)
+
+
+def _sanitize_lazy(value: Any) -> Any:
+    return cast(Union[LazyMsgpackMap, LazyMsgpackArray], value).decode()
+
+
+def _sanitize_vars(value: Any) -> Any:
+    return {k: _sanitize(v) for k, v in cast(Dict[Any, Any], vars(value)).items()}
+
+
+def _create_slots_sanitizer(slots: Tuple[str, ...]) -> Sanitizer:
+    """Create the sanitizer of a class with the given slots."""
+
+    def sanitize_slots(value: Any) -> Any:
+        return {s: _sanitize(getattr(value, s)) for s in slots if hasattr(value, s)}
+
+    return sanitize_slots
+
+
+def _resolve_sanitizer(value: Any) -> Sanitizer:
+    """Get the sanitizer of the class of a value.
+
+    Extension types are sanitized by their codec, or kept as they are.\
+        The other checks are done in order of precedence, so that a subclass\
+        is sanitized like its closest supported base class.
+    """
+    codec = find_ext_codec(type(value))  # pyright: ignore[reportUnknownArgumentType]
+    if codec is not None:
+        return codec.sanitize or _sanitize_scalar
+    for base, sanitizer in _BASE_SANITIZERS:
+        if isinstance(value, base):
+            return sanitizer
     if hasattr(value, "__slots__"):
-        return {
-            s: sanitize(getattr(value, s))
-            for s in getattr(value, "__slots__")
-            if hasattr(value, s)
-        }
+        return _create_slots_sanitizer(tuple(getattr(value, "__slots__")))
     if hasattr(value, "__dict__"):
-        return {k: sanitize(v) for k, v in cast(Dict[Any, Any], vars(value)).items()}
-    return value
+        return _sanitize_vars
+    return _sanitize_scalar
+
+
+_BASE_SANITIZERS: List[Tuple[type, Sanitizer]] = [
+    (IntEnum, _sanitize_int_enum),
+    (LazyMsgpackMap, _sanitize_lazy),
+    (LazyMsgpackArray, _sanitize_lazy),
+    (dict, _sanitize_dict),
+    (list, _sanitize_list),
+    (tuple, _sanitize_tuple),
+    (set, _sanitize_set),
+    (complex, _sanitize_complex),
+]
+
+_DEFAULT_SANITIZERS: Dict[Type[Any], Sanitizer] = {
+    **{scalar_type: _sanitize_scalar for scalar_type in _SCALAR_TYPES},
+    dict: _sanitize_dict,
+    list: _sanitize_list,
+    tuple: _sanitize_tuple,
+    set: _sanitize_set,
+    complex: _sanitize_complex,
+}
+
+_SANITIZERS: Dict[Type[Any], Sanitizer] = dict(_DEFAULT_SANITIZERS)
+"""Sanitizers by exact class, filled with the classes met while sanitizing."""
+
+
+def _reset_sanitizers() -> None:
+    """Forget the sanitizers resolved before an extension codec changed."""
+    _SANITIZERS.clear()
+    _SANITIZERS.update(_DEFAULT_SANITIZERS)
+
+
+_add_change_listener(_reset_sanitizers)
 
 
 __all__ = ["sanitize"]
@@ -0,0 +1,189 @@
+"""This module implements the streaming msgpack decoder for decoding\
+    large data recieved from a wrapper incrementally."""
+from __future__ import annotations
+
+from typing import Any, BinaryIO, Callable, Iterator, Optional, Protocol, Union, cast
+
+import msgpack
+
+from .decoder import _decode_ext_hook  # pyright: ignore[reportPrivateUsage]
+from .errors import MsgpackDecodeError
+from .extensions import ExtensionTypes
+from .headers import ext_header_size, is_array_header, is_map_header
+
+MsgpackStreamSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+"""The number of bytes read from the source at once by default."""
+
+
+class _Unpacker(Protocol):
+    """The members of msgpack.Unpacker used by the decoders."""
+
+    def feed(self, next_bytes: Any) -> None:
+        """Append bytes to the internal buffer."""
+
+    def unpack(self) -> Any:
+        """Unpack the next object."""
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def skip(self) -> None:
+        """Skip the next object."""
+
+    def tell(self) -> int:
+        """Get the position of the unpacker in the data."""
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def read_bytes(self, n: int) -> bytes:
+        """Read bytes without unpacking them."""
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def read_array_header(self) -> int:
+        """Read the header of an array and get its length."""
+        ...  # pylint: disable=unnecessary-ellipsis
+
+    def read_map_header(self) -> int:
+        """Read the header of a map and get its length."""
+        ...  # pylint: disable=unnecessary-ellipsis
+
+
+class _ChunkReader:
+    """File-like reader over a buffer or a binary file that can peek\
+        at the first byte."""
+
+    _read: Callable[[int], bytes]
+    _head: bytes
+
+    def __init__(self, source: MsgpackStreamSource):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source).cast("B")
+            position = 0
+
+            def read_view(size: int) -> bytes:
+                nonlocal position
+                chunk = bytes(view[position : position + size])
+                position += len(chunk)
+                return chunk
+
+            self._read = read_view
+        else:
+            self._read = source.read
+        self._head = b""
+
+    def peek(self) -> Optional[int]:
+        """Get the next byte without consuming it, or None at the end."""
+        if not self._head:
+            self._head = self._read(1)
+        return self._head[0] if self._head else None
+
+    def read(self, size: int = -1) -> bytes:
+        """Read at most size bytes."""
+        head, self._head = self._head, b""
+        if size < 0:
+            return head + self._read(-1)
+        if size <= len(head):
+            self._head = head[size:]
+            return head[:size]
+        return head + self._read(size - len(head))
+
+    def unread(self, data: bytes) -> None:
+        """Put back data read last, to be read again."""
+        self._head = data + self._head
+
+    def read_exactly(self, size: int) -> bytes:
+        """Read exactly size bytes."""
+        data = b""
+        while len(data) < size:
+            chunk = self.read(size - len(data))
+            if not chunk:
+                raise ValueError("Unexpected end of msgpack data")
+            data += chunk
+        return data
+
+
+def msgpack_decode_stream(
+    source: MsgpackStreamSource, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    r"""Decode msgpack data incrementally.
+
+    The source is read and decoded one top-level element at a time,\
+        so that only the element being decoded is held in memory\
+        besides the source itself. The elements of a top-level array\
+        are yielded one by one, and the items of a top-level map or\
+        GenericMap are yielded as key and value tuples. Any other value\
+        is yielded alone.
+
+    Args:
+        source (MsgpackStreamSource): The msgpack encoded bytes,\
+            or a binary file to read them from.
+        chunk_size (int): The number of bytes read from the source at once.
+
+    Raises:
+        MsgpackExtError: when given invalid extension type code
+        MsgpackDecodeError: when given invalid msgpack data
+
+    Returns:
+        Iterator[Any]: The decoded elements, items or value.
+
+    Examples:
+        >>> from polywrap_msgpack import msgpack_encode, GenericMap
+        >>> list(msgpack_decode_stream(msgpack_encode([{"a": 2}, {"b": 4}])))
+        [{'a': 2}, {'b': 4}]
+        >>> list(msgpack_decode_stream(msgpack_encode({"a": 1, "b": [2]})))
+        [('a', 1), ('b', [2])]
+        >>> list(msgpack_decode_stream(msgpack_encode(GenericMap({"a": 1}))))
+        [('a', 1)]
+        >>> list(msgpack_decode_stream(msgpack_encode("value")))
+        ['value']
+        >>> list(msgpack_decode_stream(b"\x92\x01\xc1"))
+        Traceback (most recent call last):
+        ...
+        polywrap_msgpack.errors.MsgpackDecodeError: Failed to decode msgpack data
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be a positive integer, got {chunk_size}")
+    return _decode_stream(_ChunkReader(source), chunk_size)
+
+
+def _decode_stream(reader: _ChunkReader, chunk_size: int) -> Iterator[Any]:
+    try:
+        first_byte = reader.peek()
+        if first_byte is None:
+            raise ValueError("Empty msgpack data")
+        header_size = ext_header_size(first_byte)
+        if header_size is not None:
+            # A GenericMap is an ext wrapping a map, stream the items of the map
+            header = reader.read_exactly(header_size)
+            if header[-1] == ExtensionTypes.GENERIC_MAP.value:
+                first_byte = reader.peek()
+            else:
+                reader.unread(header)
+
+        unpacker = cast(
+            _Unpacker,
+            msgpack.Unpacker(  # pyright: ignore[reportUnknownMemberType]
+                reader,  # pyright: ignore[reportArgumentType]
+                read_size=chunk_size,
+                max_buffer_size=0,
+                ext_hook=_decode_ext_hook,
+            ),
+        )
+        if first_byte is not None and is_array_header(first_byte):
+            for _ in range(unpacker.read_array_header()):
+                yield unpacker.unpack()
+        elif first_byte is not None and is_map_header(first_byte):
+            for _ in range(unpacker.read_map_header()):
+                yield unpacker.unpack(), unpacker.unpack()
+        else:
+            yield unpacker.unpack()
+        if unpacker.read_bytes(1) or reader.read(1):
+            raise ValueError("Extra data after the msgpack value")
+    except Exception as e:
+        raise MsgpackDecodeError("Failed to decode msgpack data") from e
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "MsgpackStreamSource",
+    "msgpack_decode_stream",
+]
@@ -0,0 +1,98 @@
+from io import BytesIO
+from typing import Any, List, NamedTuple, Type
+
+from msgpack import FormatError, OutOfData
+from polywrap_msgpack import (
+    GenericMap,
+    MsgpackDecodeError,
+    MsgpackExtError,
+    msgpack_decode_stream,
+    msgpack_encode,
+)
+import pytest
+
+
+def test_decode_stream_array():
+    value = [{"id": i, "name": f"item {i}"} for i in range(1000)]
+    encoded = msgpack_encode(value)
+
+    result = msgpack_decode_stream(encoded)
+
+    assert next(result) == {"id": 0, "name": "item 0"}
+    assert list(result) == value[1:]
+
+
+def test_decode_stream_map():
+    value = {"a": 1, "b": [1, 2], "c": {"d": None}}
+
+    assert list(msgpack_decode_stream(msgpack_encode(value))) == list(value.items())
+
+
+def test_decode_stream_generic_map():
+    value = GenericMap({"a": GenericMap({"b": 2}), "c": "d"})
+
+    result = list(msgpack_decode_stream(msgpack_encode(value)))
+
+    assert result == [("a", GenericMap({"b": 2})), ("c", "d")]
+    assert isinstance(result[0][1], GenericMap)
+
+
+@pytest.mark.parametrize("value", [1, "value", None, True, b"bytes", 0.5])
+def test_decode_stream_scalar(value: Any):
+    assert list(msgpack_decode_stream(msgpack_encode(value))) == [value]
+
+
+@pytest.mark.parametrize("size", [0, 15, 16, 65535, 65536])
+def test_decode_stream_array_headers(size: int):
+    value = list(range(size))
+
+    assert list(msgpack_decode_stream(msgpack_encode(value))) == value
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_decode_stream_sources(chunk_size: int):
+    value = [GenericMap({"key": "x" * i}) for i in range(300)]
+    encoded = msgpack_encode(value)
+
+    for source in (encoded, bytearray(encoded), memoryview(encoded), BytesIO(encoded)):
+        assert list(msgpack_decode_stream(source, chunk_size)) == value
+
+
+def test_decode_stream_reads_incrementally():
+    encoded = msgpack_encode([bytes(1024) for _ in range(100)])
+    source = BytesIO(encoded)
+
+    result = msgpack_decode_stream(source, chunk_size=2048)
+    next(result)
+
+    assert source.tell() < len(encoded) // 10
+
+
+def test_decode_stream_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        msgpack_decode_stream(b"\x90", 0)
+
+
+class InvalidStreamCase(NamedTuple):
+    encoded: bytes
+    error: Type[Exception]
+
+
+INVALID_STREAM_DATA: List[InvalidStreamCase] = [
+    InvalidStreamCase(b"", ValueError),  # empty
+    InvalidStreamCase(
+        b"\x92\x01\xc1", FormatError
+    ),  # fixarray(len=2) [ 1, (undefined tag) ]
+    InvalidStreamCase(b"\x92\x01", OutOfData),  # fixarray(len=2) [ 1 ]
+    InvalidStreamCase(b"\x91\x01\x01", ValueError),  # fixarray(len=1) [ 1 ] 1
+    InvalidStreamCase(b"\xd4\x05\x00", MsgpackExtError),  # fixext1 of unknown type
+]
+
+
+@pytest.mark.parametrize("encoded,error", INVALID_STREAM_DATA)
+def test_decode_stream_invalid_data(encoded: bytes, error: Type[Exception]):
+    with pytest.raises(MsgpackDecodeError) as e:
+        list(msgpack_decode_stream(encoded))
+    assert e.match("Failed to decode msgpack data")
+    assert e.value.__cause__ is not None
+    assert e.value.__cause__.__class__ is error
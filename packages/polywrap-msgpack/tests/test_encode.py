@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Dict, List
 from hypothesis import given
 from polywrap_msgpack import msgpack_encode, MsgpackSanitizeError
 import pytest
@@ -25,3 +25,31 @@ def test_invalid_generic_map_key(s: Any):
     assert e.value.__cause__ is not None
     assert e.value.__cause__.__class__ is ValueError
     assert e.value.__cause__.args[0].startswith("GenericMap key must be string")
+
+
+def test_cyclic_list():
+    value: List[Any] = [1]
+    value.append(value)
+
+    with pytest.raises(MsgpackSanitizeError) as e:
+        msgpack_encode(value)
+    assert e.match("Failed to sanitize object")
+    assert isinstance(e.value.__cause__, RecursionError)
+
+
+def test_cyclic_dict():
+    value: Dict[str, Any] = {"a": 1}
+    value["b"] = {"c": value}
+
+    with pytest.raises(MsgpackSanitizeError) as e:
+        msgpack_encode(value)
+    assert e.match("Failed to sanitize object")
+    assert isinstance(e.value.__cause__, RecursionError)
+
+
+def test_shared_value_is_encoded():
+    shared = {"a": [1, 2]}
+
+    assert msgpack_encode([shared, shared]) == msgpack_encode(
+        [{"a": [1, 2]}, {"a": [1, 2]}]
+    )
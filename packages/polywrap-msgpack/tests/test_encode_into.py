@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+from hypothesis import given
+from polywrap_msgpack import (
+    GenericMap,
+    MAX_POOLED_BUFFER_SIZE,
+    MsgpackEncodeError,
+    MsgpackSanitizeError,
+    msgpack_decode,
+    msgpack_encode,
+    msgpack_encode_into,
+    msgpack_pack,
+    sanitize,
+)
+import pytest
+
+from .strategies.basic_strategies import valid_dict_st
+from .strategies.generic_map_strategies import valid_generic_map_st
+
+
+@given(valid_dict_st())
+def test_encode_into_dict(s: Dict[str, Any]):
+    buffer = bytearray(len(msgpack_encode(s)) + 4)
+
+    size = msgpack_encode_into(s, buffer, 2)
+
+    assert bytes(buffer[2 : 2 + size]) == msgpack_encode(s)
+    assert buffer[:2] == buffer[2 + size :] == b"\x00\x00"
+
+
+@given(valid_generic_map_st())
+def test_encode_into_generic_map(s: GenericMap[str, Any]):
+    buffer = bytearray(len(msgpack_encode(s)))
+
+    size = msgpack_encode_into(s, memoryview(buffer))
+
+    assert size == len(buffer)
+    assert msgpack_decode(bytes(buffer)) == s
+
+
+def test_encode_into_too_small():
+    buffer = bytearray(4)
+
+    with pytest.raises(MsgpackEncodeError):
+        msgpack_encode_into("hello", buffer)
+    with pytest.raises(MsgpackEncodeError):
+        msgpack_encode_into(1, buffer, 4)
+    with pytest.raises(MsgpackEncodeError):
+        msgpack_encode_into(1, buffer, -1)
+    assert msgpack_encode_into(1, buffer, 3) == 1
+    assert buffer == b"\x00\x00\x00\x01"
+
+
+def test_encode_into_read_only():
+    with pytest.raises(MsgpackEncodeError):
+        msgpack_encode_into(1, memoryview(bytes(4)))
+
+
+def test_encode_into_invalid():
+    with pytest.raises(MsgpackSanitizeError):
+        msgpack_encode_into({1: 1}, bytearray(4))
+    with pytest.raises(MsgpackEncodeError):
+        msgpack_encode_into(object(), bytearray(4))
+    assert msgpack_encode_into("a", bytearray(4)) == 2
+
+
+def test_encode_into_large_value():
+    value = bytes(MAX_POOLED_BUFFER_SIZE + 1)
+    buffer = bytearray(MAX_POOLED_BUFFER_SIZE + 8)
+
+    size = msgpack_encode_into(value, buffer)
+
+    assert msgpack_decode(bytes(buffer[:size])) == value
+    assert msgpack_encode_into(1, buffer) == 1
+
+
+def test_pack_sanitized():
+    value = {"a": GenericMap({"b": GenericMap({"c": [1, 2]})}), "d": b"bytes"}
+
+    assert msgpack_pack(sanitize(value)) == msgpack_encode(value)
+
+
+def test_pack_unsanitized():
+    with pytest.raises(MsgpackEncodeError):
+        msgpack_pack({"a": (1, {2})})
+
+
+def test_encode_after_error():
+    with pytest.raises(MsgpackEncodeError):
+        msgpack_pack(GenericMap({"a": GenericMap({"b": {1}})}))
+
+    assert msgpack_decode(msgpack_encode(GenericMap({"a": GenericMap({"b": 1})}))) == (
+        GenericMap({"a": GenericMap({"b": 1})})
+    )
+
+
+def test_encode_concurrently():
+    values = [
+        GenericMap({f"key {i}": GenericMap({"nested": [i] * i}) for i in range(n)})
+        for n in range(50)
+    ]
+    expected = [msgpack_encode(value) for value in values]
+
+    def encode_all(_: int) -> Any:
+        return [msgpack_encode(value) for value in values]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(encode_all, range(32)))
+
+    assert all(result == expected for result in results)
@@ -0,0 +1,174 @@
+from typing import Iterator
+
+from polywrap_msgpack import (
+    ExtCodec,
+    ExtensionTypes,
+    GenericMap,
+    MsgpackDecodeError,
+    MsgpackEncodeError,
+    MsgpackExtError,
+    find_ext_codec,
+    get_ext_codec,
+    msgpack_decode,
+    msgpack_decode_lazy,
+    msgpack_decode_stream,
+    msgpack_encode,
+    register_ext_codec,
+    sanitize,
+    unregister_ext_codec,
+)
+import pytest
+
+
+class BigInt:
+    __slots__ = ("value",)
+
+    def __init__(self, value: int):
+        self.value = value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BigInt) and other.value == self.value
+
+
+class SubBigInt(BigInt):
+    __slots__ = ()
+
+
+BIGINT_CODE = 100
+
+
+def encode_bigint(value: BigInt) -> bytes:
+    return value.value.to_bytes((value.value.bit_length() + 8) // 8, "big", signed=True)
+
+
+def decode_bigint(data: bytes) -> BigInt:
+    return BigInt(int.from_bytes(data, "big", signed=True))
+
+
+@pytest.fixture
+def bigint_codec() -> Iterator[ExtCodec[BigInt]]:
+    codec = ExtCodec(
+        code=BIGINT_CODE, type=BigInt, encode=encode_bigint, decode=decode_bigint
+    )
+    register_ext_codec(codec)
+    yield codec
+    unregister_ext_codec(BIGINT_CODE)
+
+
+def test_generic_map_codec_registered():
+    codec = get_ext_codec(ExtensionTypes.GENERIC_MAP.value)
+
+    assert codec is not None
+    assert codec.type is GenericMap
+    assert find_ext_codec(GenericMap) is codec
+
+
+def test_encode_decode_registered_type(bigint_codec: ExtCodec[BigInt]):
+    value = {"big": BigInt(-(2**100)), "items": [BigInt(0), BigInt(2**70)]}
+
+    encoded = msgpack_encode(value)
+
+    assert msgpack_encode(BigInt(1)) == b"\xd4\x64\x01"
+    assert msgpack_decode(encoded) == value
+    assert msgpack_decode(encoded, zero_copy=True) == value
+
+
+def test_registered_type_in_generic_map(bigint_codec: ExtCodec[BigInt]):
+    value = GenericMap({"big": BigInt(2**64)})
+
+    assert msgpack_decode(msgpack_encode(value)) == value
+
+
+def test_registered_type_kept_by_sanitize(bigint_codec: ExtCodec[BigInt]):
+    value = BigInt(1)
+
+    assert sanitize({"big": value})["big"] is value
+
+
+def test_sanitize_cache_reset_on_register():
+    assert sanitize(BigInt(1)) == {"value": 1}
+
+    register_ext_codec(
+        ExtCodec(
+            code=BIGINT_CODE, type=BigInt, encode=encode_bigint, decode=decode_bigint
+        )
+    )
+    try:
+        assert isinstance(sanitize(BigInt(1)), BigInt)
+    finally:
+        unregister_ext_codec(BIGINT_CODE)
+
+    assert sanitize(BigInt(1)) == {"value": 1}
+
+
+def test_subclass_uses_base_codec(bigint_codec: ExtCodec[BigInt]):
+    assert find_ext_codec(SubBigInt) is bigint_codec
+    assert msgpack_decode(msgpack_encode(SubBigInt(5))) == BigInt(5)
+
+
+def test_registered_type_lazy_and_stream(bigint_codec: ExtCodec[BigInt]):
+    encoded = msgpack_encode({"big": BigInt(7)})
+
+    assert msgpack_decode_lazy(encoded)["big"] == BigInt(7)
+    assert list(msgpack_decode_stream(encoded)) == [("big", BigInt(7))]
+    assert list(msgpack_decode_stream(msgpack_encode(BigInt(7)))) == [BigInt(7)]
+
+
+def test_register_duplicate(bigint_codec: ExtCodec[BigInt]):
+    with pytest.raises(MsgpackExtError, match="code 100 is already registered"):
+        register_ext_codec(bigint_codec)
+
+    with pytest.raises(MsgpackExtError, match="is already registered"):
+        register_ext_codec(
+            ExtCodec(code=101, type=BigInt, encode=encode_bigint, decode=decode_bigint)
+        )
+
+    assert get_ext_codec(101) is None
+
+
+@pytest.mark.parametrize("code", [-1, 128])
+def test_register_invalid_code(code: int):
+    with pytest.raises(MsgpackExtError, match="between 0 and 127"):
+        register_ext_codec(
+            ExtCodec(code=code, type=BigInt, encode=encode_bigint, decode=decode_bigint)
+        )
+
+
+def test_unregistered_code():
+    with pytest.raises(MsgpackExtError, match="is not registered"):
+        unregister_ext_codec(BIGINT_CODE)
+
+    with pytest.raises(MsgpackDecodeError) as e:
+        msgpack_decode(b"\xd4\x64\x01")
+
+    assert isinstance(e.value.__cause__, MsgpackExtError)
+
+    with pytest.raises(MsgpackDecodeError):
+        list(msgpack_decode_stream(b"\xd4\x64\x01"))
+
+
+def test_encode_after_unregister():
+    register_ext_codec(
+        ExtCodec(
+            code=BIGINT_CODE, type=BigInt, encode=encode_bigint, decode=decode_bigint
+        )
+    )
+    assert msgpack_encode(BigInt(1))
+    unregister_ext_codec(BIGINT_CODE)
+
+    assert find_ext_codec(BigInt) is None
+    assert msgpack_encode(BigInt(1)) == msgpack_encode({"value": 1})
+
+
+def test_encode_error_in_codec():
+    def fail(value: BigInt) -> bytes:
+        raise ValueError("cannot encode")
+
+    register_ext_codec(
+        ExtCodec(code=BIGINT_CODE, type=BigInt, encode=fail, decode=decode_bigint)
+    )
+    try:
+        with pytest.raises(MsgpackEncodeError):
+            msgpack_encode(BigInt(1))
+    finally:
+        unregister_ext_codec(BIGINT_CODE)
@@ -0,0 +1,132 @@
+from typing import Any, List
+
+from polywrap_msgpack import (
+    GenericMap,
+    LazyMsgpackArray,
+    LazyMsgpackMap,
+    MsgpackDecodeError,
+    msgpack_decode,
+    msgpack_decode_lazy,
+    msgpack_encode,
+)
+import pytest
+
+
+RESPONSE = {
+    "status": 200,
+    "statusText": "OK",
+    "headers": GenericMap({"content-type": "application/json"}),
+    "body": [{"id": i, "tags": ["a", "b"]} for i in range(1000)],
+}
+
+
+def test_lazy_map_access():
+    response = msgpack_decode_lazy(msgpack_encode(RESPONSE))
+
+    assert isinstance(response, LazyMsgpackMap)
+    assert response["status"] == 200
+    assert "body" in response
+    assert "missing" not in response
+    assert len(response) == 4
+    assert list(response) == list(RESPONSE)
+    with pytest.raises(KeyError):
+        response["missing"]
+
+
+def test_lazy_nested_views():
+    response = msgpack_decode_lazy(msgpack_encode(RESPONSE))
+
+    body = response["body"]
+    headers = response["headers"]
+
+    assert isinstance(body, LazyMsgpackArray)
+    assert len(body) == 1000
+    assert body[-1]["id"] == 999
+    assert isinstance(body[3]["tags"], LazyMsgpackArray)
+    assert body[1:3] == [{"id": 1, "tags": ["a", "b"]}, {"id": 2, "tags": ["a", "b"]}]
+    assert isinstance(headers, LazyMsgpackMap)
+    assert headers.generic_map
+    assert headers.decode() == GenericMap({"content-type": "application/json"})
+    assert isinstance(headers.decode(), GenericMap)
+
+
+def test_lazy_caches_values():
+    response = msgpack_decode_lazy(msgpack_encode(RESPONSE))
+
+    assert response["body"] is response["body"]
+    assert response["body"][0] is response["body"][0]
+
+
+def test_lazy_equality():
+    response = msgpack_decode_lazy(msgpack_encode(RESPONSE))
+
+    assert response == RESPONSE
+    assert RESPONSE == response
+    assert response["body"] != RESPONSE["body"][1:]
+    assert response["body"] != "body"
+
+
+def test_lazy_decode():
+    response = msgpack_decode_lazy(msgpack_encode(RESPONSE))
+
+    assert response.decode() == msgpack_decode(msgpack_encode(RESPONSE))
+    assert response["body"].decode() == RESPONSE["body"]
+
+
+def test_lazy_encode():
+    response = msgpack_decode_lazy(msgpack_encode(RESPONSE))
+
+    assert msgpack_decode(msgpack_encode(response)) == RESPONSE
+    assert msgpack_decode(msgpack_encode({"body": response["body"]})) == {
+        "body": RESPONSE["body"]
+    }
+
+
+@pytest.mark.parametrize("value", [1, "value", None, b"bytes", 0.5])
+def test_lazy_scalar(value: Any):
+    assert msgpack_decode_lazy(msgpack_encode(value)) == value
+
+
+def test_lazy_buffers():
+    encoded = msgpack_encode(RESPONSE)
+
+    assert msgpack_decode_lazy(bytearray(encoded)) == RESPONSE
+    assert msgpack_decode_lazy(memoryview(encoded)) == RESPONSE
+
+
+@pytest.mark.parametrize(
+    "encoded", [b"", b"\xc1", b"\x92\x01", b"\x91\x01\x01", b"\x81\x01\xc1"]
+)
+def test_lazy_invalid_data(encoded: bytes):
+    with pytest.raises(MsgpackDecodeError) as e:
+        msgpack_decode_lazy(encoded)
+    assert e.match("Failed to decode msgpack data")
+
+
+def test_lazy_not_a_map():
+    with pytest.raises(MsgpackDecodeError):
+        len(LazyMsgpackMap(msgpack_encode([1])))
+    with pytest.raises(MsgpackDecodeError):
+        len(LazyMsgpackArray(msgpack_encode({"a": 1})))
+
+
+def test_lazy_copies_each_container_once(monkeypatch: pytest.MonkeyPatch):
+    from polywrap_msgpack import lazy
+
+    fed: List[int] = []
+    create_unpacker = lazy._create_unpacker  # pyright: ignore[reportPrivateUsage]
+
+    def counting_unpacker(data: memoryview) -> Any:
+        fed.append(len(data))
+        return create_unpacker(data)
+
+    monkeypatch.setattr(lazy, "_create_unpacker", counting_unpacker)
+    encoded = msgpack_encode(RESPONSE)
+
+    response = msgpack_decode_lazy(encoded)
+    assert response["status"] == 200
+    assert response["body"][0]["id"] == 0
+
+    assert fed[0] == len(encoded)
+    # The top-level map is fed once, its nested containers only their own bytes
+    assert fed.count(len(encoded)) == 1
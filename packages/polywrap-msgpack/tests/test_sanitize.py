@@ -0,0 +1,57 @@
+from typing import Any, Dict
+from hypothesis import given
+
+from polywrap_msgpack import GenericMap, sanitize
+from .strategies.basic_strategies import valid_dict_st
+from .strategies.class_strategies import SimpleSlots, Simple
+from .strategies.enum_strategies import TestEnum as SampleEnum
+
+
+class PartialSlots:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: Any):
+        self.x = x
+
+
+@given(valid_dict_st())
+def test_sanitized_dict_is_not_copied(s: Dict[str, Any]):
+    assert sanitize(s) is s
+
+
+def test_sanitized_nested_value_is_not_copied():
+    value = {"a": [1, 2.5, True, None, b"bytes", {"b": ["c"]}]}
+
+    assert sanitize(value) is value
+
+
+def test_unsanitized_leaf_copies_value():
+    value = {"a": [1, {"b": (2, 3)}], "c": "d"}
+
+    sanitized = sanitize(value)
+
+    assert sanitized == {"a": [1, {"b": [2, 3]}], "c": "d"}
+    assert sanitized is not value
+    assert value["a"][1]["b"] == (2, 3)
+
+
+def test_sanitize_subclasses_like_their_base():
+    class Mapping(dict):  # type: ignore
+        pass
+
+    value = [SampleEnum.Test2, Mapping(a=SampleEnum.Test1), {SampleEnum.Test3}]
+
+    assert sanitize(value) == [2, {"a": 1}, [3]]
+
+
+def test_sanitize_objects_with_the_same_class():
+    values = [SimpleSlots(i, [Simple(i, {i})]) for i in range(3)]
+
+    assert sanitize(values) == [{"x": i, "y": [{"x": i, "y": [i]}]} for i in range(3)]
+
+
+def test_sanitize_skips_unset_slots():
+    assert sanitize([PartialSlots(1), PartialSlots(GenericMap({"a": 1}))]) == [
+        {"x": 1},
+        {"x": GenericMap({"a": 1})},
+    ]
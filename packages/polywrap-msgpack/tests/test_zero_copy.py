@@ -0,0 +1,95 @@
+from typing import Any
+
+from polywrap_msgpack import (
+    GenericMap,
+    MsgpackDecodeError,
+    MsgpackExtError,
+    msgpack_decode,
+    msgpack_decode_lazy,
+    msgpack_encode,
+    sanitize,
+)
+import pytest
+
+
+VALUE = {
+    "scalars": [
+        0,
+        127,
+        -32,
+        -33,
+        255,
+        65536,
+        2**40,
+        -(2**40),
+        0.5,
+        None,
+        True,
+        False,
+    ],
+    "strings": ["", "a" * 31, "b" * 32, "c" * 70000, "é"],
+    "bytes": [b"", b"bin", bytes(300), bytes(70000)],
+    "map": GenericMap({"key": [b"value"], "empty": GenericMap({})}),
+}
+
+
+def test_decode_buffers():
+    encoded = msgpack_encode(VALUE)
+
+    assert msgpack_decode(bytearray(encoded)) == VALUE
+    assert msgpack_decode(memoryview(encoded)) == VALUE
+    assert msgpack_decode(memoryview(b"\x00" + encoded)[1:]) == VALUE
+
+
+def test_decode_zero_copy_matches_decode():
+    encoded = msgpack_encode(VALUE)
+
+    assert msgpack_decode(encoded, zero_copy=True) == msgpack_decode(encoded)
+
+
+def test_decode_zero_copy_bin_slices():
+    data = bytearray(msgpack_encode({"payload": b"abc", "nested": [b"def"]}))
+
+    decoded = msgpack_decode(data, zero_copy=True)
+    payload: Any = decoded["payload"]
+
+    assert isinstance(payload, memoryview)
+    assert isinstance(decoded["nested"][0], memoryview)
+    assert payload == b"abc"
+    data[data.index(b"abc")] = ord("x")
+    assert payload == b"xbc"
+
+
+def test_decode_zero_copy_large_map():
+    value = {f"key{i}": [i, str(i), bytes([i % 256])] for i in range(70000)}
+
+    assert msgpack_decode(msgpack_encode(value), zero_copy=True) == value
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"\x92\x01", b"\x01\x02", b"\xc1", b"\xc4\x05ab", b"\xdc\x00"],
+)
+def test_decode_zero_copy_invalid(data: bytes):
+    with pytest.raises(MsgpackDecodeError):
+        msgpack_decode(data, zero_copy=True)
+
+
+def test_decode_zero_copy_invalid_ext():
+    with pytest.raises(MsgpackDecodeError) as e:
+        msgpack_decode(b"\xc7\x01\x05\x00", zero_copy=True)
+
+    assert isinstance(e.value.__cause__, MsgpackExtError)
+
+
+def test_encode_buffers():
+    assert msgpack_encode(bytearray(b"bin")) == msgpack_encode(b"bin")
+    assert msgpack_encode(memoryview(b"bin")) == msgpack_encode(b"bin")
+    assert sanitize({"a": [bytearray(b"bin")]}) == {"a": [b"bin"]}
+
+
+def test_lazy_buffers():
+    data = bytearray(msgpack_encode({"a": [1, 2]}))
+
+    assert msgpack_decode_lazy(data)["a"][1] == 2
+    assert msgpack_decode_lazy(memoryview(data)) == {"a": [1, 2]}
@@ -1,8 +1,12 @@
 """This module contains the PluginModule class."""
 # pylint: disable=invalid-name
+import asyncio
+import inspect
 from abc import ABC
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Generic, Optional, TypeVar
+from functools import partial
+from typing import Any, Callable, Coroutine, Generic, Optional, TypeVar, cast
 
 from polywrap_core import (
     InvokerClient,
@@ -11,7 +15,7 @@ from polywrap_core import (
     WrapAbortError,
     WrapInvocationError,
 )
-from polywrap_msgpack import msgpack_decode
+from polywrap_msgpack import MsgpackBuffer, msgpack_decode
 
 TConfig = TypeVar("TConfig")
 
@@ -59,6 +63,12 @@ class PluginModule(Generic[TConfig], ABC):
     ) -> Any:
         """Invoke a method on the plugin.
 
+        Methods defined with `async def` are run to completion\
+            in a new event loop. When an event loop is already running\
+            in the calling thread, e.g. when an async plugin method\
+            subinvokes this plugin, the new event loop runs in a dedicated\
+            thread so that the running one is never reentered.
+
         Args:
             options (PluginInvokeOptions): The options\
                 to use when invoking the plugin.
@@ -72,25 +82,90 @@ class PluginModule(Generic[TConfig], ABC):
             WrapAbortError: If the plugin method raises an exception.
             MsgpackDecodeError: If the plugin method returns invalid msgpack.
         """
+        callable_method = self._get_method(options)
+        try:
+            result = callable_method(
+                self._decode_args(options), options.client, options.env
+            )
+            if inspect.iscoroutine(result):
+                return self._run_coroutine(result)
+            return result
+        except Exception as err:
+            raise WrapAbortError(options, repr(err)) from err
+
+    async def __wrap_invoke_async__(
+        self,
+        options: PluginInvokeOptions,
+        executor: Optional[Executor] = None,
+    ) -> Any:
+        """Invoke a method on the plugin from an event loop.
+
+        Methods defined with `async def` are awaited on the running\
+            event loop. Other methods are blocking, so they are run\
+            in the executor.
+
+        The client of the options is synchronous, so `async def` methods\
+            must not subinvoke with it directly, which would block the event\
+            loop, but hand the subinvocation to a thread, e.g. with\
+            `await asyncio.to_thread(client.invoke, ...)`.
+
+        Args:
+            options (PluginInvokeOptions): The options\
+                to use when invoking the plugin.
+            executor (Optional[Executor]): The executor running blocking\
+                methods. Defaults to the default executor of the event loop.
+
+        Returns:
+            The result of the plugin method invocation.
+
+        Raises:
+            WrapInvocationError: If the plugin method is not defined\
+                or is not callable.
+            WrapAbortError: If the plugin method raises an exception.
+            MsgpackDecodeError: If the plugin method returns invalid msgpack.
+        """
+        callable_method = self._get_method(options)
+        try:
+            decoded_args = self._decode_args(options)
+            if inspect.iscoroutinefunction(callable_method):
+                return await callable_method(decoded_args, options.client, options.env)
+            return await asyncio.get_running_loop().run_in_executor(
+                executor,
+                partial(callable_method, decoded_args, options.client, options.env),
+            )
+        except Exception as err:
+            raise WrapAbortError(options, repr(err)) from err
+
+    @staticmethod
+    def _run_coroutine(coroutine: Coroutine[Any, Any, Any]) -> Any:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="polywrap-plugin"
+        ) as loop_thread:
+            return loop_thread.submit(asyncio.run, coroutine).result()
+
+    def _get_method(self, options: PluginInvokeOptions) -> Callable[..., Any]:
         if not hasattr(self, options.method):
             raise WrapInvocationError(
                 options, f"{options.method} is not defined in plugin module"
             )
 
         callable_method = getattr(self, options.method)
-        if callable(callable_method):
-            try:
-                decoded_args = (
-                    msgpack_decode(options.args)
-                    if isinstance(options.args, bytes)
-                    else options.args
-                )
-                return callable_method(decoded_args, options.client, options.env)
-            except Exception as err:
-                raise WrapAbortError(options, repr(err)) from err
-        raise WrapInvocationError(
-            options, f"{options.method} is not a callable method in plugin module"
-        )
+        if not callable(callable_method):
+            raise WrapInvocationError(
+                options, f"{options.method} is not a callable method in plugin module"
+            )
+        return cast(Callable[..., Any], callable_method)
+
+    @staticmethod
+    def _decode_args(options: PluginInvokeOptions) -> Any:
+        args: Any = options.args
+        if isinstance(args, (bytes, bytearray, memoryview)):
+            return msgpack_decode(cast(MsgpackBuffer, args))
+        return args
 
 
 __all__ = ["PluginModule"]
@@ -1,6 +1,7 @@
 """This module contains the PluginWrapper class."""
 # pylint: disable=invalid-name
 # pylint: disable=too-many-arguments
+from concurrent.futures import Executor
 from typing import Any, Generic, Optional, TypeVar, Union
 
 from polywrap_core import (
@@ -79,6 +80,54 @@ class PluginWrapper(Wrapper, Generic[TConfig]):
         result = self.module.__wrap_invoke__(options)
         return InvocableResult(result=result, encoded=False)
 
+    async def invoke_async(
+        self,
+        uri: Uri,
+        method: str,
+        args: Optional[Any] = None,
+        env: Optional[Any] = None,
+        resolution_context: Optional[UriResolutionContext] = None,
+        client: Optional[InvokerClient] = None,
+        executor: Optional[Executor] = None,
+    ) -> InvocableResult:
+        """Invoke the Wrapper from an event loop.
+
+        Plugin methods defined with `async def` are awaited on the running\
+            event loop, and the other methods are run in the executor.
+
+        Args:
+            uri (Uri): Uri of the wrapper
+            method (str): Method to be executed
+            args (Optional[Any]) : Arguments for the method, structured as a dictionary
+            env (Optional[Any]): Override the client's config for all invokes within this invoke.
+            resolution_context (Optional[UriResolutionContext]): A URI resolution context
+            client (Optional[Invoker]): The invoker instance requesting this invocation.\
+                This invoker will be used for any subinvocation that may occur.
+            executor (Optional[Executor]): The executor running blocking\
+                plugin methods.
+
+        Returns:
+            InvocableResult: Result of the invocation.
+
+        Raises:
+            WrapInvocationError: If the plugin method is not defined\
+                or is not callable.
+            WrapAbortError: If the plugin method raises an exception.
+            MsgpackDecodeError: If the plugin method returns invalid msgpack.
+        """
+        options = PluginInvokeOptions(
+            uri=uri,
+            method=method,
+            args=args,
+            env=env,
+            resolution_context=resolution_context,
+            client=ResolutionContextOverrideClient(client, resolution_context)
+            if client
+            else None,
+        )
+        result = await self.module.__wrap_invoke_async__(options, executor)
+        return InvocableResult(result=result, encoded=False)
+
     def get_file(
         self, path: str, encoding: Optional[str] = "utf-8"
     ) -> Union[str, bytes]:
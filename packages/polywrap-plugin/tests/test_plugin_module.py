@@ -1,14 +1,109 @@
-from polywrap_core import InvokerClient, Uri
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from polywrap_core import InvokerClient, Uri, WrapInvocationError
 from polywrap_plugin import PluginModule
 from polywrap_plugin.module import PluginInvokeOptions
+import pytest
 
 
-def test_plugin_module(
-    greeting_module: PluginModule[None], client: InvokerClient
-):
+def test_plugin_module(greeting_module: PluginModule[None], client: InvokerClient):
     result = greeting_module.__wrap_invoke__(
         PluginInvokeOptions(
-            uri=Uri.from_str("plugin/greeting"), method="greeting", args={"name": "Joe"}, client=client
+            uri=Uri.from_str("plugin/greeting"),
+            method="greeting",
+            args={"name": "Joe"},
+            client=client,
         ),
     )
     assert result, "Greetings from: Joe"
+
+
+def test_plugin_module_async_method(client: InvokerClient):
+    class AsyncGreetingModule(PluginModule[None]):
+        async def greeting(
+            self, args: Dict[str, Any], client: InvokerClient, env: Optional[Any] = None
+        ):
+            await asyncio.sleep(0)
+            return f"Greetings from: {args['name']}"
+
+    module = AsyncGreetingModule(None)
+    options = PluginInvokeOptions(
+        uri=Uri.from_str("plugin/greeting"),
+        method="greeting",
+        args={"name": "Joe"},
+        client=client,
+    )
+
+    assert module.__wrap_invoke__(options) == "Greetings from: Joe"
+    assert asyncio.run(module.__wrap_invoke_async__(options)) == "Greetings from: Joe"
+
+
+def test_plugin_module_invoke_async_blocking_method(
+    greeting_module: PluginModule[None], client: InvokerClient
+):
+    options = PluginInvokeOptions(
+        uri=Uri.from_str("plugin/greeting"),
+        method="greeting",
+        args={"name": "Joe"},
+        client=client,
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = asyncio.run(greeting_module.__wrap_invoke_async__(options, executor))
+
+    assert result == "Greetings from: Joe"
+
+
+def test_plugin_module_invoke_async_undefined_method(
+    greeting_module: PluginModule[None], client: InvokerClient
+):
+    options = PluginInvokeOptions(
+        uri=Uri.from_str("plugin/greeting"), method="missing", client=client
+    )
+
+    with pytest.raises(WrapInvocationError):
+        asyncio.run(greeting_module.__wrap_invoke_async__(options))
+
+
+def test_plugin_module_nested_async_methods():
+    class InnerModule(PluginModule[None]):
+        async def hello(
+            self, args: Dict[str, Any], client: InvokerClient, env: Optional[Any] = None
+        ):
+            await asyncio.sleep(0)
+            return f"Hello {args['name']}"
+
+    inner = InnerModule(None)
+
+    class InnerInvoker(InvokerClient):
+        def invoke(
+            self, uri: Uri, method: str, args: Optional[Any] = None, *_: Any, **__: Any
+        ) -> Any:
+            return inner.__wrap_invoke__(
+                PluginInvokeOptions(uri=uri, method=method, args=args, client=self)
+            )
+
+        def get_implementations(self, *args: Any) -> Any:
+            raise NotImplementedError()
+
+    class OuterModule(PluginModule[None]):
+        async def greeting(
+            self, args: Dict[str, Any], client: InvokerClient, env: Optional[Any] = None
+        ):
+            await asyncio.sleep(0)
+            return client.invoke(
+                uri=Uri.from_str("plugin/inner"), method="hello", args=args
+            )
+
+    outer = OuterModule(None)
+    options = PluginInvokeOptions(
+        uri=Uri.from_str("plugin/outer"),
+        method="greeting",
+        args={"name": "Joe"},
+        client=InnerInvoker(),
+    )
+
+    assert outer.__wrap_invoke__(options) == "Hello Joe"
+    assert asyncio.run(outer.__wrap_invoke_async__(options)) == "Hello Joe"
@@ -1,3 +1,4 @@
+import asyncio
 from typing import cast
 
 from polywrap_core import Uri, InvokerClient
@@ -46,3 +47,22 @@ def test_plugin_wrapper_manifest(
     wrapper = PluginWrapper(greeting_module, manifest)
 
     assert wrapper.manifest is manifest
+
+
+def test_plugin_wrapper_invoke_async(
+    greeting_module: PluginModule[None], client: InvokerClient
+):
+    manifest = cast(AnyWrapManifest, {})
+
+    wrapper = PluginWrapper(greeting_module, manifest)
+
+    result = asyncio.run(
+        wrapper.invoke_async(
+            uri=Uri.from_str("ens/greeting.eth"),
+            method="greeting",
+            args={"name": "Joe"},
+            client=client,
+        )
+    )
+    assert result.result == "Greetings from: Joe"
+    assert result.encoded is False
@@ -1,5 +1,9 @@
 """This module contains the FS URI resolver."""
+import errno
+import mmap
+import os
 from pathlib import Path
+from typing import cast
 
 from polywrap_core import (
     FileReader,
@@ -10,7 +14,7 @@ from polywrap_core import (
     UriResolutionContext,
     UriResolver,
 )
-from polywrap_wasm import WasmPackage
+from polywrap_wasm import MappableFileReader, WasmPackage
 from polywrap_wasm.constants import WRAP_MANIFEST_PATH, WRAP_MODULE_PATH
 
 
@@ -30,9 +34,47 @@ class SimpleFileReader(FileReader):
             return f.read()
 
 
+class _WrapperFileReader(FileReader):
+    """Reads the Wasm module and the manifest of a wrapper directory\
+        with the file reader of the resolver.
+
+    Any other file is read from the given path, as is.
+    """
+
+    file_reader: FileReader
+    wrapper_path: Path
+
+    def __init__(self, file_reader: FileReader, wrapper_path: Path):
+        self.file_reader = file_reader
+        self.wrapper_path = wrapper_path
+
+    def read_file(self, file_path: str) -> bytes:
+        return self.file_reader.read_file(self._get_path(file_path))
+
+    def _get_path(self, file_path: str) -> str:
+        if file_path in (WRAP_MODULE_PATH, WRAP_MANIFEST_PATH):
+            return str(self.wrapper_path / file_path)
+        return file_path
+
+
+class _MappableWrapperFileReader(_WrapperFileReader, MappableFileReader):
+    """Maps the Wasm module of a wrapper directory with the file reader\
+        of the resolver."""
+
+    def map_file(self, file_path: str) -> mmap.mmap:
+        return cast(MappableFileReader, self.file_reader).map_file(
+            self._get_path(file_path)
+        )
+
+
 class FsUriResolver(UriResolver):
     """Defines a URI resolver that resolves file system URIs.
 
+    The wrapper files aren't read at resolution time, only checked to exist.\
+        They are read when the wrapper is created from the resolved package,\
+        or mapped in memory for the Wasm module when the file reader\
+        is a MappableFileReader, such as MappedFileReader.
+
     Args:
         file_reader (FileReader): The file reader used to read files.
     """
@@ -58,22 +100,35 @@ class FsUriResolver(UriResolver):
 
         Returns:
             UriPackageOrWrapper: The resolved URI.
+
+        Raises:
+            FileNotFoundError: If the Wasm module or the manifest\
+                of the wrapper doesn't exist.
         """
         if uri.authority not in ["fs", "file"]:
             return uri
 
         wrapper_path = Path(uri.path)
 
-        wasm_module = self.file_reader.read_file(str(wrapper_path / WRAP_MODULE_PATH))
-
-        manifest = self.file_reader.read_file(str(wrapper_path / WRAP_MANIFEST_PATH))
+        for file_path in (WRAP_MODULE_PATH, WRAP_MANIFEST_PATH):
+            if not (wrapper_path / file_path).is_file():
+                raise FileNotFoundError(
+                    errno.ENOENT,
+                    os.strerror(errno.ENOENT),
+                    str(wrapper_path / file_path),
+                )
+
+        file_reader = (
+            _MappableWrapperFileReader(self.file_reader, wrapper_path)
+            if isinstance(self.file_reader, MappableFileReader)
+            else _WrapperFileReader(self.file_reader, wrapper_path)
+        )
 
         return UriPackage(
             uri=uri,
             package=WasmPackage(
-                wasm_module=wasm_module,
-                manifest=manifest,
-                file_reader=self.file_reader,
+                wasm_module=None,
+                file_reader=file_reader,
             ),
         )
 
@@ -1,9 +1,12 @@
+import mmap
+from typing import cast
 import pytest
 
 from pathlib import Path
 
 from polywrap_core import FileReader, UriPackage, UriResolver, Uri
 from polywrap_uri_resolvers import FsUriResolver, SimpleFileReader
+from polywrap_wasm import MappedFileReader, WasmPackage, WasmWrapper
 
 @pytest.fixture
 def file_reader():
@@ -22,3 +25,57 @@ def test_file_resolver(fs_resolver: UriResolver):
 
     assert result
     assert isinstance(result, UriPackage)
+
+
+@pytest.mark.parametrize("file_reader", [SimpleFileReader(), MappedFileReader()])
+def test_file_resolver_missing_wrapper(fs_resolver: UriResolver, tmp_path: Path):
+    uri = Uri.from_str(f"wrap://fs/{tmp_path / 'missing'}")
+
+    with pytest.raises(FileNotFoundError):
+        fs_resolver.try_resolve_uri(uri, None, None) # type: ignore
+
+
+@pytest.mark.parametrize("file_reader", [SimpleFileReader(), MappedFileReader()])
+def test_file_resolver_does_not_read_wrapper_files(fs_resolver: UriResolver, tmp_path: Path):
+    (tmp_path / "wrap.wasm").write_bytes(b"")
+    (tmp_path / "wrap.info").write_bytes(b"")
+    uri = Uri.from_str(f"wrap://fs/{tmp_path}")
+
+    result = fs_resolver.try_resolve_uri(uri, None, None) # type: ignore
+
+    assert isinstance(result, UriPackage)
+    assert cast(WasmPackage, result.package).wasm_module is None
+
+
+def test_file_resolver_maps_wasm_module():
+    fs_resolver = FsUriResolver(file_reader=MappedFileReader())
+    path = Path(__file__).parent / "cases" / "simple"
+    uri = Uri.from_str(f"wrap://fs/{path}")
+
+    result = fs_resolver.try_resolve_uri(uri, None, None) # type: ignore
+
+    assert isinstance(result, UriPackage)
+    package = cast(WasmPackage, result.package)
+    with package:
+        assert package.wasm_module is None
+        wrapper = package.create_wrapper()
+        wasm_module = cast(WasmWrapper, wrapper).get_wasm_module()
+        assert isinstance(wasm_module, mmap.mmap)
+        assert wrapper.get_file("wrap.info", encoding=None) == (path / "wrap.info").read_bytes()
+    assert wasm_module.closed
+
+
+def test_file_resolver_get_file_reads_paths_as_is(
+    fs_resolver: UriResolver, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    path = Path(__file__).parent / "cases" / "simple"
+    uri = Uri.from_str(f"wrap://fs/{path}")
+    (tmp_path / "file.txt").write_text("hello")
+    monkeypatch.chdir(tmp_path)
+
+    result = fs_resolver.try_resolve_uri(uri, None, None) # type: ignore
+
+    assert isinstance(result, UriPackage)
+    wrapper = result.package.create_wrapper()
+    assert wrapper.get_file("file.txt") == "hello"
+    assert wrapper.get_file("wrap.info", encoding=None) == (path / "wrap.info").read_bytes()
@@ -0,0 +1,58 @@
+"""Benchmark the cold start cost of Wasm wrappers with an artifact cache.
+
+Compares compiling the wrapper module, which is what every new process does
+without an artifact cache, against loading the compiled module from an
+artifact written by a previous process.
+
+Usage:
+    python benchmarks/bench_artifact_cache.py [--iterations N] [--wrapper PATH]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from polywrap_wasm.artifact_cache import ArtifactCache
+from polywrap_wasm.module_cache import ModuleCache
+
+DEFAULT_WRAPPER = Path(__file__).parent.parent / "tests" / "cases" / "simple"
+
+
+def measure(name: str, func: Callable[[], object], iterations: int) -> float:
+    """Run func the given number of times and print the mean time per call."""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    mean = (time.perf_counter() - start) / iterations
+    print(f"{name:<40} {mean * 1e3:>12.2f} ms")
+    return mean
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--wrapper", type=Path, default=DEFAULT_WRAPPER)
+    options = parser.parse_args()
+
+    wasm_module = (options.wrapper / "wrap.wasm").read_bytes()
+
+    with tempfile.TemporaryDirectory() as directory:
+        artifact_cache = ArtifactCache(directory)
+
+        def compile_module() -> object:
+            return ModuleCache().get_module(wasm_module)
+
+        def load_artifact() -> object:
+            return ModuleCache(artifact_cache=artifact_cache).get_module(wasm_module)
+
+        print(f"wrapper: {options.wrapper} ({len(wasm_module)} bytes)")
+        before = measure("compile", compile_module, options.iterations)
+        after = measure("load artifact", load_artifact, options.iterations)
+        print(f"{'speedup':<40} {before / after:>12.2f} x")
+
+
+if __name__ == "__main__":
+    main()
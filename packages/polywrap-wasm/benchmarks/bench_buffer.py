@@ -0,0 +1,101 @@
+"""Microbenchmark the memory buffer reads and writes used by the host imports.
+
+Compares the bounded reads and writes of polywrap_wasm.buffer against
+the previous implementation, which copied the whole linear memory for every
+access, across memory sizes from 1 to 256 pages.
+
+Usage:
+    python benchmarks/bench_buffer.py [--iterations N] [--payload BYTES]
+"""
+import argparse
+import ctypes
+import time
+from typing import Any, Callable
+
+from wasmtime import Limits, Memory, MemoryType, Store
+
+from polywrap_wasm.buffer import read_bytes, read_view, write_bytes
+
+PAGE_SIZE = 64 * 1024
+MEMORY_PAGES = [1, 4, 16, 64, 256]
+
+
+def legacy_read_bytes(
+    memory_pointer: Any, memory_length: int, offset: int, length: int
+) -> bytes:
+    """Read bytes the way the previous implementation did."""
+    result = bytearray(memory_length)
+    buffer = (ctypes.c_ubyte * memory_length).from_buffer(result)
+    ctypes.memmove(buffer, memory_pointer, memory_length)
+    return bytes(result[offset : offset + length])
+
+
+def legacy_write_bytes(
+    memory_pointer: Any, memory_length: int, value: bytes, offset: int
+) -> None:
+    """Write bytes the way the previous implementation did."""
+    current_value = bytearray(
+        legacy_read_bytes(memory_pointer, memory_length, 0, memory_length)
+    )
+    current_value[offset : offset + len(value)] = value
+    current_value_buffer = (ctypes.c_ubyte * memory_length).from_buffer(current_value)
+    ctypes.memmove(memory_pointer, current_value_buffer, memory_length)
+
+
+def measure(func: Callable[[], object], iterations: int) -> float:
+    """Get the mean time per call of func in microseconds."""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--payload", type=int, default=256)
+    options = parser.parse_args()
+    payload = bytes(range(256)) * (options.payload // 256 + 1)
+    payload = payload[: options.payload]
+
+    print(f"payload: {len(payload)} bytes, times in us per call")
+    print(
+        f"{'pages':>6} {'legacy read':>12} {'read':>8} {'view':>8}"
+        f" {'legacy write':>13} {'write':>8}"
+    )
+    for pages in MEMORY_PAGES:
+        store = Store()
+        memory = Memory(store, MemoryType(Limits(pages, None)))
+        ptr, length = memory.data_ptr(store), memory.data_len(store)
+        offset = length // 2
+
+        results = [
+            measure(
+                lambda: legacy_read_bytes(ptr, length, offset, len(payload)),
+                options.iterations,
+            ),
+            measure(
+                lambda: read_bytes(ptr, length, offset, len(payload)),
+                options.iterations,
+            ),
+            measure(
+                lambda: read_view(ptr, length, offset, len(payload)), options.iterations
+            ),
+            measure(
+                lambda: legacy_write_bytes(ptr, length, payload, offset),
+                options.iterations,
+            ),
+            measure(
+                lambda: write_bytes(ptr, length, payload, offset), options.iterations
+            ),
+        ]
+        print(
+            f"{pages:>6} {results[0]:>12.2f} {results[1]:>8.2f} {results[2]:>8.2f}"
+            f" {results[3]:>13.2f} {results[4]:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark the per-invoke setup cost of Wasm wrappers.
+
+Compares instantiating the wrapper module from a shared instance template,
+which is what every invocation does now, against rebuilding the template
+(linker, host functions and memory type) for every invocation, which is what
+every invocation used to do.
+
+Usage:
+    python benchmarks/bench_instantiation.py [--iterations N] [--wrapper PATH]
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable
+
+from polywrap_core import Uri
+
+from polywrap_wasm.instance import WasmInstanceTemplate
+from polywrap_wasm.module_cache import ModuleCache
+from polywrap_wasm.types.state import State, WasmInvokeOptions
+
+DEFAULT_WRAPPER = Path(__file__).parent.parent / "tests" / "cases" / "simple"
+
+
+def measure(name: str, func: Callable[[], object], iterations: int) -> float:
+    """Run func the given number of times and print the mean time per call."""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    mean = (time.perf_counter() - start) / iterations
+    print(f"{name:<40} {mean * 1e6:>12.1f} us")
+    return mean
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--wrapper", type=Path, default=DEFAULT_WRAPPER)
+    options = parser.parse_args()
+
+    wasm_module = (options.wrapper / "wrap.wasm").read_bytes()
+    module_cache = ModuleCache()
+    template = WasmInstanceTemplate(wasm_module, module_cache)
+
+    def new_state() -> State:
+        return State(
+            invoke_options=WasmInvokeOptions(
+                uri=Uri.from_str("wrap://bench/wrapper"), method="method"
+            )
+        )
+
+    def per_invoke_template() -> object:
+        return WasmInstanceTemplate(wasm_module, module_cache).instantiate(
+            new_state(), None
+        )
+
+    def shared_template() -> object:
+        return template.instantiate(new_state(), None)
+
+    print(f"wrapper: {options.wrapper} ({len(wasm_module)} bytes)")
+    before = measure(
+        "link + instantiate per invoke", per_invoke_template, options.iterations
+    )
+    after = measure("instantiate from template", shared_template, options.iterations)
+    print(f"{'speedup':<40} {before / after:>12.2f} x")
+
+
+if __name__ == "__main__":
+    main()
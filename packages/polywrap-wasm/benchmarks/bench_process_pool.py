@@ -0,0 +1,85 @@
+"""Benchmark the scaling of Wasm invocations across threads and processes.
+
+Invokes the wrapper from 1 up to N threads, N being the number of CPUs by
+default, either in the calling process or through a ProcessPoolWasmExecutor
+with as many workers as threads, and prints the invocations per second.
+
+Usage:
+    python benchmarks/bench_process_pool.py [--invocations N] [--max-workers N]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from polywrap_core import FileReader, Uri
+from polywrap_manifest import deserialize_wrap_manifest
+
+from polywrap_wasm.process_pool import ProcessPoolWasmExecutor
+from polywrap_wasm.wasm_wrapper import WasmWrapper
+
+DEFAULT_WRAPPER = Path(__file__).parent.parent / "tests" / "cases" / "simple"
+
+
+class NoFileReader(FileReader):
+    """File reader for wrappers that don't read files."""
+
+    def read_file(self, file_path: str) -> bytes:
+        """Fail to read any file."""
+        raise NotImplementedError(file_path)
+
+
+def measure(
+    wrapper: WasmWrapper, threads: int, invocations: int, args: Any, method: str
+) -> float:
+    """Run the invocations from the given number of threads, return the rate."""
+    uri = Uri.from_str("wrap://bench/wrapper")
+
+    def invoke(_: int) -> object:
+        return wrapper.invoke(uri=uri, method=method, args=args)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(invoke, range(threads * 2)))  # warm up
+        start = time.perf_counter()
+        list(pool.map(invoke, range(invocations)))
+        return invocations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--invocations", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--wrapper", type=Path, default=DEFAULT_WRAPPER)
+    parser.add_argument("--method", default="simpleMethod")
+    parser.add_argument("--arg-size", type=int, default=256 * 1024)
+    options = parser.parse_args()
+
+    wasm_module = (options.wrapper / "wrap.wasm").read_bytes()
+    manifest = deserialize_wrap_manifest((options.wrapper / "wrap.info").read_bytes())
+    args = {"arg": "x" * options.arg_size}
+
+    def create_wrapper(executor: Optional[ProcessPoolWasmExecutor]) -> WasmWrapper:
+        return WasmWrapper(NoFileReader(), wasm_module, manifest, executor=executor)
+
+    print(f"wrapper: {options.wrapper} ({len(wasm_module)} bytes)")
+    print(f"{'threads':>8} {'in process':>14} {'process pool':>14}")
+    for threads in range(1, options.max_workers + 1):
+        in_process = measure(
+            create_wrapper(None), threads, options.invocations, args, options.method
+        )
+        with ProcessPoolWasmExecutor(max_workers=threads) as executor:
+            pooled = measure(
+                create_wrapper(executor),
+                threads,
+                options.invocations,
+                args,
+                options.method,
+            )
+        print(f"{threads:>8} {in_process:>10.1f} /s {pooled:>10.1f} /s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark the compile time versus run time tradeoff of runtime profiles.
+
+For each profile, measures compiling the wrapper module with the profile's
+engine and invoking the wrapper once it is compiled. Instances are pooled so
+that the invocation time is dominated by the generated code.
+
+Usage:
+    python benchmarks/bench_runtime_config.py [--iterations N] [--wrapper PATH]
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from polywrap_core import FileReader, Uri
+from polywrap_manifest import deserialize_wrap_manifest
+from wasmtime import Module
+
+from polywrap_wasm.instance_pool import InstancePoolConfig
+from polywrap_wasm.module_cache import ModuleCache
+from polywrap_wasm.runtime_config import WasmRuntimeConfig
+from polywrap_wasm.wasm_wrapper import WasmWrapper
+
+DEFAULT_WRAPPER = Path(__file__).parent.parent / "tests" / "cases" / "simple"
+
+PROFILES: Dict[str, WasmRuntimeConfig] = {
+    "startup": WasmRuntimeConfig.for_startup(),
+    "default": WasmRuntimeConfig(),
+    "throughput": WasmRuntimeConfig.for_throughput(),
+    "startup, serial": WasmRuntimeConfig(
+        cranelift_opt_level="none", parallel_compilation=False
+    ),
+}
+
+
+class NoFileReader(FileReader):
+    """File reader for wrappers that don't read files."""
+
+    def read_file(self, file_path: str) -> bytes:
+        """Fail to read any file."""
+        raise NotImplementedError(file_path)
+
+
+def measure(func: Callable[[], Any], iterations: int) -> float:
+    """Run func the given number of times and return the mean time per call."""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--wrapper", type=Path, default=DEFAULT_WRAPPER)
+    parser.add_argument("--method", default="simpleMethod")
+    parser.add_argument("--arg-size", type=int, default=64 * 1024)
+    options = parser.parse_args()
+
+    wasm_module = (options.wrapper / "wrap.wasm").read_bytes()
+    manifest = deserialize_wrap_manifest((options.wrapper / "wrap.info").read_bytes())
+    args = {"arg": "x" * options.arg_size}
+    uri = Uri.from_str("wrap://bench/wrapper")
+
+    print(f"wrapper: {options.wrapper} ({len(wasm_module)} bytes)")
+    print(f"{'profile':<20} {'compile':>12} {'invoke':>12}")
+    for name, runtime_config in PROFILES.items():
+        engine = runtime_config.get_engine()
+        compile_time = measure(
+            lambda: Module(engine, wasm_module),  # pylint: disable=cell-var-from-loop
+            max(options.iterations // 20, 1),
+        )
+        wrapper = WasmWrapper(
+            NoFileReader(),
+            wasm_module,
+            manifest,
+            ModuleCache(runtime_config=runtime_config),
+            InstancePoolConfig(),
+        )
+        invoke_time = measure(
+            lambda: wrapper.invoke(  # pylint: disable=cell-var-from-loop
+                uri=uri, method=options.method, args=args
+            ),
+            options.iterations,
+        )
+        print(f"{name:<20} {compile_time * 1e3:>9.2f} ms {invoke_time * 1e6:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
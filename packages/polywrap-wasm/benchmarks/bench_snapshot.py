@@ -0,0 +1,115 @@
+"""Benchmark instantiating Wasm modules from a post-initialization snapshot.
+
+Compares cold instantiation, which runs the start function of the module for
+every instance, against restoring instances from a snapshot of the memory and
+globals taken after the first initialization. The benchmark runs on a module
+whose start function builds a lookup table of the given size, and on the
+given wrapper, whose start function is usually cheap.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--iterations N] [--table-size N] \
+        [--wrapper PATH]
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable
+
+from polywrap_core import Uri
+from wasmtime import wat2wasm
+
+from polywrap_wasm.instance import WasmInstanceTemplate
+from polywrap_wasm.module_cache import ModuleCache
+from polywrap_wasm.snapshot import WasmSnapshotTemplate
+from polywrap_wasm.types.state import State, WasmInvokeOptions
+
+DEFAULT_WRAPPER = Path(__file__).parent.parent / "tests" / "cases" / "simple"
+
+INIT_MODULE = """
+(module
+  (import "env" "memory" (memory 1))
+  (func $init (local $i i32) (local $x i32)
+    (memory.grow (i32.const {pages}))
+    drop
+    (loop $fill
+      ;; xorshift the previous entry to fill the table
+      (local.set $x (i32.xor (local.get $x) (i32.shl (local.get $x) (i32.const 13))))
+      (local.set $x (i32.xor (local.get $x) (i32.shr_u (local.get $x) (i32.const 17))))
+      (local.set $x (i32.add (i32.xor (local.get $x) (local.get $i)) (i32.const 1)))
+      (i32.store
+        (i32.add (i32.const 65536) (i32.shl (local.get $i) (i32.const 2)))
+        (local.get $x))
+      (local.set $i (i32.add (local.get $i) (i32.const 1)))
+      (br_if $fill (i32.lt_u (local.get $i) (i32.const {size})))))
+  (start $init)
+  (func (export "_wrap_invoke") (param i32 i32 i32) (result i32)
+    (i32.const 0)))
+"""
+
+
+def measure(name: str, func: Callable[[], object], iterations: int) -> float:
+    """Run func the given number of times and print the mean time per call."""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    mean = (time.perf_counter() - start) / iterations
+    print(f"{name:<40} {mean * 1e6:>12.1f} us")
+    return mean
+
+
+def compare(label: str, wasm_module: bytes, iterations: int) -> None:
+    """Compare cold and snapshot instantiation of a Wasm module."""
+    module_cache = ModuleCache()
+    cold_template = WasmInstanceTemplate(wasm_module, module_cache)
+    snapshot_template = WasmSnapshotTemplate(wasm_module, module_cache)
+
+    def new_state() -> State:
+        return State(
+            invoke_options=WasmInvokeOptions(
+                uri=Uri.from_str("wrap://bench/wrapper"), method="method"
+            )
+        )
+
+    print(f"{label} ({len(wasm_module)} bytes)")
+    before = measure(
+        "cold instantiation",
+        lambda: cold_template.instantiate(new_state(), None),
+        iterations,
+    )
+    after = measure(
+        "instantiation from snapshot",
+        lambda: snapshot_template.instantiate(new_state(), None),
+        iterations,
+    )
+    snapshot = snapshot_template.snapshot
+    assert snapshot is not None
+    print(f"{'snapshot memory copied':<40} {snapshot.memory_bytes:>12} bytes")
+    print(f"{'speedup':<40} {before / after:>12.2f} x")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--table-size", type=int, default=1 << 20)
+    parser.add_argument("--wrapper", type=Path, default=DEFAULT_WRAPPER)
+    options = parser.parse_args()
+
+    pages = (options.table_size * 4 + 65535) // 65536
+    init_module = wat2wasm(INIT_MODULE.format(pages=pages, size=options.table_size))
+    compare(
+        f"start function building {options.table_size} entries",
+        init_module,
+        options.iterations,
+    )
+    print()
+    compare(
+        f"wrapper: {options.wrapper}",
+        (options.wrapper / "wrap.wasm").read_bytes(),
+        options.iterations,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -46,7 +46,17 @@ Invocation
 >>> assert result.encoded is True
 >>> assert msgpack_decode(cast(bytes, result.result)) == message
 """
+from .artifact_cache import *
+from .budget import *
 from .errors import *
 from .inmemory_file_reader import *
+from .instance_pool import *
+from .mapped_file_reader import *
+from .module_cache import *
+from .module_info import *
+from .process_pool import *
+from .profiler import *
+from .runtime_config import *
+from .snapshot import *
 from .wasm_package import *
 from .wasm_wrapper import *
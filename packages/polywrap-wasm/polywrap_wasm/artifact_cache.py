@@ -0,0 +1,236 @@
+"""This module contains the ArtifactCache for persisting compiled Wasm modules."""
+from __future__ import annotations
+
+import hashlib
+import os
+import platform
+import tempfile
+from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional, Tuple, Union
+
+from wasmtime import Engine, Module
+
+from .constants import DEFAULT_ARTIFACT_CACHE_SIZE
+
+ARTIFACT_SUFFIX = ".cwasm"
+
+
+def _get_wasmtime_version() -> str:
+    try:
+        return version("wasmtime")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@dataclass(slots=True, kw_only=True)
+class ArtifactCacheStats:
+    """ArtifactCacheStats is a dataclass that holds a snapshot of the cache counters.
+
+    Args:
+        hits (int): The number of modules loaded from an artifact.
+        misses (int): The number of lookups without a usable artifact.
+        writes (int): The number of artifacts written to the cache.
+        evictions (int): The number of artifacts removed to honor the size limit.
+        errors (int): The number of artifacts that failed to load or to be written.
+    """
+
+    hits: int
+    misses: int
+    writes: int
+    evictions: int
+    errors: int
+
+
+class ArtifactCache:  # pylint: disable=too-many-instance-attributes
+    """ArtifactCache persists serialized compiled Wasm modules in a directory.
+
+    Artifacts are keyed by the content hash of the Wasm module,\
+        the wasmtime version, the host architecture and the engine key\
+        of the runtime configuration the module was compiled with,\
+        so an artifact is only loaded by an engine able to run it.\
+        Artifacts are written atomically and the least recently used ones\
+        are removed once the directory grows beyond `max_bytes`.
+
+    An artifact that can't be loaded is removed and reported as a miss,\
+        so the caller falls back to compiling the module.
+
+    Args:
+        directory (Union[str, Path]): The directory holding the artifacts.\
+            It is created if it doesn't exist.
+        max_bytes (int): The maximum total size of the artifacts.
+    """
+
+    directory: Path
+    max_bytes: int
+    _lock: Lock
+    _hits: int
+    _misses: int
+    _writes: int
+    _evictions: int
+    _errors: int
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = DEFAULT_ARTIFACT_CACHE_SIZE,
+    ):
+        """Initialize a new ArtifactCache instance."""
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be a positive integer, got {max_bytes}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        self._errors = 0
+
+    def get_artifact_path(self, module_hash: str, engine_key: str = "") -> Path:
+        """Get the path of the artifact of a Wasm module.
+
+        Args:
+            module_hash (str): The content hash of the Wasm module.
+            engine_key (str): The identifier of the engine configuration.
+
+        Returns:
+            Path: The path of the artifact, which may not exist.
+        """
+        key = ":".join(
+            [
+                _get_wasmtime_version(),
+                platform.machine(),
+                engine_key,
+                module_hash,
+            ]
+        )
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{name}{ARTIFACT_SUFFIX}"
+
+    def load(
+        self, engine: Engine, module_hash: str, engine_key: str = ""
+    ) -> Optional[Module]:
+        """Load the compiled module of a Wasm module from its artifact.
+
+        Args:
+            engine (Engine): The engine to load the module with.
+            module_hash (str): The content hash of the Wasm module.
+            engine_key (str): The identifier of the engine configuration.
+
+        Returns:
+            Optional[Module]: The compiled module or None if there is\
+                no usable artifact.
+        """
+        path = self.get_artifact_path(module_hash, engine_key)
+        try:
+            module = Module.deserialize_file(engine, str(path))
+        except FileNotFoundError:
+            self._count(misses=1)
+            return None
+        except Exception:  # pylint: disable=broad-except
+            # Incompatible or corrupted artifact, drop it and recompile
+            self._remove(path)
+            self._count(misses=1, errors=1)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(hits=1)
+        return module
+
+    def store(self, module_hash: str, module: Module, engine_key: str = "") -> None:
+        """Write the artifact of a compiled module to the cache.
+
+        Failing to write the artifact isn't an error since the module\
+            can always be compiled again.
+
+        Args:
+            module_hash (str): The content hash of the Wasm module.
+            module (Module): The compiled module.
+            engine_key (str): The identifier of the engine configuration.
+        """
+        path = self.get_artifact_path(module_hash, engine_key)
+        try:
+            artifact = module.serialize()
+            descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    file.write(artifact)
+                os.replace(temp_path, path)
+            except BaseException:
+                self._remove(Path(temp_path))
+                raise
+        except Exception:  # pylint: disable=broad-except
+            self._count(errors=1)
+            return
+
+        self._count(writes=1)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used artifacts beyond the size limit."""
+        artifacts: List[Tuple[float, int, Path]] = []
+        for path in self.directory.glob(f"*{ARTIFACT_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            artifacts.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in artifacts)
+        artifacts.sort()
+        evictions = 0
+        for _, size, path in artifacts:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            evictions += 1
+        self._count(evictions=evictions)
+
+    def get_stats(self) -> ArtifactCacheStats:
+        """Get a snapshot of the cache counters."""
+        with self._lock:
+            return ArtifactCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                writes=self._writes,
+                evictions=self._evictions,
+                errors=self._errors,
+            )
+
+    def clear(self) -> None:
+        """Remove all the artifacts from the cache directory."""
+        for path in self.directory.glob(f"*{ARTIFACT_SUFFIX}"):
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _count(  # pylint: disable=too-many-arguments
+        self,
+        hits: int = 0,
+        misses: int = 0,
+        writes: int = 0,
+        evictions: int = 0,
+        errors: int = 0,
+    ) -> None:
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._writes += writes
+            self._evictions += evictions
+            self._errors += errors
+
+
+__all__ = ["ArtifactCache", "ArtifactCacheStats"]
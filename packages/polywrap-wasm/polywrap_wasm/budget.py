@@ -0,0 +1,243 @@
+"""This module contains the execution budgets and cost accounting\
+    of Wasm invocations."""
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Optional
+
+from polywrap_core import Uri
+from wasmtime import Engine, Store
+
+from .constants import EPOCH_TICK_INTERVAL
+from .errors import WasmError
+from .runtime_config import WasmRuntimeConfig
+
+# Budget given to invocations without a limit, far from the u64 limits
+# of wasmtime so that adding to it can't overflow.
+_UNLIMITED = 2**62
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class ExecutionBudget:
+    """ExecutionBudget is a dataclass that holds the limits of an invocation.
+
+    An invocation exceeding its budget is aborted with a WrapAbortError.
+
+    Args:
+        max_fuel (Optional[int]): The fuel the invocation may consume.\
+            Requires a runtime config with `consume_fuel` enabled.
+        timeout (Optional[float]): The time in seconds the invocation\
+            may take. Requires a runtime config with `epoch_interruption`\
+            enabled. It is enforced with a granularity of\
+            `EPOCH_TICK_INTERVAL` and only while Wasm code runs.
+    """
+
+    max_fuel: Optional[int] = None
+    timeout: Optional[float] = None
+
+    def __post_init__(self):
+        """Validate the budget."""
+        if self.max_fuel is not None and self.max_fuel < 1:
+            raise ValueError(
+                f"max_fuel must be a positive integer, got {self.max_fuel}"
+            )
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {self.timeout}")
+
+
+@dataclass(slots=True, kw_only=True)
+class InvocationCost:
+    """InvocationCost is a dataclass that holds the cost of an invocation.
+
+    Args:
+        uri (Uri): The URI of the invoked wrapper.
+        method (str): The invoked method.
+        wall_time (float): The duration of the invocation in seconds.
+        fuel_consumed (Optional[int]): The fuel consumed by the invocation,\
+            if the engine consumes fuel.
+        succeeded (bool): Whether the invocation succeeded.
+    """
+
+    uri: Uri
+    method: str
+    wall_time: float
+    fuel_consumed: Optional[int] = None
+    succeeded: bool = True
+
+
+InvocationCostHook = Callable[[InvocationCost], None]
+"""Callback receiving the cost of every invocation of a wrapper."""
+
+
+class EpochTicker:
+    """EpochTicker increments the epoch of an engine at a regular interval.
+
+    Args:
+        engine (Engine): The engine to tick.
+        interval (float): The interval in seconds between two epochs.
+    """
+
+    engine: Engine
+    interval: float
+    _stopped: Event
+    _thread: Thread
+
+    def __init__(self, engine: Engine, interval: float = EPOCH_TICK_INTERVAL):
+        """Initialize a new EpochTicker instance and start ticking."""
+        self.engine = engine
+        self.interval = interval
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, name="wasm-epoch-ticker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop ticking."""
+        self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.engine.increment_epoch()
+
+
+_epoch_tickers: Dict[Engine, EpochTicker] = {}
+_epoch_tickers_lock = Lock()
+
+
+def get_epoch_ticker(engine: Engine) -> EpochTicker:
+    """Get the ticker of an engine, starting it on first use.
+
+    Args:
+        engine (Engine): The engine with epoch interruption enabled.
+
+    Returns:
+        EpochTicker: The process-wide ticker of the engine.
+    """
+    with _epoch_tickers_lock:
+        ticker = _epoch_tickers.get(engine)
+        if ticker is None:
+            ticker = _epoch_tickers[engine] = EpochTicker(engine)
+        return ticker
+
+
+def set_unlimited_budget(
+    store: Store, runtime_config: Optional[WasmRuntimeConfig]
+) -> None:
+    """Give a new store the fuel and epoch deadline needed to run code.
+
+    Stores of engines consuming fuel or interruptible by epochs can't run\
+        any code, including the start function of an instance, until they\
+        are given fuel and a deadline.
+
+    Args:
+        store (Store): The new store.
+        runtime_config (Optional[WasmRuntimeConfig]): The configuration\
+            of the engine of the store, None for a custom engine.
+    """
+    if runtime_config is None:
+        return
+    if runtime_config.consume_fuel:
+        store.add_fuel(_UNLIMITED)
+    if runtime_config.epoch_interruption:
+        store.set_epoch_deadline(_UNLIMITED)
+
+
+class ExecutionMeter:
+    """ExecutionMeter applies a budget to a store and measures its consumption.
+
+    Engines consuming fuel or interruptible by epochs always need fuel\
+        and an epoch deadline, so invocations without a budget\
+        are given an unlimited one.
+
+    Args:
+        store (Store): The store of the invocation.
+        runtime_config (Optional[WasmRuntimeConfig]): The configuration\
+            of the engine of the store, None for a custom engine.
+        budget (Optional[ExecutionBudget]): The budget of the invocation.
+
+    Raises:
+        WasmError: If the budget requires an engine feature\
+            that isn't enabled.
+    """
+
+    budget: Optional[ExecutionBudget]
+    _store: Store
+    _consume_fuel: bool
+    _start_time: float
+    _start_fuel: int
+
+    def __init__(
+        self,
+        store: Store,
+        runtime_config: Optional[WasmRuntimeConfig],
+        budget: Optional[ExecutionBudget],
+    ):
+        """Apply the budget to the store and start measuring."""
+        self.budget = budget
+        self._store = store
+        self._consume_fuel = bool(runtime_config and runtime_config.consume_fuel)
+        epoch_interruption = bool(runtime_config and runtime_config.epoch_interruption)
+        max_fuel = budget.max_fuel if budget else None
+        timeout = budget.timeout if budget else None
+
+        if max_fuel is not None and not self._consume_fuel:
+            raise WasmError("A fuel budget requires a runtime config consuming fuel")
+        if timeout is not None and not epoch_interruption:
+            raise WasmError(
+                "A timeout requires a runtime config with epoch interruption"
+            )
+
+        self._start_fuel = 0
+        if self._consume_fuel:
+            self._set_fuel(max_fuel or _UNLIMITED)
+            self._start_fuel = store.fuel_consumed()
+        if runtime_config and epoch_interruption:
+            deadline = _UNLIMITED
+            if timeout is not None:
+                ticker = get_epoch_ticker(runtime_config.get_engine())
+                deadline = math.ceil(timeout / ticker.interval) + 1
+            store.set_epoch_deadline(deadline)
+        self._start_time = time.perf_counter()
+
+    def _set_fuel(self, fuel: int) -> None:
+        # Pooled stores keep the fuel left by their previous invocation
+        remaining = self._store.consume_fuel(0)
+        if remaining < fuel:
+            self._store.add_fuel(fuel - remaining)
+        elif remaining > fuel:
+            self._store.consume_fuel(remaining - fuel)
+
+    def get_wall_time(self) -> float:
+        """Get the time elapsed since the meter started."""
+        return time.perf_counter() - self._start_time
+
+    def get_fuel_consumed(self) -> Optional[int]:
+        """Get the fuel consumed since the meter started, if the engine consumes fuel."""
+        if not self._consume_fuel:
+            return None
+        return self._store.fuel_consumed() - self._start_fuel
+
+    def get_exceeded_limit(self) -> Optional[str]:
+        """Get a description of the budget limit that was exceeded, if any."""
+        if not self.budget:
+            return None
+        max_fuel = self.budget.max_fuel
+        if max_fuel is not None and (self.get_fuel_consumed() or 0) >= max_fuel:
+            return f"exceeded its fuel budget of {max_fuel}"
+        timeout = self.budget.timeout
+        if timeout is not None and self.get_wall_time() >= timeout:
+            return f"exceeded its timeout of {timeout}s"
+        return None
+
+
+__all__ = [
+    "EpochTicker",
+    "ExecutionBudget",
+    "ExecutionMeter",
+    "InvocationCost",
+    "InvocationCostHook",
+    "get_epoch_ticker",
+    "set_unlimited_budget",
+]
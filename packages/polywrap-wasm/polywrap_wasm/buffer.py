@@ -1,14 +1,65 @@
-"""This module provides a set of functions to read and write bytes from a memory buffer."""
+"""This module provides a set of functions to read and write bytes from a memory buffer.
+
+All the functions only touch the requested range of the memory buffer,\
+    so their cost depends on the size of the payload and not on the size\
+    of the memory.
+"""
 # pylint: disable=protected-access
 
 import ctypes
-from typing import TYPE_CHECKING, Any, Optional  # pyright: ignore[reportUnusedImport]
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .errors import WasmMemoryError
+
+if TYPE_CHECKING:
+    from ctypes import _Pointer  # pyright: ignore[reportPrivateUsage]
+
+    BufferPointer = _Pointer[ctypes.c_ubyte]
+else:
+    BufferPointer = Any
+
+BufferLike = Union[bytes, bytearray, memoryview]
 
-BufferPointer = (
-    ctypes._Pointer[ctypes.c_ubyte]  # pyright: ignore[reportPrivateUsage]
-    if TYPE_CHECKING
-    else Any
-)
+
+def _get_address(
+    memory_pointer: BufferPointer, memory_length: int, offset: int, length: int
+) -> int:
+    """Get the address of the given range of a memory buffer.
+
+    Raises:
+        WasmMemoryError: if the range is out of the bounds of the memory buffer.
+    """
+    if offset < 0 or length < 0 or offset + length > memory_length:
+        raise WasmMemoryError(
+            f"Out of bounds memory access: offset {offset} and length {length}"
+            f" exceed the memory length {memory_length}"
+        )
+    return ctypes.addressof(memory_pointer.contents) + offset
+
+
+def read_view(
+    memory_pointer: BufferPointer,
+    memory_length: int,
+    offset: int,
+    length: int,
+) -> memoryview:
+    """Get a memoryview over a range of a memory buffer without copying it.
+
+    The view is only valid for the duration of the host call it was created\
+        in, since the memory can be grown or freed once the call returns.\
+        Copy it with `bytes` to keep its content.
+
+    Args:
+        memory_pointer (BufferPointer): The pointer to the memory buffer.
+        memory_length (int): The length of the memory buffer.
+        offset (int): The offset to start reading from.
+        length (int): The number of bytes to read.
+
+    Raises:
+        WasmMemoryError: if the range is out of the bounds of the memory buffer.
+    """
+    address = _get_address(memory_pointer, memory_length, offset, length)
+    return memoryview((ctypes.c_ubyte * length).from_address(address)).cast("B")
 
 
 def read_bytes(
@@ -24,12 +75,14 @@ def read_bytes(
         memory_length (int): The length of the memory buffer.
         offset (Optional[int]): The offset to start reading from.
         length (Optional[int]): The number of bytes to read.
-    """
-    result = bytearray(memory_length)
-    buffer = (ctypes.c_ubyte * memory_length).from_buffer(result)
-    ctypes.memmove(buffer, memory_pointer, memory_length)
 
-    return bytes(result[offset : offset + length] if offset and length else result)
+    Raises:
+        WasmMemoryError: if the range is out of the bounds of the memory buffer.
+    """
+    offset = offset or 0
+    length = memory_length - offset if length is None else length
+    address = _get_address(memory_pointer, memory_length, offset, length)
+    return ctypes.string_at(address, length)
 
 
 def read_string(
@@ -42,15 +95,19 @@ def read_string(
         memory_length (int): The length of the memory buffer.
         offset (int): The offset to start reading from.
         length (int): The number of bytes to read.
+
+    Raises:
+        WasmMemoryError: if the range is out of the bounds of the memory buffer.
     """
-    value = read_bytes(memory_pointer, memory_length, offset, length)
-    return value.decode("utf-8")
+    # The string is decoded straight from the memory, without a bytes copy
+    value = read_view(memory_pointer, memory_length, offset, length)
+    return str(value, "utf-8")
 
 
 def write_bytes(
     memory_pointer: BufferPointer,
     memory_length: int,
-    value: bytes,
+    value: BufferLike,
     value_offset: int,
 ) -> None:
     """Write bytes to a memory buffer.
@@ -58,10 +115,25 @@ def write_bytes(
     Args:
         memory_pointer (BufferPointer): The pointer to the memory buffer.
         memory_length (int): The length of the memory buffer.
-        value (bytes): The bytes to write.
+        value (BufferLike): The bytes to write.
         value_offset (int): The offset to start writing to.
+
+    Raises:
+        WasmMemoryError: if the range is out of the bounds of the memory buffer.
     """
-    mem_cpy(memory_pointer, memory_length, bytearray(value), len(value), value_offset)
+    if isinstance(value, bytes):
+        address = _get_address(memory_pointer, memory_length, value_offset, len(value))
+        ctypes.memmove(address, value, len(value))
+        return
+
+    view = memoryview(value).cast("B")
+    address = _get_address(memory_pointer, memory_length, value_offset, len(view))
+    if not view.nbytes:
+        return
+    # A ctypes array over the destination range takes any source buffer,
+    # including read-only ones, without copying it first.
+    target = (ctypes.c_ubyte * view.nbytes).from_address(address)
+    memoryview(target).cast("B")[:] = view
 
 
 def write_string(
@@ -102,16 +174,11 @@ def mem_cpy(
         value (bytearray): The bytearray to copy.
         value_length (int): The length of the bytearray to copy.
         value_offset (int): The offset to start copying from.
-    """
-    current_value = bytearray(
-        read_bytes(
-            memory_pointer,
-            memory_length,
-        )
-    )
 
-    new_value = (ctypes.c_ubyte * value_length).from_buffer(value)
-    current_value[value_offset : value_offset + value_length] = new_value
-
-    current_value_buffer = (ctypes.c_ubyte * memory_length).from_buffer(current_value)
-    ctypes.memmove(memory_pointer, current_value_buffer, memory_length)
+    Raises:
+        WasmMemoryError: if the range is out of the bounds of the memory buffer.
+    """
+    address = _get_address(memory_pointer, memory_length, value_offset, value_length)
+    if value_length:
+        source = (ctypes.c_ubyte * value_length).from_buffer(value)
+        ctypes.memmove(address, source, value_length)
@@ -6,4 +6,19 @@ WRAP_MANIFEST_PATH = "wrap.info"
 WRAP_MODULE_PATH = "wrap.wasm"
 """Default path to the wrap module file."""
 
-__all__ = ["WRAP_MANIFEST_PATH", "WRAP_MODULE_PATH"]
+DEFAULT_MODULE_CACHE_SIZE = 64
+"""Default maximum number of compiled Wasm modules kept in the module cache."""
+
+DEFAULT_ARTIFACT_CACHE_SIZE = 256 * 1024 * 1024
+"""Default maximum total size in bytes of the compiled module artifacts on disk."""
+
+EPOCH_TICK_INTERVAL = 0.01
+"""Interval in seconds between two epochs of the engines interrupting invocations."""
+
+__all__ = [
+    "WRAP_MANIFEST_PATH",
+    "WRAP_MODULE_PATH",
+    "DEFAULT_MODULE_CACHE_SIZE",
+    "DEFAULT_ARTIFACT_CACHE_SIZE",
+    "EPOCH_TICK_INTERVAL",
+]
@@ -14,8 +14,18 @@ class WasmMemoryError(WasmError):
     """Raises when the Wasm memory is not found."""
 
 
+class WasmModuleError(WasmError):
+    """Raises when the Wasm module is malformed."""
+
+
+class WasmSnapshotError(WasmError):
+    """Raises when the Wasm module can't be snapshotted."""
+
+
 __all__ = [
     "WasmError",
     "WasmExportNotFoundError",
     "WasmMemoryError",
+    "WasmModuleError",
+    "WasmSnapshotError",
 ]
@@ -2,6 +2,7 @@
 from wasmtime import Func, Instance, Store
 
 from .errors import WasmExportNotFoundError
+from .running_store import run_in_store
 
 
 class WrapExports:
@@ -33,6 +34,11 @@ class WrapExports:
             )
         self._wrap_invoke = _wrap_invoke
 
+    @property
+    def instance(self) -> Instance:
+        """Get the Wasm instance the exports belong to."""
+        return self._instance
+
     def __wrap_invoke__(
         self, method_length: int, args_length: int, env_length: int
     ) -> bool:
@@ -46,6 +52,7 @@ class WrapExports:
         Returns:
             True if the invoke call was successful, False otherwise.
         """
-        return bool(
-            self._wrap_invoke(self._store, method_length, args_length, env_length)
-        )
+        with run_in_store(self._store):
+            return bool(
+                self._wrap_invoke(self._store, method_length, args_length, env_length)
+            )
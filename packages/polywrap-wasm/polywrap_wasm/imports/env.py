@@ -1,6 +1,5 @@
 """This module contains the env family of imports for the Wasm module."""
 from polywrap_core import WrapAbortError
-from polywrap_msgpack import msgpack_encode
 
 from .types import BaseWrapImports
 
@@ -17,12 +16,12 @@ class WrapEnvImports(BaseWrapImports):
         Raises:
             WasmAbortError: if the env is not set from the host.
         """
-        if not self.state.invoke_options.env:
+        if not self.state.invoke_options.encoded_env:
             raise WrapAbortError(
                 self.state.invoke_options,
                 "__wrap_load_env: Environment variables are not set from the host.",
             )
         self.write_bytes(
             ptr,
-            msgpack_encode(self.state.invoke_options.env),
+            self.state.invoke_options.encoded_env,
         )
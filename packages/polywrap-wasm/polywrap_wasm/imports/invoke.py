@@ -1,6 +1,5 @@
 """This module contains the imports for the invoke family of functions."""
 from polywrap_core import WrapAbortError
-from polywrap_msgpack import msgpack_encode
 
 from ..types import InvokeResult
 from .types import BaseWrapImports
@@ -25,15 +24,9 @@ class WrapInvokeImports(BaseWrapImports):
             self.state.invoke_options.method,
         )
 
-        encoded_args = bytearray(
-            self.state.invoke_options.args
-            if isinstance(self.state.invoke_options.args, bytes)
-            else msgpack_encode(self.state.invoke_options.args)
-        )
-
         self.write_bytes(
             args_ptr,
-            encoded_args,
+            self.state.invoke_options.encoded_args,
         )
 
     def wrap_invoke_result(self, ptr: int, length: int) -> None:
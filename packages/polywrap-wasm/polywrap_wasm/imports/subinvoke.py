@@ -1,8 +1,18 @@
 """This module contains the subinvoke imports for the Wasm module."""
-from polywrap_core import Uri, WrapAbortError
+from typing import Any, Optional, cast
+
+from polywrap_core import (
+    InvokerClient,
+    Uri,
+    UriPackage,
+    UriResolutionContext,
+    UriResolutionStep,
+    UriWrapper,
+    WrapAbortError,
+)
 from polywrap_msgpack import msgpack_encode
 
-from ..types import InvokeResult
+from ..types import InvokeResult, SubinvokeClient, SubinvokeTarget
 from .types import BaseWrapImports
 
 
@@ -20,6 +30,14 @@ class WrapSubinvokeImports(BaseWrapImports):
     ) -> bool:
         """Subinvoke a function of any wrapper from the Wasm module.
 
+        When the invoker is a SubinvokeClient, the wrapper of a URI\
+            is resolved once per invocation and invoked directly instead of\
+            through the invoke method of the client, so the wrapper is run\
+            the way its package created it, e.g. by its executor. Like\
+            the invocations through the client, every subinvocation starts\
+            from a fresh resolution context, so it doesn't change\
+            the resolution context of the invocation nor pick up its env.
+
         Args:
             uri_ptr (int): The pointer to the uri string in memory.
             uri_len (int): The length of the uri string in memory.
@@ -44,12 +62,20 @@ class WrapSubinvokeImports(BaseWrapImports):
             )
 
         try:
-            result = self.invoker.invoke(
-                uri=uri,
-                method=method,
-                args=args,
-                encode_result=True,
+            target = (
+                self._get_subinvoke_target(self.invoker, uri)
+                if isinstance(self.invoker, SubinvokeClient)
+                else None
             )
+            if target is None:
+                result = self.invoker.invoke(
+                    uri=uri,
+                    method=method,
+                    args=args,
+                    encode_result=True,
+                )
+            else:
+                result = self._invoke_subinvoke_target(target, method, args)
             if isinstance(result, bytes):
                 self.state.subinvoke_result = InvokeResult(result=result)
                 return True
@@ -90,6 +116,74 @@ class WrapSubinvokeImports(BaseWrapImports):
         error_message = repr(error)
         self.write_string(ptr, error_message)
 
+    def _get_subinvoke_target(
+        self, client: SubinvokeClient, uri: Uri
+    ) -> Optional[SubinvokeTarget]:
+        """Get the wrapper to subinvoke, resolving it once per invocation.
+
+        Returns None when the URI doesn't resolve to a wrapper, in which\
+            case the subinvocation goes through the client. That is also\
+            remembered, so the URI isn't resolved again by the next\
+            subinvocations of the invocation.
+        """
+        targets = self.state.subinvoke_targets
+        if uri in targets:
+            return targets[uri]
+
+        load_wrapper_context = UriResolutionContext().create_sub_history_context()
+        match client.try_resolve_uri(uri=uri, resolution_context=load_wrapper_context):
+            case UriPackage(package=package):
+                wrapper = package.create_wrapper()
+            case UriWrapper(wrapper=wrapper):
+                pass
+            case _:
+                targets[uri] = None
+                return None
+
+        resolution_path = load_wrapper_context.get_resolution_path() or [uri]
+        env = None
+        for resolved_uri in resolution_path:
+            if env := client.get_env_by_uri(resolved_uri):
+                break
+        target = SubinvokeTarget(wrapper=wrapper, uri=resolution_path[-1], env=env)
+        targets[uri] = target
+        return target
+
+    def _invoke_subinvoke_target(
+        self, target: SubinvokeTarget, method: str, args: bytes
+    ) -> Any:
+        """Invoke the resolved wrapper in a fresh resolution context.
+
+        The invocation is tracked in the resolution context the way\
+            the client tracks it, and the errors of the wrapper are raised\
+            as is, so a failing subinvocation fails the same way\
+            as through the client.
+        """
+        resolution_context = UriResolutionContext()
+        wrapper_invoke_context = resolution_context.create_sub_history_context()
+        try:
+            invocable_result = target.wrapper.invoke(
+                uri=target.uri,
+                method=method,
+                args=args,
+                env=target.env,
+                resolution_context=wrapper_invoke_context,
+                client=cast(InvokerClient, self.invoker),
+            )
+        except Exception as err:
+            resolution_context.track_step(
+                UriResolutionStep(
+                    source_uri=target.uri,
+                    result=target.uri,
+                    description=f"Wrapper.invoke - Error: {err.__class__.__name__}",
+                    sub_history=wrapper_invoke_context.get_history(),
+                )
+            )
+            raise err
+        if invocable_result.encoded:
+            return invocable_result.result
+        return msgpack_encode(invocable_result.result)
+
     def _get_subinvoke_uri(self, uri_ptr: int, uri_len: int) -> Uri:
         uri = self.read_string(
             uri_ptr,
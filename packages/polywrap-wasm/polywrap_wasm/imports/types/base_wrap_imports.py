@@ -1,13 +1,21 @@
 """This module contains the base class for the wrap imports modules."""
 from __future__ import annotations
 
+import weakref
 from abc import ABC
-from typing import Optional
+from typing import Optional, cast
 
 from polywrap_core import Invoker
 from wasmtime import Memory, Store
 
-from ...buffer import read_bytes, read_string, write_bytes, write_string
+from ...buffer import (
+    BufferLike,
+    read_bytes,
+    read_string,
+    read_view,
+    write_bytes,
+    write_string,
+)
 from ...types.state import State
 
 
@@ -15,12 +23,24 @@ class BaseWrapImports(ABC):
     """Base class for the wrap imports modules."""
 
     memory: Memory
-    store: Store
     state: State
     invoker: Optional[Invoker]
+    _store_ref: weakref.ref[Store]
+
+    @property
+    def store(self) -> Store:
+        """Get the store the Wasm module is instantiated in."""
+        return cast(Store, self._store_ref())
+
+    @store.setter
+    def store(self, store: Store) -> None:
+        # The wrap imports are the data of the store, so the store
+        # is only weakly referenced to let it be dropped
+        self._store_ref = weakref.ref(store)
 
     def read_string(self, ptr: int, length: int) -> str:
         """Read a UTF-8 encoded string from the memory buffer."""
+        self._record_bytes(length)
         return read_string(
             self.memory.data_ptr(self.store),
             self.memory.data_len(self.store),
@@ -30,6 +50,7 @@ class BaseWrapImports(ABC):
 
     def read_bytes(self, ptr: int, length: int) -> bytes:
         """Read bytes from the memory buffer."""
+        self._record_bytes(length)
         return read_bytes(
             self.memory.data_ptr(self.store),
             self.memory.data_len(self.store),
@@ -37,8 +58,24 @@ class BaseWrapImports(ABC):
             length,
         )
 
+    def read_view(self, ptr: int, length: int) -> memoryview:
+        """Get a memoryview over the memory buffer without copying it.
+
+        The view is only valid for the duration of the host call it was\
+            created in and must not be kept after the call returns.
+        """
+        self._record_bytes(length)
+        return read_view(
+            self.memory.data_ptr(self.store),
+            self.memory.data_len(self.store),
+            ptr,
+            length,
+        )
+
     def write_string(self, ptr: int, value: str) -> None:
         """Write a UTF-8 encoded string to the given pointer in the memory buffer."""
+        if self.state.profile is not None:
+            self.state.profile.record_bytes(len(value.encode("utf-8")))
         write_string(
             self.memory.data_ptr(self.store),
             self.memory.data_len(self.store),
@@ -46,11 +83,16 @@ class BaseWrapImports(ABC):
             ptr,
         )
 
-    def write_bytes(self, ptr: int, value: bytes) -> None:
+    def write_bytes(self, ptr: int, value: BufferLike) -> None:
         """Write bytes to the given pointer in the memory buffer."""
+        self._record_bytes(memoryview(value).nbytes)
         write_bytes(
             self.memory.data_ptr(self.store),
             self.memory.data_len(self.store),
             value,
             ptr,
         )
+
+    def _record_bytes(self, length: int) -> None:
+        if self.state.profile is not None:
+            self.state.profile.record_bytes(length)
@@ -6,7 +6,6 @@ from __future__ import annotations
 from typing import Optional
 
 from polywrap_core import Invoker
-from wasmtime import Memory, Store
 
 from ..types.state import State
 from .abort import WrapAbortImports
@@ -28,29 +27,27 @@ class WrapImports(
     """Wasm imports for the Wrap Wasm module.
 
     This class is responsible for providing all the Wasm imports to the Wasm module.
+    An instance holds the per-invocation state and is carried in the data\
+        of the store the Wasm module is instantiated in.
 
     Args:
-        memory (Memory): The Wasm memory instance.
-        store (Store): The Wasm store instance.
         state (State): The state of the Wasm module.
         invoker (Invoker): The invoker instance.
 
     Attributes:
-        memory (Memory): The Wasm memory instance.
-        store (Store): The Wasm store instance.
+        memory (Memory): The Wasm memory instance, bound once the store\
+            of the invocation is created.
+        store (Store): The store the Wasm module is instantiated in,\
+            weakly referenced since the wrap imports are its data.
         state (State): The state of the Wasm module.
         invoker (Invoker): The invoker instance.
     """
 
     def __init__(
         self,
-        memory: Memory,
-        store: Store,
         state: State,
         invoker: Optional[Invoker],
     ) -> None:
         """Initialize the WrapImports instance."""
-        self.memory = memory
-        self.store = store
         self.state = state
         self.invoker = invoker
@@ -1,41 +1,132 @@
-"""This module contains the imports of the Wasm wrapper module."""
-from typing import Optional
+"""This module contains the instance template for instantiating Wasm wrapper modules."""
+from __future__ import annotations
+
+import time
+from typing import Any, List, Optional, Tuple
 
 from polywrap_core import Invoker
-from wasmtime import Instance, Linker, Module, Store
+from wasmtime import Engine, Instance, Linker, Memory, MemoryType, Module, Store
 
+from .budget import set_unlimited_budget
+from .errors import WasmExportNotFoundError
 from .imports import WrapImports
 from .linker import WrapLinker
-from .memory import create_memory
+from .mapped_file_reader import WasmModuleBuffer
+from .memory import create_memory_type
+from .module_cache import ModuleCache, get_module_cache, hash_wasm_module
+from .module_info import WasmModuleInfo, get_wasm_module_info
+from .running_store import run_in_store
+from .runtime_config import WasmRuntimeConfig
 from .types.state import State
 
+_MEMORY_IMPORT = ("env", "memory")
+
 
-def create_instance(
-    store: Store,
-    module: bytes,
-    state: State,
-    invoker: Optional[Invoker],
-) -> Instance:
-    """Create a Wasm instance for a Wasm module.
+class WasmInstanceTemplate:  # pylint: disable=too-many-instance-attributes
+    """WasmInstanceTemplate holds everything needed to instantiate a Wasm module\
+        that doesn't depend on the invocation.
+
+    The module is parsed and checked, compiled (or taken from the module\
+        cache), the wrap imports are linked and the memory type is computed\
+        once when the template is created. Instantiating the template then\
+        only creates a store, the imported memory and the instance.\
+        A template can be instantiated concurrently from many threads.
 
     Args:
-        store (Store): The Wasm store.
-        module (bytes): The Wasm module.
-        state (State): The state of the Wasm module.
-        invoker (Optional[Invoker]): The invoker to use for subinvocations.
+        wasm_module (WasmModuleBuffer): The Wasm module.
+        module_cache (Optional[ModuleCache]): The cache of compiled modules.\
+            Defaults to the process-wide module cache.
+        module_hash (Optional[str]): The precomputed content hash\
+            of the Wasm module, if known.
+
+    Attributes:
+        compile_time (float): The time in seconds spent parsing and compiling\
+            the Wasm module, or taking it from the module cache.
 
-    Returns:
-        Instance: The Wasm instance.
+    Raises:
+        WasmModuleError: If the Wasm module is malformed.
+        WasmMemoryError: If the Wasm module doesn't import a memory\
+            the host can allocate.
+        WasmExportNotFoundError: If the Wasm module doesn't export\
+            the _wrap_invoke function.
     """
-    linker = Linker(store.engine)
-    memory = create_memory(store, module)
 
-    # Link memory
-    linker.define(store, "env", "memory", memory)
+    module: Module
+    module_hash: str
+    module_info: WasmModuleInfo
+    compile_time: float
+    memory_type: MemoryType
+    linker: Linker
+    _engine: Engine
+    _runtime_config: Optional[WasmRuntimeConfig]
+    _imports: List[Tuple[str, str]]
+
+    def __init__(
+        self,
+        wasm_module: WasmModuleBuffer,
+        module_cache: Optional[ModuleCache] = None,
+        module_hash: Optional[str] = None,
+    ):
+        """Initialize a new WasmInstanceTemplate instance."""
+        start = time.perf_counter()
+        module_cache = module_cache if module_cache is not None else get_module_cache()
+        self._engine = module_cache.engine
+        self._runtime_config = module_cache.runtime_config
+        self.module_hash = module_hash or hash_wasm_module(wasm_module)
+        # Reject incompatible modules before paying for their compilation
+        self.module_info = get_wasm_module_info(wasm_module, self.module_hash)
+        self.memory_type = create_memory_type(wasm_module, self.module_info)
+        wrap_invoke = self.module_info.get_export("_wrap_invoke")
+        if wrap_invoke is None or wrap_invoke.kind != "func":
+            raise WasmExportNotFoundError(
+                "Expected _wrap_invoke to be exported from the Wasm module."
+            )
+        self.module = module_cache.get_module(wasm_module, self.module_hash)
+        self.compile_time = time.perf_counter() - start
+
+        self.linker = Linker(self._engine)
+        WrapLinker(self.linker).link()
+
+        self._imports = [(item.module, item.name or "") for item in self.module.imports]
+
+    @property
+    def engine(self) -> Engine:
+        """Get the engine the module is compiled with."""
+        return self._engine
+
+    def instantiate(
+        self, state: State, invoker: Optional[Invoker]
+    ) -> Tuple[Store, Instance]:
+        """Instantiate the Wasm module for an invocation.
+
+        Args:
+            state (State): The state of the invocation.
+            invoker (Optional[Invoker]): The invoker to use for subinvocations.
+
+        Returns:
+            Tuple[Store, Instance]: The store of the invocation\
+                and the Wasm instance.
+        """
+        return self._instantiate(self.module, state, invoker)
+
+    def _instantiate(
+        self, module: Module, state: State, invoker: Optional[Invoker]
+    ) -> Tuple[Store, Instance]:
+        """Instantiate a module with the imports of the template."""
+        wrap_imports = WrapImports(state, invoker)
+        store = wrap_imports.store = Store(self._engine, wrap_imports)
+        set_unlimited_budget(store, self._runtime_config)
+        memory = wrap_imports.memory = Memory(store, self.memory_type)
+
+        externs: List[Any] = [
+            memory
+            if import_name == _MEMORY_IMPORT
+            else self.linker.get(store, *import_name)
+            for import_name in self._imports
+        ]
+        with run_in_store(store):
+            # The start function of the module may call the wrap imports
+            return store, Instance(store, module, externs)
 
-    wrap_imports = WrapImports(memory, store, state, invoker)
-    wrap_linker = WrapLinker(linker, wrap_imports)
-    wrap_linker.link()
 
-    instantiated_module = Module(store.engine, module)
-    return linker.instantiate(store, instantiated_module)
+__all__ = ["WasmInstanceTemplate"]
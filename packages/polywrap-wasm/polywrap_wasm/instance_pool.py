@@ -0,0 +1,204 @@
+"""This module contains the WasmInstancePool for reusing Wasm instances across invocations."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import List, Optional, cast
+
+from polywrap_core import Invoker
+from wasmtime import Memory, Store
+
+from .exports import WrapExports
+from .imports import WrapImports
+from .instance import WasmInstanceTemplate
+from .types.state import State, WasmInvokeOptions
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class InstancePoolConfig:
+    """InstancePoolConfig is a dataclass that holds the options of an instance pool.
+
+    Pooling is only safe for wrappers that don't rely on a fresh instance\
+        for every invocation, since the guest memory and globals survive\
+        between the invocations served by the same instance.
+
+    Args:
+        max_size (int): The maximum number of idle instances kept in the pool.
+        max_uses (int): The number of invocations an instance serves\
+            before it is recycled.
+        max_memory_bytes (Optional[int]): The memory high-water limit.\
+            An instance whose memory grew beyond it is recycled.
+    """
+
+    max_size: int = 4
+    max_uses: int = 1000
+    max_memory_bytes: Optional[int] = None
+
+    def __post_init__(self):
+        """Validate the pool options."""
+        if self.max_size < 1:
+            raise ValueError(
+                f"max_size must be a positive integer, got {self.max_size}"
+            )
+        if self.max_uses < 1:
+            raise ValueError(
+                f"max_uses must be a positive integer, got {self.max_uses}"
+            )
+
+
+@dataclass(slots=True, kw_only=True)
+class InstancePoolStats:
+    """InstancePoolStats is a dataclass that holds a snapshot of the pool counters.
+
+    Args:
+        created (int): The number of instances created by the pool.
+        reused (int): The number of invocations served by an idle instance.
+        recycled (int): The number of instances discarded by the pool.
+        idle (int): The number of idle instances currently in the pool.
+    """
+
+    created: int
+    reused: int
+    recycled: int
+    idle: int
+
+
+@dataclass(slots=True, kw_only=True)
+class PooledInstance:
+    """PooledInstance is a dataclass that holds a Wasm instance owned by a pool.
+
+    Args:
+        store (Store): The Wasm store of the instance.
+        exports (WrapExports): The exports of the instance.
+        wrap_imports (WrapImports): The wrap imports carried in the store data.
+        memory (Memory): The memory imported by the instance.
+        uses (int): The number of invocations served by the instance.
+    """
+
+    store: Store
+    exports: WrapExports
+    wrap_imports: WrapImports
+    memory: Memory
+    uses: int = field(default=0)
+
+
+class WasmInstancePool:
+    """WasmInstancePool keeps Wasm instances of a wrapper to serve many invocations.
+
+    Acquiring an instance binds the state of the invocation to an idle instance,\
+        or instantiates the template if none is idle. Released instances\
+        go back to the pool unless they failed, served `max_uses` invocations\
+        or grew beyond the memory high-water limit.
+
+    Args:
+        template (WasmInstanceTemplate): The template used to create instances.
+        config (InstancePoolConfig): The options of the pool.
+    """
+
+    template: WasmInstanceTemplate
+    config: InstancePoolConfig
+    _idle: List[PooledInstance]
+    _lock: Lock
+    _created: int
+    _reused: int
+    _recycled: int
+
+    def __init__(self, template: WasmInstanceTemplate, config: InstancePoolConfig):
+        """Initialize a new WasmInstancePool instance."""
+        self.template = template
+        self.config = config
+        self._idle = []
+        self._lock = Lock()
+        self._created = 0
+        self._reused = 0
+        self._recycled = 0
+
+    def acquire(self, state: State, invoker: Optional[Invoker]) -> PooledInstance:
+        """Get an instance bound to the state of an invocation.
+
+        Args:
+            state (State): The state of the invocation.
+            invoker (Optional[Invoker]): The invoker to use for subinvocations.
+
+        Returns:
+            PooledInstance: The instance to invoke. It must be given back\
+                with `release` once the invocation is done.
+        """
+        with self._lock:
+            pooled = self._idle.pop() if self._idle else None
+            if pooled is not None:
+                self._reused += 1
+            else:
+                self._created += 1
+
+        if pooled is not None:
+            pooled.wrap_imports.state = state
+            pooled.wrap_imports.invoker = invoker
+        else:
+            store, instance = self.template.instantiate(state, invoker)
+            wrap_imports = cast(WrapImports, store.data())
+            pooled = PooledInstance(
+                store=store,
+                exports=WrapExports(instance, store),
+                wrap_imports=wrap_imports,
+                memory=wrap_imports.memory,
+            )
+        pooled.uses += 1
+        return pooled
+
+    def release(self, pooled: PooledInstance, failed: bool = False) -> None:
+        """Give an instance back to the pool once its invocation is done.
+
+        Args:
+            pooled (PooledInstance): The instance returned by `acquire`.
+            failed (bool): Whether the invocation failed, in which case\
+                the instance state can't be trusted and it is recycled.
+        """
+        # Drop the references to the invocation while the instance is idle
+        invoke_options = pooled.wrap_imports.state.invoke_options
+        pooled.wrap_imports.state = State(
+            invoke_options=WasmInvokeOptions(
+                uri=invoke_options.uri, method=invoke_options.method
+            )
+        )
+        pooled.wrap_imports.invoker = None
+
+        max_memory_bytes = self.config.max_memory_bytes
+        recycle = (
+            failed
+            or pooled.uses >= self.config.max_uses
+            or (
+                max_memory_bytes is not None
+                and pooled.memory.data_len(pooled.store) > max_memory_bytes
+            )
+        )
+
+        with self._lock:
+            if recycle or len(self._idle) >= self.config.max_size:
+                self._recycled += 1
+                return
+            self._idle.append(pooled)
+
+    def get_stats(self) -> InstancePoolStats:
+        """Get a snapshot of the pool counters."""
+        with self._lock:
+            return InstancePoolStats(
+                created=self._created,
+                reused=self._reused,
+                recycled=self._recycled,
+                idle=len(self._idle),
+            )
+
+    def clear(self) -> None:
+        """Discard all the idle instances."""
+        with self._lock:
+            self._recycled += len(self._idle)
+            self._idle.clear()
+
+
+__all__ = [
+    "InstancePoolConfig",
+    "InstancePoolStats",
+    "PooledInstance",
+    "WasmInstancePool",
+]
@@ -29,9 +29,11 @@ class WrapAbortLinker(BaseWrapLinker):
             line: int,
             col: int,
         ) -> None:
-            self.wrap_imports.wrap_abort(ptr, length, file_ptr, file_len, line, col)
+            self.get_wrap_imports().wrap_abort(
+                ptr, length, file_ptr, file_len, line, col
+            )
 
-        self.linker.define_func("wrap", "__wrap_abort", wrap_abort_type, wrap_abort)
+        self.define_wrap_import("__wrap_abort", wrap_abort_type, wrap_abort)
 
     def link_abort_imports(self) -> None:
         """Link all abort family of imports to the Wasm module."""
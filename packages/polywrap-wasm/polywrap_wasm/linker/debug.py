@@ -15,11 +15,9 @@ class WrapDebugLinker(BaseWrapLinker):
         )
 
         def wrap_debug_log(ptr: int, length: int) -> None:
-            self.wrap_imports.wrap_debug_log(ptr, length)
+            self.get_wrap_imports().wrap_debug_log(ptr, length)
 
-        self.linker.define_func(
-            "wrap", "__wrap_debug_log", wrap_debug_log_type, wrap_debug_log
-        )
+        self.define_wrap_import("__wrap_debug_log", wrap_debug_log_type, wrap_debug_log)
 
     def link_debug_imports(self) -> None:
         """Link all debug family of imports to the Wasm module."""
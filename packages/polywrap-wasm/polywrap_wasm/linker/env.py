@@ -15,11 +15,9 @@ class WrapEnvLinker(BaseWrapLinker):
         )
 
         def wrap_load_env(ptr: int) -> None:
-            self.wrap_imports.wrap_load_env(ptr)
+            self.get_wrap_imports().wrap_load_env(ptr)
 
-        self.linker.define_func(
-            "wrap", "__wrap_load_env", wrap_load_env_type, wrap_load_env
-        )
+        self.define_wrap_import("__wrap_load_env", wrap_load_env_type, wrap_load_env)
 
     def link_env_imports(self) -> None:
         """Link all env family of imports to the Wasm module."""
@@ -23,10 +23,9 @@ class WrapGetImplementationsLinker(BaseWrapLinker):
             uri_ptr: int,
             uri_len: int,
         ) -> bool:
-            return self.wrap_imports.wrap_get_implementations(uri_ptr, uri_len)
+            return self.get_wrap_imports().wrap_get_implementations(uri_ptr, uri_len)
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_getImplementations",
             wrap_get_implementations_type,
             wrap_get_implementations,
@@ -43,10 +42,9 @@ class WrapGetImplementationsLinker(BaseWrapLinker):
         )
 
         def wrap_get_implementations_result_len() -> int:
-            return self.wrap_imports.wrap_get_implementations_result_len()
+            return self.get_wrap_imports().wrap_get_implementations_result_len()
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_getImplementations_result_len",
             wrap_get_implementations_result_len_type,
             wrap_get_implementations_result_len,
@@ -64,10 +62,9 @@ class WrapGetImplementationsLinker(BaseWrapLinker):
         def wrap_get_implementations_result(
             ptr: int,
         ) -> None:
-            self.wrap_imports.wrap_get_implementations_result(ptr)
+            self.get_wrap_imports().wrap_get_implementations_result(ptr)
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_getImplementations_result",
             wrap_get_implementations_result_type,
             wrap_get_implementations_result,
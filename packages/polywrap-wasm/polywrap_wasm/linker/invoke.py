@@ -12,10 +12,10 @@ class WrapInvokeLinker(BaseWrapLinker):
         wrap_invoke_args_type = FuncType([ValType.i32(), ValType.i32()], [])
 
         def wrap_invoke_args(ptr: int, length: int) -> None:
-            self.wrap_imports.wrap_invoke_args(ptr, length)
+            self.get_wrap_imports().wrap_invoke_args(ptr, length)
 
-        self.linker.define_func(
-            "wrap", "__wrap_invoke_args", wrap_invoke_args_type, wrap_invoke_args
+        self.define_wrap_import(
+            "__wrap_invoke_args", wrap_invoke_args_type, wrap_invoke_args
         )
 
     def link_wrap_invoke_result(self) -> None:
@@ -23,10 +23,10 @@ class WrapInvokeLinker(BaseWrapLinker):
         wrap_invoke_result_type = FuncType([ValType.i32(), ValType.i32()], [])
 
         def wrap_invoke_result(ptr: int, length: int) -> None:
-            self.wrap_imports.wrap_invoke_result(ptr, length)
+            self.get_wrap_imports().wrap_invoke_result(ptr, length)
 
-        self.linker.define_func(
-            "wrap", "__wrap_invoke_result", wrap_invoke_result_type, wrap_invoke_result
+        self.define_wrap_import(
+            "__wrap_invoke_result", wrap_invoke_result_type, wrap_invoke_result
         )
 
     def link_wrap_invoke_error(self) -> None:
@@ -34,10 +34,10 @@ class WrapInvokeLinker(BaseWrapLinker):
         wrap_invoke_error_type = FuncType([ValType.i32(), ValType.i32()], [])
 
         def wrap_invoke_error(ptr: int, length: int) -> None:
-            self.wrap_imports.wrap_invoke_error(ptr, length)
+            self.get_wrap_imports().wrap_invoke_error(ptr, length)
 
-        self.linker.define_func(
-            "wrap", "__wrap_invoke_error", wrap_invoke_error_type, wrap_invoke_error
+        self.define_wrap_import(
+            "__wrap_invoke_error", wrap_invoke_error_type, wrap_invoke_error
         )
 
     def link_invoke_imports(self) -> None:
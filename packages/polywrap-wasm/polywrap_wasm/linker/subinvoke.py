@@ -31,23 +31,20 @@ class WrapSubinvokeLinker(BaseWrapLinker):
             args_ptr: int,
             args_len: int,
         ) -> int:
-            return self.wrap_imports.wrap_subinvoke(
+            return self.get_wrap_imports().wrap_subinvoke(
                 ptr, length, uri_ptr, uri_len, args_ptr, args_len
             )
 
-        self.linker.define_func(
-            "wrap", "__wrap_subinvoke", wrap_subinvoke_type, wrap_subinvoke
-        )
+        self.define_wrap_import("__wrap_subinvoke", wrap_subinvoke_type, wrap_subinvoke)
 
     def link_wrap_subinvoke_result_len(self) -> None:
         """Link the __wrap_subinvoke_result_len function as an import to the Wasm module."""
         wrap_subinvoke_result_len_type = FuncType([], [ValType.i32()])
 
         def wrap_subinvoke_result_len() -> int:
-            return self.wrap_imports.wrap_subinvoke_result_len()
+            return self.get_wrap_imports().wrap_subinvoke_result_len()
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_subinvoke_result_len",
             wrap_subinvoke_result_len_type,
             wrap_subinvoke_result_len,
@@ -58,13 +55,10 @@ class WrapSubinvokeLinker(BaseWrapLinker):
         wrap_subinvoke_result_type = FuncType([ValType.i32()], [])
 
         def wrap_subinvoke_result(ptr: int) -> None:
-            self.wrap_imports.wrap_subinvoke_result(ptr)
+            self.get_wrap_imports().wrap_subinvoke_result(ptr)
 
-        self.linker.define_func(
-            "wrap",
-            "__wrap_subinvoke_result",
-            wrap_subinvoke_result_type,
-            wrap_subinvoke_result,
+        self.define_wrap_import(
+            "__wrap_subinvoke_result", wrap_subinvoke_result_type, wrap_subinvoke_result
         )
 
     def link_wrap_subinvoke_error_len(self) -> None:
@@ -72,10 +66,9 @@ class WrapSubinvokeLinker(BaseWrapLinker):
         wrap_subinvoke_error_len_type = FuncType([], [ValType.i32()])
 
         def wrap_subinvoke_error_len() -> int:
-            return self.wrap_imports.wrap_subinvoke_error_len()
+            return self.get_wrap_imports().wrap_subinvoke_error_len()
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_subinvoke_error_len",
             wrap_subinvoke_error_len_type,
             wrap_subinvoke_error_len,
@@ -86,13 +79,10 @@ class WrapSubinvokeLinker(BaseWrapLinker):
         wrap_subinvoke_error_type = FuncType([ValType.i32()], [])
 
         def wrap_subinvoke_error(ptr: int) -> None:
-            self.wrap_imports.wrap_subinvoke_error(ptr)
+            self.get_wrap_imports().wrap_subinvoke_error(ptr)
 
-        self.linker.define_func(
-            "wrap",
-            "__wrap_subinvoke_error",
-            wrap_subinvoke_error_type,
-            wrap_subinvoke_error,
+        self.define_wrap_import(
+            "__wrap_subinvoke_error", wrap_subinvoke_error_type, wrap_subinvoke_error
         )
 
     def link_subinvoke_imports(self) -> None:
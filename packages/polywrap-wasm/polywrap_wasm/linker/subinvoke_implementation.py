@@ -37,7 +37,7 @@ class WrapSubinvokeImplementationLinker(BaseWrapLinker):
             result_ptr: int,
             result_len: int,
         ) -> int:
-            return self.wrap_imports.wrap_subinvoke(
+            return self.get_wrap_imports().wrap_subinvoke(
                 uri_ptr,
                 uri_len,
                 args_ptr,
@@ -46,8 +46,7 @@ class WrapSubinvokeImplementationLinker(BaseWrapLinker):
                 result_len,
             )
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_subinvokeImplementation",
             wrap_subinvoke_implementation_type,
             wrap_subinvoke_implementation,
@@ -59,10 +58,9 @@ class WrapSubinvokeImplementationLinker(BaseWrapLinker):
         wrap_subinvoke_implementation_result_len_type = FuncType([], [ValType.i32()])
 
         def wrap_subinvoke_implementation_result_len() -> int:
-            return self.wrap_imports.wrap_subinvoke_result_len()
+            return self.get_wrap_imports().wrap_subinvoke_result_len()
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_subinvokeImplementation_result_len",
             wrap_subinvoke_implementation_result_len_type,
             wrap_subinvoke_implementation_result_len,
@@ -74,10 +72,9 @@ class WrapSubinvokeImplementationLinker(BaseWrapLinker):
         wrap_subinvoke_implementation_result_type = FuncType([ValType.i32()], [])
 
         def wrap_subinvoke_implementation_result(ptr: int) -> None:
-            self.wrap_imports.wrap_subinvoke_result(ptr)
+            self.get_wrap_imports().wrap_subinvoke_result(ptr)
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_subinvokeImplementation_result",
             wrap_subinvoke_implementation_result_type,
             wrap_subinvoke_implementation_result,
@@ -89,10 +86,9 @@ class WrapSubinvokeImplementationLinker(BaseWrapLinker):
         wrap_subinvoke_implementation_error_len_type = FuncType([], [ValType.i32()])
 
         def wrap_subinvoke_implementation_error_len() -> int:
-            return self.wrap_imports.wrap_subinvoke_error_len()
+            return self.get_wrap_imports().wrap_subinvoke_error_len()
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_subinvokeImplementation_error_len",
             wrap_subinvoke_implementation_error_len_type,
             wrap_subinvoke_implementation_error_len,
@@ -104,10 +100,9 @@ class WrapSubinvokeImplementationLinker(BaseWrapLinker):
         wrap_subinvoke_implementation_error_type = FuncType([ValType.i32()], [])
 
         def wrap_subinvoke_implementation_error(ptr: int) -> None:
-            self.wrap_imports.wrap_subinvoke_error(ptr)
+            self.get_wrap_imports().wrap_subinvoke_error(ptr)
 
-        self.linker.define_func(
-            "wrap",
+        self.define_wrap_import(
             "__wrap_subinvokeImplementation_error",
             wrap_subinvoke_implementation_error_type,
             wrap_subinvoke_implementation_error,
@@ -1,15 +1,59 @@
 """This module contains the base linker for the Wasm imports."""
 from __future__ import annotations
 
+import time
 from abc import ABC
+from typing import Any, Callable, cast
 
-from wasmtime import Linker
+from wasmtime import FuncType, Linker
 
 from ...imports import WrapImports
+from ...running_store import get_running_store
 
 
 class BaseWrapLinker(ABC):
     """Base linker for the Wasm imports."""
 
     linker: Linker
-    wrap_imports: WrapImports
+
+    def get_wrap_imports(self) -> WrapImports:
+        """Get the wrap imports of the invocation the host call belongs to.
+
+        The linked host functions are shared by every invocation, so the\
+            per-invocation wrap imports are carried in the data of the store\
+            running the Wasm code that calls them.
+
+        Returns:
+            WrapImports: The wrap imports bound to the running store.
+        """
+        return cast(WrapImports, get_running_store().data())
+
+    def define_wrap_import(
+        self, name: str, func_type: FuncType, func: Callable[..., Any]
+    ) -> None:
+        """Define a host function imported from the "wrap" module.
+
+        Calls made by profiled invocations are counted and timed\
+            in the profile of the invocation.
+
+        Args:
+            name (str): The name of the import.
+            func_type (FuncType): The type of the host function.
+            func (Callable[..., Any]): The host function, called with\
+                the Wasm arguments.
+        """
+
+        def wrap_import(*args: Any) -> Any:
+            profile = self.get_wrap_imports().state.profile
+            if profile is None:
+                return func(*args)
+
+            import_profile = profile.enter_import(name)
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                import_profile.total_time += time.perf_counter() - start
+                profile.current_import = None
+
+        self.linker.define_func("wrap", name, func_type, wrap_import)
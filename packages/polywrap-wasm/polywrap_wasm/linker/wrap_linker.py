@@ -2,7 +2,6 @@
 # pylint: disable=too-many-ancestors
 from wasmtime import Linker
 
-from ..imports import WrapImports
 from .abort import WrapAbortLinker
 from .debug import WrapDebugLinker
 from .env import WrapEnvLinker
@@ -24,20 +23,20 @@ class WrapLinker(
     """Linker for the Wrap Wasm module.
 
     This class is responsible for linking all the Wasm imports to the Wasm module.
+    The imports are linked as store independent host functions that read\
+        the WrapImports of the invocation from the data of the running store,\
+        so the same linker can be used to instantiate the module in many stores.
 
     Args:
         linker: The Wasm linker instance.
-        wrap_imports: The Wasm imports instance.
 
     Attributes:
         linker: The Wasm linker instance.
-        wrap_imports: The Wasm imports instance.
     """
 
-    def __init__(self, linker: Linker, wrap_imports: WrapImports) -> None:
+    def __init__(self, linker: Linker) -> None:
         """Initialize the WrapLinker instance."""
         self.linker = linker
-        self.wrap_imports = wrap_imports
 
     def link(self) -> None:
         """Link all the Wasm imports to the Wasm module."""
@@ -0,0 +1,96 @@
+"""This module contains the MappedFileReader type for reading files\
+    through memory maps."""
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+from typing import Optional, Protocol, Union, runtime_checkable
+
+from polywrap_core import FileReader
+
+WasmModuleBuffer = Union[bytes, mmap.mmap]
+"""The bytes of a Wasm module, either in memory or mapped from a file."""
+
+
+@runtime_checkable
+class MappableFileReader(FileReader, Protocol):
+    """Defines the protocol of the file readers able to map files in memory."""
+
+    def map_file(self, file_path: str) -> mmap.mmap:
+        """Map a file in memory without reading it.
+
+        Args:
+            file_path: The path of the file to map.
+
+        Raises:
+            OSError: If the file could not be mapped due to system errors.
+
+        Returns:
+            mmap.mmap: The read-only memory map of the file.
+        """
+        ...  # pylint: disable=unnecessary-ellipsis
+
+
+class MappedFileReader(MappableFileReader):
+    """MappedFileReader is an implementation of the FileReader protocol\
+        that maps the Wasm modules in memory instead of reading them.
+
+    The pages of a mapped module are only read from the disk when they are\
+        used, and are shared with every process mapping the same file.\
+        WasmPackage maps the Wasm module of the wrapper when its file reader\
+        is able to, while the other files are read in memory as usual.
+
+    A mapped file must not be truncated or rewritten in place while it is\
+        mapped, replace it with a new file instead. The returned maps\
+        belong to the caller, which closes them once they're unused.
+
+    Args:
+        base_path (Optional[Union[str, Path]]): The directory the paths\
+            of the files are relative to. Defaults to the current directory.
+    """
+
+    base_path: Optional[Path]
+
+    def __init__(self, base_path: Optional[Union[str, Path]] = None):
+        """Initialize a new MappedFileReader instance."""
+        self.base_path = Path(base_path) if base_path is not None else None
+
+    def read_file(self, file_path: str) -> bytes:
+        """Read a file in memory.
+
+        Args:
+            file_path: The path of the file to read.
+
+        Returns:
+            bytes: The file contents.
+        """
+        with open(self._get_path(file_path), "rb") as file:
+            return file.read()
+
+    def map_file(self, file_path: str) -> mmap.mmap:
+        """Map a file in memory without reading it.
+
+        Args:
+            file_path: The path of the file to map.
+
+        Raises:
+            OSError: If the file could not be mapped due to system errors.
+
+        Returns:
+            mmap.mmap: The read-only memory map of the file.
+        """
+        path = self._get_path(file_path)
+        with open(path, "rb") as file:
+            try:
+                # The map keeps its own handle on the file
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as err:
+                raise OSError(f"Unable to map the empty file {path}") from err
+
+    def _get_path(self, file_path: str) -> Path:
+        if self.base_path is None:
+            return Path(file_path)
+        return self.base_path / file_path
+
+
+__all__ = ["MappableFileReader", "MappedFileReader", "WasmModuleBuffer"]
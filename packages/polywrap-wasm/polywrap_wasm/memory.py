@@ -1,10 +1,13 @@
 """This module contains the create_memory function\
     for creating a shared memory instance for a Wasm module."""
 from textwrap import dedent
+from typing import Optional
 
 from wasmtime import Limits, Memory, MemoryType, Store
 
 from .errors import WasmMemoryError
+from .mapped_file_reader import WasmModuleBuffer
+from .module_info import WasmModuleInfo, parse_wasm_module
 
 
 def create_memory(
@@ -23,33 +26,31 @@ def create_memory(
     Returns:
         Memory: The shared memory instance.
     """
-    env_memory_import_signature = bytearray(
-        [
-            # env ; import module name
-            0x65,
-            0x6E,
-            0x76,
-            # string length
-            0x06,
-            # memory ; import field name
-            0x6D,
-            0x65,
-            0x6D,
-            0x6F,
-            0x72,
-            0x79,
-            # import kind
-            0x02,
-            # limits ; https://github.com/sunfishcode/wasm-reference-manual/blob/master/WebAssembly.md#resizable-limits  # pylint: disable=line-too-long
-            # limits ; flags
-            # 0x??,
-            # limits ; initial
-            # 0x__,
-        ]
-    )
-    idx = module.find(env_memory_import_signature)
+    return Memory(store, create_memory_type(module))
 
-    if idx < 0:
+
+def create_memory_type(
+    module: WasmModuleBuffer, module_info: Optional[WasmModuleInfo] = None
+) -> MemoryType:
+    """Create the type of the memory imported by a Wasm module.
+
+    Args:
+        module (WasmModuleBuffer): The Wasm module.
+        module_info (Optional[WasmModuleInfo]): The already parsed\
+            structure of the Wasm module, if known.
+
+    Raises:
+        WasmMemoryError: if the memory import is not found in the Wasm module\
+            or can't be allocated by the host.
+        WasmModuleError: if the Wasm module is malformed.
+
+    Returns:
+        MemoryType: The type of the imported memory.
+    """
+    module_info = module_info or parse_wasm_module(module)
+    memory_import = module_info.get_import("env", "memory")
+
+    if memory_import is None or memory_import.memory_limits is None:
         raise WasmMemoryError(
             dedent(
                 """
@@ -61,6 +62,8 @@ def create_memory(
             )
         )
 
-    memory_inital_limits = module[idx + len(env_memory_import_signature) + 1]
+    limits = memory_import.memory_limits
+    if limits.shared:
+        raise WasmMemoryError("Shared Wasm memories are not supported")
 
-    return Memory(store, MemoryType(Limits(memory_inital_limits, None)))
+    return MemoryType(Limits(limits.minimum, limits.maximum), is_64=limits.is_64)
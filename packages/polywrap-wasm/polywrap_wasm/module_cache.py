@@ -0,0 +1,364 @@
+"""This module contains the ModuleCache for reusing compiled Wasm modules."""
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from wasmtime import Engine, Module
+
+from .artifact_cache import ArtifactCache
+from .constants import DEFAULT_MODULE_CACHE_SIZE
+from .mapped_file_reader import WasmModuleBuffer
+from .runtime_config import WasmRuntimeConfig
+
+T = TypeVar("T")
+
+
+def hash_wasm_module(wasm_module: WasmModuleBuffer) -> str:
+    """Compute the content hash used to identify a Wasm module.
+
+    Args:
+        wasm_module (WasmModuleBuffer): The Wasm module bytes.
+
+    Returns:
+        str: The hex encoded sha256 digest of the Wasm module.
+    """
+    return hashlib.sha256(wasm_module).hexdigest()
+
+
+@dataclass(slots=True, kw_only=True)
+class ModuleCacheStats:
+    """ModuleCacheStats is a dataclass that holds a snapshot of the cache counters.
+
+    Args:
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that required a compilation.
+        evictions (int): The number of modules evicted from the cache.
+        size (int): The number of modules currently in the cache.
+        max_size (int): The maximum number of modules kept in the cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+
+class ModuleCache:  # pylint: disable=too-many-instance-attributes
+    """ModuleCache keeps compiled Wasm modules so that they are compiled only once.
+
+    Modules are keyed by the content hash of their bytes and compiled\
+        with a single shared engine. When the cache is full,\
+        the least recently used module is evicted.
+
+    The cache also keeps the objects built from a module that all the wrappers\
+        of the module share, such as its instance template, since clients\
+        create a new wrapper for every invocation. They are dropped along\
+        with their module.
+
+    The cache is safe to use from many threads. Threads requesting a module\
+        or a shared object that is being created wait for it instead of\
+        creating it again.
+
+    Args:
+        engine (Optional[Engine]): The engine used to compile the modules.\
+            Stores instantiating cached modules must be created with this engine.\
+            Defaults to the shared engine of the runtime configuration.
+        max_size (int): The maximum number of compiled modules to keep.
+        artifact_cache (Optional[ArtifactCache]): The on-disk cache of\
+            compiled modules. Modules missing from memory are loaded from it\
+            before being compiled, and compiled modules are written to it.
+        runtime_config (Optional[WasmRuntimeConfig]): The configuration\
+            of the engine used to compile the modules.
+
+    Examples:
+        >>> from wasmtime import wat2wasm
+        >>> cache = ModuleCache(max_size=1)
+        >>> wasm_module = wat2wasm("(module)")
+        >>> module = cache.get_module(wasm_module)
+        >>> cache.get_module(wasm_module) is module
+        True
+        >>> stats = cache.get_stats()
+        >>> (stats.hits, stats.misses, stats.size)
+        (1, 1, 1)
+        >>> _ = cache.get_module(wat2wasm("(module (func))"))
+        >>> cache.get_stats().evictions
+        1
+    """
+
+    _engine: Engine
+    _engine_key: str
+    _runtime_config: Optional[WasmRuntimeConfig]
+    _max_size: int
+    _artifact_cache: Optional[ArtifactCache]
+    _modules: OrderedDict[str, Module]
+    _compiling: Dict[str, Event]
+    _shared: Dict[str, Dict[Hashable, Any]]
+    _creating: Dict[Tuple[str, Hashable], Event]
+    _lock: Lock
+    _hits: int
+    _misses: int
+    _evictions: int
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        max_size: int = DEFAULT_MODULE_CACHE_SIZE,
+        artifact_cache: Optional[ArtifactCache] = None,
+        runtime_config: Optional[WasmRuntimeConfig] = None,
+    ):
+        """Initialize a new ModuleCache instance."""
+        if max_size < 1:
+            raise ValueError(f"max_size must be a positive integer, got {max_size}")
+        if engine is not None and runtime_config is not None:
+            raise ValueError("engine and runtime_config are mutually exclusive")
+        if engine is not None and artifact_cache is not None:
+            # The configuration of a custom engine is unknown, so it can't
+            # be told apart from other engines in the artifact keys.
+            raise ValueError(
+                "artifact_cache requires an engine built from a runtime_config"
+            )
+        if engine is None:
+            runtime_config = runtime_config or WasmRuntimeConfig()
+            engine = runtime_config.get_engine()
+        self._engine = engine
+        self._runtime_config = runtime_config
+        self._engine_key = runtime_config.engine_key if runtime_config else ""
+        self._max_size = max_size
+        self._artifact_cache = artifact_cache
+        self._modules = OrderedDict()
+        self._compiling = {}
+        self._shared = {}
+        self._creating = {}
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def engine(self) -> Engine:
+        """Get the engine shared by all the cached modules."""
+        return self._engine
+
+    @property
+    def runtime_config(self) -> Optional[WasmRuntimeConfig]:
+        """Get the configuration of the engine, unless it is a custom engine."""
+        return self._runtime_config
+
+    @property
+    def max_size(self) -> int:
+        """Get the maximum number of compiled modules kept in the cache."""
+        return self._max_size
+
+    @property
+    def artifact_cache(self) -> Optional[ArtifactCache]:
+        """Get the on-disk cache of compiled modules, if any."""
+        return self._artifact_cache
+
+    def get_module(
+        self, wasm_module: WasmModuleBuffer, module_hash: Optional[str] = None
+    ) -> Module:
+        """Get the compiled module for the given Wasm bytes, compiling it on a miss.
+
+        Args:
+            wasm_module (WasmModuleBuffer): The Wasm module bytes.
+            module_hash (Optional[str]): The precomputed content hash\
+                of the Wasm module, if known.
+
+        Returns:
+            Module: The compiled Wasm module.
+        """
+        key = module_hash or hash_wasm_module(wasm_module)
+
+        while True:
+            with self._lock:
+                module = self._modules.get(key)
+                if module is not None:
+                    self._modules.move_to_end(key)
+                    self._hits += 1
+                    return module
+                compiling = self._compiling.get(key)
+                if compiling is None:
+                    compiling = self._compiling[key] = Event()
+                    self._misses += 1
+                    break
+            # Another thread is compiling the module, wait for it and retry
+            compiling.wait()
+
+        # Compile outside of the lock so that other modules can be served meanwhile.
+        try:
+            module = self._load_or_compile(wasm_module, key)
+        except BaseException:
+            with self._lock:
+                del self._compiling[key]
+            compiling.set()
+            raise
+
+        with self._lock:
+            del self._compiling[key]
+            compiling.set()
+            self._modules[key] = module
+            self._modules.move_to_end(key)
+            while len(self._modules) > self._max_size:
+                evicted, _ = self._modules.popitem(last=False)
+                self._shared.pop(evicted, None)
+                self._evictions += 1
+        return module
+
+    def get_shared(self, module_hash: str, key: Hashable, create: Callable[[], T]) -> T:
+        """Get an object built from a cached module, creating it on a miss.
+
+        The object is kept until its module is evicted, so it must be\
+            created after the module, by a call to `get_module`. Objects\
+            created while their module isn't cached aren't kept.
+
+        Args:
+            module_hash (str): The content hash of the module.
+            key (Hashable): The key of the object among the objects\
+                built from the module.
+            create (Callable[[], T]): Creates the object on a miss.
+
+        Returns:
+            T: The object shared by all the users of the module.
+        """
+        creating_key = (module_hash, key)
+        while True:
+            with self._lock:
+                shared = self._shared.get(module_hash)
+                if shared is not None and key in shared:
+                    if module_hash in self._modules:
+                        self._modules.move_to_end(module_hash)
+                    return shared[key]
+                creating = self._creating.get(creating_key)
+                if creating is None:
+                    creating = self._creating[creating_key] = Event()
+                    break
+            # Another thread is creating the object, wait for it and retry
+            creating.wait()
+
+        try:
+            value = create()
+        except BaseException:
+            with self._lock:
+                del self._creating[creating_key]
+            creating.set()
+            raise
+
+        with self._lock:
+            del self._creating[creating_key]
+            creating.set()
+            if module_hash in self._modules:
+                self._shared.setdefault(module_hash, {})[key] = value
+        return value
+
+    def _load_or_compile(
+        self, wasm_module: WasmModuleBuffer, module_hash: str
+    ) -> Module:
+        if self._artifact_cache is None:
+            return self._compile(wasm_module)
+
+        module = self._artifact_cache.load(self._engine, module_hash, self._engine_key)
+        if module is None:
+            module = self._compile(wasm_module)
+            self._artifact_cache.store(module_hash, module, self._engine_key)
+        return module
+
+    def _compile(self, wasm_module: WasmModuleBuffer) -> Module:
+        # A mapped module is only copied in memory when it must be compiled
+        if not isinstance(wasm_module, bytes):
+            wasm_module = bytes(wasm_module)
+        return Module(self._engine, wasm_module)
+
+    def get_stats(self) -> ModuleCacheStats:
+        """Get a snapshot of the cache counters."""
+        with self._lock:
+            return ModuleCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._modules),
+                max_size=self._max_size,
+            )
+
+    def clear(self) -> None:
+        """Remove all the compiled modules and the objects built from them,\
+            and reset the cache counters."""
+        with self._lock:
+            self._modules.clear()
+            self._shared.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def __contains__(self, module_hash: object) -> bool:
+        """Check if a module with the given content hash is cached."""
+        with self._lock:
+            return module_hash in self._modules
+
+    def __len__(self) -> int:
+        """Get the number of compiled modules in the cache."""
+        with self._lock:
+            return len(self._modules)
+
+
+_default_module_cache: Optional[ModuleCache] = None
+_runtime_module_caches: Dict[WasmRuntimeConfig, ModuleCache] = {}
+_default_module_cache_lock = Lock()
+
+
+def get_module_cache(
+    runtime_config: Optional[WasmRuntimeConfig] = None,
+) -> ModuleCache:
+    """Get the process-wide module cache used by Wasm wrappers by default.
+
+    Args:
+        runtime_config (Optional[WasmRuntimeConfig]): The configuration\
+            of the engine. Each configuration gets its own process-wide cache,\
+            and the configuration of the default cache gets the default cache.
+
+    Returns:
+        ModuleCache: The process-wide module cache.
+    """
+    global _default_module_cache  # pylint: disable=global-statement
+    with _default_module_cache_lock:
+        if _default_module_cache is None:
+            _default_module_cache = ModuleCache()
+        if (
+            runtime_config is None
+            or runtime_config == _default_module_cache.runtime_config
+        ):
+            return _default_module_cache
+        module_cache = _runtime_module_caches.get(runtime_config)
+        if module_cache is None:
+            module_cache = _runtime_module_caches[runtime_config] = ModuleCache(
+                runtime_config=runtime_config
+            )
+        return module_cache
+
+
+def set_module_cache(module_cache: ModuleCache) -> None:
+    """Replace the process-wide module cache used by Wasm wrappers by default.
+
+    This is how an on-disk artifact cache is enabled for all the wrappers\
+        that aren't given their own module cache. Wrappers created before\
+        the call keep using the previous cache.
+
+    Args:
+        module_cache (ModuleCache): The new process-wide module cache.
+    """
+    global _default_module_cache  # pylint: disable=global-statement
+    with _default_module_cache_lock:
+        _default_module_cache = module_cache
+
+
+__all__ = [
+    "ModuleCache",
+    "ModuleCacheStats",
+    "get_module_cache",
+    "hash_wasm_module",
+    "set_module_cache",
+]
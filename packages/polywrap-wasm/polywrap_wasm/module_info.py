@@ -0,0 +1,438 @@
+"""This module contains the parser extracting the structure of Wasm modules."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from .constants import DEFAULT_MODULE_CACHE_SIZE
+from .errors import WasmModuleError
+from .mapped_file_reader import WasmModuleBuffer
+
+WASM_MAGIC = b"\x00asm"
+WASM_VERSION = b"\x01\x00\x00\x00"
+
+CUSTOM_SECTION_ID = 0
+IMPORT_SECTION_ID = 2
+MEMORY_SECTION_ID = 5
+GLOBAL_SECTION_ID = 6
+EXPORT_SECTION_ID = 7
+START_SECTION_ID = 8
+
+EXTERN_KINDS = ("func", "table", "memory", "global", "tag")
+"""Names of the external kinds, indexed by their binary encoding."""
+
+VALUE_TYPES = {
+    0x7F: "i32",
+    0x7E: "i64",
+    0x7D: "f32",
+    0x7C: "f64",
+    0x7B: "v128",
+    0x70: "funcref",
+    0x6F: "externref",
+}
+"""Names of the value types, by their binary encoding."""
+
+_LIMITS_HAS_MAX = 0x01
+_LIMITS_SHARED = 0x02
+_LIMITS_MEMORY64 = 0x04
+
+# Immediates of the instructions allowed in constant expressions
+_CONST_END = 0x0B
+_CONST_SLEB_IMMEDIATES = (0x41, 0x42)  # i32.const, i64.const
+_CONST_ULEB_IMMEDIATES = (0x23, 0xD2)  # global.get, ref.func
+_CONST_FIXED_IMMEDIATES = {0x43: 4, 0x44: 8, 0xD0: 1}  # f32, f64, ref.null
+_CONST_SIMD_PREFIX = 0xFD  # followed by v128.const and 16 bytes
+_CONST_ARITHMETIC = (0x6A, 0x6B, 0x6C, 0x7C, 0x7D, 0x7E)  # extended constants
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class WasmMemoryLimits:
+    """WasmMemoryLimits is a dataclass that holds the limits of a Wasm memory.
+
+    Args:
+        minimum (int): The initial size of the memory in pages.
+        maximum (Optional[int]): The maximum size of the memory in pages.
+        shared (bool): Whether the memory is shared between threads.
+        is_64 (bool): Whether the memory is indexed with 64-bit addresses.
+    """
+
+    minimum: int
+    maximum: Optional[int] = None
+    shared: bool = False
+    is_64: bool = False
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class WasmImport:
+    """WasmImport is a dataclass that holds an import of a Wasm module.
+
+    Args:
+        module (str): The module the item is imported from.
+        name (str): The name of the imported item.
+        kind (str): The external kind of the item, one of `EXTERN_KINDS`.
+        memory_limits (Optional[WasmMemoryLimits]): The limits\
+            of an imported memory.
+    """
+
+    module: str
+    name: str
+    kind: str
+    memory_limits: Optional[WasmMemoryLimits] = None
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class WasmExport:
+    """WasmExport is a dataclass that holds an export of a Wasm module.
+
+    Args:
+        name (str): The name of the exported item.
+        kind (str): The external kind of the item, one of `EXTERN_KINDS`.
+        index (int): The index of the item in its index space.
+    """
+
+    name: str
+    kind: str
+    index: int
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class WasmGlobal:
+    """WasmGlobal is a dataclass that holds a global defined by a Wasm module.
+
+    Args:
+        index (int): The index of the global in the global index space,\
+            which starts with the imported globals.
+        value_type (str): The value type of the global, one of `VALUE_TYPES`.
+        mutable (bool): Whether the global is mutable.
+    """
+
+    index: int
+    value_type: str
+    mutable: bool
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class WasmCustomSection:
+    """WasmCustomSection is a dataclass that holds a custom section of a Wasm module.
+
+    Args:
+        name (str): The name of the section.
+        data (bytes): The payload of the section following its name.
+    """
+
+    name: str
+    data: bytes
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class WasmModuleInfo:
+    """WasmModuleInfo is a dataclass that holds the structure of a Wasm module.
+
+    Args:
+        imports (List[WasmImport]): The imports of the module.
+        exports (List[WasmExport]): The exports of the module.
+        memories (List[WasmMemoryLimits]): The limits of the memories\
+            defined by the module.
+        globals (List[WasmGlobal]): The globals defined by the module.
+        start (Optional[int]): The index of the start function of the module.
+        custom_sections (List[WasmCustomSection]): The custom sections\
+            of the module.
+    """
+
+    imports: List[WasmImport] = field(default_factory=list[WasmImport])
+    exports: List[WasmExport] = field(default_factory=list[WasmExport])
+    memories: List[WasmMemoryLimits] = field(default_factory=list[WasmMemoryLimits])
+    globals: List[WasmGlobal] = field(default_factory=list[WasmGlobal])
+    start: Optional[int] = None
+    custom_sections: List[WasmCustomSection] = field(
+        default_factory=list[WasmCustomSection]
+    )
+
+    def get_import(self, module: str, name: str) -> Optional[WasmImport]:
+        """Get an import of the module by its module and name."""
+        for item in self.imports:
+            if item.module == module and item.name == name:
+                return item
+        return None
+
+    def get_export(self, name: str) -> Optional[WasmExport]:
+        """Get an export of the module by its name."""
+        for item in self.exports:
+            if item.name == name:
+                return item
+        return None
+
+    def get_custom_sections(self, name: str) -> List[WasmCustomSection]:
+        """Get the custom sections of the module with the given name."""
+        return [section for section in self.custom_sections if section.name == name]
+
+
+class _Reader:
+    """Cursor over the bytes of a Wasm module."""
+
+    data: memoryview
+    offset: int
+
+    def __init__(self, data: memoryview, offset: int = 0):
+        self.data = data
+        self.offset = offset
+
+    def read_byte(self) -> int:
+        """Read a single byte."""
+        if self.offset >= len(self.data):
+            raise WasmModuleError(
+                f"Unexpected end of the Wasm module at offset {self.offset}"
+            )
+        value = self.data[self.offset]
+        self.offset += 1
+        return value
+
+    def read_bytes(self, length: int) -> memoryview:
+        """Read a view of the next bytes without copying them."""
+        end = self.offset + length
+        if end > len(self.data):
+            raise WasmModuleError(
+                f"Unexpected end of the Wasm module at offset {self.offset}"
+            )
+        value = self.data[self.offset : end]
+        self.offset = end
+        return value
+
+    def read_uleb128(self, max_bits: int = 32) -> int:
+        """Read an unsigned LEB128 integer of at most max_bits bits."""
+        result = 0
+        shift = 0
+        while True:
+            byte = self.read_byte()
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+            if shift >= max_bits + 7:
+                raise WasmModuleError(
+                    f"Malformed LEB128 integer at offset {self.offset}"
+                )
+        if result >= 1 << max_bits:
+            raise WasmModuleError(f"Integer too large at offset {self.offset}")
+        return result
+
+    def read_name(self) -> str:
+        """Read a length prefixed UTF-8 name."""
+        length = self.read_uleb128()
+        try:
+            return str(self.read_bytes(length), "utf-8")
+        except UnicodeDecodeError as err:
+            raise WasmModuleError(
+                f"Malformed UTF-8 name at offset {self.offset - length}"
+            ) from err
+
+    def read_sleb128(self, max_bits: int = 64) -> None:
+        """Skip a signed LEB128 integer of at most max_bits bits."""
+        for _ in range((max_bits + 6) // 7):
+            if not self.read_byte() & 0x80:
+                return
+        raise WasmModuleError(f"Malformed LEB128 integer at offset {self.offset}")
+
+    def read_const_expr(self) -> None:
+        """Skip a constant expression, such as the initializer of a global."""
+        while True:
+            opcode = self.read_byte()
+            if opcode == _CONST_END:
+                return
+            if opcode in _CONST_SLEB_IMMEDIATES:
+                self.read_sleb128()
+            elif opcode in _CONST_ULEB_IMMEDIATES:
+                self.read_uleb128()
+            elif opcode in _CONST_FIXED_IMMEDIATES:
+                self.read_bytes(_CONST_FIXED_IMMEDIATES[opcode])
+            elif opcode == _CONST_SIMD_PREFIX:
+                self.read_uleb128()
+                self.read_bytes(16)
+            elif opcode not in _CONST_ARITHMETIC:
+                raise WasmModuleError(
+                    f"Unexpected instruction {opcode:#x} in a constant expression"
+                    f" at offset {self.offset - 1}"
+                )
+
+    def read_value_type(self) -> str:
+        """Read a value type."""
+        value_type = self.read_byte()
+        if value_type not in VALUE_TYPES:
+            raise WasmModuleError(
+                f"Unknown value type {value_type:#x} at offset {self.offset - 1}"
+            )
+        return VALUE_TYPES[value_type]
+
+    def read_limits(self) -> Tuple[int, int, Optional[int]]:
+        """Read the flags, minimum and maximum of table or memory limits."""
+        flags = self.read_byte()
+        max_bits = 64 if flags & _LIMITS_MEMORY64 else 32
+        minimum = self.read_uleb128(max_bits)
+        maximum = self.read_uleb128(max_bits) if flags & _LIMITS_HAS_MAX else None
+        return flags, minimum, maximum
+
+    def read_memory_limits(self) -> WasmMemoryLimits:
+        """Read the limits of a memory."""
+        flags, minimum, maximum = self.read_limits()
+        return WasmMemoryLimits(
+            minimum=minimum,
+            maximum=maximum,
+            shared=bool(flags & _LIMITS_SHARED),
+            is_64=bool(flags & _LIMITS_MEMORY64),
+        )
+
+
+def _read_import(reader: _Reader) -> WasmImport:
+    module = reader.read_name()
+    name = reader.read_name()
+    kind = reader.read_byte()
+    memory_limits = None
+    if kind == 0:
+        reader.read_uleb128()  # type index
+    elif kind == 1:
+        reader.read_byte()  # reference type
+        reader.read_limits()
+    elif kind == 2:
+        memory_limits = reader.read_memory_limits()
+    elif kind == 3:
+        reader.read_byte()  # value type
+        reader.read_byte()  # mutability
+    elif kind == 4:
+        reader.read_byte()  # attribute
+        reader.read_uleb128()  # type index
+    else:
+        raise WasmModuleError(f"Unknown import kind {kind} for {module}.{name}")
+    return WasmImport(
+        module=module, name=name, kind=EXTERN_KINDS[kind], memory_limits=memory_limits
+    )
+
+
+def _read_global(reader: _Reader, index: int) -> WasmGlobal:
+    value_type = reader.read_value_type()
+    mutable = bool(reader.read_byte())
+    reader.read_const_expr()
+    return WasmGlobal(index=index, value_type=value_type, mutable=mutable)
+
+
+def _read_export(reader: _Reader) -> WasmExport:
+    name = reader.read_name()
+    kind = reader.read_byte()
+    if kind >= len(EXTERN_KINDS):
+        raise WasmModuleError(f"Unknown export kind {kind} for {name}")
+    return WasmExport(name=name, kind=EXTERN_KINDS[kind], index=reader.read_uleb128())
+
+
+def parse_wasm_module(wasm_module: WasmModuleBuffer) -> WasmModuleInfo:
+    """Extract the imports, exports, memories, globals, start function\
+        and custom sections of a Wasm module.
+
+    The module is read in a single pass. The sections that aren't needed,\
+        such as the code section, are skipped without being copied.
+
+    Args:
+        wasm_module (WasmModuleBuffer): The Wasm module.
+
+    Raises:
+        WasmModuleError: If the module is malformed.
+
+    Returns:
+        WasmModuleInfo: The structure of the module.
+
+    Examples:
+        >>> from wasmtime import wat2wasm
+        >>> info = parse_wasm_module(
+        ...     wat2wasm('(module (import "env" "memory" (memory 256 512)))')
+        ... )
+        >>> info.get_import("env", "memory").memory_limits
+        WasmMemoryLimits(minimum=256, maximum=512, shared=False, is_64=False)
+    """
+    reader = _Reader(memoryview(wasm_module))
+    if bytes(reader.read_bytes(4)) != WASM_MAGIC:
+        raise WasmModuleError("Expected a Wasm module, the magic number is missing")
+    if bytes(reader.read_bytes(4)) != WASM_VERSION:
+        raise WasmModuleError("Unsupported Wasm binary format version")
+
+    info = WasmModuleInfo()
+    start: Optional[int] = None
+    while reader.offset < len(reader.data):
+        section_id = reader.read_byte()
+        size = reader.read_uleb128()
+        section = _Reader(reader.read_bytes(size))
+
+        if section_id == CUSTOM_SECTION_ID:
+            name = section.read_name()
+            info.custom_sections.append(
+                WasmCustomSection(name=name, data=bytes(section.data[section.offset :]))
+            )
+        elif section_id == IMPORT_SECTION_ID:
+            info.imports.extend(
+                _read_import(section) for _ in range(section.read_uleb128())
+            )
+        elif section_id == MEMORY_SECTION_ID:
+            info.memories.extend(
+                section.read_memory_limits() for _ in range(section.read_uleb128())
+            )
+        elif section_id == GLOBAL_SECTION_ID:
+            # Defined globals are numbered after the imported ones
+            first_index = sum(1 for item in info.imports if item.kind == "global")
+            info.globals.extend(
+                _read_global(section, first_index + index)
+                for index in range(section.read_uleb128())
+            )
+        elif section_id == EXPORT_SECTION_ID:
+            info.exports.extend(
+                _read_export(section) for _ in range(section.read_uleb128())
+            )
+        elif section_id == START_SECTION_ID:
+            start = section.read_uleb128()
+    return info if start is None else replace(info, start=start)
+
+
+_module_infos: OrderedDict[str, WasmModuleInfo] = OrderedDict()
+_module_infos_lock = Lock()
+
+
+def get_wasm_module_info(
+    wasm_module: WasmModuleBuffer, module_hash: str
+) -> WasmModuleInfo:
+    """Get the structure of a Wasm module, parsing it once per module hash.
+
+    Args:
+        wasm_module (WasmModuleBuffer): The Wasm module.
+        module_hash (str): The content hash of the Wasm module.
+
+    Raises:
+        WasmModuleError: If the module is malformed.
+
+    Returns:
+        WasmModuleInfo: The structure of the module.
+    """
+    with _module_infos_lock:
+        info = _module_infos.get(module_hash)
+        if info is not None:
+            _module_infos.move_to_end(module_hash)
+            return info
+
+    info = parse_wasm_module(wasm_module)
+
+    with _module_infos_lock:
+        _module_infos[module_hash] = info
+        while len(_module_infos) > DEFAULT_MODULE_CACHE_SIZE:
+            _module_infos.popitem(last=False)
+    return info
+
+
+__all__ = [
+    "EXTERN_KINDS",
+    "VALUE_TYPES",
+    "WasmCustomSection",
+    "WasmExport",
+    "WasmGlobal",
+    "WasmImport",
+    "WasmMemoryLimits",
+    "WasmModuleInfo",
+    "get_wasm_module_info",
+    "parse_wasm_module",
+]
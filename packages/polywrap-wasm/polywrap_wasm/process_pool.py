@@ -0,0 +1,460 @@
+"""This module contains the ProcessPoolWasmExecutor for running Wasm wrappers\
+    in worker processes."""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from queue import Empty, Queue
+from threading import Lock, local
+from typing import Any, List, Optional, Set, Tuple
+
+from polywrap_core import Invoker, Uri, UriResolutionContext, WrapAbortError, WrapError
+from polywrap_msgpack import msgpack_encode
+from wasmtime import Trap
+
+from .budget import ExecutionBudget, ExecutionMeter
+from .exports import WrapExports
+from .instance import WasmInstanceTemplate
+from .mapped_file_reader import WasmModuleBuffer
+from .module_cache import ModuleCache, get_module_cache
+from .runtime_config import WasmRuntimeConfig
+from .types.state import State, WasmInvokeOptions
+
+# Messages exchanged with the workers are tuples starting with their kind.
+_INVOKE = "invoke"
+_SUBINVOKE = "subinvoke"
+_GET_IMPLEMENTATIONS = "get_implementations"
+_RESULT = "result"
+_ERROR = "error"
+_MISSING_MODULE = "missing_module"
+_CLOSE = "close"
+
+
+class _WorkerHandle:
+    """Parent side of a worker process."""
+
+    process: BaseProcess
+    connection: Connection
+    module_hashes: Set[str]
+
+    def __init__(self, process: BaseProcess, connection: Connection):
+        self.process = process
+        self.connection = connection
+        self.module_hashes = set()
+
+    def close(self) -> None:
+        """Ask the worker to exit and wait for it."""
+        try:
+            self.connection.send((_CLOSE,))
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+
+
+class ProcessPoolWasmExecutor:
+    """ProcessPoolWasmExecutor runs Wasm wrapper invocations in worker processes.
+
+    Wasm execution holds the GIL, so a single process runs one invocation\
+        at a time. Invocations routed to the executor run in one of its\
+        worker processes instead, so invocations made from different threads\
+        run in parallel. Each worker keeps the modules it has compiled\
+        in a bounded module cache, so a module is only sent to and compiled\
+        by a worker again once the worker evicted it.
+
+    Subinvocations and get implementations calls made by the wrapper\
+        are sent back to the parent process over the worker pipe\
+        and handled by the client of the invocation. Invocations routed\
+        to the executor while a thread handles such a call run in that\
+        thread instead, since its worker waits for them and may be the only one.
+
+    Args:
+        max_workers (Optional[int]): The maximum number of worker processes.\
+            Defaults to the number of CPUs.
+        runtime_config (Optional[WasmRuntimeConfig]): The configuration\
+            of the engine of the workers.
+    """
+
+    max_workers: int
+    runtime_config: Optional[WasmRuntimeConfig]
+    _idle: Queue[_WorkerHandle]
+    _workers: List[_WorkerHandle]
+    _lock: Lock
+    _closed: bool
+    _serving: local
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        runtime_config: Optional[WasmRuntimeConfig] = None,
+    ):
+        """Initialize a new ProcessPoolWasmExecutor instance."""
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError(
+                f"max_workers must be a positive integer, got {max_workers}"
+            )
+        self.max_workers = max_workers
+        self.runtime_config = runtime_config
+        self._idle = Queue()
+        self._workers = []
+        self._lock = Lock()
+        self._closed = False
+        self._serving = local()
+
+    def invoke(
+        self,
+        wasm_module: WasmModuleBuffer,
+        module_hash: str,
+        invoke_options: WasmInvokeOptions,
+        client: Optional[Invoker],
+        budget: Optional[ExecutionBudget] = None,
+    ) -> Tuple[bytes, Optional[int]]:
+        """Run an invocation of a Wasm module in a worker process.
+
+        Args:
+            wasm_module (WasmModuleBuffer): The Wasm module of the wrapper.
+            module_hash (str): The content hash of the Wasm module.
+            invoke_options (WasmInvokeOptions): The options of the invocation\
+                with the encoded args and env.
+            client (Optional[Invoker]): The invoker handling\
+                the subinvocations.
+            budget (Optional[ExecutionBudget]): The execution budget\
+                of the invocation, enforced by the worker.
+
+        Raises:
+            WrapAbortError: If the invocation failed or the worker died.
+
+        Returns:
+            Tuple[bytes, Optional[int]]: The msgpack encoded result\
+                of the invocation and the fuel it consumed, if the engine\
+                of the workers consumes fuel.
+        """
+        if getattr(self._serving, "depth", 0):
+            return self._invoke_inline(
+                wasm_module, module_hash, invoke_options, client, budget
+            )
+
+        worker = self._acquire_worker()
+        try:
+            kind, result = self._invoke_worker(
+                worker, wasm_module, module_hash, invoke_options, client, budget
+            )
+        except (EOFError, OSError) as err:
+            self._discard_worker(worker)
+            raise WrapAbortError(
+                invoke_options, "The Wasm worker process exited unexpectedly"
+            ) from err
+        except BaseException:
+            # The worker may be in the middle of the exchange, don't reuse it
+            self._discard_worker(worker)
+            raise
+        self._idle.put(worker)
+
+        if kind == _ERROR:
+            raise WrapAbortError(invoke_options, result)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop all the worker processes."""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self) -> ProcessPoolWasmExecutor:
+        """Enter the executor context."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Shut the executor down when leaving its context."""
+        self.shutdown()
+
+    def _acquire_worker(self) -> _WorkerHandle:
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise WrapError("The executor is shut down")
+                if self._idle.empty() and len(self._workers) < self.max_workers:
+                    worker = self._spawn_worker()
+                    self._workers.append(worker)
+                    return worker
+            try:
+                # Wake up regularly in case a discarded worker can be replaced
+                return self._idle.get(timeout=0.1)
+            except Empty:
+                continue
+
+    def _spawn_worker(self) -> _WorkerHandle:
+        context = multiprocessing.get_context("spawn")
+        parent_connection, worker_connection = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(worker_connection, self.runtime_config),
+            daemon=True,
+        )
+        process.start()
+        worker_connection.close()
+        return _WorkerHandle(process, parent_connection)
+
+    def _discard_worker(self, worker: _WorkerHandle) -> None:
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.close()
+
+    def _invoke_inline(
+        self,
+        wasm_module: WasmModuleBuffer,
+        module_hash: str,
+        invoke_options: WasmInvokeOptions,
+        client: Optional[Invoker],
+        budget: Optional[ExecutionBudget],
+    ) -> Tuple[bytes, Optional[int]]:
+        """Run an invocation in the calling thread, like a worker would."""
+        if client is None:
+            raise WrapAbortError(
+                invoke_options, "Expected invoker to be defined got None"
+            )
+        module_cache = get_module_cache(self.runtime_config)
+        template = module_cache.get_shared(
+            module_hash,
+            WasmInstanceTemplate,
+            lambda: WasmInstanceTemplate(wasm_module, module_cache, module_hash),
+        )
+        try:
+            return _run_invocation(
+                template,
+                module_cache.runtime_config,
+                client,
+                str(invoke_options.uri),
+                invoke_options.method,
+                invoke_options.encoded_args,
+                invoke_options.encoded_env,
+                budget,
+            )
+        except WrapAbortError:
+            raise
+        except Exception as err:
+            raise WrapAbortError(invoke_options, _get_error_message(err)) from err
+
+    def _invoke_worker(
+        self,
+        worker: _WorkerHandle,
+        wasm_module: WasmModuleBuffer,
+        module_hash: str,
+        invoke_options: WasmInvokeOptions,
+        client: Optional[Invoker],
+        budget: Optional[ExecutionBudget],
+    ) -> Tuple[str, Any]:
+        known_module = module_hash in worker.module_hashes
+        invocation = (
+            str(invoke_options.uri),
+            invoke_options.method,
+            invoke_options.encoded_args,
+            invoke_options.encoded_env,
+            budget,
+        )
+        worker.connection.send(
+            (
+                _INVOKE,
+                module_hash,
+                None if known_module else bytes(wasm_module),
+                *invocation,
+            )
+        )
+
+        while True:
+            message = worker.connection.recv()
+            if message[0] == _MISSING_MODULE:
+                # The worker evicted the module since it compiled it
+                worker.module_hashes.discard(module_hash)
+                worker.connection.send(
+                    (_INVOKE, module_hash, bytes(wasm_module), *invocation)
+                )
+                continue
+            if message[0] in (_RESULT, _ERROR):
+                kind, result, module_loaded = message
+                # The worker only keeps the module once it compiled it
+                if module_loaded:
+                    worker.module_hashes.add(module_hash)
+                return kind, result
+            self._serving.depth = getattr(self._serving, "depth", 0) + 1
+            try:
+                reply = _handle_worker_request(message, client)
+            finally:
+                self._serving.depth -= 1
+            worker.connection.send(reply)
+
+
+def _handle_worker_request(
+    message: Tuple[Any, ...], client: Optional[Invoker]
+) -> Tuple[Any, ...]:
+    """Handle a call made by the wrapper running in a worker."""
+    try:
+        if client is None:
+            raise WrapError("Expected invoker to be defined got None")
+        if message[0] == _SUBINVOKE:
+            _, uri, method, args = message
+            result = client.invoke(
+                uri=Uri.from_str(uri),
+                method=method,
+                args=args,
+                encode_result=True,
+            )
+            if not isinstance(result, bytes):
+                result = msgpack_encode(result)
+            return (_RESULT, result)
+        if message[0] == _GET_IMPLEMENTATIONS:
+            _, uri, apply_resolution = message
+            implementations = client.get_implementations(
+                Uri.from_str(uri), apply_resolution
+            )
+            return (
+                _RESULT,
+                None
+                if implementations is None
+                else [str(implementation) for implementation in implementations],
+            )
+        raise WrapError(f"Unexpected message from the Wasm worker: {message[0]}")
+    except Exception as err:  # pylint: disable=broad-except
+        return (_ERROR, _get_error_message(err))
+
+
+def _get_error_message(err: Exception) -> str:
+    if isinstance(err, WrapAbortError):
+        return err.message
+    return f"{err.__class__.__name__}: {err}"
+
+
+class _PipeInvoker(Invoker):
+    """Worker side invoker sending the calls of the wrapper to the parent."""
+
+    connection: Connection
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+
+    def invoke(
+        self,
+        uri: Uri,
+        method: str,
+        args: Optional[Any] = None,
+        env: Optional[Any] = None,
+        resolution_context: Optional[UriResolutionContext] = None,
+        encode_result: Optional[bool] = False,
+    ) -> Any:
+        encoded_args = args if isinstance(args, bytes) else msgpack_encode(args)
+        return self._call((_SUBINVOKE, str(uri), method, encoded_args))
+
+    def get_implementations(
+        self, uri: Uri, apply_resolution: bool = True
+    ) -> Optional[List[Uri]]:
+        implementations = self._call((_GET_IMPLEMENTATIONS, str(uri), apply_resolution))
+        if implementations is None:
+            return None
+        return [Uri.from_str(implementation) for implementation in implementations]
+
+    def _call(self, message: Tuple[Any, ...]) -> Any:
+        self.connection.send(message)
+        kind, value = self.connection.recv()
+        if kind == _ERROR:
+            raise WrapError(value)
+        return value
+
+
+def _worker_main(
+    connection: Connection, runtime_config: Optional[WasmRuntimeConfig]
+) -> None:
+    """Serve invocations sent by the parent process until it closes the pipe."""
+    module_cache = ModuleCache(runtime_config=runtime_config)
+    invoker = _PipeInvoker(connection)
+
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return
+        if message[0] == _CLOSE:
+            return
+
+        _, module_hash, wasm_module, *invocation = message
+        try:
+            template = _get_template(module_cache, module_hash, wasm_module)
+            reply: Tuple[Any, ...] = (
+                _RESULT,
+                _run_invocation(
+                    template, module_cache.runtime_config, invoker, *invocation
+                ),
+            )
+        except _MissingModuleError:
+            connection.send((_MISSING_MODULE,))
+            continue
+        except Exception as err:  # pylint: disable=broad-except
+            reply = (_ERROR, _get_error_message(err))
+        connection.send((*reply, module_hash in module_cache))
+
+
+class _MissingModuleError(Exception):
+    """Raised by a worker asked to run a module it doesn't have anymore."""
+
+
+def _get_template(
+    module_cache: ModuleCache, module_hash: str, wasm_module: Optional[bytes]
+) -> WasmInstanceTemplate:
+    """Get the template of a module from the bounded cache of the worker."""
+
+    def create_template() -> WasmInstanceTemplate:
+        if wasm_module is None:
+            raise _MissingModuleError(module_hash)
+        return WasmInstanceTemplate(wasm_module, module_cache, module_hash)
+
+    return module_cache.get_shared(module_hash, WasmInstanceTemplate, create_template)
+
+
+def _run_invocation(  # pylint: disable=too-many-locals
+    template: WasmInstanceTemplate,
+    runtime_config: Optional[WasmRuntimeConfig],
+    invoker: Invoker,
+    uri: str,
+    method: str,
+    encoded_args: bytes,
+    encoded_env: bytes,
+    budget: Optional[ExecutionBudget],
+) -> Tuple[bytes, Optional[int]]:
+    """Run an invocation in a worker and return its encoded result\
+        and the fuel it consumed."""
+    state = State(
+        invoke_options=WasmInvokeOptions(
+            uri=Uri.from_str(uri),
+            method=method,
+            encoded_args=encoded_args,
+            encoded_env=encoded_env,
+        )
+    )
+    store, instance = template.instantiate(state, invoker)
+    exports = WrapExports(instance, store)
+    meter = ExecutionMeter(store, runtime_config, budget)
+    try:
+        result = exports.__wrap_invoke__(
+            len(method), len(encoded_args), len(encoded_env)
+        )
+    except Trap as err:
+        exceeded_limit = meter.get_exceeded_limit()
+        if exceeded_limit:
+            raise WrapAbortError(
+                state.invoke_options, f"The invocation {exceeded_limit}"
+            ) from err
+        raise
+    if result and state.invoke_result and state.invoke_result.result:
+        return state.invoke_result.result, meter.get_fuel_consumed()
+    raise WrapAbortError(state.invoke_options, "Expected a result from the Wasm module")
+
+
+__all__ = ["ProcessPoolWasmExecutor"]
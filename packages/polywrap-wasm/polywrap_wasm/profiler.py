@@ -0,0 +1,144 @@
+"""This module contains the WasmProfiler for measuring where the time\
+    of Wasm invocations is spent."""
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, TextIO, Tuple, Union
+
+from .types.invocation_profile import InvocationProfile
+
+_WRAP_INVOKE_FRAME = "_wrap_invoke"
+_MICROSECONDS = 1_000_000
+
+
+class WasmProfiler:
+    """WasmProfiler aggregates the profiles of Wasm invocations.
+
+    Invocations are profiled by wrapper URI and method. Each profile splits\
+        the invocation time into args and env encoding, module compilation,\
+        instantiation, guest code and every host import called by the guest,\
+        along with the number of calls and the bytes copied by the imports.
+
+    Invocations run by a ProcessPoolWasmExecutor are only measured as a whole,\
+        since their imports are called in the worker processes.
+
+    Examples:
+        >>> profiler = WasmProfiler()
+        >>> profiler.get_profiles()
+        []
+    """
+
+    _profiles: Dict[Tuple[str, str], InvocationProfile]
+    _lock: Lock
+
+    def __init__(self):
+        """Initialize a new WasmProfiler instance."""
+        self._profiles = {}
+        self._lock = Lock()
+
+    def record(self, profile: InvocationProfile) -> None:
+        """Add the profile of a finished invocation to the aggregates.
+
+        Args:
+            profile (InvocationProfile): The profile of the invocation.
+        """
+        key = (str(profile.uri), profile.method)
+        profile.current_import = None
+        with self._lock:
+            aggregate = self._profiles.get(key)
+            if aggregate is None:
+                # Start from a fresh aggregate, the profile belongs to the caller
+                aggregate = self._profiles[key] = InvocationProfile(
+                    uri=profile.uri, method=profile.method, invocations=0
+                )
+            aggregate.merge(profile)
+
+    def get_profiles(self) -> List[InvocationProfile]:
+        """Get a snapshot of the aggregated profiles, one per wrapper method."""
+        with self._lock:
+            snapshot: List[InvocationProfile] = []
+            for aggregate in self._profiles.values():
+                profile = InvocationProfile(
+                    uri=aggregate.uri, method=aggregate.method, invocations=0
+                )
+                profile.merge(aggregate)
+                snapshot.append(profile)
+            return snapshot
+
+    def get_folded_stacks(self) -> List[str]:
+        """Get the profiles in the folded stacks format read by flamegraph tools.
+
+        Each line is a semicolon separated stack followed by the time spent\
+            in its last frame, in microseconds. The guest code is the\
+            `_wrap_invoke` frame and the host imports are its children.
+
+        Returns:
+            List[str]: The lines of the folded stacks.
+        """
+        lines: List[str] = []
+        for profile in self.get_profiles():
+            root = f"{profile.uri};{profile.method}"
+            frames = [
+                ("encode", profile.encode_time),
+                ("compile", profile.compile_time),
+                ("instantiate", profile.instantiate_time),
+                (_WRAP_INVOKE_FRAME, profile.guest_time),
+            ]
+            frames.extend(
+                (f"{_WRAP_INVOKE_FRAME};{name}", import_profile.total_time)
+                for name, import_profile in sorted(profile.imports.items())
+            )
+            lines.extend(
+                f"{root};{frame} {round(duration * _MICROSECONDS)}"
+                for frame, duration in frames
+                if round(duration * _MICROSECONDS) > 0
+            )
+        return lines
+
+    def write_folded_stacks(self, output: Union[str, Path, TextIO]) -> None:
+        """Write the profiles in the folded stacks format read by flamegraph tools.
+
+        Args:
+            output (Union[str, Path, TextIO]): The path of the file to write\
+                or an open text file.
+        """
+        content = "".join(f"{line}\n" for line in self.get_folded_stacks())
+        if isinstance(output, (str, Path)):
+            Path(output).write_text(content, encoding="utf-8")
+        else:
+            output.write(content)
+
+    def clear(self) -> None:
+        """Discard all the recorded profiles."""
+        with self._lock:
+            self._profiles.clear()
+
+
+_default_profiler: Optional[WasmProfiler] = None
+
+
+def get_profiler() -> Optional[WasmProfiler]:
+    """Get the process-wide profiler used by Wasm wrappers by default.
+
+    Returns:
+        Optional[WasmProfiler]: The process-wide profiler or None\
+            if profiling is disabled.
+    """
+    return _default_profiler
+
+
+def set_profiler(profiler: Optional[WasmProfiler]) -> None:
+    """Enable or disable profiling for all the Wasm wrappers of the process.
+
+    Wrappers given their own profiler keep using it.
+
+    Args:
+        profiler (Optional[WasmProfiler]): The process-wide profiler,\
+            or None to disable profiling.
+    """
+    global _default_profiler  # pylint: disable=global-statement
+    _default_profiler = profiler
+
+
+__all__ = ["WasmProfiler", "get_profiler", "set_profiler"]
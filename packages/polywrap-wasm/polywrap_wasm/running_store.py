@@ -0,0 +1,57 @@
+"""This module keeps track of the stores running Wasm code in each thread."""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Generator, List
+
+from wasmtime import Store
+
+from .errors import WasmError
+
+_local = threading.local()
+
+
+def _get_running_stores() -> List[Store]:
+    stores: List[Store] = _local.__dict__.setdefault("stores", [])
+    return stores
+
+
+@contextmanager
+def run_in_store(store: Store) -> Generator[Store, None, None]:
+    """Mark the store as running Wasm code in the current thread.
+
+    Every call into a Wasm instance must be made in this context so that\
+        the host functions it calls can find the store they're called from.\
+        Calls nest, as a subinvocation runs another store from a host function.
+
+    Args:
+        store (Store): The store of the called instance.
+
+    Returns:
+        Generator[Store, None, None]: The running store.
+    """
+    stores = _get_running_stores()
+    stores.append(store)
+    try:
+        yield store
+    finally:
+        stores.pop()
+
+
+def get_running_store() -> Store:
+    """Get the store running Wasm code in the current thread.
+
+    Returns:
+        Store: The store of the innermost call into a Wasm instance.
+
+    Raises:
+        WasmError: If no store is running Wasm code in the current thread.
+    """
+    stores = _get_running_stores()
+    if not stores:
+        raise WasmError("Host function called outside of a Wasm store call.")
+    return stores[-1]
+
+
+__all__ = ["run_in_store", "get_running_store"]
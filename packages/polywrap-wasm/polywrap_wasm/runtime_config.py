@@ -0,0 +1,116 @@
+"""This module contains the WasmRuntimeConfig for tuning the wasmtime engine."""
+from __future__ import annotations
+
+from dataclasses import astuple, dataclass, fields
+from threading import Lock
+from typing import Dict, Literal
+
+from wasmtime import Config, Engine
+
+OptLevel = Literal["none", "speed", "speed_and_size"]
+Strategy = Literal["auto", "cranelift"]
+Profiler = Literal["none", "jitdump"]
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class WasmRuntimeConfig:  # pylint: disable=too-many-instance-attributes
+    """WasmRuntimeConfig is a dataclass that holds the wasmtime engine options.
+
+    Each distinct configuration is backed by a single engine shared by\
+        all the modules compiled and instantiated with it.
+
+    Args:
+        cranelift_opt_level (OptLevel): The optimization level of the\
+            generated code. Lower levels compile faster and run slower.
+        parallel_compilation (bool): Whether the functions of a module\
+            are compiled in parallel.
+        strategy (Strategy): The compilation strategy.
+        debug_info (bool): Whether DWARF debug information is emitted.
+        profiler (Profiler): The profiler the generated code reports to.
+        cranelift_debug_verifier (bool): Whether the generated code\
+            is checked by the Cranelift verifier. Slows down compilation.
+        wasm_simd (bool): Whether the SIMD proposal is enabled.
+        wasm_bulk_memory (bool): Whether the bulk memory proposal is enabled.
+        wasm_reference_types (bool): Whether the reference types proposal\
+            is enabled.
+        wasm_multi_value (bool): Whether the multi value proposal is enabled.
+        consume_fuel (bool): Whether the generated code consumes fuel,\
+            which is required to set a fuel budget on invocations.
+        epoch_interruption (bool): Whether the generated code can be\
+            interrupted, which is required to set a timeout on invocations.
+
+    Examples:
+        >>> config = WasmRuntimeConfig.for_startup()
+        >>> config.cranelift_opt_level
+        'none'
+        >>> config.get_engine() is WasmRuntimeConfig.for_startup().get_engine()
+        True
+    """
+
+    cranelift_opt_level: OptLevel = "speed"
+    parallel_compilation: bool = True
+    strategy: Strategy = "auto"
+    debug_info: bool = False
+    profiler: Profiler = "none"
+    cranelift_debug_verifier: bool = False
+    wasm_simd: bool = True
+    wasm_bulk_memory: bool = True
+    wasm_reference_types: bool = True
+    wasm_multi_value: bool = True
+    consume_fuel: bool = False
+    epoch_interruption: bool = False
+
+    @classmethod
+    def for_startup(cls) -> WasmRuntimeConfig:
+        """Get a configuration compiling modules as fast as possible.
+
+        Suited to short-lived processes invoking wrappers a few times.
+        """
+        return cls(cranelift_opt_level="none")
+
+    @classmethod
+    def for_throughput(cls) -> WasmRuntimeConfig:
+        """Get a configuration generating the fastest code.
+
+        Suited to long-lived processes invoking wrappers many times.
+        """
+        return cls(cranelift_opt_level="speed_and_size")
+
+    @property
+    def engine_key(self) -> str:
+        """Get the identifier of the configuration used to key compiled artifacts."""
+        return ",".join(
+            f"{field.name}={value}" for field, value in zip(fields(self), astuple(self))
+        )
+
+    def create_config(self) -> Config:
+        """Create a new wasmtime config with the options of the configuration."""
+        config = Config()
+        config.cranelift_opt_level = self.cranelift_opt_level
+        config.parallel_compilation = self.parallel_compilation
+        config.strategy = self.strategy
+        config.debug_info = self.debug_info
+        config.profiler = self.profiler
+        config.cranelift_debug_verifier = self.cranelift_debug_verifier
+        config.wasm_simd = self.wasm_simd
+        config.wasm_bulk_memory = self.wasm_bulk_memory
+        config.wasm_reference_types = self.wasm_reference_types
+        config.wasm_multi_value = self.wasm_multi_value
+        config.consume_fuel = self.consume_fuel
+        config.epoch_interruption = self.epoch_interruption
+        return config
+
+    def get_engine(self) -> Engine:
+        """Get the engine shared by all the users of the configuration."""
+        with _engines_lock:
+            engine = _engines.get(self)
+            if engine is None:
+                engine = _engines[self] = Engine(self.create_config())
+            return engine
+
+
+_engines: Dict[WasmRuntimeConfig, Engine] = {}
+_engines_lock = Lock()
+
+
+__all__ = ["WasmRuntimeConfig"]
@@ -0,0 +1,458 @@
+"""This module contains the WasmSnapshotTemplate for creating Wasm instances\
+    from a snapshot of an initialized instance."""
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+from polywrap_core import Invoker
+from wasmtime import Func, Global, Instance, Module, Store
+
+from .buffer import read_bytes  # pyright: ignore[reportUnknownVariableType]
+from .buffer import write_bytes  # pyright: ignore[reportUnknownVariableType]
+from .errors import WasmSnapshotError
+from .imports import WrapImports
+from .instance import WasmInstanceTemplate
+from .mapped_file_reader import WasmModuleBuffer
+from .module_cache import ModuleCache, get_module_cache, hash_wasm_module
+from .module_info import _Reader  # pyright: ignore[reportPrivateUsage]
+from .module_info import (
+    EXPORT_SECTION_ID,
+    EXTERN_KINDS,
+    GLOBAL_SECTION_ID,
+    START_SECTION_ID,
+    WasmModuleInfo,
+    get_wasm_module_info,
+)
+from .running_store import run_in_store
+from .types.state import State
+
+WASM_PAGE_SIZE = 65536
+
+# Granularity of the memory diff, the size of a host page, so that restoring\
+# a snapshot only touches the host pages changed by the initialization
+_CHUNK_SIZE = 4096
+
+SNAPSHOT_START_EXPORT = "__polywrap_snapshot_start"
+"""Name of the export added for the start function of a snapshotted module."""
+
+SNAPSHOT_GLOBAL_EXPORT_PREFIX = "__polywrap_snapshot_global_"
+"""Prefix of the exports added for the mutable globals of a snapshotted module."""
+
+# Opcodes of the constant instructions initializing the snapshotted globals
+_CONST_OPCODES = {"i32": 0x41, "i64": 0x42, "f32": 0x43, "f64": 0x44}
+_CONST_END = 0x0B
+
+
+def get_snapshot_module_hash(module_hash: str) -> str:
+    """Get the key of the snapshotted module of a Wasm module in the module cache.
+
+    Args:
+        module_hash (str): The content hash of the Wasm module.
+
+    Returns:
+        str: The key of the module rewritten for snapshots.
+    """
+    return f"{module_hash}-snapshot"
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class SnapshotConfig:
+    """SnapshotConfig is a dataclass that holds the options of instance snapshots.
+
+    Snapshots are only safe for wrappers that don't rely on a fresh instance\
+        for every invocation when `after_first_invoke` is set, since the state\
+        left by the first invocation is copied to all the later instances.
+
+    Args:
+        after_first_invoke (bool): Whether the snapshot is taken once the first\
+            invocation succeeded instead of right after the start function,\
+            to keep the initialization the guest does lazily on first use.
+    """
+
+    after_first_invoke: bool = False
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class WasmInstanceSnapshot:
+    """WasmInstanceSnapshot is a dataclass that holds the state\
+        of an initialized Wasm instance.
+
+    Args:
+        memory_size (int): The size of the memory in bytes.
+        memory_chunks (List[Tuple[int, bytes]]): The ranges of the memory\
+            that differ from the memory of a new instance, by offset.
+        globals (Dict[int, Any]): The values of the mutable globals,\
+            by global index.
+    """
+
+    memory_size: int
+    memory_chunks: List[Tuple[int, bytes]] = field(
+        default_factory=list[Tuple[int, bytes]]
+    )
+    globals: Dict[int, Any] = field(default_factory=dict[int, Any])
+
+    @property
+    def memory_bytes(self) -> int:
+        """Get the number of memory bytes copied to every new instance."""
+        return sum(len(chunk) for _, chunk in self.memory_chunks)
+
+
+class WasmSnapshotTemplate(
+    WasmInstanceTemplate
+):  # pylint: disable=too-many-instance-attributes
+    """WasmSnapshotTemplate instantiates a Wasm module from a snapshot\
+        of its linear memory and globals taken after its initialization.
+
+    The module is compiled without its start section and with its mutable\
+        globals exported. The first instance runs the start function, then\
+        its memory and globals are captured. The captured globals become\
+        the initial values of the globals of a second compilation\
+        of the module, which the later instances are created from.\
+        They skip the start function and get the memory ranges changed\
+        by the initialization copied into their fresh memory.
+
+    Tables aren't part of the snapshot, so the initialization must not\
+        change them. Modules with mutable reference or vector globals\
+        can't be snapshotted.
+
+    Args:
+        wasm_module (WasmModuleBuffer): The Wasm module.
+        module_cache (Optional[ModuleCache]): The cache of compiled modules.\
+            Defaults to the process-wide module cache.
+        module_hash (Optional[str]): The precomputed content hash\
+            of the Wasm module, if known.
+        snapshot_config (Optional[SnapshotConfig]): The options\
+            of the snapshot.
+
+    Raises:
+        WasmModuleError: If the Wasm module is malformed.
+        WasmMemoryError: If the Wasm module doesn't import a memory\
+            the host can allocate.
+        WasmExportNotFoundError: If the Wasm module doesn't export\
+            the _wrap_invoke function.
+        WasmSnapshotError: If the Wasm module has globals that can't\
+            be snapshotted.
+    """
+
+    snapshot_config: SnapshotConfig
+    _wasm_module: WasmModuleBuffer
+    _source_info: WasmModuleInfo
+    _module_cache: ModuleCache
+    _start_export: Optional[str]
+    _global_exports: Dict[int, str]
+    _snapshot: Optional[WasmInstanceSnapshot]
+    _snapshot_module: Optional[Module]
+    _baseline: Optional[bytes]
+    _snapshot_lock: Lock
+
+    def __init__(
+        self,
+        wasm_module: WasmModuleBuffer,
+        module_cache: Optional[ModuleCache] = None,
+        module_hash: Optional[str] = None,
+        snapshot_config: Optional[SnapshotConfig] = None,
+    ):
+        """Initialize a new WasmSnapshotTemplate instance."""
+        module_cache = module_cache if module_cache is not None else get_module_cache()
+        module_hash = module_hash or hash_wasm_module(wasm_module)
+        self._wasm_module = wasm_module
+        self._source_info = get_wasm_module_info(wasm_module, module_hash)
+        self._module_cache = module_cache
+        (
+            snapshot_module,
+            self._start_export,
+            self._global_exports,
+        ) = create_snapshot_module(wasm_module, self._source_info)
+        super().__init__(
+            snapshot_module, module_cache, get_snapshot_module_hash(module_hash)
+        )
+        self.snapshot_config = snapshot_config or SnapshotConfig()
+        self._snapshot = None
+        self._snapshot_module = None
+        self._baseline = None
+        self._snapshot_lock = Lock()
+
+    @property
+    def snapshot(self) -> Optional[WasmInstanceSnapshot]:
+        """Get the snapshot of the instances, if it was taken."""
+        return self._snapshot
+
+    def instantiate(
+        self, state: State, invoker: Optional[Invoker]
+    ) -> Tuple[Store, Instance]:
+        """Instantiate the Wasm module for an invocation.
+
+        The instance is restored from the snapshot if it was taken,\
+            else it is initialized by running the start function.
+
+        Args:
+            state (State): The state of the invocation.
+            invoker (Optional[Invoker]): The invoker to use for subinvocations.
+
+        Returns:
+            Tuple[Store, Instance]: The store of the invocation\
+                and the Wasm instance.
+        """
+        snapshot, snapshot_module = self._snapshot, self._snapshot_module
+        if snapshot is not None and snapshot_module is not None:
+            return self._restore(snapshot, snapshot_module, state, invoker)
+
+        store, instance = self._instantiate(self.module, state, invoker)
+        memory = cast(WrapImports, store.data()).memory
+        baseline = read_bytes(memory.data_ptr(store), memory.data_len(store))
+        if self._start_export is not None:
+            start = instance.exports(store)[self._start_export]
+            with run_in_store(store):
+                cast(Func, start)(store)
+
+        if self.snapshot_config.after_first_invoke:
+            with self._snapshot_lock:
+                if self._baseline is None:
+                    self._baseline = baseline
+        else:
+            self._capture(store, instance, baseline)
+        return store, instance
+
+    def capture_after_invoke(self, store: Store, instance: Instance) -> None:
+        """Take the snapshot from an instance whose invocation succeeded,\
+            if the snapshot is taken after the first invocation.
+
+        Args:
+            store (Store): The store of the instance.
+            instance (Instance): The instance created by the template.
+        """
+        if not self.snapshot_config.after_first_invoke or self._snapshot is not None:
+            return
+        with self._snapshot_lock:
+            baseline = self._baseline
+        if baseline is not None:
+            self._capture(store, instance, baseline)
+
+    def _capture(self, store: Store, instance: Instance, baseline: bytes) -> None:
+        """Take the snapshot of an instance unless it was already taken."""
+        memory = cast(WrapImports, store.data()).memory
+        memory_size = memory.data_len(store)
+        content = read_bytes(memory.data_ptr(store), memory_size)
+        exports = instance.exports(store)
+        snapshot = WasmInstanceSnapshot(
+            memory_size=memory_size,
+            memory_chunks=_diff_memory(baseline, content),
+            globals={
+                index: cast(Global, exports[name]).value(store)
+                for index, name in self._global_exports.items()
+            },
+        )
+        snapshot_module, _, _ = create_snapshot_module(
+            self._wasm_module, self._source_info, snapshot.globals
+        )
+        module = self._module_cache.get_module(snapshot_module)
+
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                self._snapshot_module = module
+                self._snapshot = snapshot
+                self._baseline = None
+
+    def _restore(
+        self,
+        snapshot: WasmInstanceSnapshot,
+        snapshot_module: Module,
+        state: State,
+        invoker: Optional[Invoker],
+    ) -> Tuple[Store, Instance]:
+        """Create an instance initialized with the snapshot."""
+        store, instance = self._instantiate(snapshot_module, state, invoker)
+        memory = cast(WrapImports, store.data()).memory
+        missing_size = snapshot.memory_size - memory.data_len(store)
+        if missing_size > 0:
+            memory.grow(store, missing_size // WASM_PAGE_SIZE)
+
+        memory_pointer = memory.data_ptr(store)
+        memory_length = memory.data_len(store)
+        for offset, chunk in snapshot.memory_chunks:
+            write_bytes(memory_pointer, memory_length, chunk, offset)
+        return store, instance
+
+
+def create_snapshot_module(
+    wasm_module: WasmModuleBuffer,
+    module_info: WasmModuleInfo,
+    global_values: Optional[Dict[int, Any]] = None,
+) -> Tuple[bytes, Optional[str], Dict[int, str]]:
+    """Rewrite a Wasm module so that its instances can be snapshotted.
+
+    The start section is removed and the start function is exported instead,\
+        so that restored instances don't run it. The mutable globals that\
+        aren't exported are exported, so that their values can be captured.\
+        The other sections are copied as is, except the global section\
+        when the captured values of the globals are given.
+
+    Args:
+        wasm_module (WasmModuleBuffer): The Wasm module.
+        module_info (WasmModuleInfo): The structure of the Wasm module.
+        global_values (Optional[Dict[int, Any]]): The values to initialize\
+            the mutable globals with, by global index.
+
+    Raises:
+        WasmSnapshotError: If the Wasm module has mutable globals\
+            whose values can't be copied between instances.
+
+    Returns:
+        Tuple[bytes, Optional[str], Dict[int, str]]: The rewritten module,\
+            the export name of the start function, if any, and the export\
+            names of the mutable globals, by global index.
+    """
+    added_exports: List[Tuple[str, str, int]] = []
+    start_export: Optional[str] = None
+    if module_info.start is not None:
+        start_export = SNAPSHOT_START_EXPORT
+        added_exports.append((start_export, "func", module_info.start))
+
+    exported_globals = {
+        item.index: item.name for item in module_info.exports if item.kind == "global"
+    }
+    global_exports: Dict[int, str] = {}
+    for item in module_info.globals:
+        if not item.mutable:
+            continue
+        if item.value_type not in _CONST_OPCODES:
+            raise WasmSnapshotError(
+                f"Unable to snapshot the mutable {item.value_type} global {item.index}"
+            )
+        name = exported_globals.get(item.index)
+        if name is None:
+            name = f"{SNAPSHOT_GLOBAL_EXPORT_PREFIX}{item.index}"
+            added_exports.append((name, "global", item.index))
+        global_exports[item.index] = name
+
+    exports = [(item.name, item.kind, item.index) for item in module_info.exports]
+    exports.extend(added_exports)
+
+    reader = _Reader(memoryview(wasm_module), 8)
+    output = bytearray(wasm_module[:8])
+    while reader.offset < len(reader.data):
+        section_start = reader.offset
+        section_id = reader.read_byte()
+        section = _Reader(reader.read_bytes(reader.read_uleb128()))
+        if section_id == START_SECTION_ID:
+            continue
+        if section_id == EXPORT_SECTION_ID:
+            _append_section(output, section_id, _encode_exports(exports))
+        elif section_id == GLOBAL_SECTION_ID and global_values:
+            _append_section(
+                output, section_id, _encode_globals(section, module_info, global_values)
+            )
+        else:
+            output += reader.data[section_start : reader.offset]
+    return bytes(output), start_export, global_exports
+
+
+def _encode_uleb128(value: int) -> bytes:
+    output = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if not value:
+            output.append(byte)
+            return bytes(output)
+        output.append(byte | 0x80)
+
+
+def _encode_sleb128(value: int) -> bytes:
+    output = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if (value == 0 and not byte & 0x40) or (value == -1 and byte & 0x40):
+            output.append(byte)
+            return bytes(output)
+        output.append(byte | 0x80)
+
+
+def _append_section(output: bytearray, section_id: int, content: bytes) -> None:
+    output.append(section_id)
+    output += _encode_uleb128(len(content))
+    output += content
+
+
+def _encode_exports(exports: List[Tuple[str, str, int]]) -> bytes:
+    output = bytearray(_encode_uleb128(len(exports)))
+    for name, kind, index in exports:
+        encoded_name = name.encode("utf-8")
+        output += _encode_uleb128(len(encoded_name))
+        output += encoded_name
+        output.append(EXTERN_KINDS.index(kind))
+        output += _encode_uleb128(index)
+    return bytes(output)
+
+
+def _encode_globals(
+    section: _Reader, module_info: WasmModuleInfo, global_values: Dict[int, Any]
+) -> bytes:
+    """Encode the global section with new initial values for some globals."""
+    output = bytearray(_encode_uleb128(section.read_uleb128()))
+    for item in module_info.globals:
+        start = section.offset
+        section.read_value_type()
+        section.read_byte()  # mutability
+        init_start = section.offset
+        section.read_const_expr()
+        if item.index not in global_values:
+            output += section.data[start : section.offset]
+            continue
+        output += section.data[start:init_start]
+        output += _encode_const(item.value_type, global_values[item.index])
+    return bytes(output)
+
+
+def _encode_const(value_type: str, value: Any) -> bytes:
+    """Encode a constant expression producing the given value."""
+    if value_type == "i32":
+        immediate = _encode_sleb128(_to_signed(value, 32))
+    elif value_type == "i64":
+        immediate = _encode_sleb128(_to_signed(value, 64))
+    elif value_type == "f32":
+        immediate = struct.pack("<f", value)
+    else:
+        immediate = struct.pack("<d", value)
+    return bytes([_CONST_OPCODES[value_type], *immediate, _CONST_END])
+
+
+def _to_signed(value: int, bits: int) -> int:
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+
+def _diff_memory(baseline: bytes, content: bytes) -> List[Tuple[int, bytes]]:
+    """Get the ranges of a memory that differ from its baseline."""
+    chunks: List[Tuple[int, bytes]] = []
+    start: Optional[int] = None
+    for offset in range(0, len(content), _CHUNK_SIZE):
+        end = offset + _CHUNK_SIZE
+        page = content[offset:end]
+        baseline_page = baseline[offset:end]
+        changed = (
+            page != baseline_page
+            if len(baseline_page) == len(page)
+            else page.count(0) != len(page)
+        )
+        if changed and start is None:
+            start = offset
+        elif not changed and start is not None:
+            chunks.append((start, content[start:offset]))
+            start = None
+    if start is not None:
+        chunks.append((start, content[start:]))
+    return chunks
+
+
+__all__ = [
+    "SnapshotConfig",
+    "WasmInstanceSnapshot",
+    "WasmSnapshotTemplate",
+    "create_snapshot_module",
+    "get_snapshot_module_hash",
+]
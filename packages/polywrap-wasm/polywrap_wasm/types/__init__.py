@@ -1,4 +1,7 @@
 """This module contains the core types, interfaces, and utilities of polywrap-wasm package."""
+from .invocation_profile import *
 from .invoke_result import *
 from .state import *
+from .subinvoke_client import *
+from .subinvoke_target import *
 from .wasm_invoke_options import *
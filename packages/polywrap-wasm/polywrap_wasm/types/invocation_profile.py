@@ -0,0 +1,115 @@
+"""This module contains the types holding the profile of Wasm invocations."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from polywrap_core import Uri
+
+
+@dataclass(kw_only=True, slots=True)
+class ImportProfile:
+    """ImportProfile is a dataclass that holds the measures of a host import.
+
+    Args:
+        calls (int): The number of calls made to the import.
+        bytes_moved (int): The number of bytes copied between the host\
+            and the Wasm memory by the import.
+        total_time (float): The cumulative time in seconds spent in the import.
+    """
+
+    calls: int = 0
+    bytes_moved: int = 0
+    total_time: float = 0.0
+
+    def merge(self, other: ImportProfile) -> None:
+        """Add the measures of another profile of the same import."""
+        self.calls += other.calls
+        self.bytes_moved += other.bytes_moved
+        self.total_time += other.total_time
+
+
+@dataclass(kw_only=True, slots=True)
+class InvocationProfile:  # pylint: disable=too-many-instance-attributes
+    """InvocationProfile is a dataclass that holds the measures of invocations\
+        of a wrapper method.
+
+    A profile is filled while a single invocation runs, then merged\
+        by the profiler into the profile aggregating all the invocations\
+        of the same method.
+
+    Args:
+        uri (Uri): The URI of the invoked wrapper.
+        method (str): The invoked method.
+        invocations (int): The number of invocations measured.
+        encode_time (float): The time in seconds spent encoding the args\
+            and env of the invocations.
+        compile_time (float): The time in seconds spent parsing and compiling\
+            the Wasm module.
+        instantiate_time (float): The time in seconds spent instantiating\
+            the Wasm module.
+        execute_time (float): The time in seconds spent in the `_wrap_invoke`\
+            export, including the host imports it called.
+        imports (Dict[str, ImportProfile]): The measures of the host imports\
+            called by the Wasm module, by import name.
+        current_import (Optional[ImportProfile]): The measures of the host\
+            import being called, to which memory copies are accounted.
+    """
+
+    uri: Uri
+    method: str
+    invocations: int = 1
+    encode_time: float = 0.0
+    compile_time: float = 0.0
+    instantiate_time: float = 0.0
+    execute_time: float = 0.0
+    imports: Dict[str, ImportProfile] = field(default_factory=dict[str, ImportProfile])
+    current_import: Optional[ImportProfile] = None
+
+    @property
+    def import_time(self) -> float:
+        """Get the time in seconds spent in the host imports."""
+        return sum(profile.total_time for profile in self.imports.values())
+
+    @property
+    def guest_time(self) -> float:
+        """Get the time in seconds spent running the Wasm code itself."""
+        return max(self.execute_time - self.import_time, 0.0)
+
+    def enter_import(self, name: str) -> ImportProfile:
+        """Count a call to a host import and make it the current import.
+
+        Args:
+            name (str): The name of the import.
+
+        Returns:
+            ImportProfile: The measures of the import.
+        """
+        profile = self.imports.get(name)
+        if profile is None:
+            profile = self.imports[name] = ImportProfile()
+        profile.calls += 1
+        self.current_import = profile
+        return profile
+
+    def record_bytes(self, length: int) -> None:
+        """Account bytes copied to or from the Wasm memory to the current import."""
+        if self.current_import is not None:
+            self.current_import.bytes_moved += length
+
+    def merge(self, other: InvocationProfile) -> None:
+        """Add the measures of another profile of the same method."""
+        self.invocations += other.invocations
+        self.encode_time += other.encode_time
+        self.compile_time += other.compile_time
+        self.instantiate_time += other.instantiate_time
+        self.execute_time += other.execute_time
+        for name, profile in other.imports.items():
+            if name in self.imports:
+                self.imports[name].merge(profile)
+            else:
+                self.imports[name] = ImportProfile(
+                    calls=profile.calls,
+                    bytes_moved=profile.bytes_moved,
+                    total_time=profile.total_time,
+                )
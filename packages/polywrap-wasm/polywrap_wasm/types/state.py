@@ -1,8 +1,12 @@
 """This module contains the State type for holding the state of a Wasm wrapper."""
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 
+from polywrap_core import Uri
+
+from .invocation_profile import InvocationProfile
 from .invoke_result import InvokeResult
+from .subinvoke_target import SubinvokeTarget
 from .wasm_invoke_options import WasmInvokeOptions
 
 
@@ -19,9 +23,18 @@ class State:
             The result of a subinvocation.
         get_implementations_result (Optional[bytes]) : \
             The result of a get implementations call.
+        subinvoke_targets (Dict[Uri, Optional[SubinvokeTarget]]): \
+            The wrappers resolved for the subinvocations, by subinvoked URI,\
+            or None for the URIs which don't resolve to a wrapper.
+        profile (Optional[InvocationProfile]): \
+            The profile of the invocation, if it is profiled.
     """
 
     invoke_options: WasmInvokeOptions
     invoke_result: Optional[InvokeResult[str]] = None
     subinvoke_result: Optional[InvokeResult[Exception]] = None
     get_implementations_result: Optional[bytes] = None
+    subinvoke_targets: Dict[Uri, Optional[SubinvokeTarget]] = field(
+        default_factory=dict[Uri, Optional[SubinvokeTarget]]
+    )
+    profile: Optional[InvocationProfile] = None
@@ -0,0 +1,23 @@
+"""This module contains the SubinvokeClient protocol."""
+from typing import Any, Protocol, Union, runtime_checkable
+
+from polywrap_core import InvokerClient, Uri
+
+
+@runtime_checkable
+class SubinvokeClient(InvokerClient, Protocol):
+    """SubinvokeClient protocol defines the invoker clients whose wrappers\
+        the subinvocations of a Wasm wrapper resolve once and invoke directly."""
+
+    def get_env_by_uri(self, uri: Uri) -> Union[Any, None]:
+        """Get the env configured for the given URI.
+
+        Args:
+            uri (Uri): The URI of the wrapper.
+
+        Returns:
+            Union[Any, None]: The env of the wrapper, if any.
+        """
+
+
+__all__ = ["SubinvokeClient"]
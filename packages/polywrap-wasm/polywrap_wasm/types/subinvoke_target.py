@@ -0,0 +1,21 @@
+"""This module contains the SubinvokeTarget type."""
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from polywrap_core import Uri, Wrapper
+
+
+@dataclass(kw_only=True, slots=True)
+class SubinvokeTarget:
+    """SubinvokeTarget is a dataclass that holds a wrapper resolved\
+        for the subinvocations of a Wasm wrapper.
+
+    Args:
+        wrapper (Wrapper): The resolved wrapper.
+        uri (Uri): The URI the wrapper was resolved to.
+        env (Optional[Any]): The env configured for the wrapper.
+    """
+
+    wrapper: Wrapper
+    uri: Uri
+    env: Optional[Any] = None
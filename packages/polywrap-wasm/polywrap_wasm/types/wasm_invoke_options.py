@@ -17,6 +17,10 @@ class WasmInvokeOptions:
             for the invocation.
         resolution_context (Optional[UriResolutionContext]): \
             A URI resolution context.
+        encoded_args (bytes): The msgpack encoded arguments,\
+            written as is into the Wasm memory.
+        encoded_env (bytes): The msgpack encoded environment variables,\
+            written as is into the Wasm memory.
     """
 
     uri: Uri
@@ -24,3 +28,5 @@ class WasmInvokeOptions:
     args: Optional[dict[str, Any]] = None
     env: Optional[dict[str, Any]] = None
     resolution_context: Optional[UriResolutionContext] = None
+    encoded_args: bytes = b""
+    encoded_env: bytes = b""
@@ -1,46 +1,126 @@
 """This module contains the WasmPackage type for loading a Wasm package."""
-from typing import Optional, Union
+from __future__ import annotations
+
+import mmap
+from typing import Any, Optional, Union
 
 from polywrap_core import FileReader, WrapPackage, Wrapper
 from polywrap_manifest import (
     AnyWrapManifest,
     DeserializeManifestOptions,
+    WrapCodecs,
     deserialize_wrap_manifest,
 )
 
+from .budget import ExecutionBudget, InvocationCostHook
 from .constants import WRAP_MANIFEST_PATH, WRAP_MODULE_PATH
 from .inmemory_file_reader import InMemoryFileReader
+from .instance_pool import InstancePoolConfig
+from .mapped_file_reader import MappableFileReader, WasmModuleBuffer
+from .module_cache import ModuleCache, get_module_cache, hash_wasm_module
+from .process_pool import ProcessPoolWasmExecutor
+from .profiler import WasmProfiler
+from .runtime_config import WasmRuntimeConfig
+from .snapshot import SnapshotConfig
 from .wasm_wrapper import WasmWrapper
 
 
-class WasmPackage(WrapPackage):
+class WasmPackage(WrapPackage):  # pylint: disable=too-many-instance-attributes
     """WasmPackage implements the WRAP package protocol for a Wasm WRAP package.
 
+    Creating a package doesn't read any file. The Wasm module and the manifest\
+        are read when they are first needed, at the latest by `create_wrapper`.\
+        The Wasm module is mapped in memory instead of being read when the file\
+        reader is a MappableFileReader such as MappedFileReader. The package\
+        owns that memory map: it is closed by `close`, or when leaving\
+        the context of the package, after which the created wrappers\
+        must not be used anymore.
+
+    The created wrappers share the manifest and, if they use them,\
+        the codecs compiled from its abi, which are created\
+        by the first `create_wrapper`.
+
     Args:
         file_reader (FileReader): The file reader used to read\
             the package files.
         manifest (Optional[Union[bytes, AnyWrapManifest]]): \
             The manifest of the wrapper.
-        wasm_module (Optional[bytes]): The Wasm module file\
+        wasm_module (Optional[WasmModuleBuffer]): The Wasm module file\
             of the wrapper.
+        module_cache (Optional[ModuleCache]): The cache of compiled modules\
+            used by the created wrappers. Defaults to the process-wide module cache.
+        instance_pool_config (Optional[InstancePoolConfig]): The options\
+            of the instance pool of the created wrappers.\
+            Defaults to no pooling.
+        runtime_config (Optional[WasmRuntimeConfig]): The configuration\
+            of the engine running the created wrappers. Ignored if\
+            a module cache is given, since it owns its engine.
+        executor (Optional[ProcessPoolWasmExecutor]): The executor running\
+            the invocations of the created wrappers in worker processes.
+        budget (Optional[ExecutionBudget]): The default execution budget\
+            of the invocations of the created wrappers.
+        on_invocation_cost (Optional[InvocationCostHook]): The callback\
+            receiving the cost of every invocation of the created wrappers.
+        profiler (Optional[WasmProfiler]): The profiler recording\
+            the invocations of the created wrappers.\
+            Defaults to the process-wide profiler, if any.
+        snapshot_config (Optional[SnapshotConfig]): The options\
+            of the instance snapshot of the created wrappers.\
+            Defaults to no snapshot.
+        use_abi_codecs (bool): If True, the created wrappers encode the args\
+            and decode the results with the codecs compiled from the abi.\
+            Defaults to encoding and decoding them generically.
     """
 
     file_reader: FileReader
     manifest: Optional[Union[bytes, AnyWrapManifest]]
-    wasm_module: Optional[bytes]
+    wasm_module: Optional[WasmModuleBuffer]
+    module_cache: Optional[ModuleCache]
+    instance_pool_config: Optional[InstancePoolConfig]
+    runtime_config: Optional[WasmRuntimeConfig]
+    executor: Optional[ProcessPoolWasmExecutor]
+    budget: Optional[ExecutionBudget]
+    on_invocation_cost: Optional[InvocationCostHook]
+    profiler: Optional[WasmProfiler]
+    snapshot_config: Optional[SnapshotConfig]
+    use_abi_codecs: bool
+    _module_hash: Optional[str]
+    _codecs: Optional[WrapCodecs]
+    _mapped_module: Optional[mmap.mmap]
 
     def __init__(
         self,
         file_reader: FileReader,
         manifest: Optional[Union[bytes, AnyWrapManifest]] = None,
-        wasm_module: Optional[bytes] = None,
+        wasm_module: Optional[WasmModuleBuffer] = None,
+        module_cache: Optional[ModuleCache] = None,
+        instance_pool_config: Optional[InstancePoolConfig] = None,
+        runtime_config: Optional[WasmRuntimeConfig] = None,
+        executor: Optional[ProcessPoolWasmExecutor] = None,
+        budget: Optional[ExecutionBudget] = None,
+        on_invocation_cost: Optional[InvocationCostHook] = None,
+        profiler: Optional[WasmProfiler] = None,
+        snapshot_config: Optional[SnapshotConfig] = None,
+        use_abi_codecs: bool = False,
     ):
         """Initialize a new WasmPackage instance."""
         self.manifest = manifest
         self.wasm_module = wasm_module
+        self.module_cache = module_cache
+        self.instance_pool_config = instance_pool_config
+        self.runtime_config = runtime_config
+        self.executor = executor
+        self.budget = budget
+        self.on_invocation_cost = on_invocation_cost
+        self.profiler = profiler
+        self.snapshot_config = snapshot_config
+        self.use_abi_codecs = use_abi_codecs
+        self._module_hash = None
+        self._codecs = None
+        self._mapped_module = None
         self.file_reader = (
             InMemoryFileReader(wasm_module=wasm_module, base_file_reader=file_reader)
-            if wasm_module
+            if isinstance(wasm_module, bytes) and wasm_module
             else file_reader
         )
 
@@ -70,7 +150,7 @@ class WasmPackage(WrapPackage):
         manifest = deserialize_wrap_manifest(encoded_manifest, options)
         return manifest
 
-    def get_wasm_module(self) -> bytes:
+    def get_wasm_module(self) -> WasmModuleBuffer:
         """Get the Wasm module of the wrapper if it exists or return an error.
 
         Raises:
@@ -79,13 +159,35 @@ class WasmPackage(WrapPackage):
         Returns:
             The Wasm module of the wrapper or an error.
         """
-        if isinstance(self.wasm_module, bytes):
+        if self.wasm_module is not None:
             return self.wasm_module
 
-        wasm_module = self.file_reader.read_file(WRAP_MODULE_PATH)
+        if isinstance(self.file_reader, MappableFileReader):
+            wasm_module = self._mapped_module = self.file_reader.map_file(
+                WRAP_MODULE_PATH
+            )
+        else:
+            wasm_module = self.file_reader.read_file(WRAP_MODULE_PATH)
         self.wasm_module = wasm_module
         return self.wasm_module
 
+    def get_module_hash(self) -> str:
+        """Get the content hash of the Wasm module of the wrapper.
+
+        The hash is computed once and given to all the created wrappers,\
+            which use it to share the compiled module and its instance\
+            template through the module cache.
+
+        Raises:
+            OSError: If the wasm module file could not be read due to system errors.
+
+        Returns:
+            The hex encoded sha256 digest of the Wasm module.
+        """
+        if self._module_hash is None:
+            self._module_hash = hash_wasm_module(self.get_wasm_module())
+        return self._module_hash
+
     def create_wrapper(self) -> Wrapper:
         """Create a new WasmWrapper instance.
 
@@ -100,8 +202,49 @@ class WasmPackage(WrapPackage):
         """
         wasm_module = self.get_wasm_module()
         wasm_manifest = self.get_manifest()
+        # Keep the manifest so that it's only deserialized once
+        self.manifest = wasm_manifest
+        if self.use_abi_codecs and self._codecs is None:
+            self._codecs = WrapCodecs(wasm_manifest.abi)
+
+        module_cache = self.module_cache
+        if module_cache is None and self.runtime_config is not None:
+            module_cache = get_module_cache(self.runtime_config)
+
+        return WasmWrapper(
+            self.file_reader,
+            wasm_module,
+            wasm_manifest,
+            module_cache,
+            self.instance_pool_config,
+            self.executor,
+            self.budget,
+            self.on_invocation_cost,
+            self.profiler,
+            self.snapshot_config,
+            self.get_module_hash(),
+            self._codecs,
+            self.use_abi_codecs,
+        )
+
+    def close(self) -> None:
+        """Close the memory map of the Wasm module mapped by the package, if any.
 
-        return WasmWrapper(self.file_reader, wasm_module, wasm_manifest)
+        The module is mapped again by the next `create_wrapper`.
+        """
+        if self._mapped_module is not None:
+            if self.wasm_module is self._mapped_module:
+                self.wasm_module = None
+            self._mapped_module.close()
+            self._mapped_module = None
+
+    def __enter__(self) -> WasmPackage:
+        """Enter the package context."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the package when leaving its context."""
+        self.close()
 
 
 __all__ = ["WasmPackage"]
@@ -1,10 +1,13 @@
 """This module contains the WasmWrapper class for invoking Wasm wrappers."""
-# pylint: disable=too-many-locals
+# pylint: disable=too-many-locals,too-many-instance-attributes
+import time
 from textwrap import dedent
-from typing import Any, Dict, Optional, Union
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 from polywrap_core import (
     FileReader,
+    InvocableBatchResult,
     InvocableResult,
     Invoker,
     Uri,
@@ -13,44 +16,138 @@ from polywrap_core import (
     WrapError,
     Wrapper,
 )
-from polywrap_manifest import AnyWrapManifest
+from polywrap_manifest import AnyWrapManifest, WrapCodecError, WrapCodecs
 from polywrap_msgpack import msgpack_encode
-from wasmtime import Instance, Store
+from wasmtime import Instance, Store, Trap
 
+from .budget import ExecutionBudget, ExecutionMeter, InvocationCost, InvocationCostHook
 from .exports import WrapExports
-from .instance import create_instance
+from .instance import WasmInstanceTemplate
+from .instance_pool import InstancePoolConfig, PooledInstance, WasmInstancePool
+from .mapped_file_reader import WasmModuleBuffer
+from .module_cache import ModuleCache, get_module_cache, hash_wasm_module
+from .process_pool import ProcessPoolWasmExecutor
+from .profiler import WasmProfiler, get_profiler
+from .snapshot import SnapshotConfig, WasmSnapshotTemplate, get_snapshot_module_hash
+from .types.invocation_profile import InvocationProfile
 from .types.state import State, WasmInvokeOptions
 
 
 class WasmWrapper(Wrapper):
     """WasmWrapper implements the Wrapper protocol for Wasm wrappers.
 
+    A wrapper can be invoked concurrently from many threads. Every invocation\
+        gets its own State and runs in its own Store, either created for it\
+        or taken from the instance pool, which is never used by two\
+        invocations at once. The compiled module, the instance template\
+        and its linker are kept in the module cache and shared by all\
+        the invocations of all the wrappers of the module, and are created\
+        once even when the first invocations are concurrent.
+
     Args:
         file_reader (FileReader): The file reader used to read the wrapper files.
-        wasm_module (bytes): The Wasm module file of the wrapper.
+        wasm_module (WasmModuleBuffer): The Wasm module file of the wrapper.
         manifest (AnyWrapManifest): The manifest of the wrapper.
+        module_cache (Optional[ModuleCache]): The cache of compiled modules.\
+            Defaults to the process-wide module cache.
+        instance_pool_config (Optional[InstancePoolConfig]): The options\
+            of the instance pool. If given, instances are reused across\
+            invocations instead of being created for every invocation.
+        executor (Optional[ProcessPoolWasmExecutor]): The executor running\
+            the invocations in worker processes. If not given, invocations\
+            run in the calling thread.
+        budget (Optional[ExecutionBudget]): The default execution budget\
+            of the invocations.
+        on_invocation_cost (Optional[InvocationCostHook]): The callback\
+            receiving the cost of every invocation.
+        profiler (Optional[WasmProfiler]): The profiler recording\
+            the invocations. Defaults to the process-wide profiler, if any.
+        snapshot_config (Optional[SnapshotConfig]): The options\
+            of the instance snapshot. If given, instances are restored\
+            from a snapshot taken after the initialization of the first\
+            instance instead of being initialized again. Invocations run\
+            by the executor don't use snapshots.
+        module_hash (Optional[str]): The precomputed content hash\
+            of the Wasm module, if known.
+        codecs (Optional[WrapCodecs]): The codecs compiled from the abi\
+            of the manifest. Defaults to compiling them on first use.
+        use_abi_codecs (bool): If True, encode the args and decode the results\
+            with the codecs compiled from the abi, which turn Map types into\
+            GenericMaps. Args which don't match the abi are encoded generically.\
+            Defaults to encoding and decoding them generically.
     """
 
     file_reader: FileReader
-    wasm_module: bytes
+    wasm_module: WasmModuleBuffer
     manifest: AnyWrapManifest
+    module_cache: ModuleCache
+    instance_pool_config: Optional[InstancePoolConfig]
+    executor: Optional[ProcessPoolWasmExecutor]
+    budget: Optional[ExecutionBudget]
+    on_invocation_cost: Optional[InvocationCostHook]
+    profiler: Optional[WasmProfiler]
+    snapshot_config: Optional[SnapshotConfig]
+    use_abi_codecs: bool
+    _module_hash: Optional[str]
+    _codecs: Optional[WrapCodecs]
+    _instance_template: Optional[WasmInstanceTemplate]
+    _template_compile_time: float
+    _instance_pool: Optional[WasmInstancePool]
+    _instance_template_lock: Lock
 
     def __init__(
-        self, file_reader: FileReader, wasm_module: bytes, manifest: AnyWrapManifest
+        self,
+        file_reader: FileReader,
+        wasm_module: WasmModuleBuffer,
+        manifest: AnyWrapManifest,
+        module_cache: Optional[ModuleCache] = None,
+        instance_pool_config: Optional[InstancePoolConfig] = None,
+        executor: Optional[ProcessPoolWasmExecutor] = None,
+        budget: Optional[ExecutionBudget] = None,
+        on_invocation_cost: Optional[InvocationCostHook] = None,
+        profiler: Optional[WasmProfiler] = None,
+        snapshot_config: Optional[SnapshotConfig] = None,
+        module_hash: Optional[str] = None,
+        codecs: Optional[WrapCodecs] = None,
+        use_abi_codecs: bool = False,
     ):
         """Initialize a new WasmWrapper instance."""
         self.file_reader = file_reader
         self.wasm_module = wasm_module
         self.manifest = manifest
+        self.module_cache = (
+            module_cache if module_cache is not None else get_module_cache()
+        )
+        self.instance_pool_config = instance_pool_config
+        self.executor = executor
+        self.budget = budget
+        self.on_invocation_cost = on_invocation_cost
+        self.profiler = profiler
+        self.snapshot_config = snapshot_config
+        self.use_abi_codecs = use_abi_codecs
+        self._module_hash = module_hash
+        self._codecs = codecs
+        self._instance_template = None
+        self._template_compile_time = 0.0
+        self._instance_pool = None
+        self._instance_template_lock = Lock()
 
     def get_manifest(self) -> AnyWrapManifest:
         """Get the manifest of the wrapper."""
         return self.manifest
 
-    def get_wasm_module(self) -> bytes:
+    def get_wasm_module(self) -> WasmModuleBuffer:
         """Get the Wasm module of the wrapper."""
         return self.wasm_module
 
+    def get_wrap_codecs(self) -> Optional[WrapCodecs]:
+        """Get the codecs compiled from the abi of the wrapper, if it uses them."""
+        if not self.use_abi_codecs:
+            return None
+        if self._codecs is None and getattr(self.manifest, "abi", None) is not None:
+            self._codecs = WrapCodecs(self.manifest.abi)
+        return self._codecs
+
     def get_file(
         self, path: str, encoding: Optional[str] = "utf-8"
     ) -> Union[str, bytes]:
@@ -66,21 +163,112 @@ class WasmWrapper(Wrapper):
         data = self.file_reader.read_file(path)
         return data.decode(encoding=encoding) if encoding else data
 
+    def get_module_hash(self) -> str:
+        """Get the content hash of the Wasm module of the wrapper."""
+        if self._module_hash is None:
+            self._module_hash = hash_wasm_module(self.wasm_module)
+        return self._module_hash
+
+    def get_instance_template(self) -> WasmInstanceTemplate:
+        """Get the instance template of the wrapper, creating it on first use.
+
+        The template is taken from the module cache when another wrapper\
+            of the same module already created it.
+
+        Returns:
+            The instance template of the wrapper Wasm module.
+        """
+        if self._instance_template is None:
+            with self._instance_template_lock:
+                if self._instance_template is None and self.snapshot_config is not None:
+                    self._instance_template = self.module_cache.get_shared(
+                        get_snapshot_module_hash(self.get_module_hash()),
+                        (WasmSnapshotTemplate, self.snapshot_config),
+                        self._create_instance_template,
+                    )
+                elif self._instance_template is None:
+                    self._instance_template = self.module_cache.get_shared(
+                        self.get_module_hash(),
+                        WasmInstanceTemplate,
+                        self._create_instance_template,
+                    )
+        return self._instance_template
+
+    def _create_instance_template(self) -> WasmInstanceTemplate:
+        """Create the instance template shared by the wrappers of the module."""
+        if self.snapshot_config is not None:
+            template: WasmInstanceTemplate = WasmSnapshotTemplate(
+                self.wasm_module,
+                self.module_cache,
+                self.get_module_hash(),
+                self.snapshot_config,
+            )
+        else:
+            template = WasmInstanceTemplate(
+                self.wasm_module, self.module_cache, self.get_module_hash()
+            )
+        # Only the invocation which created the template reports its compilation
+        self._template_compile_time = template.compile_time
+        return template
+
+    def get_instance_pool(self) -> Optional[WasmInstancePool]:
+        """Get the instance pool of the wrapper, creating it on first use.
+
+        The pool is kept in the module cache and shared by all the wrappers\
+            of the module with the same pool and snapshot options.
+
+        Returns:
+            The instance pool of the wrapper or None if pooling is disabled.
+        """
+        pool_config = self.instance_pool_config
+        if pool_config is None:
+            return None
+        if self._instance_pool is None:
+            template = self.get_instance_template()
+            with self._instance_template_lock:
+                if self._instance_pool is None:
+                    self._instance_pool = self.module_cache.get_shared(
+                        template.module_hash,
+                        (WasmInstancePool, self.snapshot_config, pool_config),
+                        lambda: WasmInstancePool(template, pool_config),
+                    )
+        return self._instance_pool
+
     def create_wasm_instance(
-        self, store: Store, state: State, client: Optional[Invoker]
-    ) -> Instance:
+        self, state: State, client: Optional[Invoker]
+    ) -> Tuple[Store, Instance]:
         """Create a new Wasm instance for the wrapper.
 
         Args:
-            store (Store): The Wasm store to use when creating the instance.
             state (State): The Wasm wrapper state to use when creating the instance.
             client (Optional[Invoker]): The client to use when creating the instance.
 
         Returns:
-            The Wasm instance of the wrapper Wasm module.
+            The Wasm store of the invocation and the Wasm instance\
+                of the wrapper Wasm module.
         """
         try:
-            return create_instance(store, self.wasm_module, state, client)
+            return self.get_instance_template().instantiate(state, client)
+        except Exception as err:
+            raise WrapAbortError(
+                state.invoke_options, "Unable to instantiate the wasm module"
+            ) from err
+
+    def acquire_pooled_instance(
+        self, pool: WasmInstancePool, state: State, client: Optional[Invoker]
+    ) -> PooledInstance:
+        """Acquire a Wasm instance of the wrapper from its instance pool.
+
+        Args:
+            pool (WasmInstancePool): The instance pool of the wrapper.
+            state (State): The Wasm wrapper state to bind to the instance.
+            client (Optional[Invoker]): The client to bind to the instance.
+
+        Returns:
+            The pooled instance to invoke.
+        """
+        try:
+            return pool.acquire(state, client)
         except Exception as err:
             raise WrapAbortError(
                 state.invoke_options, "Unable to instantiate the wasm module"
@@ -94,6 +282,7 @@ class WasmWrapper(Wrapper):
         env: Optional[Dict[str, Any]] = None,
         resolution_context: Optional[UriResolutionContext] = None,
         client: Optional[Invoker] = None,
+        budget: Optional[ExecutionBudget] = None,
     ) -> InvocableResult:
         """Invoke the wrapper.
 
@@ -105,6 +294,8 @@ class WasmWrapper(Wrapper):
             resolution_context (Optional[UriResolutionContext]): \
                 The URI resolution context to use during invocation.
             client (Optional[Invoker]): The invoker to use during invocation.
+            budget (Optional[ExecutionBudget]): The execution budget\
+                of the invocation. Defaults to the budget of the wrapper.
 
         Raises:
             WrapError: If the invocation uri or method are not defined.
@@ -124,42 +315,195 @@ class WasmWrapper(Wrapper):
                 )
             )
 
-        state = State(
+        profiler = self.profiler if self.profiler is not None else get_profiler()
+        state = self._create_state(
+            uri, method, args, env, resolution_context, None, profiler
+        )
+        return self._run(state, client, budget or self.budget, profiler)
+
+    def invoke_batch(
+        self,
+        uri: Uri,
+        method: str,
+        args_iterable: Iterable[Optional[Dict[str, Any]]],
+        env: Optional[Dict[str, Any]] = None,
+        resolution_context: Optional[UriResolutionContext] = None,
+        client: Optional[Invoker] = None,
+        budget: Optional[ExecutionBudget] = None,
+        reuse_instance: bool = False,
+    ) -> Iterator[InvocableBatchResult]:
+        """Invoke a method of the wrapper once for every args of an iterable.
+
+        The env is encoded once for the whole batch. Every invocation runs\
+            in a fresh instance of the template, like `invoke`, unless\
+            the wrapper has an instance pool, in which case the batch runs\
+            in its instances, or `reuse_instance` is set. Reusing instances\
+            is only safe for wrappers that don't rely on a fresh instance,\
+            since the guest memory and globals survive between\
+            the invocations. An instance whose invocation failed is replaced\
+            before the next invocation.
+
+        Args:
+            uri (Uri): The Wasm wrapper uri.
+            method (str): The method to invoke.
+            args_iterable (Iterable[Optional[Dict[str, Any]]]): The args\
+                of the invocations. It is consumed lazily.
+            env (Optional[Dict[str, Any]]): The env to use for all the invocations.
+            resolution_context (Optional[UriResolutionContext]): \
+                The URI resolution context to use during the invocations.
+            client (Optional[Invoker]): The invoker to use during the invocations.
+            budget (Optional[ExecutionBudget]): The execution budget\
+                of each invocation. Defaults to the budget of the wrapper.
+            reuse_instance (bool): Whether to run all the invocations\
+                in the same Wasm instance when the wrapper has no instance pool.
+
+        Raises:
+            WrapError: If the invocation uri or method are not defined.
+            MsgpackError: If failed to encode the env.
+
+        Returns:
+            Iterator[InvocableBatchResult]: The results of the invocations,\
+                in the order of their args, yielded as soon as they are done.\
+                A failed invocation yields its error and doesn't stop the batch.
+        """
+        if not (uri and method):
+            raise WrapError(
+                dedent(
+                    f"""
+                    Expected invocation uri and method to be defiened got:
+                    uri: {uri}
+                    method: {method}
+                    """
+                )
+            )
+
+        profiler = self.profiler if self.profiler is not None else get_profiler()
+        encoded_env = msgpack_encode(env) if env else b""
+        return self._invoke_batch(
+            uri,
+            method,
+            args_iterable,
+            env,
+            encoded_env,
+            resolution_context,
+            client,
+            budget or self.budget,
+            profiler,
+            reuse_instance,
+        )
+
+    def _invoke_batch(
+        self,
+        uri: Uri,
+        method: str,
+        args_iterable: Iterable[Optional[Dict[str, Any]]],
+        env: Optional[Dict[str, Any]],
+        encoded_env: bytes,
+        resolution_context: Optional[UriResolutionContext],
+        client: Optional[Invoker],
+        budget: Optional[ExecutionBudget],
+        profiler: Optional[WasmProfiler],
+        reuse_instance: bool,
+    ) -> Iterator[InvocableBatchResult]:
+        """Run the invocations of a batch and yield their results."""
+        pool: Optional[WasmInstancePool] = None
+        for args in args_iterable:
+            try:
+                if pool is None and self.executor is None:
+                    pool = self._get_batch_pool(reuse_instance)
+                state = self._create_state(
+                    uri, method, args, env, resolution_context, encoded_env, profiler
+                )
+                result = self._run(state, client, budget, profiler, pool)
+            except Exception as err:
+                yield InvocableBatchResult(error=err)
+                continue
+            yield InvocableBatchResult(result=result.result, encoded=result.encoded)
+
+    def _get_batch_pool(self, reuse_instance: bool) -> Optional[WasmInstancePool]:
+        """Get the pool of the instances running a batch, if they are reused."""
+        pool = self.get_instance_pool()
+        if pool is None and reuse_instance:
+            # A single instance, only replaced after a failed invocation
+            pool = WasmInstancePool(
+                self.get_instance_template(), InstancePoolConfig(max_size=1)
+            )
+        return pool
+
+    def _create_state(
+        self,
+        uri: Uri,
+        method: str,
+        args: Optional[Dict[str, Any]],
+        env: Optional[Dict[str, Any]],
+        resolution_context: Optional[UriResolutionContext],
+        encoded_env: Optional[bytes],
+        profiler: Optional[WasmProfiler],
+    ) -> State:
+        """Encode the args and env of an invocation into its state."""
+        start = time.perf_counter()
+        encoded_args = self._encode_args(method, args)
+        if encoded_env is None:
+            encoded_env = msgpack_encode(env) if env else b""
+        profile = (
+            InvocationProfile(
+                uri=uri, method=method, encode_time=time.perf_counter() - start
+            )
+            if profiler is not None
+            else None
+        )
+
+        return State(
             invoke_options=WasmInvokeOptions(
                 uri=uri,
                 method=method,
                 args=args,
                 env=env,
                 resolution_context=resolution_context,
-            )
-        )
-
-        encoded_args = (
-            (
-                state.invoke_options.args
-                if isinstance(state.invoke_options.args, bytes)
-                else msgpack_encode(state.invoke_options.args)
-            )
-            if state.invoke_options.args
-            else b""
-        )
-        encoded_env = (
-            msgpack_encode(state.invoke_options.env)
-            if state.invoke_options.env
-            else b""
+                encoded_args=encoded_args,
+                encoded_env=encoded_env,
+            ),
+            profile=profile,
         )
 
-        method_length = len(state.invoke_options.method)
-        args_length = len(encoded_args)
-        env_length = len(encoded_env)
+    def _encode_args(self, method: str, args: Optional[Dict[str, Any]]) -> bytes:
+        """Encode the args with the codec compiled from the abi of the method,\
+            if the wrapper uses the abi codecs.
 
-        store = Store()
-        instance = self.create_wasm_instance(store, state, client)
+        Args which don't match the abi are encoded generically instead,\
+            so that the wrapper reports them as it would otherwise.
+        """
+        if not args:
+            return b""
+        if isinstance(args, bytes):
+            return args
+        codecs = self.get_wrap_codecs()
+        codec = codecs.get(method) if codecs else None
+        if codec is not None:
+            try:
+                return codec.encode_args(args)
+            except WrapCodecError:
+                pass
+        return msgpack_encode(args)
 
-        exports = WrapExports(instance, store)
-        result = exports.__wrap_invoke__(method_length, args_length, env_length)
+    def _run(
+        self,
+        state: State,
+        client: Optional[Invoker],
+        budget: Optional[ExecutionBudget],
+        profiler: Optional[WasmProfiler],
+        pool: Optional[WasmInstancePool] = None,
+    ) -> InvocableResult:
+        """Run an invocation and get its result."""
+        try:
+            if self.executor is not None:
+                return self._invoke_executor(state, client, budget)
+            self._execute(state, client, budget, pool)
+        finally:
+            if profiler is not None and state.profile is not None:
+                profiler.record(state.profile)
 
-        if result and state.invoke_result and state.invoke_result.result:
+        if state.invoke_result and state.invoke_result.result:
             # Note: currently we only return not None result from Wasm module
             return InvocableResult(result=state.invoke_result.result, encoded=True)
         raise WrapAbortError(
@@ -167,5 +511,135 @@ class WasmWrapper(Wrapper):
             "Expected a result from the Wasm module",
         )
 
+    def _execute(
+        self,
+        state: State,
+        client: Optional[Invoker],
+        budget: Optional[ExecutionBudget],
+        pool: Optional[WasmInstancePool] = None,
+    ) -> None:
+        """Run the invocation in a Wasm instance of the wrapper.
+
+        The instance is taken from the given pool, or from the instance\
+            pool of the wrapper, or created for the invocation.
+        """
+        profile = state.profile
+        compiled = self._instance_template is None
+        start = time.perf_counter()
+        pool = pool if pool is not None else self.get_instance_pool()
+        pooled: Optional[PooledInstance] = None
+        if pool is None:
+            store, instance = self.create_wasm_instance(state, client)
+            exports = WrapExports(instance, store)
+        else:
+            pooled = self.acquire_pooled_instance(pool, state, client)
+            store, exports = pooled.store, pooled.exports
+        if profile is not None:
+            if compiled:
+                profile.compile_time = self._template_compile_time
+            profile.instantiate_time = (
+                time.perf_counter() - start - profile.compile_time
+            )
+            start = time.perf_counter()
+
+        failed = True
+        try:
+            result = self._wrap_invoke(state, store, exports, budget, start)
+            self._capture_snapshot(store, exports, result)
+            failed = False
+        finally:
+            if pool and pooled:
+                pool.release(pooled, failed=failed)
+
+        if not result:
+            state.invoke_result = None
+
+    def _wrap_invoke(
+        self,
+        state: State,
+        store: Store,
+        exports: WrapExports,
+        budget: Optional[ExecutionBudget],
+        start: float,
+    ) -> bool:
+        """Call the _wrap_invoke export within the budget and report its cost."""
+        meter: Optional[ExecutionMeter] = None
+        result = False
+        try:
+            meter = ExecutionMeter(store, self.module_cache.runtime_config, budget)
+            result = exports.__wrap_invoke__(
+                len(state.invoke_options.method),
+                len(state.invoke_options.encoded_args),
+                len(state.invoke_options.encoded_env),
+            )
+        except BaseException as err:
+            exceeded_limit = meter.get_exceeded_limit() if meter else None
+            if isinstance(err, Trap) and exceeded_limit:
+                raise WrapAbortError(
+                    state.invoke_options, f"The invocation {exceeded_limit}"
+                ) from err
+            raise
+        finally:
+            if state.profile is not None:
+                state.profile.execute_time = time.perf_counter() - start
+            self._report_cost(state, meter, result)
+        return result
+
+    def _capture_snapshot(
+        self, store: Store, exports: WrapExports, succeeded: bool
+    ) -> None:
+        """Let the snapshot template capture an instance whose invocation succeeded."""
+        template = self._instance_template
+        if succeeded and isinstance(template, WasmSnapshotTemplate):
+            template.capture_after_invoke(store, exports.instance)
+
+    def _invoke_executor(
+        self, state: State, client: Optional[Invoker], budget: Optional[ExecutionBudget]
+    ) -> InvocableResult:
+        """Run the invocation in a worker process of the executor."""
+        assert self.executor is not None
+        start = time.perf_counter()
+        fuel_consumed: Optional[int] = None
+        succeeded = False
+        try:
+            result, fuel_consumed = self.executor.invoke(
+                self.wasm_module,
+                self.get_module_hash(),
+                state.invoke_options,
+                client,
+                budget,
+            )
+            succeeded = True
+        finally:
+            if state.profile is not None:
+                state.profile.execute_time = time.perf_counter() - start
+            if self.on_invocation_cost:
+                self.on_invocation_cost(
+                    InvocationCost(
+                        uri=state.invoke_options.uri,
+                        method=state.invoke_options.method,
+                        wall_time=time.perf_counter() - start,
+                        fuel_consumed=fuel_consumed,
+                        succeeded=succeeded,
+                    )
+                )
+        return InvocableResult(result=result, encoded=True)
+
+    def _report_cost(
+        self, state: State, meter: Optional[ExecutionMeter], succeeded: bool
+    ) -> None:
+        """Send the cost of an invocation to the invocation cost hook."""
+        if not (self.on_invocation_cost and meter):
+            return
+        self.on_invocation_cost(
+            InvocationCost(
+                uri=state.invoke_options.uri,
+                method=state.invoke_options.method,
+                wall_time=meter.get_wall_time(),
+                fuel_consumed=meter.get_fuel_consumed(),
+                succeeded=succeeded,
+            )
+        )
+
 
 __all__ = ["WasmWrapper"]
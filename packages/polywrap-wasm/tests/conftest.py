@@ -0,0 +1,29 @@
+from typing import Any
+import pytest
+
+from pathlib import Path
+
+from polywrap_core import FileReader
+
+
+@pytest.fixture
+def simple_wrap_module():
+    wrap_path = Path(__file__).parent / "cases" / "simple" / "wrap.wasm"
+    with open(wrap_path, "rb") as f:
+        yield f.read()
+
+
+@pytest.fixture
+def simple_wrap_manifest():
+    wrap_path = Path(__file__).parent / "cases" / "simple" / "wrap.info"
+    with open(wrap_path, "rb") as f:
+        yield f.read()
+
+
+@pytest.fixture
+def dummy_file_reader():
+    class DummyFileReader(FileReader):
+        def read_file(self, *args: Any, **kwargs: Any) -> bytes:
+            raise NotImplementedError()
+
+    yield DummyFileReader()
@@ -0,0 +1,107 @@
+import pytest
+
+from pathlib import Path
+
+from wasmtime import Engine, Module, wat2wasm
+
+from polywrap_wasm import (
+    ArtifactCache,
+    ModuleCache,
+    WasmRuntimeConfig,
+    hash_wasm_module,
+)
+
+
+@pytest.fixture
+def wasm_module():
+    yield wat2wasm('(module (func (export "f") (result i32) i32.const 42))')
+
+
+def test_compiled_module_is_persisted(tmp_path: Path, wasm_module: bytes):
+    artifact_cache = ArtifactCache(tmp_path)
+    ModuleCache(artifact_cache=artifact_cache).get_module(wasm_module)
+
+    assert artifact_cache.get_artifact_path(
+        hash_wasm_module(wasm_module), WasmRuntimeConfig().engine_key
+    ).exists()
+    stats = artifact_cache.get_stats()
+    assert (stats.hits, stats.misses, stats.writes) == (0, 1, 1)
+
+
+def test_new_module_cache_loads_artifact(tmp_path: Path, wasm_module: bytes):
+    ModuleCache(artifact_cache=ArtifactCache(tmp_path)).get_module(wasm_module)
+
+    artifact_cache = ArtifactCache(tmp_path)
+    module = ModuleCache(artifact_cache=artifact_cache).get_module(wasm_module)
+
+    assert [export.name for export in module.exports] == ["f"]
+    stats = artifact_cache.get_stats()
+    assert (stats.hits, stats.misses, stats.writes) == (1, 0, 0)
+
+
+def test_incompatible_artifact_falls_back_to_compilation(
+    tmp_path: Path, wasm_module: bytes
+):
+    artifact_cache = ArtifactCache(tmp_path)
+    path = artifact_cache.get_artifact_path(
+        hash_wasm_module(wasm_module), WasmRuntimeConfig().engine_key
+    )
+    path.write_bytes(b"not a compiled module")
+
+    module = ModuleCache(artifact_cache=artifact_cache).get_module(wasm_module)
+
+    assert [export.name for export in module.exports] == ["f"]
+    stats = artifact_cache.get_stats()
+    assert (stats.misses, stats.errors, stats.writes) == (1, 1, 1)
+    # The corrupted artifact was replaced by a valid one
+    assert Module.deserialize_file(Engine(), str(path)) is not None
+
+
+def test_runtime_config_isolates_artifacts(tmp_path: Path, wasm_module: bytes):
+    artifact_cache = ArtifactCache(tmp_path)
+    for runtime_config in [
+        WasmRuntimeConfig.for_startup(),
+        WasmRuntimeConfig.for_throughput(),
+    ]:
+        ModuleCache(
+            artifact_cache=artifact_cache, runtime_config=runtime_config
+        ).get_module(wasm_module)
+
+    assert len(list(tmp_path.glob("*.cwasm"))) == 2
+    assert artifact_cache.get_stats().hits == 0
+
+
+def test_custom_engine_cant_use_artifacts(tmp_path: Path):
+    with pytest.raises(ValueError):
+        ModuleCache(engine=Engine(), artifact_cache=ArtifactCache(tmp_path))
+
+
+def test_artifacts_are_bounded(tmp_path: Path):
+    wasm_modules = [
+        wat2wasm(f'(module (func (export "f{i}") (result i32) i32.const {i}))')
+        for i in range(3)
+    ]
+    artifact_size = len(Module(Engine(), wasm_modules[0]).serialize())
+    artifact_cache = ArtifactCache(tmp_path, max_bytes=artifact_size * 2 + 1)
+    module_cache = ModuleCache(artifact_cache=artifact_cache)
+
+    for wasm_module in wasm_modules:
+        module_cache.get_module(wasm_module)
+
+    assert len(list(tmp_path.glob("*.cwasm"))) == 2
+    assert artifact_cache.get_stats().evictions == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_clear_removes_artifacts(tmp_path: Path, wasm_module: bytes):
+    artifact_cache = ArtifactCache(tmp_path)
+    ModuleCache(artifact_cache=artifact_cache).get_module(wasm_module)
+
+    artifact_cache.clear()
+
+    assert not list(tmp_path.glob("*.cwasm"))
+
+
+def test_invalid_max_bytes(tmp_path: Path):
+    with pytest.raises(ValueError):
+        ArtifactCache(tmp_path, max_bytes=0)
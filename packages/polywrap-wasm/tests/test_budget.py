@@ -0,0 +1,174 @@
+from typing import Any, List, cast
+
+import pytest
+from polywrap_core import FileReader, Uri, WrapAbortError
+from polywrap_manifest import deserialize_wrap_manifest
+from polywrap_msgpack import msgpack_decode
+from wasmtime import wat2wasm
+
+from polywrap_wasm import (
+    ExecutionBudget,
+    InstancePoolConfig,
+    InvocationCost,
+    ModuleCache,
+    ProcessPoolWasmExecutor,
+    WasmError,
+    WasmPackage,
+    WasmRuntimeConfig,
+    WasmWrapper,
+)
+
+METERED_CONFIG = WasmRuntimeConfig(consume_fuel=True, epoch_interruption=True)
+
+LOOP_MODULE = wat2wasm(
+    """
+    (module
+      (import "env" "memory" (memory 1))
+      (func (export "_wrap_invoke") (param i32 i32 i32) (result i32)
+        (loop (br 0))
+        (i32.const 0)))
+    """
+)
+
+
+def test_cost_is_reported(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    costs: List[InvocationCost] = []
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        ModuleCache(runtime_config=METERED_CONFIG),
+        InstancePoolConfig(),
+        on_invocation_cost=costs.append,
+    )
+
+    for message in ["hey", "there"]:
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": message},
+            budget=ExecutionBudget(max_fuel=10_000_000, timeout=10),
+        )
+        assert msgpack_decode(cast(bytes, result.result)) == message
+
+    assert len(costs) == 2
+    for cost in costs:
+        assert cost.uri == Uri.from_str("fs/./build")
+        assert cost.method == "simpleMethod"
+        assert cost.succeeded
+        assert cost.wall_time > 0
+        assert cost.fuel_consumed is not None and 0 < cost.fuel_consumed < 10_000_000
+    # Pooled instances are metered per invocation
+    assert abs(costs[0].fuel_consumed - costs[1].fuel_consumed) < 1000  # type: ignore
+
+
+def test_fuel_budget_aborts_invocation(dummy_file_reader: FileReader):
+    costs: List[InvocationCost] = []
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        LOOP_MODULE,
+        cast(Any, None),
+        ModuleCache(runtime_config=METERED_CONFIG),
+        budget=ExecutionBudget(max_fuel=100_000),
+        on_invocation_cost=costs.append,
+    )
+
+    with pytest.raises(WrapAbortError, match="fuel budget of 100000"):
+        wrapper.invoke(uri=Uri.from_str("wrap://mock/loop"), method="loop")
+
+    assert len(costs) == 1
+    assert not costs[0].succeeded
+    assert costs[0].fuel_consumed == 100_000
+
+
+def test_timeout_aborts_invocation(dummy_file_reader: FileReader):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        LOOP_MODULE,
+        cast(Any, None),
+        ModuleCache(runtime_config=WasmRuntimeConfig(epoch_interruption=True)),
+    )
+
+    with pytest.raises(WrapAbortError, match="timeout of 0.05s"):
+        wrapper.invoke(
+            uri=Uri.from_str("wrap://mock/loop"),
+            method="loop",
+            budget=ExecutionBudget(timeout=0.05),
+        )
+
+
+def test_budget_requires_metered_engine(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        ModuleCache(),
+    )
+
+    with pytest.raises(WasmError):
+        wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": "hey"},
+            budget=ExecutionBudget(max_fuel=1000),
+        )
+
+
+def test_fuel_budget_in_worker(dummy_file_reader: FileReader):
+    costs: List[InvocationCost] = []
+    with ProcessPoolWasmExecutor(
+        max_workers=1, runtime_config=METERED_CONFIG
+    ) as executor:
+        wrapper = WasmWrapper(
+            dummy_file_reader,
+            LOOP_MODULE,
+            cast(Any, None),
+            executor=executor,
+            budget=ExecutionBudget(max_fuel=100_000),
+            on_invocation_cost=costs.append,
+        )
+
+        with pytest.raises(WrapAbortError, match="fuel budget"):
+            wrapper.invoke(uri=Uri.from_str("wrap://mock/loop"), method="loop")
+
+    assert len(costs) == 1
+    assert not costs[0].succeeded
+
+
+@pytest.mark.parametrize("options", [{"max_fuel": 0}, {"timeout": 0}])
+def test_invalid_budget(options: Any):
+    with pytest.raises(ValueError):
+        ExecutionBudget(**options)
+
+
+def test_package_passes_budget_to_wrapper(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    costs: List[InvocationCost] = []
+    budget = ExecutionBudget(max_fuel=10_000_000)
+    package = WasmPackage(
+        dummy_file_reader,
+        simple_wrap_manifest,
+        simple_wrap_module,
+        runtime_config=METERED_CONFIG,
+        budget=budget,
+        on_invocation_cost=costs.append,
+    )
+
+    wrapper = cast(WasmWrapper, package.create_wrapper())
+    assert wrapper.budget is budget
+
+    wrapper.invoke(
+        uri=Uri.from_str("fs/./build"), method="simpleMethod", args={"arg": "hey"}
+    )
+    assert len(costs) == 1
@@ -0,0 +1,89 @@
+import pytest
+
+from wasmtime import Limits, Memory, MemoryType, Store
+
+from polywrap_wasm.buffer import (
+    mem_cpy,
+    read_bytes,
+    read_string,
+    read_view,
+    write_bytes,
+    write_string,
+)
+from polywrap_wasm.errors import WasmMemoryError
+
+
+@pytest.fixture
+def store():
+    return Store()
+
+
+@pytest.fixture
+def memory(store: Store):
+    return Memory(store, MemoryType(Limits(1, None)))
+
+
+def test_read_write_bytes(store: Store, memory: Memory):
+    ptr, length = memory.data_ptr(store), memory.data_len(store)
+    write_bytes(ptr, length, b"hello", 10)
+
+    assert read_bytes(ptr, length, 10, 5) == b"hello"
+    assert memory.read(store, 10, 15) == bytearray(b"hello")
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        bytearray(b"world"),
+        memoryview(b"world"),
+        memoryview(b"hello world!")[6:11],
+        memoryview(bytearray(b"world")),
+        memoryview(bytearray(b"world")).toreadonly(),
+    ],
+)
+def test_write_buffer_like(store: Store, memory: Memory, value: bytes):
+    ptr, length = memory.data_ptr(store), memory.data_len(store)
+    write_bytes(ptr, length, value, 100)
+
+    assert read_bytes(ptr, length, 100, 5) == b"world"
+
+
+def test_read_write_string(store: Store, memory: Memory):
+    ptr, length = memory.data_ptr(store), memory.data_len(store)
+    write_string(ptr, length, "héllo", 0)
+
+    assert read_string(ptr, length, 0, len("héllo".encode("utf-8"))) == "héllo"
+
+
+def test_read_view_does_not_copy(store: Store, memory: Memory):
+    ptr, length = memory.data_ptr(store), memory.data_len(store)
+    view = read_view(ptr, length, 20, 3)
+    write_bytes(ptr, length, b"abc", 20)
+
+    assert bytes(view) == b"abc"
+    assert read_view(ptr, length, 20, 0).nbytes == 0
+
+
+def test_read_whole_memory(store: Store, memory: Memory):
+    ptr, length = memory.data_ptr(store), memory.data_len(store)
+    assert len(read_bytes(ptr, length)) == length
+
+
+def test_mem_cpy(store: Store, memory: Memory):
+    ptr, length = memory.data_ptr(store), memory.data_len(store)
+    mem_cpy(ptr, length, bytearray(b"xyz"), 3, length - 3)
+
+    assert read_bytes(ptr, length, length - 3, 3) == b"xyz"
+
+
+@pytest.mark.parametrize("offset, size", [(65535, 2), (-1, 1), (0, 65537)])
+def test_out_of_bounds_access(store: Store, memory: Memory, offset: int, size: int):
+    ptr, length = memory.data_ptr(store), memory.data_len(store)
+    with pytest.raises(WasmMemoryError):
+        read_bytes(ptr, length, offset, size)
+    with pytest.raises(WasmMemoryError):
+        read_view(ptr, length, offset, size)
+    with pytest.raises(WasmMemoryError):
+        read_string(ptr, length, offset, size)
+    with pytest.raises(WasmMemoryError):
+        write_bytes(ptr, length, bytes(max(size, 0)), offset)
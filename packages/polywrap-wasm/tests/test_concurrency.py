@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, cast
+import pytest
+
+from polywrap_msgpack import msgpack_decode
+from polywrap_core import FileReader, Uri
+from polywrap_wasm import InstancePoolConfig, ModuleCache, WasmWrapper
+from polywrap_manifest import deserialize_wrap_manifest
+
+INVOCATIONS = 500
+THREADS = 16
+
+
+@pytest.mark.parametrize("instance_pool_config", [None, InstancePoolConfig()])
+def test_concurrent_invocations(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+    instance_pool_config: Optional[InstancePoolConfig],
+):
+    module_cache = ModuleCache()
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        module_cache,
+        instance_pool_config,
+    )
+
+    def invoke(i: int) -> Any:
+        # Arguments of different sizes catch results read from another store
+        message = f"message {i} " + "x" * (i % 97)
+        result = wrapper.invoke(
+            uri=Uri.from_str(f"fs/./build/{i}"),
+            method="simpleMethod",
+            args={"arg": message},
+        )
+        return message, msgpack_decode(cast(bytes, result.result))
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(invoke, range(INVOCATIONS)))
+
+    assert all(expected == actual for expected, actual in results)
+    assert module_cache.get_stats().misses == 1
+    pool = wrapper.get_instance_pool()
+    if pool is not None:
+        assert pool.get_stats().created <= THREADS
+
+
+def test_concurrent_compilation(simple_wrap_module: bytes):
+    module_cache = ModuleCache()
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        modules = list(
+            executor.map(
+                lambda _: module_cache.get_module(simple_wrap_module), range(THREADS)
+            )
+        )
+
+    assert all(module is modules[0] for module in modules)
+    stats = module_cache.get_stats()
+    assert stats.misses == 1
+    assert stats.hits == THREADS - 1
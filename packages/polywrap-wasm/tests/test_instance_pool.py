@@ -0,0 +1,241 @@
+from typing import Any, List, cast
+import pytest
+
+from polywrap_msgpack import msgpack_decode
+from polywrap_core import FileReader, Uri, WrapAbortError
+from polywrap_wasm import (
+    InstancePoolConfig,
+    ModuleCache,
+    SnapshotConfig,
+    WasmInstancePool,
+    WasmPackage,
+    WasmSnapshotTemplate,
+    WasmWrapper,
+)
+from polywrap_wasm.instance import WasmInstanceTemplate
+from polywrap_wasm.types import InvokeResult
+from polywrap_wasm.types.state import State, WasmInvokeOptions
+from polywrap_manifest import deserialize_wrap_manifest
+
+
+def new_state() -> State:
+    return State(
+        invoke_options=WasmInvokeOptions(uri=Uri.from_str("fs/./build"), method="m")
+    )
+
+
+def test_pooled_wrapper_reuses_instances(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        ModuleCache(),
+        InstancePoolConfig(),
+    )
+
+    for i in range(20):
+        message = f"message {i}" * i
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": message},
+        )
+        assert msgpack_decode(cast(bytes, result.result)) == message
+
+    pool = wrapper.get_instance_pool()
+    assert pool is not None
+    stats = pool.get_stats()
+    assert stats.created == 1
+    assert stats.reused == 19
+    assert stats.idle == 1
+
+
+def test_wrapper_without_pool_config_is_not_pooled(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+    )
+    assert wrapper.get_instance_pool() is None
+
+
+def test_package_passes_pool_config(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    config = InstancePoolConfig(max_size=2)
+    package = WasmPackage(
+        dummy_file_reader,
+        simple_wrap_manifest,
+        simple_wrap_module,
+        instance_pool_config=config,
+    )
+    wrapper = cast(WasmWrapper, package.create_wrapper())
+    assert wrapper.instance_pool_config is config
+
+
+def test_wrappers_of_a_package_share_pool(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    package = WasmPackage(
+        dummy_file_reader,
+        simple_wrap_manifest,
+        simple_wrap_module,
+        module_cache=ModuleCache(),
+        instance_pool_config=InstancePoolConfig(),
+    )
+
+    pools: List[WasmInstancePool] = []
+    for i in range(5):
+        # Clients create a new wrapper from the package for every invocation
+        wrapper = cast(WasmWrapper, package.create_wrapper())
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": f"message {i}"},
+        )
+        assert msgpack_decode(cast(bytes, result.result)) == f"message {i}"
+        pool = wrapper.get_instance_pool()
+        assert pool is not None
+        pools.append(pool)
+
+    assert all(pool is pools[0] for pool in pools)
+    stats = pools[0].get_stats()
+    assert (stats.created, stats.reused, stats.idle) == (1, 4, 1)
+
+
+def test_pooled_instance_recycled_when_snapshot_capture_fails(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    def fail_capture(*args: Any) -> None:
+        raise RuntimeError("capture failed")
+
+    monkeypatch.setattr(WasmSnapshotTemplate, "capture_after_invoke", fail_capture)
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        ModuleCache(),
+        InstancePoolConfig(),
+        snapshot_config=SnapshotConfig(after_first_invoke=True),
+    )
+
+    with pytest.raises(RuntimeError, match="capture failed"):
+        wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": "hey"},
+        )
+
+    pool = wrapper.get_instance_pool()
+    assert pool is not None
+    stats = pool.get_stats()
+    assert (stats.created, stats.recycled, stats.idle) == (1, 1, 0)
+
+
+def test_instance_is_recycled_after_max_uses(simple_wrap_module: bytes):
+    template = WasmInstanceTemplate(simple_wrap_module, ModuleCache())
+    pool = WasmInstancePool(template, InstancePoolConfig(max_uses=2))
+
+    first = pool.acquire(new_state(), None)
+    pool.release(first)
+    assert pool.acquire(new_state(), None) is first
+    pool.release(first)
+
+    assert pool.acquire(new_state(), None) is not first
+    stats = pool.get_stats()
+    assert (stats.created, stats.reused, stats.recycled) == (2, 1, 1)
+
+
+def test_idle_instance_drops_invocation_state(simple_wrap_module: bytes):
+    template = WasmInstanceTemplate(simple_wrap_module, ModuleCache())
+    pool = WasmInstancePool(template, InstancePoolConfig())
+    state = new_state()
+    state.invoke_options.encoded_args = b"args"
+    state.invoke_result = InvokeResult(result=b"result")
+
+    pooled = pool.acquire(state, None)
+    pool.release(pooled)
+
+    idle_state = pooled.wrap_imports.state
+    assert idle_state is not state
+    assert idle_state.invoke_options.encoded_args == b""
+    assert idle_state.invoke_result is None
+    assert pooled.wrap_imports.invoker is None
+
+
+def test_instance_is_recycled_above_memory_limit(simple_wrap_module: bytes):
+    template = WasmInstanceTemplate(simple_wrap_module, ModuleCache())
+    pool = WasmInstancePool(template, InstancePoolConfig(max_memory_bytes=1))
+
+    pooled = pool.acquire(new_state(), None)
+    pool.release(pooled)
+
+    assert pool.get_stats().recycled == 1
+    assert pool.acquire(new_state(), None) is not pooled
+
+
+def test_failed_instance_is_recycled(simple_wrap_module: bytes):
+    template = WasmInstanceTemplate(simple_wrap_module, ModuleCache())
+    pool = WasmInstancePool(template, InstancePoolConfig())
+
+    pooled = pool.acquire(new_state(), None)
+    pool.release(pooled, failed=True)
+
+    stats = pool.get_stats()
+    assert (stats.recycled, stats.idle) == (1, 0)
+
+
+def test_idle_instances_are_bounded(simple_wrap_module: bytes):
+    template = WasmInstanceTemplate(simple_wrap_module, ModuleCache())
+    pool = WasmInstancePool(template, InstancePoolConfig(max_size=1))
+
+    first = pool.acquire(new_state(), None)
+    second = pool.acquire(new_state(), None)
+    pool.release(first)
+    pool.release(second)
+
+    stats = pool.get_stats()
+    assert (stats.created, stats.recycled, stats.idle) == (2, 1, 1)
+
+
+def test_pooled_wrapper_recycles_aborted_instance(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        ModuleCache(),
+        InstancePoolConfig(),
+    )
+
+    with pytest.raises(WrapAbortError):
+        wrapper.invoke(uri=Uri.from_str("fs/./build"), method="simpleMethod")
+
+    pool = wrapper.get_instance_pool()
+    assert pool is not None
+    stats = pool.get_stats()
+    assert (stats.recycled, stats.idle) == (1, 0)
+
+
+@pytest.mark.parametrize("options", [{"max_size": 0}, {"max_uses": 0}])
+def test_invalid_pool_config(options: Any):
+    with pytest.raises(ValueError):
+        InstancePoolConfig(**options)
@@ -0,0 +1,131 @@
+import gc
+import weakref
+from typing import List, cast
+
+import pytest
+from wasmtime import Engine, Store, wat2wasm
+
+from polywrap_msgpack import msgpack_decode
+from polywrap_core import FileReader, Uri
+from polywrap_wasm import ModuleCache, WasmError, WasmPackage, WasmWrapper
+from polywrap_wasm.imports import WrapImports
+from polywrap_wasm.instance import WasmInstanceTemplate
+from polywrap_wasm.running_store import get_running_store, run_in_store
+from polywrap_wasm.types.state import State, WasmInvokeOptions
+from polywrap_manifest import deserialize_wrap_manifest
+
+
+def test_template_instantiates_isolated_stores(simple_wrap_module: bytes):
+    template = WasmInstanceTemplate(simple_wrap_module, ModuleCache())
+    state = State(
+        invoke_options=WasmInvokeOptions(uri=Uri.from_str("fs/./build"), method="m")
+    )
+
+    store_a, instance_a = template.instantiate(state, None)
+    store_b, instance_b = template.instantiate(state, None)
+
+    assert store_a is not store_b
+    assert instance_a.exports(store_a).get("_wrap_invoke") is not None
+    assert instance_b.exports(store_b).get("_wrap_invoke") is not None
+
+
+def test_template_binds_wrap_imports_to_store(simple_wrap_module: bytes):
+    template = WasmInstanceTemplate(simple_wrap_module, ModuleCache())
+    state = State(
+        invoke_options=WasmInvokeOptions(uri=Uri.from_str("fs/./build"), method="m")
+    )
+
+    store, instance = template.instantiate(state, None)
+    wrap_imports = cast(WrapImports, store.data())
+    assert wrap_imports.store is store
+    assert wrap_imports.state is state
+
+    store_ref = weakref.ref(store)
+    del store, instance, wrap_imports
+    gc.collect()
+    # The host functions and the wrap imports don't keep the store alive
+    assert store_ref() is None
+
+
+def test_running_stores_nest():
+    outer, inner = Store(Engine()), Store(Engine())
+
+    with pytest.raises(WasmError):
+        get_running_store()
+    with run_in_store(outer):
+        with run_in_store(inner):
+            assert get_running_store() is inner
+        assert get_running_store() is outer
+
+
+def test_wrapper_reuses_template(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+    )
+    template = wrapper.get_instance_template()
+
+    for message in ["hey", "there"]:
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": message},
+        )
+        assert msgpack_decode(cast(bytes, result.result)) == message
+
+    assert wrapper.get_instance_template() is template
+
+
+def test_wrappers_of_a_package_share_template(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    module_cache = ModuleCache()
+    package = WasmPackage(
+        dummy_file_reader,
+        simple_wrap_manifest,
+        simple_wrap_module,
+        module_cache=module_cache,
+    )
+
+    templates: List[WasmInstanceTemplate] = []
+    for message in ["hey", "there", "again"]:
+        # Clients create a new wrapper from the package for every invocation
+        wrapper = cast(WasmWrapper, package.create_wrapper())
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": message},
+        )
+        assert msgpack_decode(cast(bytes, result.result)) == message
+        templates.append(wrapper.get_instance_template())
+
+    assert all(template is templates[0] for template in templates)
+    assert module_cache.get_stats().misses == 1
+
+
+def test_template_dropped_with_module(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    module_cache = ModuleCache(max_size=1)
+    manifest = deserialize_wrap_manifest(simple_wrap_manifest)
+    template = WasmWrapper(
+        dummy_file_reader, simple_wrap_module, manifest, module_cache
+    ).get_instance_template()
+
+    module_cache.get_module(wat2wasm("(module)"))
+
+    assert (
+        WasmWrapper(
+            dummy_file_reader, simple_wrap_module, manifest, module_cache
+        ).get_instance_template()
+        is not template
+    )
@@ -0,0 +1,196 @@
+from typing import Any, List, cast
+import pytest
+
+from polywrap_msgpack import msgpack_decode
+from polywrap_core import FileReader, Uri, WrapAbortError, WrapError
+from polywrap_wasm import InstancePoolConfig, WasmWrapper
+from polywrap_manifest import deserialize_wrap_manifest
+from wasmtime import wat2wasm
+
+URI = Uri.from_str("fs/./build")
+
+# Returns the msgpack encoded number of invocations served by the instance
+COUNTER_MODULE = wat2wasm(
+    """
+    (module
+      (import "env" "memory" (memory 1))
+      (import "wrap" "__wrap_invoke_result" (func $invoke_result (param i32 i32)))
+      (global $counter (mut i32) (i32.const 0))
+      (func (export "_wrap_invoke") (param i32 i32 i32) (result i32)
+        (global.set $counter (i32.add (global.get $counter) (i32.const 1)))
+        (i32.store8 (i32.const 0) (global.get $counter))
+        (call $invoke_result (i32.const 0) (i32.const 1))
+        (i32.const 1)))
+    """
+)
+
+
+@pytest.fixture
+def simple_wrapper(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    yield WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+    )
+
+
+def count_instantiations(wrapper: WasmWrapper) -> List[int]:
+    template = wrapper.get_instance_template()
+    instantiate = template.instantiate
+    calls = [0]
+
+    def counting_instantiate(*args: Any, **kwargs: Any):
+        calls[0] += 1
+        return instantiate(*args, **kwargs)
+
+    template.instantiate = counting_instantiate  # type: ignore
+    return calls
+
+
+def test_batch_instantiates_every_invocation(simple_wrapper: WasmWrapper):
+    calls = count_instantiations(simple_wrapper)
+    messages = [f"message {i}" for i in range(5)]
+
+    results = list(
+        simple_wrapper.invoke_batch(
+            uri=URI,
+            method="simpleMethod",
+            args_iterable=({"arg": message} for message in messages),
+        )
+    )
+
+    assert [
+        msgpack_decode(cast(bytes, result.result)) for result in results
+    ] == messages
+    assert calls[0] == 5
+
+
+def test_batch_reuses_one_instance(simple_wrapper: WasmWrapper):
+    calls = count_instantiations(simple_wrapper)
+    messages = [f"message {i}" for i in range(20)]
+
+    results = list(
+        simple_wrapper.invoke_batch(
+            uri=URI,
+            method="simpleMethod",
+            args_iterable=({"arg": message} for message in messages),
+            reuse_instance=True,
+        )
+    )
+
+    assert [
+        msgpack_decode(cast(bytes, result.result)) for result in results
+    ] == messages
+    assert all(result.encoded and result.error is None for result in results)
+    assert calls[0] == 1
+
+
+def test_batch_captures_item_errors(simple_wrapper: WasmWrapper):
+    calls = count_instantiations(simple_wrapper)
+
+    results = list(
+        simple_wrapper.invoke_batch(
+            uri=URI,
+            method="simpleMethod",
+            args_iterable=[{"arg": "a"}, {"wrong": "b"}, {"arg": "c"}],
+            reuse_instance=True,
+        )
+    )
+
+    assert msgpack_decode(cast(bytes, results[0].result)) == "a"
+    assert isinstance(results[1].error, WrapAbortError)
+    assert results[1].result is None
+    assert msgpack_decode(cast(bytes, results[2].result)) == "c"
+    # The instance of the failed invocation is replaced
+    assert calls[0] == 2
+
+
+def test_stateful_batch_matches_single_invocations(
+    dummy_file_reader: FileReader, simple_wrap_manifest: bytes
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        COUNTER_MODULE,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+    )
+
+    single = [
+        msgpack_decode(cast(bytes, wrapper.invoke(uri=URI, method="count").result))
+        for _ in range(3)
+    ]
+    batch = [
+        msgpack_decode(cast(bytes, result.result))
+        for result in wrapper.invoke_batch(
+            uri=URI, method="count", args_iterable=[None, None, None]
+        )
+    ]
+    reused = [
+        msgpack_decode(cast(bytes, result.result))
+        for result in wrapper.invoke_batch(
+            uri=URI,
+            method="count",
+            args_iterable=[None, None, None],
+            reuse_instance=True,
+        )
+    ]
+
+    assert single == [1, 1, 1]
+    assert batch == single
+    assert reused == [1, 2, 3]
+
+
+def test_batch_is_lazy(simple_wrapper: WasmWrapper):
+    consumed: List[int] = []
+
+    def args_iterable():
+        for i in range(3):
+            consumed.append(i)
+            yield {"arg": str(i)}
+
+    results = simple_wrapper.invoke_batch(
+        uri=URI, method="simpleMethod", args_iterable=args_iterable()
+    )
+    assert consumed == []
+
+    first = next(results)
+    assert msgpack_decode(cast(bytes, first.result)) == "0"
+    assert consumed == [0]
+
+
+def test_batch_uses_instance_pool(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        instance_pool_config=InstancePoolConfig(),
+    )
+
+    results = list(
+        wrapper.invoke_batch(
+            uri=URI,
+            method="simpleMethod",
+            args_iterable=[{"arg": "a"}, {"arg": "b"}],
+        )
+    )
+
+    assert [msgpack_decode(cast(bytes, result.result)) for result in results] == [
+        "a",
+        "b",
+    ]
+    pool = wrapper.get_instance_pool()
+    assert pool is not None
+    assert pool.get_stats().created == 1
+    assert pool.get_stats().idle == 1
+
+
+def test_batch_requires_method(simple_wrapper: WasmWrapper):
+    with pytest.raises(WrapError):
+        simple_wrapper.invoke_batch(uri=URI, method="", args_iterable=[])
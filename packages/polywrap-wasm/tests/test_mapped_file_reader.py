@@ -0,0 +1,107 @@
+import mmap
+from typing import Any, cast
+import pytest
+
+from pathlib import Path
+
+from polywrap_msgpack import msgpack_decode
+from polywrap_core import Uri
+from polywrap_wasm import (
+    MappableFileReader,
+    MappedFileReader,
+    ModuleCache,
+    WasmPackage,
+    WasmWrapper,
+    hash_wasm_module,
+)
+
+SIMPLE_WRAP_PATH = Path(__file__).parent / "cases" / "simple"
+
+
+class CountingFileReader(MappedFileReader):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.reads: list[str] = []
+        self.maps: list[str] = []
+
+    def read_file(self, file_path: str) -> bytes:
+        self.reads.append(file_path)
+        return super().read_file(file_path)
+
+    def map_file(self, file_path: str) -> mmap.mmap:
+        self.maps.append(file_path)
+        return super().map_file(file_path)
+
+
+def test_map_file():
+    reader = MappedFileReader(SIMPLE_WRAP_PATH)
+
+    with reader.map_file("wrap.wasm") as mapped:
+        assert isinstance(mapped, mmap.mmap)
+        assert mapped[:] == reader.read_file("wrap.wasm")
+        assert hash_wasm_module(mapped) == hash_wasm_module(
+            reader.read_file("wrap.wasm")
+        )
+
+
+def test_mappable_file_reader_protocol():
+    class PlainFileReader:
+        def read_file(self, file_path: str) -> bytes:
+            raise NotImplementedError()
+
+    assert isinstance(MappedFileReader(), MappableFileReader)
+    assert not isinstance(PlainFileReader(), MappableFileReader)
+
+
+def test_map_empty_file(tmp_path: Path):
+    (tmp_path / "wrap.wasm").write_bytes(b"")
+
+    with pytest.raises(OSError):
+        MappedFileReader(tmp_path).map_file("wrap.wasm")
+
+
+def test_package_is_lazy():
+    reader = CountingFileReader(SIMPLE_WRAP_PATH)
+
+    with WasmPackage(reader, module_cache=ModuleCache()) as package:
+        assert reader.reads == []
+        assert reader.maps == []
+
+        wrapper = cast(WasmWrapper, package.create_wrapper())
+        assert reader.maps == ["wrap.wasm"]
+        assert reader.reads == ["wrap.info"]
+        assert isinstance(wrapper.get_wasm_module(), mmap.mmap)
+
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"), method="simpleMethod", args={"arg": "hey"}
+        )
+        assert msgpack_decode(cast(bytes, result.result)) == "hey"
+
+
+def test_package_closes_mapped_module():
+    reader = CountingFileReader(SIMPLE_WRAP_PATH)
+    package = WasmPackage(reader, module_cache=ModuleCache())
+
+    mapped = cast(mmap.mmap, package.get_wasm_module())
+    package.close()
+
+    assert mapped.closed
+    # The module is mapped again when it's needed
+    assert package.get_wasm_module()[:] == reader.read_file("wrap.wasm")
+    assert reader.maps == ["wrap.wasm", "wrap.wasm"]
+    package.close()
+
+
+def test_package_leaves_given_module_open():
+    with MappedFileReader(SIMPLE_WRAP_PATH).map_file("wrap.wasm") as mapped:
+        with WasmPackage(MappedFileReader(SIMPLE_WRAP_PATH), wasm_module=mapped):
+            pass
+
+        assert not mapped.closed
+
+
+def test_package_without_module_file(tmp_path: Path):
+    package = WasmPackage(MappedFileReader(tmp_path))
+
+    with pytest.raises(OSError):
+        package.create_wrapper()
@@ -0,0 +1,135 @@
+from typing import cast
+import pytest
+
+from wasmtime import Engine, wat2wasm
+
+from polywrap_msgpack import msgpack_decode
+from polywrap_core import FileReader, Uri
+from polywrap_wasm import (
+    ModuleCache,
+    WasmWrapper,
+    get_module_cache,
+    hash_wasm_module,
+)
+from polywrap_manifest import deserialize_wrap_manifest
+
+
+def test_module_is_compiled_once():
+    cache = ModuleCache()
+    wasm_module = wat2wasm("(module)")
+
+    first = cache.get_module(wasm_module)
+    second = cache.get_module(wasm_module)
+
+    assert first is second
+    stats = cache.get_stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert hash_wasm_module(wasm_module) in cache
+
+
+def test_least_recently_used_module_is_evicted():
+    cache = ModuleCache(max_size=2)
+    module_a = wat2wasm("(module (func))")
+    module_b = wat2wasm("(module (func) (func))")
+    module_c = wat2wasm("(module (func) (func) (func))")
+
+    cache.get_module(module_a)
+    cache.get_module(module_b)
+    # Touch module_a so that module_b becomes the least recently used one
+    cache.get_module(module_a)
+    cache.get_module(module_c)
+
+    assert len(cache) == 2
+    assert hash_wasm_module(module_a) in cache
+    assert hash_wasm_module(module_b) not in cache
+    assert hash_wasm_module(module_c) in cache
+    assert cache.get_stats().evictions == 1
+
+
+def test_shared_object_is_created_once():
+    cache = ModuleCache()
+    wasm_module = wat2wasm("(module)")
+    module_hash = hash_wasm_module(wasm_module)
+    cache.get_module(wasm_module)
+
+    first = cache.get_shared(module_hash, "key", object)
+    second = cache.get_shared(module_hash, "key", object)
+
+    assert first is second
+    assert cache.get_shared(module_hash, "other", object) is not first
+
+
+def test_shared_object_dropped_with_module():
+    cache = ModuleCache(max_size=1)
+    wasm_module = wat2wasm("(module)")
+    module_hash = hash_wasm_module(wasm_module)
+    cache.get_module(wasm_module)
+    shared = cache.get_shared(module_hash, "key", object)
+
+    cache.get_module(wat2wasm("(module (func))"))
+
+    assert cache.get_shared(module_hash, "key", object) is not shared
+
+
+def test_shared_object_not_kept_without_module():
+    cache = ModuleCache()
+
+    first = cache.get_shared("unknown", "key", object)
+
+    assert cache.get_shared("unknown", "key", object) is not first
+
+
+def test_clear_resets_counters():
+    cache = ModuleCache()
+    cache.get_module(wat2wasm("(module)"))
+    cache.clear()
+
+    stats = cache.get_stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (0, 0, 0, 0)
+
+
+def test_invalid_max_size():
+    with pytest.raises(ValueError):
+        ModuleCache(max_size=0)
+
+
+def test_uses_given_engine():
+    engine = Engine()
+    cache = ModuleCache(engine=engine)
+    assert cache.engine is engine
+
+
+def test_default_module_cache_is_shared():
+    assert get_module_cache() is get_module_cache()
+
+
+def test_wrappers_compile_module_once(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    cache = ModuleCache()
+    wrappers = [
+        WasmWrapper(
+            dummy_file_reader,
+            simple_wrap_module,
+            deserialize_wrap_manifest(simple_wrap_manifest),
+            cache,
+        )
+        for _ in range(2)
+    ]
+
+    for wrapper, message in zip(wrappers, ["hey", "there"]):
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": message},
+        )
+        assert msgpack_decode(cast(bytes, result.result)) == message
+
+    stats = cache.get_stats()
+    assert stats.misses == 1
+    # The second wrapper takes the instance template of the first from the cache
+    assert stats.hits == 0
+    assert wrappers[0].get_instance_template() is wrappers[1].get_instance_template()
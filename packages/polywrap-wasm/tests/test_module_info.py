@@ -0,0 +1,160 @@
+from typing import Any
+import pytest
+
+from wasmtime import wat2wasm
+
+from polywrap_wasm import (
+    ModuleCache,
+    WasmExportNotFoundError,
+    WasmGlobal,
+    WasmMemoryError,
+    WasmMemoryLimits,
+    WasmModuleError,
+    get_wasm_module_info,
+    parse_wasm_module,
+)
+from polywrap_wasm.instance import WasmInstanceTemplate
+from polywrap_wasm.memory import create_memory_type
+
+
+def with_custom_section(wasm_module: bytes, name: str, data: bytes) -> bytes:
+    payload = bytes([len(name)]) + name.encode("utf-8") + data
+    assert len(payload) < 0x80
+    return wasm_module + bytes([0, len(payload)]) + payload
+
+
+def test_parse_simple_wrapper(simple_wrap_module: bytes):
+    info = parse_wasm_module(simple_wrap_module)
+
+    memory_import = info.get_import("env", "memory")
+    assert memory_import is not None
+    assert memory_import.kind == "memory"
+    assert memory_import.memory_limits is not None
+    assert info.get_import("wrap", "__wrap_invoke_args") is not None
+
+    wrap_invoke = info.get_export("_wrap_invoke")
+    assert wrap_invoke is not None
+    assert wrap_invoke.kind == "func"
+
+
+@pytest.mark.parametrize(
+    "memory, limits",
+    [
+        ("1", WasmMemoryLimits(minimum=1)),
+        ("200", WasmMemoryLimits(minimum=200)),
+        ("300 70000", WasmMemoryLimits(minimum=300, maximum=70000)),
+    ],
+)
+def test_parse_memory_limits(memory: str, limits: WasmMemoryLimits):
+    wasm_module = wat2wasm(f'(module (import "env" "memory" (memory {memory})))')
+
+    info = parse_wasm_module(wasm_module)
+    memory_import = info.get_import("env", "memory")
+
+    assert memory_import is not None
+    assert memory_import.memory_limits == limits
+
+    memory_type = create_memory_type(wasm_module)
+    assert memory_type.limits.min == limits.minimum
+    assert memory_type.limits.max == limits.maximum
+
+
+def test_parse_imports_exports_and_memories():
+    wasm_module = wat2wasm(
+        """
+        (module
+          (import "wrap" "f" (func $f (param i32)))
+          (import "env" "table" (table 1 funcref))
+          (import "env" "g" (global i32))
+          (memory 2 3)
+          (func (export "run"))
+          (export "mem" (memory 0)))
+        """
+    )
+
+    info = parse_wasm_module(wasm_module)
+
+    assert [(i.module, i.name, i.kind) for i in info.imports] == [
+        ("wrap", "f", "func"),
+        ("env", "table", "table"),
+        ("env", "g", "global"),
+    ]
+    assert [(e.name, e.kind, e.index) for e in info.exports] == [
+        ("run", "func", 1),
+        ("mem", "memory", 0),
+    ]
+    assert info.memories == [WasmMemoryLimits(minimum=2, maximum=3)]
+
+
+def test_parse_globals_and_start():
+    wasm_module = wat2wasm(
+        """
+        (module
+          (import "env" "g" (global i32))
+          (global (mut i64) (i64.const -624485))
+          (global f64 (f64.const 1.5))
+          (global (mut i32) (i32.add (global.get 0) (i32.const 11)))
+          (func $init)
+          (start $init))
+        """
+    )
+
+    info = parse_wasm_module(wasm_module)
+
+    assert info.globals == [
+        WasmGlobal(index=1, value_type="i64", mutable=True),
+        WasmGlobal(index=2, value_type="f64", mutable=False),
+        WasmGlobal(index=3, value_type="i32", mutable=True),
+    ]
+    assert info.start == 0
+
+
+def test_parse_custom_sections():
+    wasm_module = with_custom_section(wat2wasm("(module)"), "producers", b"\x01\x02")
+
+    info = parse_wasm_module(wasm_module)
+
+    assert len(info.get_custom_sections("producers")) == 1
+    assert info.get_custom_sections("producers")[0].data == b"\x01\x02"
+    assert info.get_custom_sections("name") == []
+
+
+@pytest.mark.parametrize(
+    "wasm_module",
+    [
+        b"",
+        b"not a wasm module",
+        b"\x00asm\x02\x00\x00\x00",
+        # Section size beyond the end of the module
+        b"\x00asm\x01\x00\x00\x00\x02\x10\x00",
+    ],
+)
+def test_parse_malformed_module(wasm_module: bytes):
+    with pytest.raises(WasmModuleError):
+        parse_wasm_module(wasm_module)
+
+
+def test_module_info_is_cached(simple_wrap_module: bytes):
+    info = get_wasm_module_info(simple_wrap_module, "simple-wrap-module-info")
+
+    assert get_wasm_module_info(simple_wrap_module, "simple-wrap-module-info") is info
+
+
+@pytest.mark.parametrize(
+    "wat, error",
+    [
+        ('(module (func (export "_wrap_invoke")))', WasmMemoryError),
+        ('(module (import "env" "memory" (memory 1)))', WasmExportNotFoundError),
+        (
+            '(module (import "env" "memory" (memory 1 1 shared)) (func (export "_wrap_invoke")))',
+            WasmMemoryError,
+        ),
+    ],
+)
+def test_template_rejects_module_before_compilation(wat: str, error: Any):
+    cache = ModuleCache()
+
+    with pytest.raises(error):
+        WasmInstanceTemplate(wat2wasm(wat), cache)
+
+    assert cache.get_stats().misses == 0
@@ -0,0 +1,250 @@
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pipe
+from threading import Thread
+from typing import Any, Dict, List, cast
+import pytest
+
+from polywrap_msgpack import msgpack_decode, msgpack_encode
+from polywrap_core import FileReader, Uri, WrapAbortError, WrapError
+from polywrap_wasm import ProcessPoolWasmExecutor, WasmPackage, WasmWrapper
+from polywrap_wasm.types.state import WasmInvokeOptions
+from polywrap_wasm.process_pool import (
+    _PipeInvoker,
+    _handle_worker_request,
+)  # pyright: ignore[reportPrivateUsage]
+from polywrap_manifest import deserialize_wrap_manifest
+from wasmtime import wat2wasm
+
+OUTER_MODULE = wat2wasm(
+    """
+    (module
+      (import "env" "memory" (memory 1))
+      (import "wrap" "__wrap_subinvoke"
+        (func $subinvoke (param i32 i32 i32 i32 i32 i32) (result i32)))
+      (import "wrap" "__wrap_subinvoke_result_len" (func $result_len (result i32)))
+      (import "wrap" "__wrap_subinvoke_result" (func $result (param i32)))
+      (import "wrap" "__wrap_invoke_result" (func $invoke_result (param i32 i32)))
+      (data (i32.const 0) "wrap://mock/inner")
+      (data (i32.const 32) "method")
+      (func (export "_wrap_invoke") (param i32 i32 i32) (result i32)
+        (if (i32.eqz (call $subinvoke
+              (i32.const 0) (i32.const 17) (i32.const 32) (i32.const 6)
+              (i32.const 64) (i32.const 0)))
+          (then (return (i32.const 0))))
+        (call $result (i32.const 128))
+        (call $invoke_result (i32.const 128) (call $result_len))
+        (i32.const 1)))
+    """
+)
+
+# Returns the msgpack encoded "inner" string
+INNER_MODULE = wat2wasm(
+    """
+    (module
+      (import "env" "memory" (memory 1))
+      (import "wrap" "__wrap_invoke_result" (func $invoke_result (param i32 i32)))
+      (data (i32.const 0) "\\a5inner")
+      (func (export "_wrap_invoke") (param i32 i32 i32) (result i32)
+        (call $invoke_result (i32.const 0) (i32.const 6))
+        (i32.const 1)))
+    """
+)
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolWasmExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def test_invoke_in_worker(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+    executor: ProcessPoolWasmExecutor,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        executor=executor,
+    )
+
+    def invoke(message: str) -> Any:
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": message},
+        )
+        assert result.encoded is True
+        return msgpack_decode(cast(bytes, result.result))
+
+    messages = [f"message {i}" for i in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as threads:
+        assert list(threads.map(invoke, messages)) == messages
+
+
+def test_worker_error_is_raised(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+    executor: ProcessPoolWasmExecutor,
+):
+    package = WasmPackage(
+        dummy_file_reader,
+        simple_wrap_manifest,
+        simple_wrap_module,
+        executor=executor,
+    )
+    wrapper = package.create_wrapper()
+
+    with pytest.raises(WrapAbortError) as err:
+        wrapper.invoke(uri=Uri.from_str("fs/./build"), method="simpleMethod")
+    assert err.value.uri == Uri.from_str("fs/./build")
+
+    # The worker is still usable after a failed invocation
+    result = wrapper.invoke(
+        uri=Uri.from_str("fs/./build"),
+        method="simpleMethod",
+        args={"arg": "hey"},
+    )
+    assert msgpack_decode(cast(bytes, result.result)) == "hey"
+
+
+def test_shutdown_executor_refuses_invocations(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    executor = ProcessPoolWasmExecutor(max_workers=1)
+    executor.shutdown()
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        executor=executor,
+    )
+
+    with pytest.raises(WrapError):
+        wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": "hey"},
+        )
+
+
+def test_worker_records_module_once_compiled(simple_wrap_module: bytes):
+    invoke_options = WasmInvokeOptions(
+        uri=Uri.from_str("fs/./build"),
+        method="simpleMethod",
+        encoded_args=msgpack_encode({"arg": "hey"}),
+    )
+
+    with ProcessPoolWasmExecutor(max_workers=1) as executor:
+        with pytest.raises(WrapAbortError):
+            executor.invoke(b"not a wasm module", "module", invoke_options, None)
+        [worker] = executor._workers  # pyright: ignore[reportPrivateUsage]
+        assert "module" not in worker.module_hashes
+
+        # The worker didn't keep the module, so it is sent again
+        result, _ = executor.invoke(simple_wrap_module, "module", invoke_options, None)
+        assert msgpack_decode(result) == "hey"
+        assert "module" in worker.module_hashes
+
+
+def test_worker_recompiles_evicted_module():
+    invoke_options = WasmInvokeOptions(
+        uri=Uri.from_str("wrap://mock/inner"), method="method", encoded_args=b""
+    )
+
+    with ProcessPoolWasmExecutor(max_workers=1) as executor:
+        executor.invoke(INNER_MODULE, "inner", invoke_options, None)
+        [worker] = executor._workers  # pyright: ignore[reportPrivateUsage]
+        # The worker doesn't have the module, as if it evicted it
+        worker.module_hashes.add("evicted")
+
+        result, _ = executor.invoke(INNER_MODULE, "evicted", invoke_options, None)
+
+        assert msgpack_decode(result) == "inner"
+        assert "evicted" in worker.module_hashes
+
+
+def test_nested_subinvoke_with_single_worker(dummy_file_reader: FileReader):
+    executor = ProcessPoolWasmExecutor(max_workers=1)
+    wrappers: Dict[str, WasmWrapper] = {
+        uri: WasmWrapper(
+            dummy_file_reader, wasm_module, cast(Any, None), executor=executor
+        )
+        for uri, wasm_module in [
+            ("wrap://mock/outer", OUTER_MODULE),
+            ("wrap://mock/inner", INNER_MODULE),
+        ]
+    }
+
+    class MockClient:
+        def invoke(self, **kwargs: Any) -> Any:
+            return (
+                wrappers[str(kwargs["uri"])]
+                .invoke(
+                    uri=kwargs["uri"],
+                    method=kwargs["method"],
+                    args=kwargs["args"],
+                    client=cast(Any, self),
+                )
+                .result
+            )
+
+        def get_implementations(self, uri: Uri, apply_resolution: bool = True) -> Any:
+            return None
+
+    results: List[Any] = []
+
+    def invoke_outer() -> None:
+        results.append(
+            MockClient().invoke(
+                uri=Uri.from_str("wrap://mock/outer"), method="method", args=None
+            )
+        )
+
+    # The worker running the outer wrapper waits for the inner one
+    thread = Thread(target=invoke_outer, daemon=True)
+    try:
+        thread.start()
+        thread.join(timeout=60)
+        assert not thread.is_alive()
+        assert [msgpack_decode(result) for result in results] == ["inner"]
+    finally:
+        executor.shutdown()
+
+
+def test_subinvoke_is_sent_to_parent():
+    class MockClient:
+        def invoke(self, **kwargs: Any) -> Any:
+            assert kwargs["uri"] == Uri.from_str("wrap://mock/sub")
+            assert kwargs["encode_result"] is True
+            return {"method": kwargs["method"]}
+
+        def get_implementations(self, uri: Uri, apply_resolution: bool = True) -> Any:
+            return [Uri.from_str("wrap://mock/impl")]
+
+    parent, worker = Pipe()
+    invoker = _PipeInvoker(worker)
+    with ThreadPoolExecutor(max_workers=1) as threads:
+        subinvoke = threads.submit(
+            invoker.invoke, Uri.from_str("wrap://mock/sub"), "method", {"a": 1}
+        )
+        parent.send(_handle_worker_request(parent.recv(), cast(Any, MockClient())))
+        assert msgpack_decode(subinvoke.result()) == {"method": "method"}
+
+        implementations = threads.submit(
+            invoker.get_implementations, Uri.from_str("wrap://mock/interface")
+        )
+        parent.send(_handle_worker_request(parent.recv(), cast(Any, MockClient())))
+        assert implementations.result() == [Uri.from_str("wrap://mock/impl")]
+
+        failed = threads.submit(
+            invoker.invoke, Uri.from_str("wrap://mock/sub"), "method"
+        )
+        parent.send(_handle_worker_request(parent.recv(), None))
+        with pytest.raises(WrapError):
+            failed.result()
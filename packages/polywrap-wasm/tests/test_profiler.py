@@ -0,0 +1,123 @@
+from io import StringIO
+from typing import Generator
+import pytest
+
+from polywrap_msgpack import msgpack_encode
+from polywrap_core import FileReader, Uri
+from polywrap_wasm import (
+    ModuleCache,
+    WasmPackage,
+    WasmProfiler,
+    WasmWrapper,
+    get_profiler,
+    set_profiler,
+)
+from polywrap_wasm.types import InvocationProfile
+from polywrap_manifest import deserialize_wrap_manifest
+
+URI = Uri.from_str("wrap://fs/./build")
+
+
+@pytest.fixture
+def process_profiler() -> Generator[WasmProfiler, None, None]:
+    profiler = WasmProfiler()
+    set_profiler(profiler)
+    yield profiler
+    set_profiler(None)
+
+
+def test_recorded_profiles_are_not_modified():
+    profiler = WasmProfiler()
+    first = InvocationProfile(uri=URI, method="method", execute_time=1.0)
+    second = InvocationProfile(uri=URI, method="method", execute_time=2.0)
+
+    profiler.record(first)
+    profiler.record(second)
+
+    assert (first.invocations, first.execute_time) == (1, 1.0)
+    [aggregate] = profiler.get_profiles()
+    assert (aggregate.invocations, aggregate.execute_time) == (2, 3.0)
+
+
+def test_profile_imports(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    profiler = WasmProfiler()
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        ModuleCache(),
+        profiler=profiler,
+    )
+
+    args = {"arg": "hello"}
+    for _ in range(3):
+        wrapper.invoke(uri=URI, method="simpleMethod", args=args)
+
+    [profile] = profiler.get_profiles()
+    assert profile.uri == URI
+    assert profile.method == "simpleMethod"
+    assert profile.invocations == 3
+    assert profile.compile_time > 0
+    assert profile.instantiate_time > 0
+    assert profile.execute_time >= profile.import_time > 0
+
+    invoke_args = profile.imports["__wrap_invoke_args"]
+    assert invoke_args.calls == 3
+    assert invoke_args.bytes_moved == 3 * (
+        len("simpleMethod") + len(msgpack_encode(args))
+    )
+    invoke_result = profile.imports["__wrap_invoke_result"]
+    assert invoke_result.calls == 3
+    assert invoke_result.bytes_moved == 3 * len(msgpack_encode("hello"))
+
+
+def test_folded_stacks(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    profiler = WasmProfiler()
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        ModuleCache(),
+        profiler=profiler,
+    )
+    wrapper.invoke(uri=URI, method="simpleMethod", args={"arg": "hello"})
+
+    output = StringIO()
+    profiler.write_folded_stacks(output)
+    lines = output.getvalue().splitlines()
+
+    assert lines == profiler.get_folded_stacks()
+    stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+    assert f"{URI};simpleMethod;compile" in stacks
+    assert f"{URI};simpleMethod;_wrap_invoke" in stacks
+    assert all(count > 0 for count in stacks.values())
+
+    profiler.clear()
+    assert profiler.get_folded_stacks() == []
+
+
+def test_process_profiler(
+    process_profiler: WasmProfiler,
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    assert get_profiler() is process_profiler
+    package = WasmPackage(
+        dummy_file_reader, simple_wrap_manifest, simple_wrap_module, ModuleCache()
+    )
+
+    package.create_wrapper().invoke(
+        uri=URI, method="simpleMethod", args={"arg": "hello"}
+    )
+
+    [profile] = process_profiler.get_profiles()
+    assert profile.invocations == 1
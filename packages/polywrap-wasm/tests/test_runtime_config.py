@@ -0,0 +1,68 @@
+from typing import cast
+import pytest
+
+from polywrap_msgpack import msgpack_decode
+from polywrap_core import FileReader, Uri
+from polywrap_wasm import (
+    ModuleCache,
+    WasmPackage,
+    WasmRuntimeConfig,
+    WasmWrapper,
+    get_module_cache,
+)
+
+
+def test_engine_is_shared_per_config():
+    assert WasmRuntimeConfig().get_engine() is WasmRuntimeConfig().get_engine()
+    assert (
+        WasmRuntimeConfig.for_startup().get_engine()
+        is not WasmRuntimeConfig.for_throughput().get_engine()
+    )
+
+
+def test_engine_key_depends_on_options():
+    assert WasmRuntimeConfig().engine_key == WasmRuntimeConfig().engine_key
+    assert (
+        WasmRuntimeConfig.for_startup().engine_key
+        != WasmRuntimeConfig.for_throughput().engine_key
+    )
+
+
+def test_module_cache_uses_config_engine():
+    runtime_config = WasmRuntimeConfig(parallel_compilation=False)
+    module_cache = ModuleCache(runtime_config=runtime_config)
+    assert module_cache.engine is runtime_config.get_engine()
+
+
+def test_module_cache_is_shared_per_config():
+    runtime_config = WasmRuntimeConfig.for_startup()
+    assert get_module_cache(runtime_config) is get_module_cache(runtime_config)
+    assert get_module_cache(runtime_config) is not get_module_cache()
+    assert get_module_cache(WasmRuntimeConfig()) is get_module_cache()
+
+
+@pytest.mark.parametrize(
+    "runtime_config",
+    [WasmRuntimeConfig.for_startup(), WasmRuntimeConfig.for_throughput()],
+)
+def test_package_invokes_with_runtime_config(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+    runtime_config: WasmRuntimeConfig,
+):
+    package = WasmPackage(
+        dummy_file_reader,
+        simple_wrap_manifest,
+        simple_wrap_module,
+        runtime_config=runtime_config,
+    )
+    wrapper = cast(WasmWrapper, package.create_wrapper())
+    assert wrapper.module_cache.engine is runtime_config.get_engine()
+
+    result = wrapper.invoke(
+        uri=Uri.from_str("fs/./build"),
+        method="simpleMethod",
+        args={"arg": "hey"},
+    )
+    assert msgpack_decode(cast(bytes, result.result)) == "hey"
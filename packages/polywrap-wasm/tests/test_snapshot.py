@@ -0,0 +1,220 @@
+from typing import Any, List, cast
+import pytest
+
+from polywrap_msgpack import msgpack_decode
+from polywrap_core import FileReader, Uri
+from polywrap_manifest import deserialize_wrap_manifest
+from wasmtime import Func, Instance, Store, wat2wasm
+
+from polywrap_wasm import (
+    ModuleCache,
+    SnapshotConfig,
+    WasmPackage,
+    WasmSnapshotError,
+    WasmSnapshotTemplate,
+    WasmWrapper,
+    create_snapshot_module,
+    parse_wasm_module,
+)
+from polywrap_wasm.imports import WrapImports
+from polywrap_wasm.types.state import State, WasmInvokeOptions
+
+INIT_MODULE = wat2wasm(
+    """
+    (module
+      (import "env" "memory" (memory 1))
+      (global $counter (mut i32) (i32.const 0))
+      (global $seed (mut i64) (i64.const 0))
+      (global $ratio (mut f64) (f64.const 0))
+      (global (export "counter") (mut i32) (i32.const 0))
+      (func $init (local $i i32)
+        ;; Build a table of squares in the second page
+        (memory.grow (i32.const 1))
+        drop
+        (loop $fill
+          (i32.store
+            (i32.add (i32.const 65536) (i32.shl (local.get $i) (i32.const 2)))
+            (i32.mul (local.get $i) (local.get $i)))
+          (local.set $i (i32.add (local.get $i) (i32.const 1)))
+          (br_if $fill (i32.lt_u (local.get $i) (i32.const 1024))))
+        (global.set $seed (i64.const -8589934592))
+        (global.set $ratio (f64.const 0.1))
+        (global.set $counter (i32.add (global.get $counter) (i32.const 1))))
+      (start $init)
+      (func (export "_wrap_invoke") (param i32 i32 i32) (result i32)
+        (global.set $counter (i32.add (global.get $counter) (i32.const 1)))
+        (i32.const 0))
+      (func (export "get_counter") (result i32) (global.get $counter))
+      (func (export "get_seed") (result i64) (global.get $seed))
+      (func (export "get_ratio") (result f64) (global.get $ratio))
+      (func (export "get_square") (param i32) (result i32)
+        (i32.load
+          (i32.add (i32.const 65536) (i32.shl (local.get 0) (i32.const 2))))))
+    """
+)
+
+
+def new_state() -> State:
+    return State(
+        invoke_options=WasmInvokeOptions(uri=Uri.from_str("fs/./build"), method="m")
+    )
+
+
+def call(store: Store, instance: Instance, name: str, *args: Any) -> Any:
+    return cast(Func, instance.exports(store)[name])(store, *args)
+
+
+def read_memory(store: Store) -> bytes:
+    memory = cast(WrapImports, store.data()).memory
+    return bytes(memory.read(store))
+
+
+def test_snapshot_module_exports_start_and_globals():
+    snapshot_module, start_export, global_exports = create_snapshot_module(
+        INIT_MODULE, parse_wasm_module(INIT_MODULE)
+    )
+
+    info = parse_wasm_module(snapshot_module)
+
+    assert info.start is None
+    assert start_export is not None
+    assert info.get_export(start_export) is not None
+    assert len(global_exports) == 4
+    assert "counter" in global_exports.values()
+    assert all(info.get_export(name) is not None for name in global_exports.values())
+
+
+def test_restored_instance_matches_initialized_instance():
+    template = WasmSnapshotTemplate(INIT_MODULE, ModuleCache())
+
+    store_a, instance_a = template.instantiate(new_state(), None)
+    snapshot = template.snapshot
+    store_b, instance_b = template.instantiate(new_state(), None)
+
+    assert snapshot is not None
+    assert snapshot.memory_size == 2 * 65536
+    assert snapshot.memory_bytes == 4096
+    assert read_memory(store_b) == read_memory(store_a)
+    for name in ["get_counter", "get_seed", "get_ratio"]:
+        assert call(store_b, instance_b, name) == call(store_a, instance_a, name)
+    assert call(store_b, instance_b, "get_counter") == 1
+    assert call(store_b, instance_b, "get_seed") == -8589934592
+    assert call(store_b, instance_b, "get_ratio") == 0.1
+    assert call(store_b, instance_b, "get_square", 1000) == 1000000
+
+
+def test_restored_instances_are_isolated():
+    template = WasmSnapshotTemplate(INIT_MODULE, ModuleCache())
+    template.instantiate(new_state(), None)
+
+    store_a, instance_a = template.instantiate(new_state(), None)
+    call(store_a, instance_a, "_wrap_invoke", 0, 0, 0)
+    store_b, instance_b = template.instantiate(new_state(), None)
+
+    assert call(store_a, instance_a, "get_counter") == 2
+    assert call(store_b, instance_b, "get_counter") == 1
+
+
+def test_snapshot_after_first_invoke():
+    template = WasmSnapshotTemplate(
+        INIT_MODULE,
+        ModuleCache(),
+        snapshot_config=SnapshotConfig(after_first_invoke=True),
+    )
+
+    store_a, instance_a = template.instantiate(new_state(), None)
+    assert template.snapshot is None
+    call(store_a, instance_a, "_wrap_invoke", 0, 0, 0)
+    template.capture_after_invoke(store_a, instance_a)
+    store_b, instance_b = template.instantiate(new_state(), None)
+
+    assert template.snapshot is not None
+    assert call(store_b, instance_b, "get_counter") == 2
+    assert call(store_b, instance_b, "get_square", 12) == 144
+
+
+def test_snapshot_rejects_mutable_reference_globals():
+    wasm_module = wat2wasm(
+        """
+        (module
+          (import "env" "memory" (memory 1))
+          (global (mut funcref) (ref.null func))
+          (func (export "_wrap_invoke") (param i32 i32 i32) (result i32)
+            (i32.const 0)))
+        """
+    )
+
+    with pytest.raises(WasmSnapshotError):
+        WasmSnapshotTemplate(wasm_module, ModuleCache())
+
+
+@pytest.mark.parametrize(
+    "snapshot_config", [SnapshotConfig(), SnapshotConfig(after_first_invoke=True)]
+)
+def test_wrapper_invokes_from_snapshot(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+    snapshot_config: SnapshotConfig,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        ModuleCache(),
+        snapshot_config=snapshot_config,
+    )
+
+    for message in ["hey", "there", "snapshot"]:
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": message},
+        )
+        assert msgpack_decode(cast(bytes, result.result)) == message
+
+    template = wrapper.get_instance_template()
+    assert isinstance(template, WasmSnapshotTemplate)
+    assert template.snapshot is not None
+
+
+@pytest.mark.parametrize(
+    "snapshot_config", [SnapshotConfig(), SnapshotConfig(after_first_invoke=True)]
+)
+def test_wrappers_of_a_package_share_snapshot(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+    snapshot_config: SnapshotConfig,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    captures: List[WasmSnapshotTemplate] = []
+    capture = WasmSnapshotTemplate._capture  # pyright: ignore[reportPrivateUsage]
+
+    def counting_capture(self: WasmSnapshotTemplate, *args: Any) -> None:
+        captures.append(self)
+        capture(self, *args)
+
+    monkeypatch.setattr(WasmSnapshotTemplate, "_capture", counting_capture)
+    package = WasmPackage(
+        dummy_file_reader,
+        simple_wrap_manifest,
+        simple_wrap_module,
+        module_cache=ModuleCache(),
+        snapshot_config=snapshot_config,
+    )
+
+    templates: List[WasmSnapshotTemplate] = []
+    for message in ["hey", "there", "snapshot"]:
+        # Clients create a new wrapper from the package for every invocation
+        wrapper = cast(WasmWrapper, package.create_wrapper())
+        result = wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": message},
+        )
+        assert msgpack_decode(cast(bytes, result.result)) == message
+        templates.append(cast(WasmSnapshotTemplate, wrapper.get_instance_template()))
+
+    assert all(template is templates[0] for template in templates)
+    assert len(captures) == 1
@@ -0,0 +1,189 @@
+from typing import Any, List, Optional, Tuple
+import pytest
+
+from polywrap_msgpack import msgpack_decode, msgpack_encode
+from polywrap_core import (
+    InvocableResult,
+    Uri,
+    UriPackageOrWrapper,
+    UriResolutionContext,
+    UriWrapper,
+)
+from wasmtime import Engine, Limits, Memory, MemoryType, Store
+
+from polywrap_wasm.imports import WrapImports
+from polywrap_wasm.types.state import State, WasmInvokeOptions
+
+URI = "wrap://mock/subinvoked"
+METHOD = "method"
+ARGS = msgpack_encode({"arg": 1})
+
+
+class MockWrapper:
+    def __init__(self, result: Any, encoded: bool):
+        self.result = result
+        self.encoded = encoded
+        self.invocations: List[Any] = []
+
+    def invoke(self, **kwargs: Any) -> InvocableResult:
+        self.invocations.append(kwargs)
+        return InvocableResult(result=self.result, encoded=self.encoded)
+
+
+class MockClient:
+    def __init__(self, wrapper: MockWrapper, env: Optional[Any] = None):
+        self.wrapper = wrapper
+        self.env = env
+        self.resolutions = 0
+        self.invocations = 0
+
+    def try_resolve_uri(
+        self, uri: Uri, resolution_context: UriResolutionContext
+    ) -> UriPackageOrWrapper:
+        self.resolutions += 1
+        return UriWrapper(uri=uri, wrapper=self.wrapper)  # type: ignore
+
+    def get_env_by_uri(self, uri: Uri) -> Any:
+        return self.env
+
+    def invoke(self, **kwargs: Any) -> Any:
+        self.invocations += 1
+        return msgpack_encode(self.wrapper.result)
+
+    def get_implementations(self, *args: Any, **kwargs: Any) -> Any:
+        raise NotImplementedError()
+
+
+def create_wrap_imports(
+    invoker: Any, resolution_context: Optional[UriResolutionContext] = None
+) -> Tuple[Store, WrapImports]:
+    state = State(
+        invoke_options=WasmInvokeOptions(
+            uri=Uri.from_str("wrap://mock/parent"),
+            method="m",
+            resolution_context=resolution_context,
+        )
+    )
+    wrap_imports = WrapImports(state, invoker)
+    store = wrap_imports.store = Store(Engine(), wrap_imports)
+    wrap_imports.memory = Memory(store, MemoryType(Limits(1, None)))
+    wrap_imports.write_string(0, URI)
+    wrap_imports.write_string(100, METHOD)
+    wrap_imports.write_bytes(200, ARGS)
+    return store, wrap_imports
+
+
+def subinvoke(wrap_imports: WrapImports) -> bool:
+    return wrap_imports.wrap_subinvoke(0, len(URI), 100, len(METHOD), 200, len(ARGS))
+
+
+def test_subinvoke_resolves_wrapper_once():
+    encoded_result = msgpack_encode("result")
+    wrapper = MockWrapper(encoded_result, encoded=True)
+    client = MockClient(wrapper, env={"key": "value"})
+    _store, wrap_imports = create_wrap_imports(client)
+
+    for _ in range(3):
+        assert subinvoke(wrap_imports)
+        assert wrap_imports.state.subinvoke_result is not None
+        # Encoded results are passed back as is
+        assert wrap_imports.state.subinvoke_result.result is encoded_result
+
+    assert client.resolutions == 1
+    assert client.invocations == 0
+    assert len(wrapper.invocations) == 3
+    assert wrapper.invocations[0]["method"] == METHOD
+    assert wrapper.invocations[0]["env"] == {"key": "value"}
+    assert msgpack_decode(wrapper.invocations[0]["args"]) == {"arg": 1}
+
+
+def test_subinvoke_leaves_resolution_context_untouched():
+    class PathClient(MockClient):
+        def try_resolve_uri(
+            self, uri: Uri, resolution_context: UriResolutionContext
+        ) -> UriPackageOrWrapper:
+            resolution_context.start_resolving(uri)
+            resolution_context.stop_resolving(uri)
+            return super().try_resolve_uri(uri, resolution_context)
+
+    client = PathClient(MockWrapper(msgpack_encode("result"), encoded=True))
+    resolution_context = UriResolutionContext()
+    resolution_context.start_resolving(Uri.from_str("wrap://mock/parent"))
+    _store, wrap_imports = create_wrap_imports(client, resolution_context)
+
+    assert subinvoke(wrap_imports)
+    assert subinvoke(wrap_imports)
+
+    assert resolution_context.get_resolution_path() == [
+        Uri.from_str("wrap://mock/parent")
+    ]
+    assert resolution_context.get_history() == []
+    assert client.resolutions == 1
+    subinvoke_context = client.wrapper.invocations[0]["resolution_context"]
+    assert subinvoke_context.get_resolution_path() == []
+
+
+def test_subinvoke_resolves_unresolved_uri_once():
+    class UnresolvedClient(MockClient):
+        def try_resolve_uri(
+            self, uri: Uri, resolution_context: UriResolutionContext
+        ) -> UriPackageOrWrapper:
+            self.resolutions += 1
+            return uri
+
+    client = UnresolvedClient(MockWrapper("result", encoded=False))
+    _store, wrap_imports = create_wrap_imports(client)
+
+    for _ in range(3):
+        assert subinvoke(wrap_imports)
+        assert wrap_imports.state.subinvoke_result is not None
+        assert wrap_imports.state.subinvoke_result.result == msgpack_encode("result")
+
+    assert client.resolutions == 1
+    assert client.invocations == 3
+    assert client.wrapper.invocations == []
+
+
+def test_subinvoke_encodes_decoded_result():
+    client = MockClient(MockWrapper("result", encoded=False))
+    _store, wrap_imports = create_wrap_imports(client)
+
+    assert subinvoke(wrap_imports)
+    assert wrap_imports.state.subinvoke_result is not None
+    assert wrap_imports.state.subinvoke_result.result == msgpack_encode("result")
+
+
+def test_subinvoke_captures_wrapper_error():
+    class FailingWrapper(MockWrapper):
+        def invoke(self, **kwargs: Any) -> InvocableResult:
+            raise RuntimeError("failed")
+
+    client = MockClient(FailingWrapper(None, encoded=True))
+    _store, wrap_imports = create_wrap_imports(client)
+
+    assert not subinvoke(wrap_imports)
+    assert wrap_imports.state.subinvoke_result is not None
+    assert isinstance(wrap_imports.state.subinvoke_result.error, RuntimeError)
+
+
+@pytest.mark.parametrize("result", ["result", {"a": [1, 2]}])
+def test_subinvoke_falls_back_to_invoker(result: Any):
+    class MockInvoker:
+        def __init__(self):
+            self.invocations = 0
+
+        def invoke(self, **kwargs: Any) -> Any:
+            self.invocations += 1
+            assert kwargs["encode_result"] is True
+            assert "resolution_context" not in kwargs
+            return msgpack_encode(result)
+
+    invoker = MockInvoker()
+    resolution_context = UriResolutionContext()
+    _store, wrap_imports = create_wrap_imports(invoker, resolution_context)
+
+    assert subinvoke(wrap_imports)
+    assert subinvoke(wrap_imports)
+    assert invoker.invocations == 2
+    assert wrap_imports.state.subinvoke_result is not None
+    assert wrap_imports.state.subinvoke_result.result == msgpack_encode(result)
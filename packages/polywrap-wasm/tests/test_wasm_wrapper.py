@@ -1,16 +1,13 @@
-from typing import Any, cast
+from typing import Any, List, cast
 import pytest
 
-from pathlib import Path
-
-from polywrap_msgpack import msgpack_decode
-from polywrap_core import InvokerClient, Uri, Invoker, FileReader
+from polywrap_msgpack import encoder, msgpack_decode, msgpack_encode
+from polywrap_core import InvokerClient, Uri, Invoker, FileReader, WrapAbortError
 from polywrap_wasm import WasmPackage, WasmWrapper
 from polywrap_wasm.constants import WRAP_MODULE_PATH, WRAP_MANIFEST_PATH
 from polywrap_manifest import deserialize_wrap_manifest
 
 
-
 @pytest.fixture
 def mock_invoker():
     class MockInvoker(InvokerClient):
@@ -27,29 +24,6 @@ def mock_invoker():
     return MockInvoker()
 
 
-@pytest.fixture
-def simple_wrap_module():
-    wrap_path = Path(__file__).parent / "cases" / "simple" / "wrap.wasm"
-    with open(wrap_path, "rb") as f:
-        yield f.read()
-
-
-@pytest.fixture
-def simple_wrap_manifest():
-    wrap_path = Path(__file__).parent / "cases" / "simple" / "wrap.info"
-    with open(wrap_path, "rb") as f:
-        yield f.read()
-
-
-@pytest.fixture
-def dummy_file_reader():
-    class DummyFileReader(FileReader):
-        def read_file(self, *args: Any, **kwargs: Any) -> bytes:
-            raise NotImplementedError()
-
-    yield DummyFileReader()
-
-
 @pytest.fixture
 def simple_file_reader(simple_wrap_module: bytes, simple_wrap_manifest: bytes):
     class DummyFileReader(FileReader):
@@ -101,3 +75,104 @@ def test_invoke_with_package(simple_file_reader: FileReader, mock_invoker: Invok
     )
     assert result.encoded is True
     assert msgpack_decode(cast(bytes, result.result)) == message
+
+
+def test_invoke_encodes_args_and_env_once(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+    )
+
+    encoded_values: List[Any] = []
+    pack = encoder._pack
+
+    def counting_pack(value: Any) -> bytes:
+        encoded_values.append(value)
+        return pack(value)
+
+    monkeypatch.setattr(encoder, "_pack", counting_pack)
+
+    message = "hey" * 1000
+    result = wrapper.invoke(
+        uri=Uri.from_str("fs/./build"),
+        method="simpleMethod",
+        args={"arg": message},
+        env={"key": "value"},
+    )
+
+    assert msgpack_decode(cast(bytes, result.result)) == message
+    assert encoded_values == [{"arg": message}, {"key": "value"}]
+
+
+@pytest.mark.parametrize("use_abi_codecs", [False, True])
+def test_invoke_with_args_not_matching_abi(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+    use_abi_codecs: bool,
+):
+    wrapper = WasmWrapper(
+        dummy_file_reader,
+        simple_wrap_module,
+        deserialize_wrap_manifest(simple_wrap_manifest),
+        use_abi_codecs=use_abi_codecs,
+    )
+
+    with pytest.raises(WrapAbortError) as err:
+        wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": 1},
+        )
+
+    assert "Property must be of type" in err.value.args[0]
+
+
+def test_wrapper_uses_abi_codecs_only_if_enabled(
+    dummy_file_reader: FileReader,
+    simple_wrap_module: bytes,
+    simple_wrap_manifest: bytes,
+):
+    manifest = deserialize_wrap_manifest(simple_wrap_manifest)
+    default = WasmWrapper(dummy_file_reader, simple_wrap_module, manifest)
+    enabled = WasmWrapper(
+        dummy_file_reader, simple_wrap_module, manifest, use_abi_codecs=True
+    )
+
+    assert default.get_wrap_codecs() is None
+    assert enabled.get_wrap_codecs() is not None
+    results = [
+        wrapper.invoke(
+            uri=Uri.from_str("fs/./build"),
+            method="simpleMethod",
+            args={"arg": "hey"},
+        ).result
+        for wrapper in [default, enabled]
+    ]
+    assert results[0] == results[1] == msgpack_encode("hey")
+
+
+def test_package_wrappers_use_abi_codecs_only_if_enabled(
+    simple_file_reader: FileReader,
+):
+    package = WasmPackage(simple_file_reader)
+    wrapper = cast(WasmWrapper, package.create_wrapper())
+
+    assert wrapper.get_wrap_codecs() is None
+
+
+def test_wrappers_of_a_package_share_codecs(simple_file_reader: FileReader):
+    package = WasmPackage(simple_file_reader, use_abi_codecs=True)
+    first = cast(WasmWrapper, package.create_wrapper())
+    second = cast(WasmWrapper, package.create_wrapper())
+
+    assert first.get_manifest() is second.get_manifest()
+    codecs = first.get_wrap_codecs()
+    assert codecs is not None
+    assert codecs is second.get_wrap_codecs()